@@ -62,10 +62,14 @@ def convert_file(src_file, dst_file):
     return len(converted)
 
 
-def run(input_dir, output_dir):
+def run(input_dir, output_dir, leagues=None):
     src = Path(input_dir)
     dst = Path(output_dir)
-    files = sorted(src.glob("*_Team_Stats.xlsx"))
+    if leagues:
+        files = [src / f"{league}_Team_Stats.xlsx" for league in leagues]
+        files = [f for f in files if f.exists()]
+    else:
+        files = sorted(src.glob("*_Team_Stats.xlsx"))
 
     if not files:
         print(f"No files found in {src}")
@@ -93,9 +97,14 @@ def parse_args():
         default="active/sofascore_team_data",
         help="Directory to write derived per90 files.",
     )
+    parser.add_argument(
+        "--league",
+        action="append",
+        help="Only convert this league (repeatable). Default: every *_Team_Stats.xlsx in --input-dir.",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    raise SystemExit(run(args.input_dir, args.output_dir))
+    raise SystemExit(run(args.input_dir, args.output_dir, leagues=args.league))
@@ -2,19 +2,30 @@
 import argparse
 import json
 import math
+import multiprocessing
 import os
 import re
 import sys
 import time
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import requests
 
+import data_store
+import market_pricing
+import match_montecarlo
+import opta_aggregates
+import team_registry
+
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
 
+PROJECT_ROOT = Path(__file__).resolve().parent
+
 TEAM_NAME_MAP = {
     "Paris S-G": "Paris Saint-Germain",
     "PSG": "Paris Saint-Germain",
@@ -35,6 +46,11 @@ TEAM_NAME_MAP = {
 
 TEAM_SUFFIX_TOKENS = {"fc", "cf", "sc", "afc", "ac"}
 SCORE_PAIR_RE = re.compile(r"^\s*(\d+)\s*[-:]\s*(\d+)\s*$")
+# Per-side lambda scale range searched by --target-score (about +/-28% xG).
+TARGET_SHIFT_MIN = 0.72
+TARGET_SHIFT_MAX = 1.28
+TARGET_SHIFT_STEP = 0.02
+NO_LIVE_CONTEXT = "No live context available (Lineups/Injuries missing)."
 
 SOFASCORE_HTTP_HEADERS = {
     "User-Agent": "Mozilla/5.0",
@@ -100,22 +116,66 @@ def _team_aliases(name):
     return out
 
 
-def _find_team_row(df, team_col, team_name):
+def _find_team_pos(df, team_col, team_name):
     if df is None or df.empty or team_col not in df.columns:
         return None
     series = df[team_col].astype(str)
     for alias in _team_aliases(team_name):
         mask = series.str.contains(re.escape(alias), case=False, na=False)
         if mask.any():
-            return df.loc[mask].iloc[0]
+            return int(mask.to_numpy().argmax())
     target = _normalize_text(team_name)
     norm = series.apply(_normalize_text)
     mask = (norm == target) | norm.str.contains(target, regex=False, na=False)
     if mask.any():
-        return df.loc[mask].iloc[0]
+        return int(mask.to_numpy().argmax())
     return None
 
 
+def _find_team_row(df, team_col, team_name):
+    pos = _find_team_pos(df, team_col, team_name)
+    return None if pos is None else df.iloc[pos]
+
+
+# (abs path, team column) -> name index over the process-wide cached table.
+_TEAM_ROW_INDEX = {}
+
+
+def _team_row_index(file_path, team_col):
+    df = data_store.cached_table(file_path)
+    key = (os.path.abspath(str(file_path)), team_col)
+    index = _TEAM_ROW_INDEX.get(key)
+    if index is None or index["frame"] is not df:
+        names = {}
+        if team_col in df.columns:
+            for pos, value in enumerate(df[team_col].astype(str)):
+                names.setdefault(_normalize_text(value), pos)
+        index = {"frame": df, "names": names, "resolved": {}}
+        _TEAM_ROW_INDEX[key] = index
+    return index
+
+
+def _lookup_team_row(file_path, team_col, team_name):
+    """
+    _find_team_row over a league workbook, without re-reading or re-scanning it.
+    Exact alias hits come from the name index; anything else falls back to the
+    substring scan once and is memoized until the file changes.
+    """
+    index = _team_row_index(file_path, team_col)
+    resolved = index["resolved"]
+    if team_name not in resolved:
+        pos = None
+        for alias in _team_aliases(team_name):
+            pos = index["names"].get(_normalize_text(alias))
+            if pos is not None:
+                break
+        if pos is None:
+            pos = _find_team_pos(index["frame"], team_col, team_name)
+        resolved[team_name] = pos
+    pos = resolved[team_name]
+    return None if pos is None else index["frame"].iloc[pos]
+
+
 def _to_number(value):
     try:
         num = float(value)
@@ -139,17 +199,20 @@ def _per90_from_row(row, per90_key, raw_key, default=0.0):
 
 
 def find_team_league(team_name):
-    base = Path("sofaplayer")
-    if not base.exists():
-        return None
+    registry = team_registry.get_registry()
+    team = registry.lookup(team_name)
+    if team is not None and registry.files("player_stats", team["league"]):
+        return team["league"]
+    return registry.memo(("find_team_league", str(team_name)), lambda: _scan_team_league(registry, team_name))
+
+
+def _scan_team_league(registry, team_name):
     aliases = [_normalize_text(a) for a in _team_aliases(team_name)]
-    for league_dir in base.iterdir():
-        if not league_dir.is_dir():
-            continue
-        for f in league_dir.glob("*_stats.xlsx"):
-            stem = _normalize_text(f.stem.replace("_stats", ""))
+    for league in registry.leagues("player_stats"):
+        for fname in registry.files("player_stats", league):
+            stem = _normalize_text(fname[: -len(".xlsx")].replace("_stats", ""))
             if any(alias and (alias in stem or stem in alias) for alias in aliases):
-                return league_dir.name
+                return league
     return None
 
 
@@ -158,8 +221,7 @@ def get_simulation_stats(team_name, league):
     if not file_path.exists():
         return None
     try:
-        df = pd.read_excel(file_path)
-        row = _find_team_row(df, "Team_Name", team_name)
+        row = _lookup_team_row(file_path, "Team_Name", team_name)
         if row is None:
             return None
         goals_scored_p90 = _per90_from_row(row, "goalsScored_per_90", "goalsScored", default=0.0)
@@ -177,8 +239,7 @@ def get_progression_stats(team_name, league):
     if not file_path.exists():
         return {}
     try:
-        df = pd.read_excel(file_path)
-        row = _find_team_row(df, "Team_Name", team_name)
+        row = _lookup_team_row(file_path, "Team_Name", team_name)
         if row is None:
             return {}
         opp_half_passes_p90 = _per90_from_row(
@@ -466,7 +527,7 @@ def _expand_sofascore_widget_context(context_text, home_team=None, away_team=Non
 
 def _load_live_context(path="match_context.txt", home_team=None, away_team=None):
     if not os.path.exists(path):
-        return "No live context available (Lineups/Injuries missing)."
+        return NO_LIVE_CONTEXT
     try:
         with open(path, "r", encoding="utf-8") as f:
             context_text = f.read()
@@ -476,7 +537,7 @@ def _load_live_context(path="match_context.txt", home_team=None, away_team=None)
                 away_team=away_team,
             )
     except Exception:
-        return "No live context available (Lineups/Injuries missing)."
+        return NO_LIVE_CONTEXT
 
 
 def _parse_context_headers(context_text):
@@ -603,12 +664,18 @@ def run_data_qc(home_team, away_team, league, context_text, home_league=None, aw
     return flags, headers
 
 
+def _poisson_log_pmf(goals, lam):
+    goals = np.asarray(goals, dtype=float)
+    lam = np.maximum(1e-12, np.asarray(lam, dtype=float))
+    log_fact = np.vectorize(math.lgamma)(goals + 1.0) if goals.ndim else math.lgamma(float(goals) + 1.0)
+    return goals * np.log(lam) - lam - log_fact
+
+
 def _build_poisson_matrix(lambda_home, lambda_away, max_goals=10):
-    lambda_home = max(0.0, float(lambda_home))
-    lambda_away = max(0.0, float(lambda_away))
-    home = [math.exp(-lambda_home) * (lambda_home ** g) / math.factorial(g) for g in range(max_goals)]
-    away = [math.exp(-lambda_away) * (lambda_away ** g) / math.factorial(g) for g in range(max_goals)]
-    return [[home[h] * away[a] for a in range(max_goals)] for h in range(max_goals)]
+    goals = np.arange(max_goals)
+    home = np.exp(_poisson_log_pmf(goals, max(0.0, float(lambda_home))))
+    away = np.exp(_poisson_log_pmf(goals, max(0.0, float(lambda_away))))
+    return np.outer(home, away)
 
 
 def _result_from_score(score):
@@ -652,58 +719,81 @@ def _target_realism_band(prob_pct, rank):
     return "long_shot"
 
 
-def _search_reasonable_shift(lambda_home, lambda_away, target_home, target_away):
-    base_prob = _score_probability(lambda_home, lambda_away, target_home, target_away)
-    target_prob = min(0.25, base_prob + max(0.008, base_prob * 0.35))
-
-    scales = [round(0.72 + (i * 0.02), 2) for i in range(29)]
-    best_reaching = None
-    best_any = None
-
-    for h_scale in scales:
-        for a_scale in scales:
-            cand_home = max(0.25, min(3.8, float(lambda_home) * h_scale))
-            cand_away = max(0.25, min(3.8, float(lambda_away) * a_scale))
-            prob = _score_probability(cand_home, cand_away, target_home, target_away)
-            move = abs(h_scale - 1.0) + abs(a_scale - 1.0)
-            candidate = {
-                "lambda_home": float(cand_home),
-                "lambda_away": float(cand_away),
-                "home_scale": float(h_scale),
-                "away_scale": float(a_scale),
-                "probability": float(prob),
-                "move": float(move),
+def _shift_scales(step=TARGET_SHIFT_STEP):
+    """
+    Per-side lambda scales searched by the target-score solver: 1.0 (no shift) and `step`
+    increments out from it in both directions, within TARGET_SHIFT_MIN..TARGET_SHIFT_MAX.
+    """
+    step = float(step)
+    if not step > 0:
+        raise ValueError(f"target shift step must be positive, got {step}")
+    down = int(np.floor((1.0 - TARGET_SHIFT_MIN) / step + 1e-9))
+    up = int(np.floor((TARGET_SHIFT_MAX - 1.0) / step + 1e-9))
+    return np.round(1.0 + step * np.arange(-down, up + 1), 6)
+
+
+def _positive_step(value):
+    """argparse type of --target-step: a float above 0."""
+    try:
+        step = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid step: {value!r}")
+    if not step > 0:
+        raise argparse.ArgumentTypeError(f"step must be positive, got {value}")
+    return step
+
+
+def _search_reasonable_shifts(lambda_home, lambda_away, targets, step=TARGET_SHIFT_STEP):
+    """
+    Smallest per-side lambda shift (|home scale - 1| + |away scale - 1|) that lifts each (home, away)
+    target score to its goal probability, for every target at once. The score probability factorizes
+    into two Poisson terms, so the (targets, scales, scales) grid is one broadcast sum of log-pmfs.
+    Falls back to the most probable grid point when no shift reaches the goal.
+    """
+    targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+    scales = _shift_scales(step)
+    cand_home = np.clip(float(lambda_home) * scales, 0.25, 3.8)
+    cand_away = np.clip(float(lambda_away) * scales, 0.25, 3.8)
+    log_home = _poisson_log_pmf(targets[:, :1], cand_home[None, :])
+    log_away = _poisson_log_pmf(targets[:, 1:], cand_away[None, :])
+    probs = np.exp(log_home[:, :, None] + log_away[:, None, :]).reshape(len(targets), -1)
+    move = (np.abs(scales - 1.0)[:, None] + np.abs(scales - 1.0)[None, :]).ravel()
+
+    base_probs = np.array([_score_probability(lambda_home, lambda_away, h, a) for h, a in targets.astype(int)])
+    target_probs = np.minimum(0.25, base_probs + np.maximum(0.008, base_probs * 0.35))
+
+    # Most probable point (smallest move among near-ties) and cheapest point reaching the goal
+    # (most probable among near-equal moves); ties go to the first point in grid order.
+    near_best = probs >= probs.max(axis=1, keepdims=True) - 1e-12
+    any_idx = np.argmin(np.where(near_best, move, np.inf), axis=1)
+    reaching = probs + 1e-12 >= target_probs[:, None]
+    min_move = np.where(reaching, move, np.inf).min(axis=1, keepdims=True)
+    cheapest = reaching & (move <= min_move + 1e-12)
+    reach_idx = np.argmax(np.where(cheapest, probs, -np.inf), axis=1)
+
+    size = len(scales)
+    results = []
+    for t in range(len(targets)):
+        reached = bool(reaching[t].any())
+        idx = int(reach_idx[t] if reached else any_idx[t])
+        i, j = divmod(idx, size)
+        results.append(
+            {
+                "lambda_home": float(cand_home[i]),
+                "lambda_away": float(cand_away[j]),
+                "home_scale": float(scales[i]),
+                "away_scale": float(scales[j]),
+                "probability": float(probs[t, idx]),
+                "move": float(move[idx]),
+                "target_probability": float(target_probs[t]),
+                "target_reached": reached,
             }
+        )
+    return results
 
-            if best_any is None:
-                best_any = candidate
-            else:
-                best_prob = best_any["probability"]
-                if prob > best_prob + 1e-12 or (abs(prob - best_prob) <= 1e-12 and move < best_any["move"]):
-                    best_any = candidate
 
-            if prob + 1e-12 < target_prob:
-                continue
-            if best_reaching is None:
-                best_reaching = candidate
-            else:
-                if move < best_reaching["move"] - 1e-12 or (
-                    abs(move - best_reaching["move"]) <= 1e-12
-                    and prob > best_reaching["probability"] + 1e-12
-                ):
-                    best_reaching = candidate
-
-    chosen = best_reaching or best_any or {
-        "lambda_home": float(lambda_home),
-        "lambda_away": float(lambda_away),
-        "home_scale": 1.0,
-        "away_scale": 1.0,
-        "probability": float(base_prob),
-        "move": 0.0,
-    }
-    chosen["target_probability"] = float(target_prob)
-    chosen["target_reached"] = bool(best_reaching)
-    return chosen
+def _search_reasonable_shift(lambda_home, lambda_away, target_home, target_away, step=TARGET_SHIFT_STEP):
+    return _search_reasonable_shifts(lambda_home, lambda_away, [(target_home, target_away)], step=step)[0]
 
 
 def _build_target_hypotheses(home, away, target_home, target_away, lambda_home, lambda_away, shift_data, sim):
@@ -775,81 +865,115 @@ def _build_target_hypotheses(home, away, target_home, target_away, lambda_home,
     return unique[:5]
 
 
-def analyze_target_score_scenario(home, away, sim, target_score, max_goals=10):
-    parsed = _parse_score_pair(target_score)
-    if parsed is None:
-        return {
-            "error": "invalid_target_score",
-            "input": target_score,
-            "expected_format": "H-A",
-        }
+def expand_target_scores(text, sim, max_goals=10):
+    """
+    --target-score value -> list of score strings: comma-separated "H-A" scores and/or "topN" for the
+    N most likely scorelines of the active model. Invalid entries are kept so they are reported.
+    """
+    scores = []
+    for item in str(text or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        m = re.fullmatch(r"top(\d+)", item.lower())
+        if m:
+            lambda_home = float((sim or {}).get("expected_goals_home", 1.5))
+            lambda_away = float((sim or {}).get("expected_goals_away", 1.2))
+            matrix = _build_poisson_matrix(lambda_home, lambda_away, max_goals=max(int(max_goals), 12))
+            order = np.argsort(-matrix.ravel(), kind="stable")[: int(m.group(1))]
+            scores.extend(f"{i // matrix.shape[1]}-{i % matrix.shape[1]}" for i in order)
+        else:
+            scores.append(item)
+    return list(dict.fromkeys(scores))
+
 
-    target_home, target_away = parsed
+def analyze_target_scores(home, away, sim, target_scores, max_goals=10, step=TARGET_SHIFT_STEP):
+    """analyze_target_score_scenario for several target scores, sharing one score grid and one shift solve."""
     lambda_home = float((sim or {}).get("expected_goals_home", 1.5))
     lambda_away = float((sim or {}).get("expected_goals_away", 1.2))
+    parsed = [_parse_score_pair(t) for t in target_scores]
+    valid = [p for p in parsed if p is not None]
+
+    shifts = []
+    ranks = {}
+    top5 = []
+    if valid:
+        grid_goals = max([int(max_goals), 12] + [g + 6 for p in valid for g in p])
+        matrix = _build_poisson_matrix(lambda_home, lambda_away, max_goals=grid_goals)
+        order = np.argsort(-matrix.ravel(), kind="stable")
+        positions = np.empty(len(order), dtype=int)
+        positions[order] = np.arange(1, len(order) + 1)
+        ranks = {p: int(positions[p[0] * grid_goals + p[1]]) for p in valid}
+        top5 = [
+            {"score": f"{i // grid_goals}-{i % grid_goals}", "probability": round(float(matrix.ravel()[i]) * 100.0, 2)}
+            for i in order[:5]
+        ]
+        shifts = _search_reasonable_shifts(lambda_home, lambda_away, valid, step=step)
+    shift_by_target = dict(zip(valid, shifts))
+
+    results = []
+    for target_score, pair in zip(target_scores, parsed):
+        if pair is None:
+            results.append(
+                {
+                    "error": "invalid_target_score",
+                    "input": target_score,
+                    "expected_format": "H-A",
+                }
+            )
+            continue
+        target_home, target_away = pair
+        rank = ranks.get(pair)
+        current_prob = _score_probability(lambda_home, lambda_away, target_home, target_away)
+        shift_data = shift_by_target[pair]
+        shifted_home = float(shift_data["lambda_home"])
+        shifted_away = float(shift_data["lambda_away"])
+
+        xg_shift = {
+            "probability_goal": round(float(shift_data["target_probability"]) * 100.0, 2),
+            "goal_reached_with_reasonable_shift": bool(shift_data["target_reached"]),
+            "probability_after_shift": round(float(shift_data["probability"]) * 100.0, 2),
+            "home_xg_current": round(lambda_home, 3),
+            "away_xg_current": round(lambda_away, 3),
+            "home_xg_required": round(shifted_home, 3),
+            "away_xg_required": round(shifted_away, 3),
+            "home_xg_change_pct": round(((shifted_home / max(0.01, lambda_home)) - 1.0) * 100.0, 1),
+            "away_xg_change_pct": round(((shifted_away / max(0.01, lambda_away)) - 1.0) * 100.0, 1),
+        }
 
-    grid_goals = max(int(max_goals), target_home + 6, target_away + 6, 12)
-    matrix = _build_poisson_matrix(lambda_home, lambda_away, max_goals=grid_goals)
-
-    rows = []
-    for h in range(grid_goals):
-        for a in range(grid_goals):
-            rows.append((h, a, matrix[h][a]))
-    rows.sort(key=lambda x: x[2], reverse=True)
-
-    rank = None
-    for idx, (h, a, _) in enumerate(rows, start=1):
-        if h == target_home and a == target_away:
-            rank = idx
-            break
-
-    current_prob = _score_probability(lambda_home, lambda_away, target_home, target_away)
-    realism_band = _target_realism_band(current_prob * 100.0, rank)
-    top5 = [{"score": f"{h}-{a}", "probability": round(float(p) * 100.0, 2)} for h, a, p in rows[:5]]
-
-    shift_data = _search_reasonable_shift(lambda_home, lambda_away, target_home, target_away)
-    shifted_home = float(shift_data["lambda_home"])
-    shifted_away = float(shift_data["lambda_away"])
-    shifted_prob = float(shift_data["probability"])
-
-    xg_shift = {
-        "probability_goal": round(float(shift_data["target_probability"]) * 100.0, 2),
-        "goal_reached_with_reasonable_shift": bool(shift_data["target_reached"]),
-        "probability_after_shift": round(shifted_prob * 100.0, 2),
-        "home_xg_current": round(lambda_home, 3),
-        "away_xg_current": round(lambda_away, 3),
-        "home_xg_required": round(shifted_home, 3),
-        "away_xg_required": round(shifted_away, 3),
-        "home_xg_change_pct": round(((shifted_home / max(0.01, lambda_home)) - 1.0) * 100.0, 1),
-        "away_xg_change_pct": round(((shifted_away / max(0.01, lambda_away)) - 1.0) * 100.0, 1),
-    }
+        hypotheses = _build_target_hypotheses(
+            home=home,
+            away=away,
+            target_home=target_home,
+            target_away=target_away,
+            lambda_home=lambda_home,
+            lambda_away=lambda_away,
+            shift_data=shift_data,
+            sim=sim,
+        )
 
-    hypotheses = _build_target_hypotheses(
-        home=home,
-        away=away,
-        target_home=target_home,
-        target_away=target_away,
-        lambda_home=lambda_home,
-        lambda_away=lambda_away,
-        shift_data=shift_data,
-        sim=sim,
-    )
+        results.append(
+            {
+                "target_score": f"{target_home}-{target_away}",
+                "target_result": _result_from_score(f"{target_home}-{target_away}"),
+                "current_probability": round(current_prob * 100.0, 2),
+                "rank_in_score_grid": rank,
+                "realism_band": _target_realism_band(current_prob * 100.0, rank),
+                "top5_scores_now": top5,
+                "xg_shift_scenario": xg_shift,
+                "hypotheses": hypotheses,
+                "assumptions": [
+                    "Uses current expected-goal surface from the active model output.",
+                    "Search is constrained to roughly +/-28% xG shift per side to keep scenarios realistic.",
+                    "Hypotheses are tactical interpretations of xG shift, not guaranteed outcomes.",
+                ],
+            }
+        )
+    return results
 
-    return {
-        "target_score": f"{target_home}-{target_away}",
-        "target_result": _result_from_score(f"{target_home}-{target_away}"),
-        "current_probability": round(current_prob * 100.0, 2),
-        "rank_in_score_grid": int(rank) if rank is not None else None,
-        "realism_band": realism_band,
-        "top5_scores_now": top5,
-        "xg_shift_scenario": xg_shift,
-        "hypotheses": hypotheses,
-        "assumptions": [
-            "Uses current expected-goal surface from the active model output.",
-            "Search is constrained to roughly +/-28% xG shift per side to keep scenarios realistic.",
-            "Hypotheses are tactical interpretations of xG shift, not guaranteed outcomes.",
-        ],
-    }
+
+def analyze_target_score_scenario(home, away, sim, target_score, max_goals=10, step=TARGET_SHIFT_STEP):
+    return analyze_target_scores(home, away, sim, [target_score], max_goals=max_goals, step=step)[0]
 
 
 def _pick_result_from_probs(home_prob, draw_prob, away_prob):
@@ -860,55 +984,19 @@ def _pick_result_from_probs(home_prob, draw_prob, away_prob):
     return "Draw"
 
 
-def _pick_score_for_result(lambda_home, lambda_away, result, max_goals=10):
-    matrix = _build_poisson_matrix(lambda_home, lambda_away, max_goals=max_goals)
+def _pick_score_for_result(lambda_home, lambda_away, result, max_goals=10, rho=0.0):
+    matrix = market_pricing.score_matrix(lambda_home, lambda_away, rho=rho, max_goals=max_goals)
+    return market_pricing.best_score_for_result(matrix, result)
 
-    def ok(h, a):
-        if result == "Home":
-            return h > a
-        if result == "Away":
-            return h < a
-        return h == a
 
-    best_score, best_prob = None, -1.0
-    for h in range(max_goals):
-        for a in range(max_goals):
-            if not ok(h, a):
-                continue
-            p = matrix[h][a]
-            if p > best_prob:
-                best_prob = p
-                best_score = f"{h}-{a}"
-
-    if best_score is None:
-        for h in range(max_goals):
-            for a in range(max_goals):
-                p = matrix[h][a]
-                if p > best_prob:
-                    best_prob = p
-                    best_score = f"{h}-{a}"
-    return best_score, float(best_prob)
-
-def _poisson_summary(lambda_home, lambda_away, max_goals=10):
-    matrix = _build_poisson_matrix(lambda_home, lambda_away, max_goals=max_goals)
-    home_win = draw = away_win = 0.0
-    rows = []
-    for h in range(max_goals):
-        for a in range(max_goals):
-            p = matrix[h][a]
-            rows.append((h, a, p))
-            if h > a:
-                home_win += p
-            elif h == a:
-                draw += p
-            else:
-                away_win += p
-    rows.sort(key=lambda x: x[2], reverse=True)
-    top3 = rows[:3]
+def _poisson_summary(lambda_home, lambda_away, max_goals=10, rho=0.0):
+    matrix = market_pricing.score_matrix(lambda_home, lambda_away, rho=rho, max_goals=max_goals)
+    priced = market_pricing.price_matrices(matrix)
+    top3 = market_pricing.top_scores(matrix, top_n=3)
     return {
-        "home_win_prob": home_win * 100.0,
-        "draw_prob": draw * 100.0,
-        "away_win_prob": away_win * 100.0,
+        "home_win_prob": float(priced["home_win"][0]) * 100.0,
+        "draw_prob": float(priced["draw"][0]) * 100.0,
+        "away_win_prob": float(priced["away_win"][0]) * 100.0,
         "expected_goals_home": float(lambda_home),
         "expected_goals_away": float(lambda_away),
         "most_likely_score": f"{top3[0][0]}-{top3[0][1]}",
@@ -918,46 +1006,8 @@ def _poisson_summary(lambda_home, lambda_away, max_goals=10):
     }
 
 
-def _calculate_bet_data(lambda_home, lambda_away, max_goals=10):
-    matrix = _build_poisson_matrix(lambda_home, lambda_away, max_goals=max_goals)
-
-    def hdp_outcomes(hdp):
-        win = push = loss = 0.0
-        for h in range(max_goals):
-            for a in range(max_goals):
-                adj = (h - a) + hdp
-                p = matrix[h][a]
-                if adj > 0:
-                    win += p
-                elif adj < 0:
-                    loss += p
-                else:
-                    push += p
-        return win, push, loss
-
-    def ou_prob(boundary, side):
-        p = 0.0
-        for h in range(max_goals):
-            for a in range(max_goals):
-                total = h + a
-                if side == "Over" and total > boundary:
-                    p += matrix[h][a]
-                if side == "Under" and total < boundary:
-                    p += matrix[h][a]
-        return p
-
-    bet_data = {}
-    bet_detail = {}
-    for hdp in [-3, -2, -1, 0, 1, 2, 3]:
-        win, push, loss = hdp_outcomes(hdp)
-        bet_data[f"HDP_{hdp}"] = win
-        bet_detail[f"HDP_{hdp}"] = {"win": win, "push": push, "loss": loss}
-
-    for boundary in [0.5, 1.5, 2.5, 3.5]:
-        bet_data[f"Over_{boundary}"] = ou_prob(boundary, "Over")
-        bet_data[f"Under_{boundary}"] = ou_prob(boundary, "Under")
-
-    return bet_data, bet_detail
+def _calculate_bet_data(lambda_home, lambda_away, max_goals=10, rho=0.0):
+    return market_pricing.price_fixture(lambda_home, lambda_away, rho=rho, max_goals=max_goals)
 
 
 def _safe_float(value, default=None):
@@ -1299,9 +1349,8 @@ def get_game_flow_stats(team_name, league):
     if not file_path.exists():
         return {}
     try:
-        df = pd.read_excel(file_path)
         for col in ["Team_Name", "Team", "Squad"]:
-            row = _find_team_row(df, col, team_name)
+            row = _lookup_team_row(file_path, col, team_name)
             if row is not None:
                 return row.to_dict()
     except Exception:
@@ -1314,9 +1363,8 @@ def get_squad_stats(team_name, league):
     if not file_path.exists():
         return {}
     try:
-        df = pd.read_excel(file_path)
         for col in ["Squad", "Team_Name", "Team"]:
-            row = _find_team_row(df, col, team_name)
+            row = _lookup_team_row(file_path, col, team_name)
             if row is not None:
                 return row.to_dict()
     except Exception:
@@ -1324,107 +1372,46 @@ def get_squad_stats(team_name, league):
     return {}
 
 
-def get_opta_team_stats(team_name, league):
-    """Load OPTA advanced stats from output_opta/{league}/{team}.xlsx.
-    Aggregates player-level data into team-level summaries."""
-    opta_dir = Path("output_opta") / league
-    if not opta_dir.exists():
-        return {}
+def _resolve_opta_file(team_name, league):
+    registry = team_registry.get_registry()
+    if league not in registry.leagues("opta"):
+        return None
 
-    # --- Resolve file name (fuzzy match) ---
-    target = _normalize_text(team_name)
-    best_file = None
-    for f in opta_dir.glob("*.xlsx"):
-        if _normalize_text(f.stem) == target:
-            best_file = f
-            break
-    if best_file is None:
+    def _scan():
+        target = _normalize_text(team_name)
+        stems = [(f, _normalize_text(f[: -len(".xlsx")])) for f in registry.files("opta", league) if f.endswith(".xlsx")]
+        for f, stem in stems:
+            if stem == target:
+                return f
         # Try partial / alias matching
         for alias in _team_aliases(team_name):
             alias_norm = _normalize_text(alias)
-            for f in opta_dir.glob("*.xlsx"):
-                if _normalize_text(f.stem) == alias_norm:
-                    best_file = f
-                    break
-            if best_file:
-                break
-    if best_file is None:
+            for f, stem in stems:
+                if stem == alias_norm:
+                    return f
         # Substring fallback
-        for f in opta_dir.glob("*.xlsx"):
-            if target in _normalize_text(f.stem) or _normalize_text(f.stem) in target:
-                best_file = f
-                break
+        for f, stem in stems:
+            if target in stem or stem in target:
+                return f
+        return None
+
+    fname = registry.memo(("opta_file", league, str(team_name)), _scan)
+    return Path("output_opta") / league / fname if fname else None
+
+
+def get_opta_team_stats(team_name, league):
+    """Team-level OPTA summary for output_opta/{league}/{team}.xlsx.
+    Read from the league aggregate table (scripts/build_opta_team_table.py) when it is
+    current for that workbook, otherwise aggregated from the player-level sheets."""
+    best_file = _resolve_opta_file(team_name, league)
     if best_file is None:
         return {}
 
+    aggregates = opta_aggregates.lookup_team(best_file, league)
+    if aggregates is None:
+        aggregates = opta_aggregates.aggregate_team_workbook(best_file)
     result = {"opta_file": best_file.name}
-    try:
-        xl = pd.ExcelFile(best_file)
-        sheets = xl.sheet_names
-
-        # --- Attacking ---
-        if "Attacking" in sheets:
-            df = pd.read_excel(best_file, sheet_name="Attacking")
-            result["opta_goals"] = pd.to_numeric(df.get("goals"), errors="coerce").sum()
-            result["opta_xg"] = pd.to_numeric(df.get("xg"), errors="coerce").sum()
-            result["opta_shots"] = pd.to_numeric(df.get("shots"), errors="coerce").sum()
-            result["opta_sot"] = pd.to_numeric(df.get("sot"), errors="coerce").sum()
-            conv = pd.to_numeric(df.get("conv %"), errors="coerce").dropna()
-            result["opta_conv_pct"] = float(conv.mean()) if len(conv) > 0 else None
-            xgps = pd.to_numeric(df.get("xG per Shot"), errors="coerce").dropna()
-            result["opta_xg_per_shot"] = float(xgps.mean()) if len(xgps) > 0 else None
-
-        # --- Passing ---
-        if "Passing" in sheets:
-            df = pd.read_excel(best_file, sheet_name="Passing")
-            op_total = pd.to_numeric(df.get("Open Play Passes_total"), errors="coerce").sum()
-            op_succ = pd.to_numeric(df.get("Open Play Passes_successful"), errors="coerce").sum()
-            result["opta_open_play_passes"] = float(op_total)
-            result["opta_pass_pct"] = float(op_succ / op_total * 100) if op_total > 0 else None
-            ft_total = pd.to_numeric(df.get("In Final Third_total"), errors="coerce").sum()
-            ft_succ = pd.to_numeric(df.get("In Final Third_successful"), errors="coerce").sum()
-            result["opta_final_third_passes"] = float(ft_total)
-            result["opta_final_third_pct"] = float(ft_succ / ft_total * 100) if ft_total > 0 else None
-            result["opta_crosses"] = pd.to_numeric(df.get("Crosses_total"), errors="coerce").sum()
-            result["opta_through_balls"] = pd.to_numeric(df.get("through balls"), errors="coerce").sum()
-
-        # --- Defending ---
-        if "Defending" in sheets:
-            df = pd.read_excel(best_file, sheet_name="Defending")
-            result["opta_tackles"] = pd.to_numeric(df.get("tackles"), errors="coerce").sum()
-            result["opta_interceptions"] = pd.to_numeric(df.get("ints"), errors="coerce").sum()
-            result["opta_blocks"] = pd.to_numeric(df.get("blocks"), errors="coerce").sum()
-            result["opta_clearances"] = pd.to_numeric(df.get("clearances"), errors="coerce").sum()
-            gd_won = pd.to_numeric(df.get("Ground Duels_won"), errors="coerce").sum()
-            gd_total = pd.to_numeric(df.get("Ground Duels_total"), errors="coerce").sum()
-            result["opta_ground_duels_pct"] = float(gd_won / gd_total * 100) if gd_total > 0 else None
-            ad_won = pd.to_numeric(df.get("Aerial Duels_won"), errors="coerce").sum()
-            ad_total = pd.to_numeric(df.get("Aerial Duels_total"), errors="coerce").sum()
-            result["opta_aerial_duels_pct"] = float(ad_won / ad_total * 100) if ad_total > 0 else None
-
-        # --- Carrying ---
-        if "Carrying" in sheets:
-            df = pd.read_excel(best_file, sheet_name="Carrying")
-            result["opta_progressive_carries"] = pd.to_numeric(df.get("Progressive_total"), errors="coerce").sum()
-            prog_dist = pd.to_numeric(df.get("Progressive_distance (m)"), errors="coerce").sum()
-            result["opta_progressive_distance"] = float(prog_dist)
-            result["opta_carries_to_shot"] = pd.to_numeric(df.get("Ended With_shot"), errors="coerce").sum()
-            result["opta_carries_to_goal"] = pd.to_numeric(df.get("Ended With_goal"), errors="coerce").sum()
-            result["opta_carries_to_chance"] = pd.to_numeric(df.get("Ended With_chance"), errors="coerce").sum()
-
-        # --- Goalkeeping ---
-        if "Goalkeeping" in sheets:
-            df = pd.read_excel(best_file, sheet_name="Goalkeeping")
-            save_pct = pd.to_numeric(df.get("save %"), errors="coerce").dropna()
-            result["opta_save_pct"] = float(save_pct.mean()) if len(save_pct) > 0 else None
-            result["opta_goals_conceded"] = pd.to_numeric(df.get("goals conceded"), errors="coerce").sum()
-            result["opta_saves"] = pd.to_numeric(df.get("saves made"), errors="coerce").sum()
-            gp = pd.to_numeric(df.get("goals prevented"), errors="coerce").dropna()
-            result["opta_goals_prevented"] = float(gp.sum()) if len(gp) > 0 else None
-
-    except Exception as e:
-        result["opta_error"] = str(e)
-
+    result.update(aggregates)
     return result
 
 
@@ -1459,7 +1446,7 @@ def get_top_players(team_name, league, top_n=3):
         return [], []
 
     try:
-        df = pd.read_excel(file_path)
+        df = data_store.read_table(file_path)
     except Exception:
         return [], []
     if df.empty:
@@ -1825,6 +1812,8 @@ def _try_simulator(
     context_text,
     home_flow=None,
     away_flow=None,
+    iterations=10000,
+    as_of=None,
 ):
     home_xg_data = None
     away_xg_data = None
@@ -1833,8 +1822,8 @@ def _try_simulator(
         import simulator_v9
 
         eng = xg_engine.XGEngine(league)
-        home_xg_data = eng.get_team_rolling_stats(home, n_games=10)
-        away_xg_data = eng.get_team_rolling_stats(away, n_games=10)
+        home_xg_data = eng.get_team_rolling_stats(home, n_games=10, as_of=as_of)
+        away_xg_data = eng.get_team_rolling_stats(away, n_games=10, as_of=as_of)
         if not (home_xg_data and away_xg_data):
             raise RuntimeError("xG data missing")
         sim = simulator_v9.simulate_match(
@@ -1842,7 +1831,7 @@ def _try_simulator(
             away_xg_data,
             home_sim_stats,
             away_sim_stats,
-            iterations=10000,
+            iterations=iterations,
             league=league,
             home_team=home,
             away_team=away,
@@ -1851,6 +1840,7 @@ def _try_simulator(
             away_progression=away_prog,
             home_flow=home_flow,
             away_flow=away_flow,
+            as_of=as_of,
         )
         sim["xg_input"] = {"home": home_xg_data, "away": away_xg_data}
         sim.setdefault("lineup_context", {})
@@ -1995,6 +1985,10 @@ def _resolve_demo_v2_league(league_name):
     return "All", {"requested": raw, "resolved": "All", "method": "fallback_all", "confidence": 0.35}
 
 
+# (team names in the table, requested name) -> (resolved name, mapping context)
+_DEMO_NAME_CACHE = {}
+
+
 def _resolve_demo_team_name(df, team_name, team_col="team_name"):
     default = {
         "requested": str(team_name or ""),
@@ -2009,6 +2003,14 @@ def _resolve_demo_team_name(df, team_name, team_col="team_name"):
     if not names:
         return default["resolved"], default
 
+    key = (tuple(names), str(team_name or ""))
+    if key not in _DEMO_NAME_CACHE:
+        _DEMO_NAME_CACHE[key] = _match_demo_team_name(names, team_name, default)
+    resolved, ctx = _DEMO_NAME_CACHE[key]
+    return resolved, dict(ctx)
+
+
+def _match_demo_team_name(names, team_name, default):
     aliases = _team_aliases(team_name)
     alias_norms = {_normalize_text(a) for a in aliases if a}
     lookup = {name: _normalize_text(name) for name in names}
@@ -2218,7 +2220,7 @@ def _confidence_class_from_probs(home_prob, draw_prob, away_prob):
     return "low"
 
 
-def _run_demo_v2_shadow(home_team, away_team, league):
+def _run_demo_v2_shadow(home_team, away_team, league, as_of=None):
     league_key, league_ctx = _resolve_demo_v2_league(league)
     unit_policy, unit_policy_ctx = _resolve_demo_unit_policy()
     adapter_context = {
@@ -2261,7 +2263,7 @@ def _run_demo_v2_shadow(home_team, away_team, league):
         engine = FeatureEngine()
         df_processed = engine.calculate_feature_metrics(df_normalized)
 
-        log_loader = MatchLogLoader("Match Logs")
+        log_loader = MatchLogLoader("Match Logs", as_of=as_of)
         impact_engine = PlayerImpactEngine("sofaplayer")
         home_tax = impact_engine.calculate_missing_tax(home_resolved, league_key, None)
         away_tax = impact_engine.calculate_missing_tax(away_resolved, league_key, None)
@@ -2272,6 +2274,7 @@ def _run_demo_v2_shadow(home_team, away_team, league):
             match_log_loader=log_loader,
             venue="Home",
             player_tax=home_tax,
+            as_of=as_of,
         )
         away_ratings = engine.get_team_ratings(
             df_processed,
@@ -2279,6 +2282,7 @@ def _run_demo_v2_shadow(home_team, away_team, league):
             match_log_loader=log_loader,
             venue="Away",
             player_tax=away_tax,
+            as_of=as_of,
         )
 
         model = PoissonModel()
@@ -2448,10 +2452,13 @@ def _build_hybrid_sim(sim_v9, demo_v2):
     blended_home = _clip_scalar(blended_home_raw, 0.25, 3.8)
     blended_away = _clip_scalar(blended_away_raw, 0.25, 3.8)
 
-    summary = _poisson_summary(blended_home, blended_away, max_goals=10)
+    v9_rho = _safe_float(sim_v9.get("dixon_coles_rho"), 0.0)
+    summary = _poisson_summary(blended_home, blended_away, max_goals=10, rho=v9_rho)
     sim = dict(sim_v9)
     sim.update(summary)
     sim["model_version"] = "hybrid_v10"
+    # The v9 Monte Carlo ran on the v9 lambdas, not the blend.
+    sim["monte_carlo"] = None
     sim["bonus_applied"] = f"{sim_v9.get('bonus_applied', 'v9')} | Hybrid blend v9={v9_weight:.2f} demo_v2={demo_weight:.2f}"
     sim["base_exp_home"] = _safe_float(sim_v9.get("base_exp_home"), None)
     sim["base_exp_away"] = _safe_float(sim_v9.get("base_exp_away"), None)
@@ -2632,8 +2639,18 @@ def _resolve_core_predictions(
     context_text,
     home_flow,
     away_flow,
+    simulation_iterations=10000,
+    as_of=None,
 ):
+    """
+    v9, demo_v2 shadow and hybrid predictions of one fixture plus the MODEL_CORE selection.
+    simulation_iterations=0 skips v9's minute-by-minute Monte Carlo (1X2 and scores are analytic).
+    as_of: point-in-time match-log features (only matches played before that day), for backtests.
+    """
     model_core, model_core_env_ctx = _resolve_model_core(default_core="v9")
+    # Only a selected v9 keeps its own Monte Carlo; other cores get one on their lambdas later.
+    if model_core != "v9":
+        simulation_iterations = 0
     sim_v9 = _try_simulator(
         home,
         away,
@@ -2645,8 +2662,10 @@ def _resolve_core_predictions(
         context_text,
         home_flow=home_flow,
         away_flow=away_flow,
+        iterations=simulation_iterations,
+        as_of=as_of,
     )
-    demo_v2_shadow = _run_demo_v2_shadow(home, away, stats_league)
+    demo_v2_shadow = _run_demo_v2_shadow(home, away, stats_league, as_of=as_of)
     sim_hybrid, hybrid_context = _build_hybrid_sim(sim_v9, demo_v2_shadow)
     sim_selected, model_core_context = _select_active_sim(
         model_core=model_core,
@@ -2665,23 +2684,226 @@ def _resolve_core_predictions(
     }
 
 
+def _headline_prediction(sim):
+    """(1X2 pick, likeliest score consistent with it, that score's probability, result of the score)."""
+    result_1x2 = _pick_result_from_probs(sim["home_win_prob"], sim["draw_prob"], sim["away_win_prob"])
+    score_aligned, aligned_prob = _pick_score_for_result(
+        sim.get("expected_goals_home", 1.5),
+        sim.get("expected_goals_away", 1.2),
+        result_1x2,
+        max_goals=10,
+        rho=_safe_float(sim.get("dixon_coles_rho"), 0.0),
+    )
+    return result_1x2, score_aligned, aligned_prob, _result_from_score(score_aligned)
+
+
+def _target_score_analysis(home, away, sim, target_score, step=TARGET_SHIFT_STEP):
+    """Target_Score_Analysis of a --target-score input (None without one)."""
+    if not target_score:
+        return None
+    target_scores = expand_target_scores(target_score, sim, max_goals=10)
+    analyses = analyze_target_scores(
+        home=home,
+        away=away,
+        sim=sim,
+        target_scores=target_scores,
+        max_goals=10,
+        step=step,
+    )
+    for analysis in analyses:
+        if analysis.get("error"):
+            print(f"[Warning] Target score input '{analysis['input']}' is invalid. Use H-A format (example: 2-1).")
+        else:
+            print(
+                f"[Info] Target score scenario for {analysis['target_score']}: "
+                f"{analysis['current_probability']:.2f}% baseline probability."
+            )
+    # A single target keeps the original object shape; several targets are stored as a list.
+    return analyses[0] if len(analyses) == 1 else analyses
+
+
+# Batch fixture file column -> accepted header names (case-insensitive; spaces count as underscores).
+FIXTURE_COLUMNS = {
+    "home": ("home", "home_team"),
+    "away": ("away", "away_team"),
+    "league": ("league",),
+    "date": ("date", "match_date"),
+    "context": ("context", "context_file"),
+    "target_score": ("target_score",),
+}
+
+
+def load_fixtures(path):
+    """
+    Fixtures of a batch CSV (header row; home/away required, league/date/context/target_score
+    optional) as dicts keyed by FIXTURE_COLUMNS.
+    """
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    headers = {str(col).strip().lower().replace(" ", "_"): col for col in df.columns}
+    columns = {}
+    for key, names in FIXTURE_COLUMNS.items():
+        columns[key] = next((headers[name] for name in names if name in headers), None)
+    if not columns["home"] or not columns["away"]:
+        raise ValueError(f"{path}: fixture file needs home and away columns.")
+
+    fixtures = []
+    for _, row in df.iterrows():
+        fixture = {key: str(row[col]).strip() if col else "" for key, col in columns.items()}
+        if fixture["home"] and fixture["away"]:
+            fixtures.append(fixture)
+    return fixtures
+
+
+def _fixture_context(fixture, context_dir=None):
+    """
+    Context text of a batch fixture: its own context file, else {context_dir}/{Home}_{Away}.txt,
+    else {context_dir}/{league}.txt; without any, the no-context placeholder.
+    """
+    home, away = fixture["home"], fixture["away"]
+    candidates = [fixture.get("context")]
+    if context_dir:
+        league = fixture.get("league") or find_team_league(home) or find_team_league(away)
+        candidates.append(os.path.join(context_dir, f"{_team_slug(home)}_{_team_slug(away)}.txt"))
+        if league:
+            candidates.append(os.path.join(context_dir, f"{league}.txt"))
+    path = next((c for c in candidates if c and os.path.exists(c)), "")
+    return _load_live_context(path, home_team=home, away_team=away)
+
+
+def _predict_batch_fixture(task):
+    fixture, options = task
+    home, away = fixture["home"], fixture["away"]
+    try:
+        return predict_fixture(
+            home,
+            away,
+            context_text=_fixture_context(fixture, options["context_dir"]),
+            target_score=fixture.get("target_score") or options["target_score"],
+            target_step=options["target_step"],
+            match_date=fixture.get("date") or None,
+            ai_report=options["ai_report"],
+        )
+    except Exception as ex:
+        print(f"[Warning] Prediction failed for {home} vs {away}: {ex}")
+        return {"Match": f"{home} vs {away}", "Home_Team": home, "Away_Team": away, "Error": str(ex)}
+
+
+def _init_batch_worker(project_root):
+    # Data paths are relative to the project root; forked workers also inherit the parent's warm caches.
+    os.chdir(project_root)
+
+
+def predict_fixtures(
+    fixtures,
+    workers=1,
+    context_dir=None,
+    target_score=None,
+    target_step=TARGET_SHIFT_STEP,
+    ai_report=True,
+):
+    """
+    predict_fixture for every fixture (dicts as returned by load_fixtures) with the data loaded once:
+    workbooks, match logs, squad frames and model imports stay warm between fixtures. With
+    workers > 1 the fixtures fan out over a process pool; where workers fork (Linux), the first
+    fixture runs in this process beforehand so every worker inherits the warm data. Spawned workers
+    (Windows, macOS) start cold anyway, so there is no parent warm-up. Returns the records in
+    fixture order; a failed fixture gets "Error".
+    """
+    options = {
+        "context_dir": context_dir,
+        "target_score": target_score,
+        "target_step": target_step,
+        "ai_report": ai_report,
+    }
+    tasks = [(dict(fixture), options) for fixture in fixtures]
+    workers = int(workers or 1)
+    if workers <= 1 or len(tasks) <= 2:
+        return [_predict_batch_fixture(task) for task in tasks]
+
+    warmed = []
+    if multiprocessing.get_start_method() == "fork":
+        warmed.append(_predict_batch_fixture(tasks[0]))
+        for fixture, _ in tasks[1:]:
+            find_team_league(fixture["home"])
+            find_team_league(fixture["away"])
+    rest = tasks[len(warmed):]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(rest)), initializer=_init_batch_worker, initargs=(str(PROJECT_ROOT),)
+    ) as pool:
+        return warmed + list(pool.map(_predict_batch_fixture, rest))
+
+
+def write_predictions_jsonl(predictions, path):
+    """One latest_prediction.json-shaped record per line."""
+    with open(path, "w", encoding="utf-8") as f:
+        for prediction in predictions:
+            f.write(json.dumps(prediction, ensure_ascii=False) + "\n")
+
+
 def _parse_args(argv):
     parser = argparse.ArgumentParser(description="Analyze a football match and export prediction JSON.")
-    parser.add_argument("home_team", help="Home team name")
-    parser.add_argument("away_team", help="Away team name")
+    parser.add_argument("home_team", nargs="?", help="Home team name")
+    parser.add_argument("away_team", nargs="?", help="Away team name")
+    parser.add_argument(
+        "--fixtures",
+        help="CSV of fixtures (home,away[,league,date,context,target_score]) to predict in one run; writes JSONL",
+    )
+    parser.add_argument(
+        "--output",
+        default="predictions.jsonl",
+        help="JSONL output of --fixtures, one latest_prediction.json record per line (default: predictions.jsonl)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for --fixtures (default: 1, in-process)",
+    )
+    parser.add_argument(
+        "--context-dir",
+        dest="context_dir",
+        help="Folder of per-fixture ({Home}_{Away}.txt) or per-league ({League}.txt) context files for --fixtures",
+    )
+    parser.add_argument(
+        "--no-ai-report",
+        dest="no_ai_report",
+        action="store_true",
+        help="Skip the Gemini analysis report",
+    )
     parser.add_argument(
         "--target-score",
         dest="target_score",
-        help="Optional desired score in H-A format (example: 2-1)",
+        help="Optional desired score(s) in H-A format, comma-separated, or topN for the N likeliest scores (example: 2-1,1-1 or top10)",
     )
-    return parser.parse_args(argv)
-
+    parser.add_argument(
+        "--target-step",
+        dest="target_step",
+        type=_positive_step,
+        default=TARGET_SHIFT_STEP,
+        help=f"Lambda scale step of the target-score shift search (default: {TARGET_SHIFT_STEP})",
+    )
+    args = parser.parse_args(argv)
+    if not args.fixtures and not (args.home_team and args.away_team):
+        parser.error("home_team and away_team are required unless --fixtures is given")
+    return args
 
-def main():
-    args = _parse_args(sys.argv[1:])
 
-    home = args.home_team.strip()
-    away = args.away_team.strip()
+def predict_fixture(
+    home,
+    away,
+    context_text=None,
+    target_score=None,
+    target_step=TARGET_SHIFT_STEP,
+    match_date=None,
+    ai_report=True,
+):
+    """
+    Full prediction of one fixture as the latest_prediction.json record.
+    context_text=None reads match_context.txt; ai_report=False skips the Gemini report;
+    match_date (default: today) is the record's "Date".
+    """
+    home = str(home).strip()
+    away = str(away).strip()
     print(f"Analyzing {home} vs {away} ...")
 
     home_league = find_team_league(home)
@@ -2696,7 +2918,8 @@ def main():
     home_prog = get_progression_stats(home, stats_league)
     away_prog = get_progression_stats(away, stats_league)
 
-    context_text = _load_live_context("match_context.txt", home_team=home, away_team=away)
+    if context_text is None:
+        context_text = _load_live_context("match_context.txt", home_team=home, away_team=away)
     context_headers = _parse_context_headers(context_text)
     context_league = str(context_headers.get("league") or "").strip()
     league = context_league or stats_league
@@ -2729,33 +2952,11 @@ def main():
         f"(requested={model_core_context.get('requested_core')})"
     )
 
-    result_1x2 = _pick_result_from_probs(sim["home_win_prob"], sim["draw_prob"], sim["away_win_prob"])
+    result_1x2, score_aligned, aligned_prob, result_from_score = _headline_prediction(sim)
     score_unconditional = sim.get("most_likely_score", "1-1")
-    score_aligned, aligned_prob = _pick_score_for_result(
-        sim.get("expected_goals_home", 1.5),
-        sim.get("expected_goals_away", 1.2),
-        result_1x2,
-        max_goals=10,
-    )
-    result_from_score = _result_from_score(score_aligned)
+    sim_rho = _safe_float(sim.get("dixon_coles_rho"), 0.0)
     final_result = result_from_score or result_1x2
-
-    target_score_analysis = None
-    if args.target_score:
-        target_score_analysis = analyze_target_score_scenario(
-            home=home,
-            away=away,
-            sim=sim,
-            target_score=args.target_score,
-            max_goals=10,
-        )
-        if target_score_analysis.get("error"):
-            print(f"[Warning] Target score input '{args.target_score}' is invalid. Use H-A format (example: 2-1).")
-        else:
-            print(
-                f"[Info] Target score scenario for {target_score_analysis['target_score']}: "
-                f"{target_score_analysis['current_probability']:.2f}% baseline probability."
-            )
+    target_score_analysis = _target_score_analysis(home, away, sim, target_score, step=target_step)
 
     home_squad = get_squad_stats(home, league)
     away_squad = get_squad_stats(away, league)
@@ -2822,8 +3023,10 @@ def main():
     analysis_error = None
     gemini_key_source = None
 
-    gemini_key, gemini_key_source = _load_gemini_api_key()
-    if gemini_key:
+    gemini_key, gemini_key_source = _load_gemini_api_key() if ai_report else (None, None)
+    if not ai_report:
+        analysis_error = "skipped"
+    elif gemini_key:
         prompt = _build_gemini_prompt(
             home=home,
             away=away,
@@ -2872,17 +3075,27 @@ def main():
             " Set env var as described in README or add key to gemini_key.txt."
         )
 
+    # simulate_match's Monte Carlo runs on the v9 lambdas; other cores get one on their own lambdas.
+    monte_carlo = sim.get("monte_carlo") if sim.get("model_version") == "v9" else None
+    if monte_carlo is None:
+        monte_carlo = match_montecarlo.simulate_minutes(
+            sim.get("expected_goals_home", 1.5),
+            sim.get("expected_goals_away", 1.2),
+            fatigue_context=sim.get("fatigue_context"),
+        )
+
     bet_data, bet_detail = _calculate_bet_data(
         sim.get("expected_goals_home", 1.5),
         sim.get("expected_goals_away", 1.2),
         max_goals=10,
+        rho=sim_rho,
     )
 
     canonical_home = _canonical_team_name(home)
     canonical_away = _canonical_team_name(away)
 
     prediction = {
-        "Date": pd.Timestamp.now().strftime("%Y-%m-%d"),
+        "Date": pd.Timestamp(match_date or pd.Timestamp.now()).strftime("%Y-%m-%d"),
         "Match": f"{home} vs {away}",
         "Match_Canonical": f"{canonical_home} vs {canonical_away}",
         "League": league,
@@ -2903,7 +3116,7 @@ def main():
         "Expected_Goals_Away": float(sim.get("expected_goals_away", 0.0)),
         "Base_Expected_Goals_Home": _safe_float(sim.get("base_exp_home"), None),
         "Base_Expected_Goals_Away": _safe_float(sim.get("base_exp_away"), None),
-        "Target_Score_Input": args.target_score,
+        "Target_Score_Input": target_score,
         "Target_Score_Analysis": target_score_analysis,
         "Model_Version": sim.get("model_version", "unknown"),
         "Model_Core": model_core_context.get("active_core", "v9"),
@@ -2912,6 +3125,7 @@ def main():
         "Context_Header": context_header,
         "Bet_Data": bet_data,
         "Bet_Detail": bet_detail,
+        "Monte_Carlo": monte_carlo,
         "Progression_Data": {"home": home_prog, "away": away_prog},
         "Flow_Data": {"home": home_flow, "away": away_flow},
         "Tactical_Scenarios": tactical_scenarios,
@@ -2951,12 +3165,38 @@ def main():
         "AI_Report_Error": None if analysis_generated else analysis_error,
         "Gemini_Key_Source": gemini_key_source,
     }
+    if not analysis_generated:
+        print("[Info] Analysis file was not created (Gemini not available or request failed).")
+    return prediction
+
 
+def main():
+    args = _parse_args(sys.argv[1:])
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+        predictions = predict_fixtures(
+            fixtures,
+            workers=args.workers,
+            context_dir=args.context_dir,
+            target_score=args.target_score,
+            target_step=args.target_step,
+            ai_report=not args.no_ai_report,
+        )
+        write_predictions_jsonl(predictions, args.output)
+        failed = sum(1 for p in predictions if p.get("Error"))
+        print(f"[Info] {len(predictions) - failed}/{len(predictions)} predictions saved to {args.output}")
+        return
+
+    prediction = predict_fixture(
+        args.home_team,
+        args.away_team,
+        target_score=args.target_score,
+        target_step=args.target_step,
+        ai_report=not args.no_ai_report,
+    )
     with open("latest_prediction.json", "w", encoding="utf-8") as f:
         json.dump(prediction, f, indent=4, ensure_ascii=False)
 
-    if not analysis_generated:
-        print("[Info] Analysis file was not created (Gemini not available or request failed).")
     print("[Info] Prediction saved to latest_prediction.json")
     print("[Info] Run: python update_tracker.py save")
 
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+MANIFEST_DIRNAME = "data_store"
+MANIFEST_NAME = "pipeline_manifest.json"
+MANIFEST_VERSION = 1
+HASH_CHUNK = 1 << 20
+PARTITION_FIELD = "{league}"
+_IMPORT_RE = re.compile(r"^\s*(?:from|import)\s+([A-Za-z_]\w*)", re.MULTILINE)
+
+
+def default_manifest_path(project_root=PROJECT_ROOT):
+    return Path(project_root) / MANIFEST_DIRNAME / MANIFEST_NAME
+
+
+def _partition_regex(template):
+    """Regex of a partition template such as "game flow/{league}_GameFlow.xlsx" (globs allowed)."""
+    pattern = re.escape(template).replace(re.escape(PARTITION_FIELD), "(?P<league>[^/]+)")
+    return re.compile("^" + pattern.replace(re.escape("*"), "[^/]*") + "$")
+
+
+def partition_of(template, rel_path):
+    match = _partition_regex(template).match(rel_path)
+    return match.group("league") if match else None
+
+
+class BuildManifest:
+    """
+    Make-style record of the last successful run of each pipeline step: a digest of its code and
+    the content hashes of the files it read and wrote. plan() compares that record with the tree
+    to decide whether a step is up to date, needs a full run or only some league partitions.
+    File hashes are reused while a file's mtime and size are unchanged, so a no-op check only stats.
+    """
+
+    def __init__(self, path=None, project_root=PROJECT_ROOT):
+        self.project_root = Path(project_root)
+        self.path = Path(path) if path else default_manifest_path(project_root)
+        self.hashes = {}
+        self.steps = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.hashes = data.get("hashes") or {}
+                self.steps = data.get("steps") or {}
+        except Exception:
+            pass
+
+    def file_hash(self, rel_path):
+        full = self.project_root / rel_path
+        try:
+            st = os.stat(full)
+        except OSError:
+            return None
+        cached = self.hashes.get(rel_path)
+        if cached and cached["mtime"] == float(st.st_mtime) and cached["size"] == int(st.st_size):
+            return cached["sha256"]
+        digest = hashlib.sha256()
+        with open(full, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+        sha = digest.hexdigest()
+        self.hashes[rel_path] = {"mtime": float(st.st_mtime), "size": int(st.st_size), "sha256": sha}
+        return sha
+
+    def expand(self, patterns):
+        """Project-relative POSIX paths of the files matching the globs (Excel lock files skipped)."""
+        found = set()
+        for pattern in patterns:
+            for path in self.project_root.glob(pattern):
+                if path.is_file() and not path.name.startswith("~$"):
+                    found.add(path.relative_to(self.project_root).as_posix())
+        return sorted(found)
+
+    def snapshot(self, patterns):
+        out = {}
+        for rel_path in self.expand(patterns):
+            sha = self.file_hash(rel_path)
+            if sha is not None:
+                out[rel_path] = sha
+        return out
+
+    def code_digest(self, script_rel_path):
+        """Hash of a step script plus the project modules it imports (transitively)."""
+        digest = hashlib.sha256()
+        pending = [Path(script_rel_path).as_posix()]
+        seen = set()
+        while pending:
+            rel_path = pending.pop()
+            if rel_path in seen:
+                continue
+            seen.add(rel_path)
+            sha = self.file_hash(rel_path)
+            if sha is None:
+                continue
+            digest.update(f"{rel_path}:{sha}\n".encode("utf-8"))
+            try:
+                source = (self.project_root / rel_path).read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+            for module in _IMPORT_RE.findall(source):
+                if (self.project_root / f"{module}.py").exists():
+                    pending.append(f"{module}.py")
+        return digest.hexdigest()
+
+    def plan(self, script_rel_path, io, code, inputs):
+        """
+        (action, leagues, reason) for a step about to run, given its STEP_IO entry, code digest and
+        current input hashes. action is "skip" (up to date), "run" (everything) or "partial"
+        (only `leagues`, for steps with a "partition" template whose changes map to leagues).
+        """
+        entry = self.steps.get(script_rel_path)
+        if entry is None:
+            return "run", None, "no previous build"
+        if entry.get("code") != code:
+            return "run", None, "script changed"
+
+        outputs = self.snapshot(io["outputs"])
+        recorded_inputs = entry.get("inputs") or {}
+        recorded_outputs = entry.get("outputs") or {}
+        changed_inputs = sorted(p for p in set(inputs) | set(recorded_inputs) if inputs.get(p) != recorded_inputs.get(p))
+        changed_outputs = sorted(
+            p for p in set(outputs) | set(recorded_outputs) if outputs.get(p) != recorded_outputs.get(p)
+        )
+        if not changed_inputs and not changed_outputs:
+            return "skip", None, "up to date"
+
+        reason = f"{len(changed_inputs)} input(s), {len(changed_outputs)} output(s) changed"
+        partition = io.get("partition")
+        if not partition:
+            return "run", None, reason
+        leagues = set()
+        for rel_path, template in [(p, partition["inputs"]) for p in changed_inputs] + [
+            (p, partition["outputs"]) for p in changed_outputs
+        ]:
+            league = partition_of(template, rel_path)
+            if league is None:
+                return "run", None, reason
+            leagues.add(league)
+        live = {partition_of(partition["inputs"], p) for p in inputs}
+        leagues = sorted(league for league in leagues if league in live)
+        if not leagues:
+            return "run", None, reason
+        return "partial", leagues, reason
+
+    def record(self, script_rel_path, io, code, inputs):
+        """Store a successful run: the input hashes seen before it started and the outputs it left."""
+        self.steps[script_rel_path] = {"code": code, "inputs": dict(inputs), "outputs": self.snapshot(io["outputs"])}
+
+    def forget(self, script_rel_path):
+        self.steps.pop(script_rel_path, None)
+
+    def save(self):
+        self.hashes = {p: h for p, h in self.hashes.items() if (self.project_root / p).exists()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": MANIFEST_VERSION, "hashes": self.hashes, "steps": self.steps},
+                    f,
+                    ensure_ascii=False,
+                    indent=1,
+                )
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
@@ -1,13 +1,17 @@
-import pandas as pd
 import os
-import glob
+import sys
 import warnings
 
 warnings.filterwarnings('ignore')
 
-# Settings
-INPUT_DIR = r"c:\Users\errig\OneDrive - มหาวิทยาลัยสยาม (1)\Desktop\model football\all stats"
-OUTPUT_DIR = r"c:\Users\errig\OneDrive - มหาวิทยาลัยสยาม (1)\Desktop\model football\charts"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import player_master
+
+# Settings (player rows come from the player master table built from all stats/{league}_Stats.xlsx)
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "charts")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "final_chart_data.xlsx")
 
 # Format: (Sheet Name, Raw Column Name, New Column Name)
@@ -42,87 +46,35 @@ METRICS_TO_LOAD = [
 ALREADY_RATE_METRICS = ['Pass_Completion_Pct']
 
 def load_and_process_leagues():
-    all_files = glob.glob(os.path.join(INPUT_DIR, "*.xlsx"))
-    final_df = pd.DataFrame()
+    # Typed, deduplicated FBref player rows with per-90 columns (rebuilt when the workbooks change).
+    master, columns_by_sheet = player_master.load_master(project_root=PROJECT_ROOT)
+    if master.empty:
+        print("No FBref player data found.")
+        return
 
-    for file_path in all_files:
-        league_name = os.path.basename(file_path).replace("_Stats.xlsx", "").replace("_", " ")
-        print(f"Processing {league_name}...")
-        
-        try:
-            xls = pd.ExcelFile(file_path)
-            
-            # 1. Base DataFrame from Player_Stats
-            base_df = pd.read_excel(xls, sheet_name='Player_Stats')
-            
-            # Base columns
-            base_cols = ['Player', 'Nation', 'Pos', 'Squad', 'Age', 'Playing Time_90s']
-            
-            # Rename columns found in Player_Stats
-            for sheet, col, new_name in METRICS_TO_LOAD:
-                if sheet == 'Player_Stats' and col in base_df.columns:
-                    base_df.rename(columns={col: new_name}, inplace=True)
-            
-            # Keep only keys + renames
-            keys = ['Player', 'Squad']
-            
-            # We must only keep columns that are either in base_cols or in our new_names list
-            # But wait, base_df has everything. Let's just keep what we need later or rename everything first.
-            merged_df = base_df.copy()
+    base_cols = ['Player', 'Nation', 'Pos', 'Squad', 'Playing Time_90s']
+    final_df = master[[c for c in base_cols if c in master.columns]].copy()
+    final_df['League'] = master['League'].str.replace("_", " ")
 
-            # 2. Merge other sheets
-            sheet_map = {}
-            for sheet, col, new_name in METRICS_TO_LOAD:
-                if sheet != 'Player_Stats':
-                    if sheet not in sheet_map: sheet_map[sheet] = []
-                    sheet_map[sheet].append((col, new_name))
-            
-            for sheet, metrics in sheet_map.items():
-                if sheet in xls.sheet_names:
-                    sheet_df = pd.read_excel(xls, sheet_name=sheet)
-                    
-                    # Columns to fetch: Keys + Metrics
-                    cols_to_fetch = keys + [m[0] for m in metrics]
-                    
-                    # Verify cols exist
-                    existing_cols = [c for c in cols_to_fetch if c in sheet_df.columns]
-                    
-                    # Rename dict
-                    rename_dict = {m[0]: m[1] for m in metrics if m[0] in existing_cols}
-                    
-                    subset = sheet_df[existing_cols].rename(columns=rename_dict)
-                    
-                    # Clean duplicates before merge if necessary? 
-                    # Usually Player+Squad is unique per sheet, but let's drop duplicates just in case
-                    subset = subset.drop_duplicates(subset=[c for c in keys if c in subset.columns])
-                    
-                    merged_df = pd.merge(merged_df, subset, on=keys, how='left')
-            
-            merged_df['League'] = league_name
-            final_df = pd.concat([final_df, merged_df], ignore_index=True)
-            
-        except Exception as e:
-            print(f"Error processing {league_name}: {e}")
+    # 1-2. Pick each metric from the sheet it belongs to (Player_Stats first, then the detailed sheets)
+    available_metrics = []
+    per90_cols = []
+    for sheet, col, new_name in METRICS_TO_LOAD:
+        if col not in columns_by_sheet.get(sheet, []) or new_name in final_df.columns:
+            continue
+        final_df[new_name] = master[col]
+        available_metrics.append(new_name)
 
-    # 3. Calculate Per 90 stats
+    # 3. Per 90 stats (precomputed in the master table; rate metrics are copied as-is)
     print("Calculating Per 90 stats...")
-    
-    # Identify which columns we actually possess in final_df
-    available_metrics = [m[2] for m in METRICS_TO_LOAD if m[2] in final_df.columns]
-    per90_cols = []
-    
+    raw_by_name = {m[2]: m[1] for m in METRICS_TO_LOAD}
     for col in available_metrics:
         p90_name = f"{col}_Per90"
         per90_cols.append(p90_name)
-        
         if col in ALREADY_RATE_METRICS:
-            # Just copy the value (it's already %)
             final_df[p90_name] = final_df[col]
         else:
-            # Divide by 90
-            final_df[p90_name] = final_df.apply(
-                lambda row: row[col] / row['Playing Time_90s'] if row['Playing Time_90s'] > 0 else 0, axis=1
-            )
+            final_df[p90_name] = master[player_master.per90_column(raw_by_name[col])]
 
     # 4. Filter for Ranking (optional, but good for data quality)
     # We'll calculate percentiles for everyone, but typically you'd only compare against players with decent minutes
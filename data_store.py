@@ -0,0 +1,365 @@
+import json
+import os
+import re
+import time
+from pathlib import Path, PurePosixPath
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+except Exception:  # pragma: no cover
+    pyarrow = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+STORE_DIRNAME = "data_store"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Scraper outputs compiled into the columnar store: source -> (source root, workbook glob).
+# Per-team sources live under {root}/{league}/, league-level sources are named {league}_*.xlsx,
+# so every dataset in the store is partitioned by league the same way the scrapers write it.
+STORE_SOURCES = {
+    "team_stats": ("sofascore_team_data", "*_Team_Stats.xlsx"),
+    "player_stats": ("sofaplayer", "*/*_stats.xlsx"),
+    "positions": ("position", "*/*_positions.xlsx"),
+    "characteristics": ("player_characteristics", "*_Characteristics.xlsx"),
+    "game_flow": ("game flow", "*_GameFlow.xlsx"),
+    "match_logs": ("Match Logs", "*/*.xlsx"),
+    "opta": ("output_opta", "*/*.xlsx"),
+    "opta_teams": ("output_opta", "*_Team_Aggregates.xlsx"),
+}
+
+_MANIFEST_CACHE = {}
+_TABLE_CACHE = {}
+# Resident mode (long-running services): parsed tables keep being served after their file
+# changes; the service reloads them off to the side and swaps them in with install_tables().
+_RESIDENT = False
+
+
+def parquet_available():
+    return pyarrow is not None
+
+
+def _store_dir(project_root=PROJECT_ROOT):
+    return Path(project_root) / STORE_DIRNAME
+
+
+def _relative_source_path(path, project_root=PROJECT_ROOT):
+    try:
+        rel = Path(os.path.abspath(str(path))).relative_to(Path(os.path.abspath(str(project_root))))
+    except ValueError:
+        return None
+    return rel.as_posix()
+
+
+def _source_for(rel_path):
+    for source, (root, pattern) in STORE_SOURCES.items():
+        if rel_path.startswith(f"{root}/") and PurePosixPath(rel_path[len(root) + 1:]).match(pattern):
+            return source, root
+    return None, None
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return {"mtime": float(st.st_mtime), "size": int(st.st_size)}
+
+
+def _sheet_filename(index, sheet_name):
+    slug = re.sub(r'[<>:"/\\|?*\s]+', "_", str(sheet_name)).strip("_") or "sheet"
+    return f"{index:02d}_{slug}.parquet"
+
+
+def _coerce_for_parquet(df):
+    """Give every column a single Arrow-compatible type (Excel sheets often mix str/number cells)."""
+    out = df.copy()
+    out.columns = [str(c) for c in out.columns]
+    for col in out.columns:
+        series = out[col]
+        if series.dtype != object:
+            continue
+        kind = pd.api.types.infer_dtype(series, skipna=True)
+        if kind in {"integer", "floating", "mixed-integer-float", "decimal"}:
+            out[col] = pd.to_numeric(series, errors="coerce")
+        elif kind in {"datetime", "datetime64", "date"}:
+            out[col] = pd.to_datetime(series, errors="coerce")
+        elif kind in {"boolean", "empty"}:
+            continue
+        else:
+            out[col] = series.map(lambda v: v if pd.isna(v) else str(v))
+    return out
+
+
+def load_manifest(project_root=PROJECT_ROOT):
+    path = _store_dir(project_root) / MANIFEST_NAME
+    sig = file_signature(path)
+    if sig is None:
+        return {"version": MANIFEST_VERSION, "files": {}}
+
+    key = str(path)
+    cached = _MANIFEST_CACHE.get(key)
+    if cached and cached[0] == sig:
+        return cached[1]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        data = None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        data = {"version": MANIFEST_VERSION, "files": {}}
+    data.setdefault("files", {})
+    _MANIFEST_CACHE[key] = (sig, data)
+    return data
+
+
+def _save_manifest(manifest, project_root=PROJECT_ROOT):
+    store = _store_dir(project_root)
+    store.mkdir(parents=True, exist_ok=True)
+    path = store / MANIFEST_NAME
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+    _MANIFEST_CACHE.pop(str(path), None)
+
+
+def _fresh_entry(path, project_root=PROJECT_ROOT):
+    """Manifest entry for a workbook if its compiled tables still match the Excel file, else None."""
+    if not parquet_available():
+        return None
+    rel = _relative_source_path(path, project_root=project_root)
+    if rel is None:
+        return None
+    entry = load_manifest(project_root).get("files", {}).get(rel)
+    if not isinstance(entry, dict):
+        return None
+    sig = file_signature(path)
+    if sig is None or sig["size"] != entry.get("size") or abs(sig["mtime"] - float(entry.get("mtime", -1))) > 1e-6:
+        return None
+    return entry
+
+
+def _resolve_sheet(entry, sheet_name):
+    sheets = entry.get("sheets") or []
+    if isinstance(sheet_name, int):
+        if sheet_name < 0 or sheet_name >= len(sheets):
+            raise ValueError(f"Worksheet index {sheet_name} is invalid, {len(sheets)} worksheets found")
+        return sheets[sheet_name]
+    if sheet_name not in sheets:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    return sheet_name
+
+
+def _load_table(path, sheet_name, project_root):
+    entry = _fresh_entry(path, project_root=project_root)
+    if entry is None:
+        return pd.read_excel(path, sheet_name=sheet_name)
+
+    sheet = _resolve_sheet(entry, sheet_name)
+    table_path = _store_dir(project_root) / entry["tables"][sheet]
+    if not table_path.exists():
+        return pd.read_excel(path, sheet_name=sheet_name)
+    return pd.read_parquet(table_path)
+
+
+def cached_table(path, sheet_name=0, project_root=PROJECT_ROOT):
+    """
+    Process-wide parsed table, shared between callers (treat it as read-only).
+    The cached frame is reused until the source file's mtime or size changes.
+    """
+    key = (os.path.abspath(str(path)), sheet_name)
+    hit = _TABLE_CACHE.get(key)
+    if hit is not None and _RESIDENT:
+        return hit[1]
+    sig = file_signature(path)
+    if hit is not None and sig is not None and hit[0] == sig:
+        return hit[1]
+
+    df = _load_table(path, sheet_name, project_root)
+    if sig is not None:
+        _TABLE_CACHE[key] = (sig, df)
+    return df
+
+
+def read_table(path, sheet_name=0, project_root=PROJECT_ROOT):
+    """
+    Drop-in replacement for pd.read_excel(path, sheet_name=...) on the prediction path.
+    Reads the compiled Parquet table when the store is current for this workbook and
+    falls back to parsing the Excel file otherwise. Returns a private copy of the
+    process-wide cached table, so callers may mutate it freely.
+    """
+    return cached_table(path, sheet_name=sheet_name, project_root=project_root).copy()
+
+
+def read_workbook(path, project_root=PROJECT_ROOT):
+    """
+    Every sheet of a workbook as {sheet name: frame}, parsed in a single pass and shared
+    process-wide (treat the frames as read-only). Cached until the file changes.
+    """
+    key = (os.path.abspath(str(path)), None)
+    hit = _TABLE_CACHE.get(key)
+    if hit is not None and _RESIDENT:
+        return hit[1]
+    sig = file_signature(path)
+    if hit is not None and sig is not None and hit[0] == sig:
+        return hit[1]
+
+    sheets = _load_workbook(path, project_root)
+    if sig is not None:
+        _TABLE_CACHE[key] = (sig, sheets)
+    return sheets
+
+
+def _load_workbook(path, project_root):
+    entry = _fresh_entry(path, project_root=project_root)
+    if entry is not None:
+        tables = [_store_dir(project_root) / entry["tables"][sheet] for sheet in entry.get("sheets") or []]
+        if all(table_path.exists() for table_path in tables):
+            return {sheet: pd.read_parquet(table_path) for sheet, table_path in zip(entry["sheets"], tables)}
+    return pd.read_excel(path, sheet_name=None)
+
+
+def clear_cache():
+    _TABLE_CACHE.clear()
+    _MANIFEST_CACHE.clear()
+
+
+def set_resident(enabled=True):
+    """Serve parsed tables without re-checking their files (see stale_tables/install_tables)."""
+    global _RESIDENT
+    _RESIDENT = bool(enabled)
+
+
+def stale_tables():
+    """
+    {cache key: current signature} of the resident tables whose source file changed since
+    they were parsed. Deleted files are left out: their last good table stays resident.
+    """
+    stale = {}
+    for key, (sig, _) in list(_TABLE_CACHE.items()):
+        current = file_signature(key[0])
+        if current is not None and current != sig:
+            stale[key] = current
+    return stale
+
+
+def load_tables(keys, project_root=PROJECT_ROOT):
+    """
+    Freshly parsed {cache key: (signature, table)} for cache keys of stale_tables(), without
+    touching the cache, so a reload can be parsed off to the side and swapped in with
+    install_tables(). A file that fails to parse (e.g. mid-write) is left out.
+    """
+    entries = {}
+    for key in keys:
+        path, sheet_name = key
+        sig = file_signature(path)
+        if sig is None:
+            continue
+        try:
+            if sheet_name is None:
+                table = _load_workbook(path, project_root)
+            else:
+                table = _load_table(path, sheet_name, project_root)
+        except Exception:
+            continue
+        entries[key] = (sig, table)
+    return entries
+
+
+def install_tables(entries):
+    """Swap parsed tables from load_tables() into the process-wide cache in one step."""
+    _TABLE_CACHE.update(entries)
+
+
+def sheet_names(path, project_root=PROJECT_ROOT):
+    entry = _fresh_entry(path, project_root=project_root)
+    if entry is not None:
+        return list(entry.get("sheets") or [])
+    return list(pd.ExcelFile(path).sheet_names)
+
+
+def iter_source_files(project_root=PROJECT_ROOT, sources=None):
+    root = Path(project_root)
+    for source, (source_root, pattern) in STORE_SOURCES.items():
+        if sources and source not in sources:
+            continue
+        base = root / source_root
+        if not base.is_dir():
+            continue
+        for file_path in sorted(base.glob(pattern)):
+            if file_path.name.startswith("~$"):
+                continue
+            yield source, file_path
+
+
+def compile_workbook(file_path, manifest, project_root=PROJECT_ROOT):
+    rel = _relative_source_path(file_path, project_root=project_root)
+    source, source_root = _source_for(rel)
+    sig = file_signature(file_path)
+    workbook = pd.read_excel(file_path, sheet_name=None)
+
+    table_dir = Path(source) / Path(rel[len(source_root) + 1:]).with_suffix("")
+    out_dir = _store_dir(project_root) / table_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    tables = {}
+    rows = {}
+    for index, (sheet, df) in enumerate(workbook.items()):
+        filename = _sheet_filename(index, sheet)
+        _coerce_for_parquet(df).to_parquet(out_dir / filename, index=False)
+        tables[sheet] = (table_dir / filename).as_posix()
+        rows[sheet] = int(len(df))
+
+    manifest["files"][rel] = {
+        "source": source,
+        "mtime": sig["mtime"],
+        "size": sig["size"],
+        "sheets": list(workbook.keys()),
+        "tables": tables,
+        "rows": rows,
+    }
+    return rows
+
+
+def build_store(project_root=PROJECT_ROOT, sources=None, force=False, log_callback=print):
+    """Compile every scraper workbook into Parquet tables; unchanged workbooks are skipped."""
+    if not parquet_available():
+        log_callback("[DataStore] pyarrow is not installed; prediction path keeps reading Excel.")
+        return {"compiled": 0, "skipped": 0, "failed": 0, "enabled": False}
+
+    start = time.time()
+    manifest = load_manifest(project_root)
+    manifest = {"version": MANIFEST_VERSION, "files": dict(manifest.get("files", {}))}
+    compiled = skipped = failed = 0
+    seen = set()
+
+    for source, file_path in iter_source_files(project_root=project_root, sources=sources):
+        rel = _relative_source_path(file_path, project_root=project_root)
+        seen.add(rel)
+        if not force and _fresh_entry(file_path, project_root=project_root) is not None:
+            skipped += 1
+            continue
+        try:
+            rows = compile_workbook(file_path, manifest, project_root=project_root)
+            compiled += 1
+            log_callback(f"  + [{source}] {rel} ({sum(rows.values())} rows, {len(rows)} sheets)")
+        except Exception as exc:
+            manifest["files"].pop(rel, None)
+            failed += 1
+            log_callback(f"  ! [{source}] {rel}: {exc}")
+
+    for rel in list(manifest["files"].keys()):
+        source = manifest["files"][rel].get("source")
+        if rel not in seen and (not sources or source in sources):
+            manifest["files"].pop(rel, None)
+
+    _save_manifest(manifest, project_root=project_root)
+    log_callback(
+        f"[DataStore] compiled={compiled} skipped={skipped} failed={failed} "
+        f"time={time.time() - start:.1f}s -> {_store_dir(project_root)}"
+    )
+    return {"compiled": compiled, "skipped": skipped, "failed": failed, "enabled": True}
@@ -5,6 +5,8 @@ import sys
 
 # Ensure we can import from local modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Project root too, so the loaders can read through data_store.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data_loader import DataLoader
 from feature_engine import FeatureEngine
@@ -81,11 +83,15 @@ def main():
         except:
             continue
 
+        # Point-in-time: ratings only see the matches played before the fixture day.
+        match_date = pd.to_datetime(row.get('Date'), errors='coerce')
+        as_of = match_date if pd.notna(match_date) else None
+
         # Run Prediction
         try:
             # Pass log_loader and venue to get time-decay + home/away ratings
-            home_ratings = engine.get_team_ratings(df_processed, home_team, match_log_loader=log_loader, venue="Home")
-            away_ratings = engine.get_team_ratings(df_processed, away_team, match_log_loader=log_loader, venue="Away")
+            home_ratings = engine.get_team_ratings(df_processed, home_team, match_log_loader=log_loader, venue="Home", as_of=as_of)
+            away_ratings = engine.get_team_ratings(df_processed, away_team, match_log_loader=log_loader, venue="Away", as_of=as_of)
             
             source_h = home_ratings.get('source', 'Avg')
             source_a = away_ratings.get('source', 'Avg')
@@ -2,6 +2,12 @@ import pandas as pd
 import numpy as np
 import os
 
+import data_store
+
+# filepath -> (cached source frame, cleaned frame); reused while the source table is unchanged.
+_PREPARED_CACHE = {}
+
+
 class DataLoader:
     def __init__(self, data_folder):
         self.data_folder = data_folder
@@ -35,10 +41,15 @@ class DataLoader:
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Data file not found: {filepath}")
         
-        df = pd.read_excel(filepath)
-        df = self._clean_column_names(df)
-        df = self._impute_synthetic_xg(df)
-        return df
+        source = data_store.cached_table(filepath)
+        key = os.path.abspath(filepath)
+        hit = _PREPARED_CACHE.get(key)
+        if hit is None or hit[0] is not source:
+            df = self._clean_column_names(source.copy())
+            df = self._impute_synthetic_xg(df)
+            hit = (source, df)
+            _PREPARED_CACHE[key] = hit
+        return hit[1].copy()
 
     def _clean_column_names(self, df):
         """Standardizes column names to be snake_case."""
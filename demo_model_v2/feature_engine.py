@@ -2,9 +2,13 @@ import pandas as pd
 import numpy as np
 import math
 
+from feature_store import DECAY_ALPHA, LEAGUE_BASELINE_XG, RATING_VENUES
+
+
 class FeatureEngine:
     def __init__(self, data_loader=None):
         self.data_loader = data_loader
+        self._ratings_tables = {}
 
     def calculate_feature_metrics(self, df):
         """
@@ -55,90 +59,121 @@ class FeatureEngine:
 
         return df
 
+    def _opponent_strengths(self, season_stats_df, opponents):
+        """(defense_strength, attack_strength) arrays of each opponent; 1.0 for teams not in the season table."""
+        opp_def = np.ones(len(opponents))
+        opp_att = np.ones(len(opponents))
+        if season_stats_df is None or 'team_name' not in season_stats_df.columns:
+            return opp_def, opp_att
+
+        strengths = season_stats_df.drop_duplicates(subset=['team_name']).set_index('team_name')
+        known = opponents.isin(strengths.index).to_numpy()
+        for out, col in ((opp_def, 'defense_strength'), (opp_att, 'attack_strength')):
+            if col in strengths.columns:
+                values = pd.to_numeric(opponents.map(strengths[col]), errors='coerce').to_numpy(dtype=float)
+                out[known] = values[known]
+        return opp_def, opp_att
+
+    def build_ratings_table(self, season_stats_df, match_log_loader, teams=None, alpha=DECAY_ALPHA):
+        """
+        League-wide time-decay ratings in one pass: every team's match log is stacked, joined once
+        against the opponent-strength table (xG / opponent defense, xGA / opponent attack) and
+        reduced with precomputed exp(-alpha * matches_ago) weights.
+        Returns one row per team and venue ('All', 'Home', 'Away') with
+        attack / defense / expected_goals_avg / matches.
+        """
+        if teams is None:
+            teams = season_stats_df['team_name'] if season_stats_df is not None else []
+        logs = []
+        for team in dict.fromkeys(teams):
+            df_log = match_log_loader.load_match_log(team)
+            if df_log is None or df_log.empty:
+                continue
+            logs.append(pd.DataFrame({
+                'team_name': team,
+                # Position in the team's full log (0 = most recent), also for venue-filtered rows.
+                'matches_ago': df_log.index.to_numpy(),
+                'Venue': df_log['Venue'].to_numpy(),
+                'Opponent': df_log['Opponent'].to_numpy(),
+                'xG': df_log['xG'].to_numpy(dtype=float),
+                'xGA': df_log['xGA'].to_numpy(dtype=float),
+            }))
+
+        columns = ['team_name', 'venue', 'matches', 'attack', 'defense', 'expected_goals_avg']
+        if not logs:
+            return pd.DataFrame(columns=columns)
+
+        stacked = pd.concat(logs, ignore_index=True)
+        opp_def, opp_att = self._opponent_strengths(season_stats_df, stacked['Opponent'])
+        matches_ago = stacked['matches_ago'].to_numpy(dtype=int)
+        decay = np.array([math.exp(-alpha * k) for k in range(int(matches_ago.max()) + 1)])
+        weights = decay[matches_ago]
+        weighted_xg = (stacked['xG'].to_numpy() / opp_def) * weights
+        weighted_xga = (stacked['xGA'].to_numpy() / opp_att) * weights
+
+        codes, team_names = pd.factorize(stacked['team_name'])
+        venues = stacked['Venue'].to_numpy()
+        rows = []
+        for venue in RATING_VENUES:
+            mask = np.ones(len(stacked), dtype=bool) if venue == 'All' else venues == venue
+            n = len(team_names)
+            counts = np.bincount(codes[mask], minlength=n)
+            weight_sum = np.bincount(codes[mask], weights=weights[mask], minlength=n)
+            xg_sum = np.bincount(codes[mask], weights=weighted_xg[mask], minlength=n)
+            xga_sum = np.bincount(codes[mask], weights=weighted_xga[mask], minlength=n)
+            rated = weight_sum > 0
+            avg_xg = xg_sum[rated] / weight_sum[rated]
+            avg_xga = xga_sum[rated] / weight_sum[rated]
+            rows.append(pd.DataFrame({
+                'team_name': np.asarray(team_names)[rated],
+                'venue': venue,
+                'matches': counts[rated],
+                'attack': avg_xg / LEAGUE_BASELINE_XG,
+                'defense': avg_xga / LEAGUE_BASELINE_XG,
+                'expected_goals_avg': avg_xg,
+            }))
+        return pd.concat(rows, ignore_index=True)[columns]
+
+    def ratings_table(self, season_stats_df, match_log_loader, team_name=None):
+        """
+        build_ratings_table for every team of the season table, built once per (table, loader);
+        a team outside the table is rated on first request and added.
+        """
+        key = (id(season_stats_df), id(match_log_loader))
+        hit = self._ratings_tables.get(key)
+        if hit is None or hit[0] is not season_stats_df or hit[1] is not match_log_loader:
+            teams = list(season_stats_df['team_name']) if season_stats_df is not None else []
+            table = self.build_ratings_table(season_stats_df, match_log_loader, teams=teams)
+            hit = [season_stats_df, match_log_loader, table.set_index(['team_name', 'venue']), set(teams)]
+            self._ratings_tables[key] = hit
+        if team_name is not None and team_name not in hit[3]:
+            extra = self.build_ratings_table(season_stats_df, match_log_loader, teams=[team_name])
+            hit[2] = pd.concat([hit[2], extra.set_index(['team_name', 'venue'])])
+            hit[3].add(team_name)
+        return hit[2]
+
     def _calculate_weighted_ratings(self, team_name, match_log_loader, season_stats_df=None, venue_filter=None):
         """
-        Calculates ratings based on recent match logs using exponential time-decay.
-        Also adjusts for Opponent Strength if season_stats_df is provided.
-        Can filter by venue ('Home' or 'Away').
+        Time-decay, opponent-adjusted ratings of one team (optionally at one venue, 'Home' or 'Away')
+        read from the league-wide ratings table.
         """
-        df_log = match_log_loader.load_match_log(team_name)
-        
-        if df_log is None or df_log.empty:
+        table = self.ratings_table(season_stats_df, match_log_loader, team_name)
+        key = (team_name, venue_filter or 'All')
+        if key not in table.index:
             return None
-            
-        # Filter by Venue if requested
-        if venue_filter:
-             # Normalize venue strings. Log usually has 'Home' or 'Away'.
-             # df_log['Venue'] should be 'Home' or 'Away' (from loader)
-             df_log = df_log[df_log['Venue'] == venue_filter].copy()
-             
-             if df_log.empty:
-                 return None
-            
-        # Exponential Decay Parameters
-        alpha = 0.05 # Decay rate
-        
-        # Calculate weights
-        weights = []
-        weighted_xg_sum = 0
-        weighted_xga_sum = 0
-        weight_sum = 0
-        
-        # Pre-compute average ratings for normalization/adjustment
-        league_avg_attack = 1.0
-        league_avg_defense = 1.0
-        
-        # We iterate through the filtered log.
-        # Note: 'matches_ago' should arguably be 'games ago AT THIS VENUE' if we filter.
-        # Iterating on the filtered DF effectively does this (i=0 is last home game).
-        for i, row in df_log.iterrows():
-            matches_ago = i # 0 = most recent match in this set
-            weight = math.exp(-alpha * matches_ago)
-            
-            xG = row['xG']
-            xGA = row['xGA']
-            opponent_name = row['Opponent']
-            
-            # Opponent Strength Adjustment
-            opp_def_strength = 1.0
-            opp_att_strength = 1.0
-            
-            if season_stats_df is not None:
-                try:
-                   opp_stats = season_stats_df[season_stats_df['team_name'] == opponent_name]
-                   if not opp_stats.empty:
-                       opp_def_strength = opp_stats.iloc[0].get('defense_strength', 1.0)
-                       opp_att_strength = opp_stats.iloc[0].get('attack_strength', 1.0)
-                except Exception:
-                    pass 
-            
-            adjusted_xg = xG / opp_def_strength
-            adjusted_xga = xGA / opp_att_strength
-            
-            weighted_xg_sum += adjusted_xg * weight
-            weighted_xga_sum += adjusted_xga * weight
-            weight_sum += weight
-            
-        if weight_sum == 0:
-            return None
-            
-        avg_weighted_xg = weighted_xg_sum / weight_sum
-        avg_weighted_xga = weighted_xga_sum / weight_sum
-        
-        # Normalize
-        league_baseline = 1.5 
-        
+        row = table.loc[key]
         return {
-            'attack': avg_weighted_xg / league_baseline,
-            'defense': avg_weighted_xga / league_baseline,
-            'expected_goals_avg': avg_weighted_xg
+            'attack': float(row['attack']),
+            'defense': float(row['defense']),
+            'expected_goals_avg': float(row['expected_goals_avg'])
         }
 
-    def get_team_ratings(self, df, team_name, match_log_loader=None, venue=None, player_tax=None):
+    def get_team_ratings(self, df, team_name, match_log_loader=None, venue=None, player_tax=None, as_of=None):
         """
         Returns a dictionary of ratings for a specific team.
         Prioritizes weighted ratings (Time-Decay + Opponent Adj + Home/Away) from match logs.
         player_tax: Dict {'attack_tax': float, 'defense_tax': float} (Multiplier, e.g. 0.9 = 10% drop)
+        as_of: point-in-time time-decay ratings (matches before that day, not opponent-adjusted) for backtests
         """
         
         ratings = None
@@ -146,12 +181,15 @@ class FeatureEngine:
         
         # 1. Try Time-Decay (Weighted) Ratings First
         if match_log_loader:
-             weighted_rating = self._calculate_weighted_ratings(
-                team_name, 
-                match_log_loader, 
-                season_stats_df=df,
-                venue_filter=venue
-            )
+             if as_of is not None:
+                 weighted_rating = match_log_loader.ratings_as_of(team_name, as_of, venue)
+             else:
+                 weighted_rating = self._calculate_weighted_ratings(
+                    team_name,
+                    match_log_loader,
+                    season_stats_df=df,
+                    venue_filter=venue
+                )
              if weighted_rating:
                  season_stats = self._get_season_stats(df, team_name)
                  source_label = f"Weighted ({venue})" if venue else "Weighted (All)"
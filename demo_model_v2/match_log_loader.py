@@ -3,9 +3,15 @@ import os
 import datetime
 import re
 
+import feature_store
+import match_log
+
+
 class MatchLogLoader:
-    def __init__(self, logs_root_dir):
+    def __init__(self, logs_root_dir, as_of=None):
         self.logs_root_dir = logs_root_dir
+        # Point-in-time cut-off: only matches played before this day (default: everything up to now).
+        self.as_of = as_of
         self.leagues = ["Premier_League", "La_Liga", "Serie_A", "Bundesliga", "Ligue_1"]
 
     def find_team_log(self, team_name):
@@ -32,6 +38,20 @@ class MatchLogLoader:
                 
         return None, None
 
+    def ratings_as_of(self, team_name, as_of, venue=None):
+        """
+        Point-in-time time-decay ratings of a team from the matches played before `as_of`
+        (feature_store timeline of its log), or None when there is no log or no match yet.
+        """
+        filepath, league = self.find_team_log(team_name)
+        if not filepath:
+            return None
+        try:
+            timeline = feature_store.team_timeline(match_log.load_team_match_log(filepath))
+        except Exception:
+            return None
+        return timeline.ratings(as_of, venue or "All")
+
     def load_match_log(self, team_name):
         """
         Loads the match log for a specific team.
@@ -44,18 +64,21 @@ class MatchLogLoader:
             return None
 
         try:
-            df = pd.read_excel(filepath)
-            
-            # Identify columns
-            date_col = next((c for c in df.columns if 'Date' in c), None)
-            gf_col = next((c for c in df.columns if c.endswith('_GF')), None)
-            ga_col = next((c for c in df.columns if c.endswith('_GA')), None)
-            opponent_col = next((c for c in df.columns if c.endswith('_Opponent')), None)
-            venue_col = next((c for c in df.columns if c.endswith('_Venue')), None)
-            
+            log = match_log.load_team_match_log(filepath)
+            df = log.sheet(0)
+            if df is None:
+                return None
+
+            # Identify columns (shared Match Logs column roles)
+            date_col = log.column(0, "date")
+            gf_col = log.column(0, "gf")
+            ga_col = log.column(0, "ga")
+            opponent_col = log.column(0, "opponent")
+            venue_col = log.column(0, "venue")
+
             # Stats for Synthetic xG
-            shots_col = next((c for c in df.columns if 'Standard_Sh' in c and 'SoT' not in c), None) # 'Standard_Sh'
-            sot_col = next((c for c in df.columns if 'Standard_SoT' in c and '%' not in c), None)   # 'Standard_SoT'
+            shots_col = log.column(0, "shots")  # 'Standard_Sh'
+            sot_col = log.column(0, "sot")  # 'Standard_SoT'
 
             if not date_col or not gf_col or not ga_col:
                 return None
@@ -94,7 +117,7 @@ class MatchLogLoader:
             df_std['xGA'] = df_std['GA']
 
             # Filter valid outcomes (Played matches only)
-            now = pd.Timestamp.now()
+            now = pd.Timestamp(self.as_of).normalize() if self.as_of is not None else pd.Timestamp.now()
             df_std = df_std[df_std['Date'] < now].copy()
             df_std = df_std[df_std['GF'].notna()] # Ensure played
             
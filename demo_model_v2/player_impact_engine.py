@@ -1,7 +1,10 @@
 import pandas as pd
 import numpy as np
 import os
-import difflib
+
+import data_store
+import player_names
+
 
 class PlayerImpactEngine:
     def __init__(self, data_root_dir):
@@ -28,7 +31,7 @@ class PlayerImpactEngine:
             return None
             
         try:
-            df = pd.read_excel(filepath)
+            df = data_store.read_table(filepath)
             
             # Standardize columns
             # 'Player_Name' -> 'name'
@@ -73,30 +76,13 @@ class PlayerImpactEngine:
         missing_names_raw = [s.strip() for s in missing_players_str.split(',')]
         
         missing_indices = []
-        df['name_lower'] = df['name'].str.lower()
+        # Squad name index shared with simulator_v9 (full name, surname, token, substring, then fuzzy).
+        name_index = player_names.squad_index(df['name'].tolist())
         
         for raw_name in missing_names_raw:
-            raw_lower = raw_name.lower()
-            found = False
-            
-            # 1. Exact or Substring Match (Case Insensitive)
-            # Check if input 'saka' is in 'bukayo saka'
-            for idx, row in df.iterrows():
-                if raw_lower in row['name_lower']:
-                    missing_indices.append(idx)
-                    found = True
-                    # Break or continue? If 'Gabriel' is input, might match 'Gabriel Jesus' and 'Gabriel Magalhaes'.
-                    # For safety, let's take the first match for now or highest rating?
-                    # Let's take the first match and break to avoid double counting.
-                    break 
-            
-            # 2. Fuzzy Match if strict/substring failed
-            if not found:
-                 match = difflib.get_close_matches(raw_lower, df['name_lower'], n=1, cutoff=0.6)
-                 if match:
-                     idx = df[df['name_lower'] == match[0]].index[0]
-                     missing_indices.append(idx)
-                     found = True
+            pos = name_index.find(raw_name)
+            if pos is not None:
+                missing_indices.append(df.index[pos])
         
         if not missing_indices:
             print(f"DEBUG: No matching players found for input: {missing_players_str}")
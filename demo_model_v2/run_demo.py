@@ -5,6 +5,8 @@ import numpy as np
 
 # Add current directory to path so we can import modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Project root too, so the loaders can read through data_store.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data_loader import DataLoader
 from feature_engine import FeatureEngine
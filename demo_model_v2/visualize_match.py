@@ -4,6 +4,11 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import argparse
 import os
+import sys
+
+# Project root, so the loaders can use data_store / match_log.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from data_loader import DataLoader
 from feature_engine import FeatureEngine
 from match_log_loader import MatchLogLoader
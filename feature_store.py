@@ -0,0 +1,307 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+import match_log
+import xg_engine
+
+DEFAULT_N_GAMES = 10
+FORM_GAMES = 5
+FATIGUE_WINDOWS = (7, 14, 21)
+# Shared with demo_model_v2.feature_engine's season ratings.
+# Time-decay weight of a match k games ago: exp(-DECAY_ALPHA * k).
+DECAY_ALPHA = 0.05
+LEAGUE_BASELINE_XG = 1.5
+RATING_VENUES = ("All", "Home", "Away")
+
+_TIMELINE_CACHE = {}
+
+
+def _cutoff(as_of):
+    """Features as of a day only see matches played before that day (the fixture itself is excluded)."""
+    return pd.Timestamp(as_of).normalize().to_datetime64()
+
+
+def _dated_order(df, date_col):
+    """
+    (dates, positions) of the rows of `df` with a parseable date, oldest first. Same-day rows are in
+    reverse sheet order, so read newest-first they keep sheet order like XGEngine's sort.
+    """
+    if df is None or df.empty or not date_col:
+        return np.array([], dtype="datetime64[ns]"), np.array([], dtype=int)
+    dates = pd.to_datetime(df[date_col], errors="coerce").to_numpy(dtype="datetime64[ns]")
+    keep = np.flatnonzero(~np.isnat(dates))[::-1]
+    order = keep[np.argsort(dates[keep], kind="stable")]
+    return dates[order], order
+
+
+def _day_rank(dates):
+    """Position of each entry among the entries of its day (sorted dates)."""
+    return pd.Series(dates).groupby(dates).cumcount().to_numpy()
+
+
+def _prefix(values):
+    return np.concatenate([[0.0], np.cumsum(values, dtype=float)])
+
+
+def _window_means(values, n_games):
+    """Mean of the non-NaN values among the last `n_games` rows of every prefix (index k = first k rows)."""
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    sums = _prefix(np.where(valid, values, 0.0))
+    counts = _prefix(valid)
+    k = np.arange(len(values) + 1)
+    lo = np.maximum(0, k - max(1, int(n_games)))
+    n = counts[k] - counts[lo]
+    return np.where(n > 0, (sums[k] - sums[lo]) / np.maximum(n, 1), np.nan)
+
+
+class _WindowSeries:
+    """xg_engine rolling average of one per-match series, precomputed for every prefix of its dated rows."""
+
+    def __init__(self, df, values, source, low, high, default, empty_source, n_games):
+        self.dates, order = _dated_order(df, match_log.find_col(df, *match_log.COLUMN_RULES["date"]))
+        means = _window_means(np.asarray(values, dtype=float)[order], n_games)
+        self.values = np.clip(np.where(np.isnan(means), default, means), low, high)
+        self.source = source
+        self.default = default
+        self.empty_source = empty_source
+
+    def at(self, cutoff):
+        k = int(np.searchsorted(self.dates, cutoff, side="left"))
+        if k == 0:
+            return self.default, self.empty_source
+        return float(self.values[k]), self.source
+
+
+class TeamTimeline:
+    """
+    Point-in-time features of one Match Logs workbook. Every per-match series is sorted by date
+    once and reduced to running prefix states (window sums, form points, season goals, decayed
+    rating sums), so the features as of any day are a binary search over the team's match dates
+    plus array lookups. Rolling xG/xGA and form follow xg_engine.XGEngine on the matches played
+    before that day; ratings use the demo_model_v2 time decay (not opponent-adjusted).
+    """
+
+    def __init__(self, log, n_games=DEFAULT_N_GAMES, alpha=DECAY_ALPHA):
+        engine = xg_engine.XGEngine(log.league)
+        self.team = log.team
+        self.n_games = int(n_games)
+        self.alpha = float(alpha)
+
+        df_shoot = log.sheet("Shooting")
+        df_goalkeeping = log.sheet("Goalkeeping")
+        df_res = log.results_sheet()
+        res_sheet = "Shooting" if df_res is df_shoot else 0
+
+        attack_df = df_shoot if df_shoot is not None else df_res
+        attack = engine._attack_values(attack_df) if attack_df is not None and not attack_df.empty else None
+        if attack is None:
+            self._attack = None
+        else:
+            self._attack = _WindowSeries(
+                attack_df, *attack, xg_engine.DEFAULT_ATTACK_XG, "default_attack", self.n_games
+            )
+        defense = engine._defense_values(df_goalkeeping, df_res)
+        if defense is None:
+            self._defense = None
+        else:
+            self._defense = _WindowSeries(
+                *defense, xg_engine.DEFAULT_DEFENSE_XGA, "default_defense", self.n_games
+            )
+
+        self._build_form(engine, df_res)
+        self._build_fatigue(log)
+        self._build_results(log, res_sheet, df_res, attack if attack_df is df_res else None, defense)
+
+    def _build_form(self, engine, df_res):
+        self._form_dates = np.array([], dtype="datetime64[ns]")
+        self._form_points = _prefix([])
+        self._form_has_results = False
+        if df_res is None or df_res.empty:
+            return
+        date_col = match_log.find_col(df_res, *match_log.COLUMN_RULES["date"])
+        result_col = match_log.find_col(df_res, *match_log.COLUMN_RULES["result"])
+        dates, order = _dated_order(df_res, date_col)
+        if result_col:
+            self._form_has_results = True
+            played = df_res[result_col].iloc[order].notna().to_numpy()
+            dates, order = dates[played], order[played]
+            self._form_points = _prefix(engine._result_points(df_res[result_col].iloc[order]).to_numpy())
+        self._form_dates = dates
+
+    def _build_fatigue(self, log):
+        dates = log.match_dates()
+        self._match_days = np.array(sorted(dates), dtype="datetime64[ns]")
+
+    def _build_results(self, log, res_sheet, df_res, attack, defense):
+        empty = np.array([], dtype="datetime64[ns]")
+        self._result_dates = empty
+        if df_res is None or df_res.empty:
+            return
+        gf_col = log.column(res_sheet, "goals_for")
+        ga_col = log.column(res_sheet, "goals_against")
+        if not gf_col or not ga_col:
+            return
+        dates, order = _dated_order(df_res, log.column(res_sheet, "date"))
+        goals_for = pd.to_numeric(df_res[gf_col], errors="coerce").to_numpy(dtype=float)[order]
+        goals_against = pd.to_numeric(df_res[ga_col], errors="coerce").to_numpy(dtype=float)[order]
+        played = ~np.isnan(goals_for) & ~np.isnan(goals_against)
+
+        # Per-match xG / xGA for the ratings: the engine's per-match series when it has one, else goals.
+        xg = goals_for.copy()
+        if attack is not None:
+            attack_values = np.asarray(attack[0], dtype=float)[order]
+            xg = np.where(np.isnan(attack_values), xg, attack_values)
+        xga = goals_against.copy()
+        if defense is not None:
+            frame, values = defense[0], np.asarray(defense[1], dtype=float)
+            # Rows of the two sheets are matched on (date, n-th match that day).
+            def_dates, def_order = _dated_order(frame, match_log.find_col(frame, *match_log.COLUMN_RULES["date"]))
+            by_match = pd.Series(
+                values[def_order], index=pd.MultiIndex.from_arrays([def_dates, _day_rank(def_dates)])
+            )
+            mapped = by_match.reindex(pd.MultiIndex.from_arrays([dates, _day_rank(dates)])).to_numpy(dtype=float)
+            xga = np.where(np.isnan(mapped), xga, mapped)
+
+        self._result_dates = dates[played]
+        self._goals_for = _prefix(goals_for[played])
+        self._goals_against = _prefix(goals_against[played])
+
+        venue_col = log.column(res_sheet, "venue")
+        venues = (
+            df_res[venue_col].astype(str).str.strip().to_numpy()[order][played]
+            if venue_col
+            else np.full(int(played.sum()), "")
+        )
+        decay = math.exp(-self.alpha)
+        xg, xga = xg[played], xga[played]
+        self._ratings = {}
+        for venue in RATING_VENUES:
+            mask = np.ones(len(venues), dtype=bool) if venue == "All" else venues == venue
+            states = np.zeros((len(venues) + 1, 4))
+            for i in range(len(venues)):
+                # [decayed weight, decayed xG, decayed xGA, matches]; older matches fade by exp(-alpha) per game.
+                states[i + 1, :3] = states[i, :3] * decay
+                states[i + 1, 3] = states[i, 3]
+                if mask[i]:
+                    states[i + 1] += (1.0, xg[i], xga[i], 1.0)
+            self._ratings[venue] = states
+
+    def rolling(self, as_of):
+        """(form_last_5, games_played, xg_per_game, xg_source, xga_per_game, xga_source) before `as_of`."""
+        cutoff = _cutoff(as_of)
+        k = int(np.searchsorted(self._form_dates, cutoff, side="left"))
+        if not self._form_has_results:
+            form, games = xg_engine.DEFAULT_FORM_LAST_5, k
+        elif k == 0:
+            form, games = xg_engine.DEFAULT_FORM_LAST_5, 0
+        else:
+            form, games = int(self._form_points[k] - self._form_points[max(0, k - FORM_GAMES)]), k
+        xg, xg_source = self._attack.at(cutoff) if self._attack else (xg_engine.DEFAULT_ATTACK_XG, "default_attack")
+        xga, xga_source = (
+            self._defense.at(cutoff) if self._defense else (xg_engine.DEFAULT_DEFENSE_XGA, "default_defense")
+        )
+        return int(form), int(games), float(xg), xg_source, float(xga), xga_source
+
+    def fatigue(self, as_of):
+        """Days since the last match and matches in the 7/14/21 days before `as_of`."""
+        cutoff = _cutoff(as_of)
+        k = int(np.searchsorted(self._match_days, cutoff, side="left"))
+        out = {"days_since_last": None}
+        if k:
+            out["days_since_last"] = int((cutoff - self._match_days[k - 1]) // np.timedelta64(1, "D"))
+        for days in FATIGUE_WINDOWS:
+            start = cutoff - np.timedelta64(days, "D")
+            out[f"matches_{days}d"] = k - int(np.searchsorted(self._match_days, start, side="left"))
+        return out
+
+    def season_to_date(self, as_of):
+        """Played matches and goals for/against per game before `as_of` (None when nothing was played)."""
+        k = int(np.searchsorted(self._result_dates, _cutoff(as_of), side="left"))
+        if k == 0:
+            return {"games": 0, "goals_for_per_game": None, "goals_against_per_game": None}
+        return {
+            "games": k,
+            "goals_for_per_game": float(self._goals_for[k] / k),
+            "goals_against_per_game": float(self._goals_against[k] / k),
+        }
+
+    def ratings(self, as_of, venue="All"):
+        """Time-decay attack/defense ratings (demo_model_v2 scale) before `as_of`, or None without matches."""
+        if not len(self._result_dates):
+            return None
+        k = int(np.searchsorted(self._result_dates, _cutoff(as_of), side="left"))
+        weight, xg_sum, xga_sum, matches = self._ratings[venue or "All"][k]
+        if weight <= 0:
+            return None
+        return {
+            "attack": float(xg_sum / weight / LEAGUE_BASELINE_XG),
+            "defense": float(xga_sum / weight / LEAGUE_BASELINE_XG),
+            "expected_goals_avg": float(xg_sum / weight),
+            "matches": int(matches),
+        }
+
+    def features(self, as_of):
+        form, games, xg, xg_source, xga, xga_source = self.rolling(as_of)
+        return {
+            "team": self.team,
+            "as_of": str(pd.Timestamp(as_of).date()),
+            "form_last_5": form,
+            "games_played": games,
+            "xg_per_game": xg,
+            "xg_source": xg_source,
+            "xga_per_game": xga,
+            "xga_source": xga_source,
+            "fatigue": self.fatigue(as_of),
+            "season": self.season_to_date(as_of),
+            "ratings": {venue: self.ratings(as_of, venue) for venue in RATING_VENUES},
+        }
+
+
+def team_timeline(log, n_games=DEFAULT_N_GAMES, alpha=DECAY_ALPHA):
+    """TeamTimeline of a TeamMatchLog, reused while match_log keeps serving the same parsed workbook."""
+    key = (os.path.abspath(log.path), int(n_games), float(alpha))
+    hit = _TIMELINE_CACHE.get(key)
+    if hit is None or hit[0] is not log:
+        hit = (log, TeamTimeline(log, n_games=n_games, alpha=alpha))
+        _TIMELINE_CACHE[key] = hit
+    return hit[1]
+
+
+class FeatureStore:
+    """
+    Point-in-time team features from Match Logs: features(league, team, as_of) only uses the
+    matches played before `as_of`, so backtests score past fixtures without future data.
+    """
+
+    def __init__(self, n_games=DEFAULT_N_GAMES, alpha=DECAY_ALPHA):
+        self.n_games = int(n_games)
+        self.alpha = float(alpha)
+        self._engines = {}
+        self._files = {}
+
+    def team_file(self, league, team):
+        key = (league, team)
+        if key not in self._files:
+            if league not in self._engines:
+                self._engines[league] = xg_engine.XGEngine(league)
+            self._files[key] = self._engines[league].resolve_team_file(team)
+        return self._files[key]
+
+    def timeline(self, league, team):
+        path = self.team_file(league, team)
+        if not path:
+            return None
+        return team_timeline(match_log.load_team_match_log(path), n_games=self.n_games, alpha=self.alpha)
+
+    def features(self, league, team, as_of):
+        timeline = self.timeline(league, team)
+        return timeline.features(as_of) if timeline is not None else None
+
+    def preload(self, league, teams):
+        """Build every team's timeline up front (e.g. before forking backtest workers)."""
+        for team in teams:
+            self.timeline(league, team)
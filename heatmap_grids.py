@@ -0,0 +1,222 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import data_store
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+# scripts/scrape_heatmaps.py writes heatmap/{league}/{team}_heatmaps.xlsx relative to scripts/.
+HEATMAP_DIR = os.path.join("scripts", "heatmap")
+GRID_DIRNAME = "heatmaps"
+GRID_VERSION = 1
+GRID_SIZE = 50
+# SofaScore heatmap coordinates are percentages of the pitch: X along the attacking direction, Y across it.
+PITCH_MAX = 100.0
+COUNT_MAX = np.iinfo(np.uint16).max
+
+_LEAGUE_CACHE = {}
+
+
+def _grid_dir(project_root=PROJECT_ROOT):
+    return Path(project_root) / data_store.STORE_DIRNAME / GRID_DIRNAME
+
+
+def grid_paths(league, project_root=PROJECT_ROOT):
+    """(grids .npy, index .json) of a league."""
+    base = _grid_dir(project_root)
+    return base / f"{league}.npy", base / f"{league}.json"
+
+
+def rasterize(x, y, count, grid_size=GRID_SIZE):
+    """Sum point counts into a (grid_size, grid_size) uint16 grid indexed [y_cell, x_cell]."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    count = np.nan_to_num(np.asarray(count, dtype=float), nan=0.0)
+    ok = np.isfinite(x) & np.isfinite(y)
+    xi = np.clip((x[ok] / PITCH_MAX * grid_size).astype(int), 0, grid_size - 1)
+    yi = np.clip((y[ok] / PITCH_MAX * grid_size).astype(int), 0, grid_size - 1)
+    grid = np.zeros(grid_size * grid_size, dtype=np.int64)
+    np.add.at(grid, yi * grid_size + xi, count[ok].astype(np.int64))
+    return np.minimum(grid, COUNT_MAX).astype(np.uint16).reshape(grid_size, grid_size)
+
+
+def _league_sources(league, heatmap_dir):
+    league_dir = Path(heatmap_dir) / league
+    if not league_dir.is_dir():
+        return []
+    return sorted(p for p in league_dir.glob("*_heatmaps.xlsx") if not p.name.startswith("~$"))
+
+
+def _source_signatures(paths):
+    return {p.name: data_store.file_signature(p) for p in paths}
+
+
+def build_league(league, heatmap_dir=HEATMAP_DIR, project_root=PROJECT_ROOT, force=False):
+    """
+    Rasterize every player of {heatmap_dir}/{league}/*_heatmaps.xlsx into one (n_players, GRID_SIZE,
+    GRID_SIZE) uint16 array saved as data_store/heatmaps/{league}.npy, with a JSON index of
+    player id -> row offset. Skipped (returns None) when the team workbooks have not changed.
+    """
+    heatmap_dir = Path(project_root) / heatmap_dir
+    sources = _league_sources(league, heatmap_dir)
+    if not sources:
+        raise FileNotFoundError(f"No heatmap workbooks in {heatmap_dir / league}")
+    signatures = _source_signatures(sources)
+    grid_path, index_path = grid_paths(league, project_root)
+    if not force and grid_path.exists() and index_path.exists():
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                old = json.load(f)
+            if old.get("version") == GRID_VERSION and old.get("sources") == signatures:
+                return None
+        except Exception:
+            pass
+
+    grids = []
+    players = []
+    for path in sources:
+        df = pd.read_excel(path)
+        if df.empty or "Player_ID" not in df.columns:
+            continue
+        team_default = path.name[: -len("_heatmaps.xlsx")]
+        for player_id, group in df.groupby("Player_ID", sort=False):
+            team = group["Team"].iloc[0] if "Team" in group.columns else team_default
+            players.append(
+                {
+                    "player_id": int(player_id),
+                    "name": str(group["Player_Name"].iloc[0]) if "Player_Name" in group.columns else "",
+                    "team": str(team),
+                    "offset": len(grids),
+                    "points": int(len(group)),
+                }
+            )
+            grids.append(rasterize(group["X"], group["Y"], group.get("Count", pd.Series(1, index=group.index))))
+
+    stack = np.stack(grids) if grids else np.zeros((0, GRID_SIZE, GRID_SIZE), dtype=np.uint16)
+    grid_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_grid = grid_path.with_suffix(".npy.tmp")
+    with open(tmp_grid, "wb") as f:
+        np.save(f, stack)
+    os.replace(tmp_grid, grid_path)
+    payload = {
+        "version": GRID_VERSION,
+        "league": league,
+        "grid_size": GRID_SIZE,
+        "sources": signatures,
+        "players": players,
+    }
+    tmp_index = index_path.with_suffix(".json.tmp")
+    with open(tmp_index, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_index, index_path)
+    return grid_path
+
+
+def build_all(heatmap_dir=HEATMAP_DIR, project_root=PROJECT_ROOT, force=False, log_callback=print):
+    base = Path(project_root) / heatmap_dir
+    if not base.is_dir():
+        log_callback(f"[Heatmap] {base} not found; nothing to rasterize.")
+        return []
+    written = []
+    for league_dir in sorted(p for p in base.iterdir() if p.is_dir()):
+        try:
+            out_path = build_league(league_dir.name, heatmap_dir=heatmap_dir, project_root=project_root, force=force)
+        except FileNotFoundError as e:
+            log_callback(f"  - {e}")
+            continue
+        if out_path is None:
+            log_callback(f"  = {league_dir.name} (unchanged)")
+        else:
+            log_callback(f"  + {out_path}")
+            written.append(out_path)
+    return written
+
+
+def positional_features(grids):
+    """
+    Per-grid positional features as vectorized reductions over a (n, size, size) stack:
+    share of touches per pitch third (X), in the wide channels (outer fifth on each side of Y),
+    mean depth/lateral position (0-100) and lateral spread.
+    """
+    grids = np.asarray(grids, dtype=np.float64)
+    if grids.ndim == 2:
+        grids = grids[None]
+    size = grids.shape[-1]
+    centers = (np.arange(size) + 0.5) / size * PITCH_MAX
+    total = grids.sum(axis=(1, 2))
+    safe = np.where(total > 0, total, 1.0)
+
+    by_x = grids.sum(axis=1)
+    by_y = grids.sum(axis=2)
+    third = np.digitize(centers, [PITCH_MAX / 3, 2 * PITCH_MAX / 3])
+    wide = (centers < PITCH_MAX * 0.2) | (centers > PITCH_MAX * 0.8)
+
+    mean_x = by_x @ centers / safe
+    mean_y = by_y @ centers / safe
+    var_y = by_y @ (centers**2) / safe - mean_y**2
+    features = pd.DataFrame(
+        {
+            "heat_touches": total,
+            "heat_def_third": by_x[:, third == 0].sum(axis=1) / safe,
+            "heat_mid_third": by_x[:, third == 1].sum(axis=1) / safe,
+            "heat_att_third": by_x[:, third == 2].sum(axis=1) / safe,
+            "heat_wide_share": by_y[:, wide].sum(axis=1) / safe,
+            "heat_depth": mean_x,
+            "heat_lateral": mean_y,
+            "heat_width": np.sqrt(np.clip(var_y, 0.0, None)),
+        }
+    )
+    features.loc[total == 0, features.columns[1:]] = np.nan
+    return features
+
+
+class LeagueHeatmaps:
+    """Memory-mapped player grids of one league plus the player id -> offset index."""
+
+    def __init__(self, league, grids, index):
+        self.league = league
+        self.grids = grids
+        self.players = index.get("players", [])
+        self._offsets = {p["player_id"]: p["offset"] for p in self.players}
+
+    def __len__(self):
+        return len(self.players)
+
+    def player(self, player_id):
+        offset = self._offsets.get(int(player_id))
+        return None if offset is None else self.grids[offset]
+
+    def team_offsets(self, team):
+        return [p["offset"] for p in self.players if p["team"] == team]
+
+    def team(self, team):
+        """Summed grid of every player of a team (None when the team has no heatmaps)."""
+        offsets = self.team_offsets(team)
+        if not offsets:
+            return None
+        return self.grids[offsets].sum(axis=0, dtype=np.uint32)
+
+    def features(self):
+        """positional_features() of every player, with player_id / name / team columns."""
+        meta = pd.DataFrame(self.players, columns=["player_id", "name", "team", "offset", "points"])
+        return pd.concat([meta.drop(columns=["offset"]), positional_features(self.grids)], axis=1)
+
+
+def load_league(league, project_root=PROJECT_ROOT):
+    """LeagueHeatmaps for a league, or None when its grids were never built. Memoized per file version."""
+    grid_path, index_path = grid_paths(league, project_root)
+    if not grid_path.exists() or not index_path.exists():
+        return None
+    key = str(grid_path.resolve())
+    signature = (data_store.file_signature(grid_path), data_store.file_signature(index_path))
+    hit = _LEAGUE_CACHE.get(key)
+    if hit is not None and hit[0] == signature:
+        return hit[1]
+    with open(index_path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    heatmaps = LeagueHeatmaps(league, np.load(grid_path, mmap_mode="r"), index)
+    _LEAGUE_CACHE[key] = (signature, heatmaps)
+    return heatmaps
@@ -0,0 +1,196 @@
+import math
+
+import numpy as np
+
+MAX_GOALS = 10
+# Home-side Asian handicap lines in quarter steps; x.25 / x.75 lines split the stake over the two neighbours.
+HDP_LINES = [round(-3.0 + 0.25 * i, 2) for i in range(25)]
+TOTAL_LINES = [0.5, 1.5, 2.5, 3.5, 4.5]
+CORRECT_SCORE_TOP = 10
+HDP_OUTCOMES = ("win", "half_win", "push", "half_loss", "loss")
+
+# prediction_tracker.xlsx "Bet_Data" sheet column -> Bet_Data key.
+BET_ROW_COLUMNS = [
+    ("HDP -3", "HDP_-3"),
+    ("HDP -2", "HDP_-2"),
+    ("HDP -1", "HDP_-1"),
+    ("HDP 0", "HDP_0"),
+    ("HDP +1", "HDP_1"),
+    ("HDP +2", "HDP_2"),
+    ("HDP +3", "HDP_3"),
+    ("Over 0.5", "Over_0.5"),
+    ("Under 0.5", "Under_0.5"),
+    ("Over 1.5", "Over_1.5"),
+    ("Under 1.5", "Under_1.5"),
+    ("Over 2.5", "Over_2.5"),
+    ("Under 2.5", "Under_2.5"),
+    ("Over 3.5", "Over_3.5"),
+    ("Under 3.5", "Under_3.5"),
+]
+
+
+def line_key(line):
+    """Bet_Data suffix of a line: 'HDP_-1', 'HDP_0.25', 'Over_2.5'."""
+    return f"{float(line) + 0.0:g}"
+
+
+def score_matrices(lambda_home, lambda_away, rho=0.0, max_goals=MAX_GOALS):
+    """
+    Normalized (N, G, G) score tensors, G = max_goals + 1, indexed [fixture, home_goals, away_goals],
+    from a vectorized Poisson log-pmf with the Dixon-Coles low-score correction (rho=0 is plain Poisson).
+    """
+    lambda_home = np.maximum(1e-9, np.atleast_1d(np.asarray(lambda_home, dtype=float)))
+    lambda_away = np.maximum(1e-9, np.atleast_1d(np.asarray(lambda_away, dtype=float)))
+    rho = np.broadcast_to(np.asarray(rho, dtype=float), lambda_home.shape)
+    goals = np.arange(max_goals + 1, dtype=float)
+    log_fact = np.array([math.lgamma(k + 1.0) for k in range(max_goals + 1)])
+
+    home_probs = np.exp(goals * np.log(lambda_home)[:, None] - lambda_home[:, None] - log_fact)
+    away_probs = np.exp(goals * np.log(lambda_away)[:, None] - lambda_away[:, None] - log_fact)
+    mats = home_probs[:, :, None] * away_probs[:, None, :]
+
+    if max_goals >= 1:
+        mats[:, 0, 0] *= np.maximum(0.01, 1 - rho * lambda_home * lambda_away)
+        mats[:, 0, 1] *= np.maximum(0.01, 1 + rho * lambda_home)
+        mats[:, 1, 0] *= np.maximum(0.01, 1 + rho * lambda_away)
+        mats[:, 1, 1] *= np.maximum(0.01, 1 - rho)
+
+    totals = mats.sum(axis=(1, 2))
+    mats /= np.where(totals > 0, totals, 1.0)[:, None, None]
+    return mats
+
+
+def score_matrix(lambda_home, lambda_away, rho=0.0, max_goals=MAX_GOALS):
+    return score_matrices(lambda_home, lambda_away, rho=rho, max_goals=max_goals)[0]
+
+
+def _marginal_weights(size):
+    """One-hot (G*G, 2G-1) maps of each cell to its goal difference (h - a) and total goals (h + a)."""
+    h, a = np.divmod(np.arange(size * size), size)
+    diff = np.zeros((size * size, 2 * size - 1))
+    diff[np.arange(size * size), h - a + size - 1] = 1.0
+    total = np.zeros((size * size, 2 * size - 1))
+    total[np.arange(size * size), h + a] = 1.0
+    return diff, total
+
+
+def price_matrices(mats):
+    """
+    Every market of (N, G, G) score tensors from their goal-difference and total-goal marginals.
+    Returns arrays keyed by market: "home_win"/"draw"/"away_win", "hdp" {line: {outcome: (N,)}},
+    "over"/"under" {line: (N,)}, "btts_yes", "clean_sheet_home"/"clean_sheet_away" and "matrix".
+    """
+    mats = np.asarray(mats, dtype=float)
+    if mats.ndim == 2:
+        mats = mats[None]
+    n, size = mats.shape[0], mats.shape[-1]
+    diff_w, total_w = _marginal_weights(size)
+    flat = mats.reshape(n, -1)
+    by_diff = flat @ diff_w
+    by_total = flat @ total_w
+    diffs = np.arange(-(size - 1), size)
+    totals = np.arange(2 * size - 1)
+
+    # Quarter lines settle as two half stakes on line -/+ 0.25; whole and half lines have lo == hi.
+    lines = np.array(HDP_LINES)
+    quarter = np.isclose(np.mod(lines * 2, 1.0), 0.5)
+    lo = np.where(quarter, lines - 0.25, lines)[None, :] + diffs[:, None]
+    hi = np.where(quarter, lines + 0.25, lines)[None, :] + diffs[:, None]
+    masks = {
+        "win": lo > 0,
+        "half_win": (lo == 0) & (hi > 0),
+        "push": (lo == 0) & (hi == 0),
+        "half_loss": (hi == 0) & (lo < 0),
+        "loss": hi < 0,
+    }
+    hdp_probs = {outcome: by_diff @ mask for outcome, mask in masks.items()}
+
+    bounds = np.array(TOTAL_LINES)
+    over = by_total @ (totals[:, None] > bounds[None, :])
+    under = by_total @ (totals[:, None] < bounds[None, :])
+
+    return {
+        "home_win": by_diff[:, diffs > 0].sum(axis=1),
+        "draw": by_diff[:, diffs == 0].sum(axis=1),
+        "away_win": by_diff[:, diffs < 0].sum(axis=1),
+        "hdp": {
+            line: {outcome: hdp_probs[outcome][:, j] for outcome in HDP_OUTCOMES} for j, line in enumerate(HDP_LINES)
+        },
+        "over": {line: over[:, j] for j, line in enumerate(TOTAL_LINES)},
+        "under": {line: under[:, j] for j, line in enumerate(TOTAL_LINES)},
+        "btts_yes": mats[:, 1:, 1:].sum(axis=(1, 2)),
+        "clean_sheet_home": mats[:, :, 0].sum(axis=1),
+        "clean_sheet_away": mats[:, 0, :].sum(axis=1),
+        "matrix": mats,
+    }
+
+
+def top_scores(mat, top_n=3):
+    """[(home_goals, away_goals, probability)] by descending probability, ties in row-major order."""
+    mat = np.asarray(mat, dtype=float)
+    size = mat.shape[-1]
+    order = np.argsort(-mat.ravel(), kind="stable")[:top_n]
+    return [(int(i // size), int(i % size), float(mat.ravel()[i])) for i in order]
+
+
+def best_score_for_result(mat, result):
+    """Most likely score consistent with a "Home"/"Draw"/"Away" result (any score if none is)."""
+    mat = np.asarray(mat, dtype=float)
+    size = mat.shape[-1]
+    h, a = np.indices((size, size))
+    allowed = {"Home": h > a, "Away": h < a}.get(result, h == a)
+    masked = np.where(allowed, mat, -1.0)
+    if not allowed.any():
+        masked = mat
+    idx = int(np.argmax(masked))
+    return f"{idx // size}-{idx % size}", float(mat.ravel()[idx])
+
+
+def bet_tables(mats):
+    """(Bet_Data, Bet_Detail) of every fixture in a (N, G, G) tensor."""
+    priced = price_matrices(mats)
+    tables = []
+    for i, mat in enumerate(priced["matrix"]):
+        bet_data = {
+            "Home_Win": float(priced["home_win"][i]),
+            "Draw": float(priced["draw"][i]),
+            "Away_Win": float(priced["away_win"][i]),
+        }
+        bet_detail = {}
+        for line, outcomes in priced["hdp"].items():
+            key = f"HDP_{line_key(line)}"
+            bet_data[key] = float(outcomes["win"][i])
+            bet_detail[key] = {outcome: float(outcomes[outcome][i]) for outcome in HDP_OUTCOMES}
+        for line in TOTAL_LINES:
+            bet_data[f"Over_{line}"] = float(priced["over"][line][i])
+            bet_data[f"Under_{line}"] = float(priced["under"][line][i])
+        bet_data["BTTS_Yes"] = float(priced["btts_yes"][i])
+        bet_data["BTTS_No"] = float(1.0 - priced["btts_yes"][i])
+        bet_data["Clean_Sheet_Home"] = float(priced["clean_sheet_home"][i])
+        bet_data["Clean_Sheet_Away"] = float(priced["clean_sheet_away"][i])
+
+        top = top_scores(mat, top_n=CORRECT_SCORE_TOP)
+        bet_detail["Correct_Score"] = {f"{h}-{a}": p for h, a, p in top}
+        bet_detail["Correct_Score_Other"] = float(max(0.0, 1.0 - sum(p for _, _, p in top)))
+        tables.append((bet_data, bet_detail))
+    return tables
+
+
+def price_fixture(lambda_home, lambda_away, rho=0.0, max_goals=MAX_GOALS):
+    """(Bet_Data, Bet_Detail) of one fixture's expected goals and Dixon-Coles rho."""
+    return bet_tables(score_matrices(lambda_home, lambda_away, rho=rho, max_goals=max_goals))[0]
+
+
+def hdp_probability(bet_data, bet_detail, key):
+    """Win probability of a handicap with pushes refunded (half outcomes count as half a win/loss)."""
+    detail = (bet_detail or {}).get(key)
+    if isinstance(detail, dict):
+        win = float(detail.get("win", 0.0)) + 0.5 * float(detail.get("half_win", 0.0))
+        loss = float(detail.get("loss", 0.0)) + 0.5 * float(detail.get("half_loss", 0.0))
+        return win / max(1e-9, win + loss)
+    return float((bet_data or {}).get(key, 0.0))
+
+
+def bet_row(bet_data):
+    """Percent columns of the tracker's Bet_Data sheet."""
+    return {column: round(float(bet_data.get(key, 0.0)) * 100.0, 1) for column, key in BET_ROW_COLUMNS}
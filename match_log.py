@@ -0,0 +1,124 @@
+import os
+
+import pandas as pd
+
+import data_store
+
+# Column roles shared by every Match Logs consumer: role -> (exact, endswith, contains).
+# Covers both the legacy schema (GF, Standard_xG, ...) and the prefixed one ("For {team}_Date", ...).
+COLUMN_RULES = {
+    "date": (["date"], ["_date"], None),
+    "result": (["result"], ["_result"], ["result"]),
+    "opponent": (["opponent"], ["_opponent"], None),
+    "venue": (["venue"], ["_venue"], None),
+    "gf": (["gf"], ["_gf"], None),
+    "ga": (["ga"], ["_ga"], None),
+    # Result goals under either schema ("GF" or "For {team}_Goals For").
+    "goals_for": (["gf", "goals for"], ["_gf", "_goals for"], None),
+    "goals_against": (["ga", "goals against"], ["_ga", "_goals against"], None),
+    "xg": (["standard_xg", "expected_xg"], ["_xg"], ["_xg", "expected_xg"]),
+    "shots": (["standard_sh"], ["_sh"], None),
+    "sot": (["standard_sot"], ["_sot"], None),
+    "goals": (["standard_gls"], ["_gls"], None),
+    "psxg": (["performance_psxg"], ["_psxg"], ["psxg"]),
+    "gk_ga": (["performance_ga", "ga"], ["_ga"], None),
+    "sota": (["performance_sota"], ["_sota"], None),
+    "save_pct": (["performance_save%"], ["_save%"], ["save%"]),
+}
+
+_LOG_CACHE = {}
+
+
+def find_col(df, exact=None, endswith=None, contains=None):
+    if df is None or df.empty:
+        return None
+
+    exact = [x.lower() for x in (exact or [])]
+    endswith = [x.lower() for x in (endswith or [])]
+    contains = [x.lower() for x in (contains or [])]
+
+    columns = list(df.columns)
+    lowered = {str(col).lower(): col for col in columns}
+
+    for key in exact:
+        if key in lowered:
+            return lowered[key]
+
+    for col in columns:
+        col_text = str(col).lower()
+        if any(col_text.endswith(s) for s in endswith):
+            return col
+
+    for col in columns:
+        col_text = str(col).lower()
+        if any(s in col_text for s in contains):
+            return col
+
+    return None
+
+
+class TeamMatchLog:
+    """
+    One parsed `Match Logs/{league}/{team}.xlsx` workbook.
+    Sheets are parsed once and shared between consumers, so treat them as read-only.
+    """
+
+    def __init__(self, path, sheets):
+        self.path = str(path)
+        self.team = os.path.splitext(os.path.basename(self.path))[0]
+        self.league = os.path.basename(os.path.dirname(os.path.abspath(self.path)))
+        self.sheets = dict(sheets or {})
+        self.sheet_names = list(self.sheets.keys())
+        self._columns = {}
+
+    def sheet(self, name=0):
+        """Sheet by name or position, or None when the workbook does not have it."""
+        if isinstance(name, int):
+            if name < 0 or name >= len(self.sheet_names):
+                return None
+            name = self.sheet_names[name]
+        return self.sheets.get(name)
+
+    def results_sheet(self):
+        """Shooting when it has rows (it carries the result columns too), else the first sheet."""
+        df = self.sheet("Shooting")
+        if df is not None and not df.empty:
+            return df
+        return self.sheet(0)
+
+    def column(self, sheet, role):
+        """Column name holding `role` (see COLUMN_RULES) in the given sheet, or None."""
+        df = self.sheet(sheet)
+        key = (sheet, role)
+        if key not in self._columns:
+            exact, endswith, contains = COLUMN_RULES[role]
+            self._columns[key] = find_col(df, exact=exact, endswith=endswith, contains=contains)
+        return self._columns[key]
+
+    def match_dates(self, until=None):
+        """Distinct match dates (normalized, newest first), optionally only those on or before `until`."""
+        sheet = "Shooting" if self.sheet("Shooting") is not None else 0
+        df = self.sheet(sheet)
+        date_col = self.column(sheet, "date")
+        if df is None or df.empty or not date_col:
+            return []
+
+        dates = pd.to_datetime(df[date_col], errors="coerce").dropna().dt.normalize()
+        if until is not None:
+            dates = dates[dates <= pd.Timestamp(until).normalize()]
+        if dates.empty:
+            return []
+        return list(dates.drop_duplicates().sort_values(ascending=False))
+
+
+def load_team_match_log(path):
+    """TeamMatchLog for a workbook path, memoized while data_store serves the same parsed workbook."""
+    sheets = data_store.read_workbook(path)
+    key = os.path.abspath(str(path))
+    hit = _LOG_CACHE.get(key)
+    if hit is not None and hit[0] is sheets:
+        return hit[1]
+
+    log = TeamMatchLog(path, sheets)
+    _LOG_CACHE[key] = (sheets, log)
+    return log
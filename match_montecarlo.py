@@ -0,0 +1,194 @@
+import numpy as np
+
+MINUTES = 90
+HALF_TIME = 45
+LATE_MINUTE = 60
+LATE_GOAL_MINUTE = 75
+DEFAULT_SEED = 20260220
+DEFAULT_TOLERANCE = 0.006
+BATCH_SIZE = 2000
+# Scoring rate rises through a match (roughly +/-35% from the first to the last minute).
+GOAL_TIME_SLOPE = 0.35
+# Share of a side's fatigue attack penalty moved from its early to its late scoring rate,
+# and the matching late leak it concedes.
+LATE_FATIGUE_GAIN = 2.5
+LATE_FATIGUE_LEAK = 1.2
+RED_CARD_RATE_PER_90 = 0.11
+RED_CARD_ATTACK_SCALE = 0.72
+RED_CARD_OPPONENT_SCALE = 1.22
+FIRST_GOAL_BUCKETS = [(1, 15), (16, 30), (31, 45), (46, 60), (61, 75), (76, 90)]
+
+
+def _outcome(home_goals, away_goals):
+    return np.sign(home_goals - away_goals)
+
+
+def _side_fatigue(fatigue_context):
+    ctx = fatigue_context or {}
+    home = float(ctx.get("home_attack_penalty") or 0.0)
+    away = float(ctx.get("away_attack_penalty") or 0.0)
+    return max(0.0, home), max(0.0, away)
+
+
+def minute_rates(lambda_home, lambda_away, fatigue_context=None):
+    """
+    (2, MINUTES) per-minute scoring rates whose sums equal the match expected goals: a rising
+    time profile, with each side fading late by its fatigue penalty and leaking late against a
+    tired opponent.
+    """
+    minute = np.arange(1, MINUTES + 1, dtype=float)
+    profile = 1.0 + GOAL_TIME_SLOPE * (minute - (MINUTES + 1) / 2.0) / (MINUTES / 2.0)
+    late = minute > LATE_MINUTE
+    home_penalty, away_penalty = _side_fatigue(fatigue_context)
+
+    rates = []
+    for lam, own, opp in ((lambda_home, home_penalty, away_penalty), (lambda_away, away_penalty, home_penalty)):
+        shape = profile * np.where(late, 1.0 - LATE_FATIGUE_GAIN * own + LATE_FATIGUE_LEAK * opp, 1.0)
+        shape = np.clip(shape, 0.05, None)
+        rates.append(float(lam) * shape / shape.sum())
+    return np.vstack(rates)
+
+
+def _simulate_batch(rng, rates, size, start_minute, start_score, red_card_rate):
+    """`size` paths from `start_minute` to full time; goals and red cards per minute."""
+    minutes = rates.shape[1] - start_minute
+    base = rates[:, start_minute:]
+
+    # First red card minute per side (minutes when none), then the resulting rate shifts.
+    reds = rng.random((2, size, minutes)) < (red_card_rate / MINUTES)
+    red_minute = np.where(reds.any(axis=2), reds.argmax(axis=2), minutes)
+    played = np.arange(minutes)
+    home_down = played[None, :] > red_minute[0][:, None]
+    away_down = played[None, :] > red_minute[1][:, None]
+    home_scale = np.where(home_down, RED_CARD_ATTACK_SCALE, 1.0) * np.where(away_down, RED_CARD_OPPONENT_SCALE, 1.0)
+    away_scale = np.where(away_down, RED_CARD_ATTACK_SCALE, 1.0) * np.where(home_down, RED_CARD_OPPONENT_SCALE, 1.0)
+
+    home_rate = base[0][None, :] * home_scale
+    away_rate = base[1][None, :] * away_scale
+    home_goals = rng.poisson(home_rate)
+    away_goals = rng.poisson(away_rate)
+
+    scored = (home_goals + away_goals) > 0
+    any_goal = scored.any(axis=1)
+    first_idx = np.where(any_goal, scored.argmax(axis=1), minutes)
+    rows = np.arange(size)
+    idx = np.minimum(first_idx, minutes - 1)
+    h_first = home_goals[rows, idx] > 0
+    a_first = away_goals[rows, idx] > 0
+    # Both sides scoring in the same minute: split by their rates in that minute.
+    both = h_first & a_first
+    share = home_rate[rows, idx] / np.maximum(1e-12, home_rate[rows, idx] + away_rate[rows, idx])
+    home_first = any_goal & np.where(both, rng.random(size) < share, h_first)
+    away_first = any_goal & ~home_first
+
+    half = max(0, HALF_TIME - start_minute)
+    return {
+        "home_ft": start_score[0] + home_goals.sum(axis=1),
+        "away_ft": start_score[1] + away_goals.sum(axis=1),
+        "home_ht": start_score[0] + home_goals[:, :half].sum(axis=1),
+        "away_ht": start_score[1] + away_goals[:, :half].sum(axis=1),
+        "first_minute": np.where(any_goal, first_idx + start_minute + 1, 0),
+        "home_first": home_first,
+        "away_first": away_first,
+        "red_card": (red_minute < minutes).any(axis=0),
+        "late_goals": (home_goals + away_goals)[:, max(0, LATE_GOAL_MINUTE - start_minute) :].sum(axis=1),
+    }
+
+
+def _pct(mask):
+    return float(np.mean(mask) * 100.0)
+
+
+def _standard_error(outcomes):
+    n = len(outcomes)
+    probs = np.array([(outcomes == k).mean() for k in (1, 0, -1)])
+    return float(np.sqrt(probs * (1.0 - probs) / max(1, n)).max())
+
+
+def simulate_minutes(
+    lambda_home,
+    lambda_away,
+    iterations=10000,
+    seed=DEFAULT_SEED,
+    fatigue_context=None,
+    tolerance=DEFAULT_TOLERANCE,
+    start_minute=0,
+    start_score=(0, 0),
+    red_card_rate=RED_CARD_RATE_PER_90,
+    batch_size=BATCH_SIZE,
+    top_n=5,
+):
+    """
+    Seeded minute-by-minute Monte Carlo of one match (numpy Generator, vectorized over paths).
+    Paths are drawn in batches until the largest 1X2 standard error is below `tolerance` or
+    `iterations` paths have run. Gives what the analytic score matrix cannot: half-time/full-time,
+    side and timing of the next goal (the first goal at kickoff, or in-play from `start_minute` /
+    `start_score`), late goals, and the effect of red cards and fatigue-driven late rate shifts.
+    Probabilities are percentages.
+    """
+    iterations = int(iterations)
+    start_minute = int(min(max(start_minute, 0), MINUTES - 1))
+    start_score = (int(start_score[0]), int(start_score[1]))
+    rng = np.random.default_rng(seed)
+    rates = minute_rates(lambda_home, lambda_away, fatigue_context)
+
+    batches = []
+    ran = 0
+    converged = False
+    while ran < iterations:
+        size = min(int(batch_size), iterations - ran)
+        batches.append(_simulate_batch(rng, rates, size, start_minute, start_score, red_card_rate))
+        ran += size
+        outcomes = np.concatenate([_outcome(b["home_ft"], b["away_ft"]) for b in batches])
+        if _standard_error(outcomes) < tolerance:
+            converged = True
+            break
+    if not batches:
+        return None
+
+    paths = {key: np.concatenate([b[key] for b in batches]) for key in batches[0]}
+    ft = _outcome(paths["home_ft"], paths["away_ft"])
+
+    scores = paths["home_ft"] * 100 + paths["away_ft"]
+    values, counts = np.unique(scores, return_counts=True)
+    order = np.argsort(-counts, kind="stable")[:top_n]
+    top_scores = [
+        {"score": f"{values[i] // 100}-{values[i] % 100}", "probability": round(counts[i] / ran * 100.0, 2)} for i in order
+    ]
+
+    ht_ft = None
+    if start_minute < HALF_TIME:
+        ht = _outcome(paths["home_ht"], paths["away_ht"])
+        labels = {1: "H", 0: "D", -1: "A"}
+        ht_ft = {f"{labels[h]}/{labels[f]}": _pct((ht == h) & (ft == f)) for h in (1, 0, -1) for f in (1, 0, -1)}
+
+    minute = paths["first_minute"]
+    scored = minute > 0
+    next_goal = {
+        "home": _pct(paths["home_first"]),
+        "away": _pct(paths["away_first"]),
+        "none": _pct(~scored),
+        "mean_minute": float(minute[scored].mean()) if scored.any() else None,
+        "by_window": {f"{lo}-{hi}": _pct((minute >= lo) & (minute <= hi)) for lo, hi in FIRST_GOAL_BUCKETS},
+    }
+
+    return {
+        "iterations": int(ran),
+        "max_iterations": iterations,
+        "converged": converged,
+        "tolerance": float(tolerance),
+        "standard_error": _standard_error(ft),
+        "seed": seed,
+        "start_minute": start_minute,
+        "start_score": f"{start_score[0]}-{start_score[1]}",
+        "home_win_prob": _pct(ft == 1),
+        "draw_prob": _pct(ft == 0),
+        "away_win_prob": _pct(ft == -1),
+        "mean_goals_home": float(paths["home_ft"].mean()),
+        "mean_goals_away": float(paths["away_ft"].mean()),
+        "top_scores": top_scores,
+        "ht_ft": ht_ft,
+        "next_goal": next_goal,
+        "late_goal_prob": _pct(paths["late_goals"] > 0),
+        "red_card_prob": _pct(paths["red_card"]),
+    }
@@ -0,0 +1,160 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+
+import data_store
+
+OPTA_DIR = "output_opta"
+TABLE_SUFFIX = "_Team_Aggregates.xlsx"
+
+# (abs table path) -> (cached table frame, {opta file name: row dict})
+_TABLE_INDEX = {}
+
+
+def aggregate_team_workbook(path):
+    """Team-level opta_* summary of one output_opta/{league}/{team}.xlsx player workbook."""
+    result = {}
+    try:
+        sheets = data_store.read_workbook(path)
+
+        # --- Attacking ---
+        if "Attacking" in sheets:
+            df = sheets["Attacking"]
+            result["opta_goals"] = pd.to_numeric(df.get("goals"), errors="coerce").sum()
+            result["opta_xg"] = pd.to_numeric(df.get("xg"), errors="coerce").sum()
+            result["opta_shots"] = pd.to_numeric(df.get("shots"), errors="coerce").sum()
+            result["opta_sot"] = pd.to_numeric(df.get("sot"), errors="coerce").sum()
+            conv = pd.to_numeric(df.get("conv %"), errors="coerce").dropna()
+            result["opta_conv_pct"] = float(conv.mean()) if len(conv) > 0 else None
+            xgps = pd.to_numeric(df.get("xG per Shot"), errors="coerce").dropna()
+            result["opta_xg_per_shot"] = float(xgps.mean()) if len(xgps) > 0 else None
+
+        # --- Passing ---
+        if "Passing" in sheets:
+            df = sheets["Passing"]
+            op_total = pd.to_numeric(df.get("Open Play Passes_total"), errors="coerce").sum()
+            op_succ = pd.to_numeric(df.get("Open Play Passes_successful"), errors="coerce").sum()
+            result["opta_open_play_passes"] = float(op_total)
+            result["opta_pass_pct"] = float(op_succ / op_total * 100) if op_total > 0 else None
+            ft_total = pd.to_numeric(df.get("In Final Third_total"), errors="coerce").sum()
+            ft_succ = pd.to_numeric(df.get("In Final Third_successful"), errors="coerce").sum()
+            result["opta_final_third_passes"] = float(ft_total)
+            result["opta_final_third_pct"] = float(ft_succ / ft_total * 100) if ft_total > 0 else None
+            result["opta_crosses"] = pd.to_numeric(df.get("Crosses_total"), errors="coerce").sum()
+            result["opta_through_balls"] = pd.to_numeric(df.get("through balls"), errors="coerce").sum()
+
+        # --- Defending ---
+        if "Defending" in sheets:
+            df = sheets["Defending"]
+            result["opta_tackles"] = pd.to_numeric(df.get("tackles"), errors="coerce").sum()
+            result["opta_interceptions"] = pd.to_numeric(df.get("ints"), errors="coerce").sum()
+            result["opta_blocks"] = pd.to_numeric(df.get("blocks"), errors="coerce").sum()
+            result["opta_clearances"] = pd.to_numeric(df.get("clearances"), errors="coerce").sum()
+            gd_won = pd.to_numeric(df.get("Ground Duels_won"), errors="coerce").sum()
+            gd_total = pd.to_numeric(df.get("Ground Duels_total"), errors="coerce").sum()
+            result["opta_ground_duels_pct"] = float(gd_won / gd_total * 100) if gd_total > 0 else None
+            ad_won = pd.to_numeric(df.get("Aerial Duels_won"), errors="coerce").sum()
+            ad_total = pd.to_numeric(df.get("Aerial Duels_total"), errors="coerce").sum()
+            result["opta_aerial_duels_pct"] = float(ad_won / ad_total * 100) if ad_total > 0 else None
+
+        # --- Carrying ---
+        if "Carrying" in sheets:
+            df = sheets["Carrying"]
+            result["opta_progressive_carries"] = pd.to_numeric(df.get("Progressive_total"), errors="coerce").sum()
+            prog_dist = pd.to_numeric(df.get("Progressive_distance (m)"), errors="coerce").sum()
+            result["opta_progressive_distance"] = float(prog_dist)
+            result["opta_carries_to_shot"] = pd.to_numeric(df.get("Ended With_shot"), errors="coerce").sum()
+            result["opta_carries_to_goal"] = pd.to_numeric(df.get("Ended With_goal"), errors="coerce").sum()
+            result["opta_carries_to_chance"] = pd.to_numeric(df.get("Ended With_chance"), errors="coerce").sum()
+
+        # --- Goalkeeping ---
+        if "Goalkeeping" in sheets:
+            df = sheets["Goalkeeping"]
+            save_pct = pd.to_numeric(df.get("save %"), errors="coerce").dropna()
+            result["opta_save_pct"] = float(save_pct.mean()) if len(save_pct) > 0 else None
+            result["opta_goals_conceded"] = pd.to_numeric(df.get("goals conceded"), errors="coerce").sum()
+            result["opta_saves"] = pd.to_numeric(df.get("saves made"), errors="coerce").sum()
+            gp = pd.to_numeric(df.get("goals prevented"), errors="coerce").dropna()
+            result["opta_goals_prevented"] = float(gp.sum()) if len(gp) > 0 else None
+
+    except Exception as e:
+        result["opta_error"] = str(e)
+
+    return result
+
+
+def table_path(league, base_dir=OPTA_DIR):
+    return Path(base_dir) / f"{league}{TABLE_SUFFIX}"
+
+
+def build_league_table(league, base_dir=OPTA_DIR):
+    """One row per team workbook in {base_dir}/{league}/ with its opta_* aggregates."""
+    league_dir = Path(base_dir) / league
+    if not league_dir.is_dir():
+        raise FileNotFoundError(f"OPTA league folder not found: {league_dir}")
+    rows = []
+    for path in sorted(league_dir.glob("*.xlsx")):
+        if path.name.startswith("~$"):
+            continue
+        sig = data_store.file_signature(path) or {}
+        row = {
+            "Team": path.stem,
+            "opta_file": path.name,
+            "source_mtime": sig.get("mtime"),
+            "source_size": sig.get("size"),
+        }
+        row.update(aggregate_team_workbook(path))
+        rows.append(row)
+
+    df = pd.DataFrame(rows)
+    out_path = table_path(league, base_dir=base_dir)
+    df.to_excel(out_path, index=False)
+    return out_path, df
+
+
+def build_all(base_dir=OPTA_DIR, log_callback=print):
+    base = Path(base_dir)
+    if not base.is_dir():
+        log_callback(f"[OPTA] {base} not found; nothing to aggregate.")
+        return []
+    written = []
+    for league_dir in sorted(p for p in base.iterdir() if p.is_dir()):
+        out_path, df = build_league_table(league_dir.name, base_dir=base_dir)
+        log_callback(f"  + {out_path} ({len(df)} teams)")
+        written.append(out_path)
+    return written
+
+
+def _league_index(path):
+    df = data_store.cached_table(path)
+    key = os.path.abspath(str(path))
+    hit = _TABLE_INDEX.get(key)
+    if hit is None or hit[0] is not df:
+        index = {}
+        for row in df.to_dict(orient="records"):
+            index[str(row.get("opta_file"))] = {k: (None if pd.isna(v) else v) for k, v in row.items()}
+        hit = (df, index)
+        _TABLE_INDEX[key] = hit
+    return hit[1]
+
+
+def lookup_team(workbook_path, league, base_dir=OPTA_DIR):
+    """
+    Precomputed opta_* aggregates for a team workbook, or None when the league table is
+    missing or was built from an older copy of the workbook.
+    """
+    path = table_path(league, base_dir=base_dir)
+    if not path.exists():
+        return None
+    try:
+        row = _league_index(path).get(Path(workbook_path).name)
+    except Exception:
+        return None
+    if row is None:
+        return None
+
+    sig = data_store.file_signature(workbook_path)
+    if sig is None or sig["size"] != row.get("source_size") or abs(sig["mtime"] - float(row.get("source_mtime") or -1)) > 1e-6:
+        return None
+    return {k: v for k, v in row.items() if k.startswith("opta_") and k != "opta_file"}
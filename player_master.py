@@ -0,0 +1,261 @@
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import data_store
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+ALL_STATS_DIR = "all stats"
+MASTER_BASENAME = "player_master"
+MASTER_VERSION = 1
+
+LEAGUES = ["Premier_League", "La_Liga", "Bundesliga", "Serie_A", "Ligue_1"]
+# FBref player sheets in merge order; Player_Stats is the base every other sheet is joined onto.
+PLAYER_SHEETS = [
+    "Player_Stats",
+    "Shooting",
+    "Passing",
+    "Pass Types",
+    "Goal and Shot Creation",
+    "Defensive Actions",
+    "Possession",
+    "Playing Time",
+    "Miscellaneous Stats",
+    "Advanced Goalkeeping",
+]
+ID_COLUMNS = ["Player", "Nation", "Pos", "Squad"]
+MINUTES_90_COL = "Playing Time_90s"
+PER90_SUFFIX = "_per90"
+# Columns that are already rates/ratios or describe the player rather than count events.
+_RATE_TOKENS = ("Per 90", "%", "/", "90s")
+_META_COLUMNS = {"Rk", "Age", "Born", "Matches", "Playing Time_Min", "Playing Time_MP", "Playing Time_Starts"}
+
+_MASTER_CACHE = {}
+
+
+def _norm(text):
+    text = unicodedata.normalize("NFKD", "" if text is None else str(text))
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+    return re.sub(r"[^0-9a-z]+", "-", text.lower()).strip("-")
+
+
+def player_key(league, player, squad):
+    """Stable key of a player-season row: league/squad/player, accent- and punctuation-insensitive."""
+    return f"{league}/{_norm(squad)}/{_norm(player)}"
+
+
+def is_rate_column(col):
+    """True for columns whose per-90 value is the column itself (rates, %, ratios, bio/meta fields)."""
+    col = str(col)
+    return col in _META_COLUMNS or any(token in col for token in _RATE_TOKENS)
+
+
+def per90_column(col):
+    """Column of the master table holding the per-90 value of `col`."""
+    return col if is_rate_column(col) else f"{col}{PER90_SUFFIX}"
+
+
+def per90_value(frame, idx, col):
+    """
+    Per-90 value of frame.at[idx, col]. Columns left untyped (mixed text/numbers) have no
+    precomputed {col}_per90, so their raw cell is returned as is.
+    """
+    column = per90_column(col)
+    if column not in frame.columns:
+        column = col
+    return float(frame.at[idx, column])
+
+
+def _typed(series):
+    """Numeric, smallest lossless dtype, when every non-blank cell parses as a number; otherwise unchanged."""
+    if series.dtype != object and not pd.api.types.is_string_dtype(series):
+        numeric = series
+    else:
+        numeric = pd.to_numeric(series, errors="coerce")
+        if numeric.notna().sum() != series.notna().sum() or numeric.notna().sum() == 0:
+            return series
+    if not pd.api.types.is_numeric_dtype(numeric) or pd.api.types.is_bool_dtype(numeric):
+        return series
+    values = numeric.to_numpy(dtype=float)
+    finite = values[~np.isnan(values)]
+    if numeric.notna().all() and np.array_equal(finite, np.round(finite)):
+        return pd.to_numeric(numeric, downcast="integer")
+    as32 = values.astype(np.float32)
+    if np.array_equal(as32.astype(float), values, equal_nan=True):
+        return pd.Series(as32, index=series.index, name=series.name)
+    return numeric.astype(float)
+
+
+def _read_player_sheet(xl, sheet):
+    df = pd.read_excel(xl, sheet_name=sheet)
+    if "Player" not in df.columns:
+        return None
+    # FBref repeats its header row inside long tables.
+    df = df[df["Player"].notna() & (df["Player"].astype(str) != "Player")]
+    return df
+
+
+def build_league_frame(league, path):
+    """Deduplicated, typed player rows of one {league}_Stats.xlsx with every player sheet joined on player_key."""
+    columns_by_sheet = {}
+    with pd.ExcelFile(path) as xl:
+        base = None
+        for sheet in PLAYER_SHEETS:
+            if sheet not in xl.sheet_names:
+                continue
+            df = _read_player_sheet(xl, sheet)
+            if df is None or df.empty:
+                continue
+            df = df.copy()
+            df.insert(0, "player_key", [player_key(league, p, s) for p, s in zip(df["Player"], df.get("Squad", ""))])
+            df = df.drop_duplicates(subset=["player_key"], keep="first")
+            if base is None:
+                base = df
+                columns_by_sheet[sheet] = [c for c in df.columns if c != "player_key"]
+                continue
+            new_cols = [c for c in df.columns if c not in base.columns]
+            columns_by_sheet[sheet] = new_cols
+            ids = [c for c in ID_COLUMNS if c in df.columns and c in base.columns]
+            base = base.merge(df[["player_key"] + ids + new_cols], on="player_key", how="outer", suffixes=("", "__sheet"))
+            for col in ids:
+                base[col] = base[col].combine_first(base.pop(f"{col}__sheet"))
+
+    if base is None:
+        return pd.DataFrame(), columns_by_sheet
+    base.insert(1, "League", league)
+    return base.reset_index(drop=True), columns_by_sheet
+
+
+def _add_per90(df):
+    if MINUTES_90_COL not in df.columns:
+        return df
+    minutes = pd.to_numeric(df[MINUTES_90_COL], errors="coerce").to_numpy(dtype=float)
+    played = minutes > 0
+    per90 = {}
+    for col in df.columns:
+        if col in ("player_key", "League") or col in ID_COLUMNS or is_rate_column(col):
+            continue
+        if not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+            continue
+        values = df[col].to_numpy(dtype=float)
+        out = np.zeros(len(df))
+        np.divide(values, minutes, out=out, where=played)
+        per90[f"{col}{PER90_SUFFIX}"] = out
+    return pd.concat([df, pd.DataFrame(per90, index=df.index)], axis=1)
+
+
+def _source_paths(all_stats_dir):
+    return {league: Path(all_stats_dir) / f"{league}_Stats.xlsx" for league in LEAGUES}
+
+
+def _source_signatures(all_stats_dir):
+    return {
+        league: data_store.file_signature(path)
+        for league, path in _source_paths(all_stats_dir).items()
+        if path.exists()
+    }
+
+
+def master_paths(project_root=PROJECT_ROOT):
+    base = Path(project_root) / data_store.STORE_DIRNAME
+    ext = ".parquet" if data_store.parquet_available() else ".pkl"
+    return base / f"{MASTER_BASENAME}{ext}", base / f"{MASTER_BASENAME}.json"
+
+
+def build_master(project_root=PROJECT_ROOT, all_stats_dir=None, log_callback=print):
+    """
+    Build data_store/player_master.parquet (pickle without pyarrow) from all stats/{league}_Stats.xlsx:
+    one row per player_key, numeric columns downcast losslessly and {col}_per90 for every counting stat
+    (0 for players without minutes). A JSON sidecar records the source fingerprints and which sheet
+    each column came from.
+    """
+    all_stats_dir = Path(all_stats_dir or Path(project_root) / ALL_STATS_DIR)
+    frames = []
+    columns_by_sheet = {}
+    for league, path in _source_paths(all_stats_dir).items():
+        if not path.exists():
+            continue
+        df, sheet_cols = build_league_frame(league, path)
+        if df.empty:
+            continue
+        log_callback(f"  + {league}: {len(df)} players")
+        frames.append(df)
+        for sheet, cols in sheet_cols.items():
+            known = columns_by_sheet.setdefault(sheet, [])
+            known.extend(c for c in cols if c not in known)
+
+    master = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+    for col in master.columns:
+        if col not in ("player_key", "League") and col not in ID_COLUMNS:
+            master[col] = _typed(master[col])
+    master = _add_per90(master)
+
+    table_path, meta_path = master_paths(project_root)
+    table_path.parent.mkdir(parents=True, exist_ok=True)
+    if table_path.suffix == ".parquet":
+        data_store._coerce_for_parquet(master).to_parquet(table_path, index=False)
+    else:
+        master.to_pickle(table_path)
+    meta = {
+        "version": MASTER_VERSION,
+        "sources": _source_signatures(all_stats_dir),
+        "columns_by_sheet": columns_by_sheet,
+        "rows": int(len(master)),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    _MASTER_CACHE.pop(str(table_path), None)
+    return table_path, master
+
+
+def _load_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception:
+        return None
+    return meta if meta.get("version") == MASTER_VERSION else None
+
+
+def is_stale(project_root=PROJECT_ROOT, all_stats_dir=None):
+    table_path, meta_path = master_paths(project_root)
+    meta = _load_meta(meta_path)
+    if meta is None or not table_path.exists():
+        return True
+    all_stats_dir = Path(all_stats_dir or Path(project_root) / ALL_STATS_DIR)
+    return meta.get("sources") != _source_signatures(all_stats_dir)
+
+
+def load_master(project_root=PROJECT_ROOT, all_stats_dir=None, rebuild=True):
+    """
+    The player master table (shared frame, do not mutate), rebuilt first when missing or older
+    than the FBref workbooks. Returns (frame, columns_by_sheet).
+    """
+    table_path, meta_path = master_paths(project_root)
+    if is_stale(project_root, all_stats_dir):
+        if not rebuild:
+            return pd.DataFrame(), {}
+        build_master(project_root, all_stats_dir, log_callback=lambda *_: None)
+
+    key = str(table_path)
+    signature = data_store.file_signature(table_path)
+    hit = _MASTER_CACHE.get(key)
+    if hit is None or hit[0] != signature:
+        if table_path.suffix == ".parquet":
+            frame = pd.read_parquet(table_path)
+        else:
+            frame = pd.read_pickle(table_path)
+        hit = (signature, frame, (_load_meta(meta_path) or {}).get("columns_by_sheet", {}))
+        _MASTER_CACHE[key] = hit
+    return hit[1], hit[2]
+
+
+def league_players(league, project_root=PROJECT_ROOT, all_stats_dir=None):
+    master, _ = load_master(project_root, all_stats_dir)
+    if master.empty:
+        return master
+    return master[master["League"] == league]
@@ -0,0 +1,170 @@
+import difflib
+import re
+import unicodedata
+
+NGRAM = 3
+MIN_TOKEN_LEN = 3
+# Lineup scoring: a whole-name containment, each shared surname/forename token and a matching
+# last token; anything below MIN_LINEUP_SCORE is not the same player.
+CONTAINS_SCORE = 20
+LAST_TOKEN_SCORE = 8
+MIN_LINEUP_SCORE = 6
+FUZZY_CUTOFF = 0.6
+INDEX_CACHE_SIZE = 256
+
+_INDEX_CACHE = {}
+
+
+def normalize_name(text):
+    """Accent-, case- and punctuation-insensitive form of a name ("Kylian Mbappé" -> "kylian mbappe")."""
+    text = "" if text is None else str(text)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+    text = re.sub(r"[^0-9a-zA-Z\s]", " ", text).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def _ngrams(text):
+    return {text[i : i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def lineup_score(target, candidate):
+    """Lineup match score of a normalized context name against a normalized squad name."""
+    if not target or not candidate:
+        return 0
+    tokens = [t for t in target.split() if len(t) >= MIN_TOKEN_LEN]
+    score = 0
+    if target in candidate or candidate in target:
+        score += CONTAINS_SCORE
+    for token in tokens:
+        if token in candidate:
+            score += len(token)
+    if tokens and candidate.endswith(tokens[-1]):
+        score += LAST_TOKEN_SCORE
+    return score
+
+
+class PlayerNameIndex:
+    """
+    Name index of one squad: normalized full names, surnames, name tokens and character
+    3-gram postings over row positions, plus a cache of every context name already resolved.
+    Lookups only score the rows sharing a 3-gram with the query and return row positions;
+    ties are broken by priority, then squad order, so results are deterministic.
+    """
+
+    def __init__(self, names, priorities=None):
+        self.names = ["" if name is None else str(name) for name in names]
+        self.keys = [normalize_name(name) for name in self.names]
+        self.lowered = [name.lower() for name in self.names]
+        self.priorities = [float(p) for p in priorities] if priorities is not None else [0.0] * len(self.keys)
+
+        self.by_key = {}
+        self.by_surname = {}
+        self.by_token = {}
+        self.by_ngram = {}
+        self.short = []
+        for pos, key in enumerate(self.keys):
+            if not key:
+                continue
+            self.by_key.setdefault(key, []).append(pos)
+            tokens = key.split()
+            self.by_surname.setdefault(tokens[-1], []).append(pos)
+            for token in set(tokens):
+                self.by_token.setdefault(token, []).append(pos)
+            if len(key) < NGRAM:
+                self.short.append(pos)
+            for gram in _ngrams(key):
+                self.by_ngram.setdefault(gram, []).append(pos)
+        self._lineup_cache = {}
+        self._find_cache = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def candidates(self, key):
+        """Row positions that can contain, be contained in or share a token with `key` (squad order)."""
+        if len(key) < NGRAM:
+            return [pos for pos, name in enumerate(self.keys) if name]
+        hits = set(self.short)
+        for gram in _ngrams(key):
+            hits.update(self.by_ngram.get(gram, ()))
+        return sorted(hits)
+
+    def _ranked(self, target):
+        hit = self._lineup_cache.get(target)
+        if hit is None:
+            exact = sorted(self.by_key.get(target, []), key=lambda pos: -self.priorities[pos])
+            scored = []
+            for pos in self.candidates(target):
+                score = lineup_score(target, self.keys[pos])
+                if score >= MIN_LINEUP_SCORE:
+                    scored.append((-score, -self.priorities[pos], pos))
+            hit = (exact, [pos for _, _, pos in sorted(scored)])
+            self._lineup_cache[target] = hit
+        return hit
+
+    def match_lineup_name(self, name, used=()):
+        """
+        Row position of a confirmed-lineup name, skipping positions in `used`: an exact normalized
+        match first (highest priority), otherwise the best lineup_score >= MIN_LINEUP_SCORE.
+        """
+        target = normalize_name(name)
+        if not target:
+            return None
+        exact, ranked = self._ranked(target)
+        for pos in exact:
+            if pos not in used:
+                return pos
+        for pos in ranked:
+            if pos not in used:
+                return pos
+        return None
+
+    def find(self, name):
+        """
+        Row position of a free-text player name (e.g. a missing-players list): the first squad
+        row whose full name, surname or a name token equals it, then the first row containing it,
+        otherwise the closest name by difflib ratio (>= FUZZY_CUTOFF).
+        """
+        query = normalize_name(name)
+        if not query:
+            return None
+        if query in self._find_cache:
+            return self._find_cache[query]
+
+        for postings in (self.by_key, self.by_surname, self.by_token):
+            if query in postings:
+                self._find_cache[query] = postings[query][0]
+                return postings[query][0]
+
+        pool = self.candidates(query)
+        found = next((pos for pos in pool if query in self.keys[pos]), None)
+        if found is None:
+            lowered = str(name).strip().lower()
+            best = FUZZY_CUTOFF
+            matcher = difflib.SequenceMatcher()
+            matcher.set_seq2(lowered)
+            for pos in pool:
+                matcher.set_seq1(self.lowered[pos])
+                if matcher.real_quick_ratio() < best or matcher.quick_ratio() < best:
+                    continue
+                ratio = matcher.ratio()
+                if ratio > best or (ratio == best and found is None):
+                    best, found = ratio, pos
+        self._find_cache[query] = found
+        return found
+
+
+def squad_index(names, priorities=None):
+    """Shared PlayerNameIndex of a squad, reused (with its resolved-name cache) while the squad is unchanged."""
+    names = tuple("" if name is None else str(name) for name in names)
+    priorities = tuple(float(p) for p in priorities) if priorities is not None else None
+    key = (names, priorities)
+    index = _INDEX_CACHE.get(key)
+    if index is None:
+        if len(_INDEX_CACHE) >= INDEX_CACHE_SIZE:
+            _INDEX_CACHE.pop(next(iter(_INDEX_CACHE)))
+        index = PlayerNameIndex(names, priorities)
+        _INDEX_CACHE[key] = index
+    return index
@@ -0,0 +1,315 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import analyze_match
+import data_store
+import team_registry
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_POLL_SECONDS = 2.0
+MAX_BODY_BYTES = 1 << 20
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+# JSON body fields of POST /predict (predict_match keywords).
+PREDICT_FIELDS = ("home", "away", "match_context", "target_score", "target_step", "simulation_iterations")
+
+
+def predict_match(
+    home,
+    away,
+    match_context=None,
+    target_score=None,
+    target_step=analyze_match.TARGET_SHIFT_STEP,
+    simulation_iterations=0,
+):
+    """
+    Core predictions and tactical scenarios of one fixture, shaped like the matching fields of
+    latest_prediction.json. match_context is the match_context.txt text itself (used as given,
+    no SofaScore widget expansion); simulation_iterations=0 keeps v9's 1X2 and scores analytic.
+    """
+    home = str(home).strip()
+    away = str(away).strip()
+    home_league = analyze_match.find_team_league(home)
+    away_league = analyze_match.find_team_league(away)
+    stats_league = home_league or away_league or "Premier_League"
+
+    context_text = str(match_context).strip() if match_context else ""
+    context_text = context_text or analyze_match.NO_LIVE_CONTEXT
+    context_league = str(analyze_match._parse_context_headers(context_text).get("league") or "").strip()
+    league = context_league or stats_league
+    qc_flags, context_header = analyze_match.run_data_qc(home, away, league, context_text, home_league, away_league)
+
+    home_prog = analyze_match.get_progression_stats(home, stats_league)
+    away_prog = analyze_match.get_progression_stats(away, stats_league)
+    home_flow = analyze_match.get_game_flow_stats(home, league)
+    away_flow = analyze_match.get_game_flow_stats(away, league)
+    core_bundle = analyze_match._resolve_core_predictions(
+        home=home,
+        away=away,
+        stats_league=stats_league,
+        home_sim_stats=analyze_match.get_simulation_stats(home, stats_league),
+        away_sim_stats=analyze_match.get_simulation_stats(away, stats_league),
+        home_prog=home_prog,
+        away_prog=away_prog,
+        context_text=context_text,
+        home_flow=home_flow,
+        away_flow=away_flow,
+        simulation_iterations=simulation_iterations,
+    )
+    sim = core_bundle["selected_sim"]
+    model_core_context = core_bundle["model_core_context"]
+    result_1x2, score_aligned, aligned_prob, result_from_score = analyze_match._headline_prediction(sim)
+
+    home_top_rated, _ = analyze_match.get_top_players(home, league, top_n=3)
+    away_top_rated, _ = analyze_match.get_top_players(away, league, top_n=3)
+    tactical_scenarios = analyze_match.build_tactical_scenario_report(
+        home_team=home,
+        away_team=away,
+        sim=sim,
+        home_flow=home_flow,
+        away_flow=away_flow,
+        home_squad=analyze_match.get_squad_stats(home, league),
+        away_squad=analyze_match.get_squad_stats(away, league),
+        home_prog=home_prog,
+        away_prog=away_prog,
+        home_top_rated=home_top_rated,
+        away_top_rated=away_top_rated,
+        max_scenarios=6,
+    )
+
+    return {
+        "Match": f"{home} vs {away}",
+        "League": league,
+        "Home_Team": home,
+        "Away_Team": away,
+        "Pred_Home_Win": float(sim["home_win_prob"]),
+        "Pred_Draw": float(sim["draw_prob"]),
+        "Pred_Away_Win": float(sim["away_win_prob"]),
+        "Pred_Score": score_aligned,
+        "Pred_Result": result_from_score or result_1x2,
+        "Pred_Score_Unconditional": sim.get("most_likely_score", "1-1"),
+        "Pred_Result_1X2": result_1x2,
+        "Pred_Aligned_Score_Prob": float(aligned_prob * 100.0),
+        "Expected_Goals_Home": float(sim.get("expected_goals_home", 0.0)),
+        "Expected_Goals_Away": float(sim.get("expected_goals_away", 0.0)),
+        "Target_Score_Input": target_score,
+        "Target_Score_Analysis": analyze_match._target_score_analysis(home, away, sim, target_score, step=target_step),
+        "Model_Version": sim.get("model_version", "unknown"),
+        "Model_Core": model_core_context.get("active_core", "v9"),
+        "Model_Core_Context": model_core_context,
+        "QC_Flags": qc_flags,
+        "Context_Header": context_header,
+        "Tactical_Scenarios": tactical_scenarios,
+        "Calibration_Context": sim.get("calibration_context", {}),
+        "Lineup_Context": sim.get("lineup_context", {}),
+        "Fatigue_Context": sim.get("fatigue_context", {}),
+        "Monte_Carlo": sim.get("monte_carlo") if sim.get("model_version") == "v9" else None,
+    }
+
+
+class PredictionService:
+    """
+    Long-running predictor with every dataset it has touched kept resident (data_store resident
+    mode, plus the match log / squad / calibration caches built on it). Predictions run one at a
+    time on a single thread that owns those caches; a watcher re-parses changed files on a second
+    thread and installs them on the prediction thread between two requests, so a request never
+    pays for a reload and never sees half of one. `generation` counts installed reloads.
+    """
+
+    def __init__(self, poll_seconds=DEFAULT_POLL_SECONDS, project_root=PROJECT_ROOT):
+        self.poll_seconds = float(poll_seconds)
+        self.project_root = project_root
+        self.generation = 0
+        self.reloaded_tables = 0
+        self.reloaded_at = None
+        self.started_at = time.time()
+        self._pending = {}
+        self._predictor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict")
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reload")
+        data_store.set_resident(True)
+
+    def close(self):
+        self._predictor.shutdown(wait=True)
+        self._loader.shutdown(wait=True)
+        data_store.set_resident(False)
+
+    def _predict(self, request):
+        record = predict_match(**request)
+        record["Data_Generation"] = self.generation
+        return record
+
+    def _install(self, entries):
+        data_store.install_tables(entries)
+        # Refreshed data may add or rename team files; the registry only rescans when asked.
+        team_registry.get_registry(self.project_root, reload=True)
+        self.generation += 1
+        self.reloaded_tables += len(entries)
+        self.reloaded_at = time.time()
+
+    def warm(self, fixtures):
+        """Predict each fixture once (dicts with home/away, e.g. from analyze_match.load_fixtures) to load its data."""
+        for fixture in fixtures:
+            try:
+                self._predictor.submit(self._predict, {"home": fixture["home"], "away": fixture["away"]}).result()
+            except Exception as ex:
+                print(f"[Warning] Warm-up failed for {fixture['home']} vs {fixture['away']}: {ex}")
+
+    async def predict(self, request):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._predictor, self._predict, request)
+
+    async def refresh(self, settle=True):
+        """
+        Reload the resident tables whose files changed and swap them in; returns how many were
+        installed. With settle=True a file is only reloaded once its size/mtime held still for a
+        whole poll, so a workbook the pipeline is still writing is not picked up half-written.
+        """
+        loop = asyncio.get_running_loop()
+        stale = await loop.run_in_executor(self._loader, data_store.stale_tables)
+        if settle:
+            ready = [key for key, sig in stale.items() if self._pending.get(key) == sig]
+        else:
+            ready = list(stale)
+        self._pending = {key: sig for key, sig in stale.items() if key not in ready}
+        if not ready:
+            return 0
+        entries = await loop.run_in_executor(self._loader, data_store.load_tables, ready, self.project_root)
+        if not entries:
+            return 0
+        await loop.run_in_executor(self._predictor, self._install, entries)
+        print(f"[Info] Reloaded {len(entries)} table(s); data generation {self.generation}.")
+        return len(entries)
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.refresh()
+            except Exception as ex:
+                print(f"[Warning] Data reload failed: {ex}")
+
+    def status(self):
+        return {
+            "status": "ok",
+            "data_generation": self.generation,
+            "reloaded_tables": self.reloaded_tables,
+            "reloaded_at": self.reloaded_at,
+            "pending_reloads": len(self._pending),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+        }
+
+    async def dispatch(self, method, path, body):
+        """(HTTP status, JSON payload) of one request."""
+        if path == "/health":
+            return 200, self.status()
+        if path == "/reload":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            installed = await self.refresh(settle=False)
+            return 200, dict(self.status(), installed=installed)
+        if path != "/predict":
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        try:
+            payload = json.loads(body.decode("utf-8") or "{}")
+        except (UnicodeDecodeError, ValueError) as ex:
+            return 400, {"error": f"invalid JSON body: {ex}"}
+        if not isinstance(payload, dict) or not payload.get("home") or not payload.get("away"):
+            return 400, {"error": "body needs home and away"}
+        request = {field: payload[field] for field in PREDICT_FIELDS if payload.get(field) is not None}
+        try:
+            return 200, await self.predict(request)
+        except Exception as ex:
+            return 500, {"error": str(ex), "Match": f"{payload['home']} vs {payload['away']}"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                if body is None:
+                    status, payload = 413, {"error": f"body over {MAX_BODY_BYTES} bytes"}
+                else:
+                    status, payload = await self.dispatch(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close" and body is not None
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        watcher = asyncio.create_task(self.watch())
+        print(f"[Info] Prediction service on http://{host}:{port} (POST /predict, GET /health, POST /reload)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+async def _read_request(reader):
+    """(method, path, headers, body) of the next HTTP/1.1 request, None at EOF; body is None when too large."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    path = target.split("?", 1)[0]
+    if length > MAX_BODY_BYTES:
+        return method.upper(), path, headers, None
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+
+def _response(status, payload, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def run(host=DEFAULT_HOST, port=DEFAULT_PORT, poll_seconds=DEFAULT_POLL_SECONDS, warm_fixtures=None):
+    os.chdir(PROJECT_ROOT)
+    service = PredictionService(poll_seconds=poll_seconds)
+    try:
+        if warm_fixtures:
+            started = time.perf_counter()
+            service.warm(warm_fixtures)
+            print(f"[Info] Warmed {len(warm_fixtures)} fixture(s) in {time.perf_counter() - started:.1f}s")
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
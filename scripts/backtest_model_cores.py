@@ -3,6 +3,7 @@ import json
 import math
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 import pandas as pd
@@ -12,6 +13,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 import analyze_match
+import feature_store
 
 
 def _safe_float(value, default=0.0):
@@ -93,23 +95,40 @@ def _evaluate_one(sim, actual_score_pair):
     }
 
 
-def _aggregate(records):
-    if not records:
-        return {"n_matches": 0}
+METRIC_KEYS = ["brier_1x2", "log_loss_1x2", "calibration_gap", "score_mae"]
+MODEL_NAMES = ["v9", "demo_v2", "hybrid"]
 
-    def _mean(key):
-        vals = [r[key] for r in records if r.get(key) is not None]
-        if not vals:
-            return None
-        return float(sum(vals) / len(vals))
 
-    return {
-        "n_matches": int(len(records)),
-        "brier_1x2": round(_mean("brier_1x2"), 4) if _mean("brier_1x2") is not None else None,
-        "log_loss_1x2": round(_mean("log_loss_1x2"), 4) if _mean("log_loss_1x2") is not None else None,
-        "calibration_gap": round(_mean("calibration_gap"), 4) if _mean("calibration_gap") is not None else None,
-        "score_mae": round(_mean("score_mae"), 4) if _mean("score_mae") is not None else None,
-    }
+class RollingAggregate:
+    """Running per-metric sums and counts; summary() equals averaging every record seen so far."""
+
+    def __init__(self):
+        self.n_matches = 0
+        self.sums = {key: 0.0 for key in METRIC_KEYS}
+        self.counts = {key: 0 for key in METRIC_KEYS}
+
+    def add(self, record):
+        self.n_matches += 1
+        for key in METRIC_KEYS:
+            value = record.get(key)
+            if value is not None:
+                self.sums[key] += value
+                self.counts[key] += 1
+
+    def summary(self):
+        if not self.n_matches:
+            return {"n_matches": 0}
+        out = {"n_matches": int(self.n_matches)}
+        for key in METRIC_KEYS:
+            out[key] = round(float(self.sums[key] / self.counts[key]), 4) if self.counts[key] else None
+        return out
+
+
+def _aggregate(records):
+    rolling = RollingAggregate()
+    for record in records:
+        rolling.add(record)
+    return rolling.summary()
 
 
 def _resolve_fixture_row(row):
@@ -119,7 +138,7 @@ def _resolve_fixture_row(row):
     return home, away, league
 
 
-def run_backtest(tracker_path, output_json, max_rows=None):
+def _load_completed_rows(tracker_path, max_rows=None):
     df = pd.read_excel(tracker_path, sheet_name="Predictions", engine="openpyxl")
     if "Actual_Score" not in df.columns:
         raise RuntimeError("Predictions sheet missing Actual_Score column.")
@@ -132,10 +151,42 @@ def run_backtest(tracker_path, output_json, max_rows=None):
     done = done.sort_values(by="__date", kind="stable").reset_index(drop=True)
     if max_rows is not None and max_rows > 0:
         done = done.tail(int(max_rows)).reset_index(drop=True)
+    return done
 
-    records_by_model = {"v9": [], "demo_v2": [], "hybrid": []}
-    rolling_rows = []
 
+def _team_inputs(team, stats_league, model_league, snapshot, as_of=None, store=None):
+    key = (team, stats_league, model_league)
+    if key not in snapshot:
+        snapshot[key] = {
+            "sim_stats": analyze_match.get_simulation_stats(team, stats_league),
+            "prog": analyze_match.get_progression_stats(team, stats_league),
+            "flow": analyze_match.get_game_flow_stats(team, model_league),
+        }
+    if as_of is None or store is None:
+        return snapshot[key]
+
+    # Goals per game from the Match Logs played before the fixture replace the season totals.
+    timeline = store.timeline(stats_league, team)
+    season = timeline.season_to_date(as_of) if timeline is not None else {"games": 0}
+    sim_stats = None
+    if season["games"]:
+        sim_stats = {
+            "goals_scored_per_game": season["goals_for_per_game"],
+            "goals_conceded_per_game": season["goals_against_per_game"],
+        }
+    return dict(snapshot[key], sim_stats=sim_stats)
+
+
+def _build_fixture_tasks(done, point_in_time=True):
+    """
+    One task per scorable tracker row with every model input resolved from a single preloaded
+    snapshot: team leagues and per-team stats are read once per team, not once per fixture.
+    With point_in_time, dated rows use feature_store features as of the fixture day.
+    """
+    leagues = {}
+    snapshot = {}
+    store = feature_store.FeatureStore() if point_in_time else None
+    tasks = []
     for i, row in done.iterrows():
         actual_score = _parse_score(row.get("Actual_Score"))
         if actual_score is None:
@@ -145,65 +196,105 @@ def run_backtest(tracker_path, output_json, max_rows=None):
         if not home or not away:
             continue
 
-        stats_league = analyze_match.find_team_league(home) or analyze_match.find_team_league(away) or "Premier_League"
+        for team in (home, away):
+            if team not in leagues:
+                leagues[team] = analyze_match.find_team_league(team)
+        stats_league = leagues[home] or leagues[away] or "Premier_League"
         model_league = league or stats_league
+        as_of = row.get("__date") if point_in_time and pd.notna(row.get("__date")) else None
+        home_inputs = _team_inputs(home, stats_league, model_league, snapshot, as_of=as_of, store=store)
+        away_inputs = _team_inputs(away, stats_league, model_league, snapshot, as_of=as_of, store=store)
 
-        home_sim_stats = analyze_match.get_simulation_stats(home, stats_league)
-        away_sim_stats = analyze_match.get_simulation_stats(away, stats_league)
-        home_prog = analyze_match.get_progression_stats(home, stats_league)
-        away_prog = analyze_match.get_progression_stats(away, stats_league)
-        home_flow = analyze_match.get_game_flow_stats(home, model_league)
-        away_flow = analyze_match.get_game_flow_stats(away, model_league)
-
-        bundle = analyze_match._resolve_core_predictions(
-            home=home,
-            away=away,
-            stats_league=stats_league,
-            home_sim_stats=home_sim_stats,
-            away_sim_stats=away_sim_stats,
-            home_prog=home_prog,
-            away_prog=away_prog,
-            context_text="",
-            home_flow=home_flow,
-            away_flow=away_flow,
+        tasks.append(
+            {
+                "index": int(i + 1),
+                "date": str(row.get("Date") or ""),
+                "home": home,
+                "away": away,
+                "stats_league": stats_league,
+                "as_of": as_of,
+                "actual_score": actual_score,
+                "home_inputs": home_inputs,
+                "away_inputs": away_inputs,
+            }
         )
+    return tasks
+
+
+def _evaluate_fixture(task):
+    """Metrics of every model core on one fixture ({model: metrics or None})."""
+    home_inputs = task["home_inputs"]
+    away_inputs = task["away_inputs"]
+    bundle = analyze_match._resolve_core_predictions(
+        home=task["home"],
+        away=task["away"],
+        stats_league=task["stats_league"],
+        home_sim_stats=home_inputs["sim_stats"],
+        away_sim_stats=away_inputs["sim_stats"],
+        home_prog=home_inputs["prog"],
+        away_prog=away_inputs["prog"],
+        context_text="",
+        home_flow=home_inputs["flow"],
+        away_flow=away_inputs["flow"],
+        # Only 1X2 and the most likely score are scored, so the per-fixture Monte Carlo is skipped.
+        simulation_iterations=0,
+        as_of=task["as_of"],
+    )
 
-        sim_v9 = bundle.get("v9_sim")
-        sim_hybrid = bundle.get("hybrid_sim")
-        sim_demo = analyze_match._demo_v2_to_sim_result(bundle.get("demo_v2_shadow"), sim_v9=sim_v9)
+    sim_v9 = bundle.get("v9_sim")
+    sim_hybrid = bundle.get("hybrid_sim")
+    sim_demo = analyze_match._demo_v2_to_sim_result(bundle.get("demo_v2_shadow"), sim_v9=sim_v9)
 
-        model_sims = {
-            "v9": sim_v9,
-            "demo_v2": sim_demo,
-            "hybrid": sim_hybrid,
-        }
-        for model_name, sim in model_sims.items():
-            metrics = _evaluate_one(sim, actual_score)
+    model_sims = {
+        "v9": sim_v9,
+        "demo_v2": sim_demo,
+        "hybrid": sim_hybrid,
+    }
+    return {model_name: _evaluate_one(sim, task["actual_score"]) for model_name, sim in model_sims.items()}
+
+
+def _init_worker(project_root):
+    # Workers resolve every data path relative to the project root; with fork they also inherit the
+    # parent's warmed data_store / match_log caches.
+    os.chdir(project_root)
+
+
+def _run_fixtures(tasks, workers=None):
+    workers = int(workers or os.cpu_count() or 1)
+    if workers <= 1 or len(tasks) <= 1:
+        return [_evaluate_fixture(task) for task in tasks]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)), initializer=_init_worker, initargs=(PROJECT_ROOT,)
+    ) as pool:
+        return list(pool.map(_evaluate_fixture, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def run_backtest(tracker_path, output_json, max_rows=None, workers=None, point_in_time=True):
+    done = _load_completed_rows(tracker_path, max_rows=max_rows)
+    tasks = _build_fixture_tasks(done, point_in_time=point_in_time)
+    results = _run_fixtures(tasks, workers=workers)
+
+    rolling = {model_name: RollingAggregate() for model_name in MODEL_NAMES}
+    rolling_rows = []
+    for task, metrics_by_model in zip(tasks, results):
+        match = f"{task['home']} vs {task['away']}"
+        for model_name in MODEL_NAMES:
+            metrics = metrics_by_model.get(model_name)
             if metrics is not None:
-                rec = {"date": str(row.get("Date") or ""), "match": f"{home} vs {away}"}
+                rec = {"date": task["date"], "match": match}
                 rec.update(metrics)
-                records_by_model[model_name].append(rec)
+                rolling[model_name].add(rec)
 
-        rolling_rows.append(
-            {
-                "index": int(i + 1),
-                "date": str(row.get("Date") or ""),
-                "match": f"{home} vs {away}",
-                "v9": _aggregate(records_by_model["v9"]),
-                "demo_v2": _aggregate(records_by_model["demo_v2"]),
-                "hybrid": _aggregate(records_by_model["hybrid"]),
-            }
-        )
+        row = {"index": task["index"], "date": task["date"], "match": match}
+        row.update({model_name: rolling[model_name].summary() for model_name in MODEL_NAMES})
+        rolling_rows.append(row)
 
     payload = {
         "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "tracker_path": tracker_path,
         "rows_evaluated": int(len(rolling_rows)),
-        "overall": {
-            "v9": _aggregate(records_by_model["v9"]),
-            "demo_v2": _aggregate(records_by_model["demo_v2"]),
-            "hybrid": _aggregate(records_by_model["hybrid"]),
-        },
+        "point_in_time": bool(point_in_time),
+        "overall": {model_name: rolling[model_name].summary() for model_name in MODEL_NAMES},
         "rolling_origin": rolling_rows,
     }
 
@@ -226,12 +317,25 @@ def main():
         default=None,
         help="Optional limit to evaluate latest N completed matches only.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for the fixtures (default: one per CPU; 1 runs in-process).",
+    )
+    parser.add_argument(
+        "--live-features",
+        action="store_true",
+        help="Score every fixture with today's data files instead of point-in-time Match Logs features.",
+    )
     args = parser.parse_args()
 
     report = run_backtest(
         tracker_path=args.tracker,
         output_json=args.output,
         max_rows=args.max_rows,
+        workers=args.workers,
+        point_in_time=not args.live_features,
     )
     overall = report.get("overall", {})
     print("[Info] Rolling-origin backtest complete.")
@@ -0,0 +1,39 @@
+import argparse
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import data_store
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compile scraper Excel outputs into the columnar data store used by the prediction path."
+    )
+    parser.add_argument(
+        "--source",
+        action="append",
+        choices=sorted(data_store.STORE_SOURCES.keys()),
+        help="Only compile this source (repeatable). Default: all sources.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompile every workbook even if the stored copy is current.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    summary = data_store.build_store(
+        project_root=PROJECT_ROOT,
+        sources=args.source,
+        force=args.force,
+        log_callback=print,
+    )
+    raise SystemExit(1 if summary.get("failed") else 0)
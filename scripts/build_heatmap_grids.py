@@ -0,0 +1,35 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import heatmap_grids
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Rasterize scraped heatmap points into data_store/heatmaps/{league}.npy player grids."
+    )
+    parser.add_argument(
+        "--league",
+        action="append",
+        help="Only rebuild this league (repeatable). Default: every league folder in scripts/heatmap.",
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild even when the heatmap workbooks are unchanged.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.chdir(PROJECT_ROOT)
+    if args.league:
+        for league in args.league:
+            out_path = heatmap_grids.build_league(league, force=args.force)
+            print(f"  + {out_path}" if out_path else f"  = {league} (unchanged)")
+    else:
+        heatmap_grids.build_all(force=args.force)
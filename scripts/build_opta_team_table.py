@@ -0,0 +1,34 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import opta_aggregates
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Build output_opta/{league}_Team_Aggregates.xlsx (one row of opta_* aggregates per team)."
+    )
+    parser.add_argument(
+        "--league",
+        action="append",
+        help="Only rebuild this league (repeatable). Default: every league folder in output_opta.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.chdir(PROJECT_ROOT)
+    if args.league:
+        for league in args.league:
+            out_path, df = opta_aggregates.build_league_table(league)
+            print(f"  + {out_path} ({len(df)} teams)")
+    else:
+        opta_aggregates.build_all()
@@ -0,0 +1,20 @@
+import os
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import player_master
+
+
+if __name__ == "__main__":
+    os.chdir(PROJECT_ROOT)
+    force = "--force" in sys.argv[1:]
+    if not force and not player_master.is_stale():
+        print("[PlayerMaster] all stats workbooks unchanged; nothing to rebuild.")
+    else:
+        table_path, master = player_master.build_master()
+        print(f"[PlayerMaster] {table_path} ({len(master)} players, {len(master.columns)} columns)")
@@ -1,3 +1,4 @@
+import argparse
 import glob
 import os
 from pathlib import Path
@@ -36,10 +37,24 @@ def calculate_metrics(df):
     return df
 
 
-def main():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build game flow/{league}_GameFlow.xlsx from SofaScore team stats.")
+    parser.add_argument(
+        "--league",
+        action="append",
+        help="Only rebuild this league (repeatable). Default: every *_Team_Stats.xlsx in sofascore_team_data.",
+    )
+    return parser.parse_args()
+
+
+def main(leagues=None):
     DEST_DIR.mkdir(parents=True, exist_ok=True)
 
-    files = glob.glob(os.path.join(str(SOURCE_DIR), "*_Team_Stats.xlsx"))
+    if leagues:
+        files = [str(SOURCE_DIR / f"{league}_Team_Stats.xlsx") for league in leagues]
+        files = [f for f in files if os.path.exists(f)]
+    else:
+        files = glob.glob(os.path.join(str(SOURCE_DIR), "*_Team_Stats.xlsx"))
     print(f"Found {len(files)} files.")
 
     for file_path in files:
@@ -93,4 +108,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_args().league)
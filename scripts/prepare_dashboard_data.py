@@ -1,11 +1,17 @@
 import pandas as pd
 import json
 import os
+import sys
 import numpy as np
 from pathlib import Path
 
 # Base paths
 BASE_DIR = str(Path(__file__).resolve().parent.parent)
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import player_master
+
 SOFASCORE_DIR = os.path.join(BASE_DIR, "sofascore_team_data")
 GAMEFLOW_DIR = os.path.join(BASE_DIR, "game flow")
 ALL_STATS_DIR = os.path.join(BASE_DIR, "all stats")
@@ -114,37 +120,19 @@ def load_player_data():
         'Goal and Shot Creation'
     ]
     
+    # Typed, deduplicated FBref player rows with per-90 columns (rebuilt when the workbooks change).
+    master, columns_by_sheet = player_master.load_master(project_root=BASE_DIR)
+    player_cols = []
+    for sheet in SHEETS_OF_INTEREST:
+        player_cols.extend(c for c in columns_by_sheet.get(sheet, []) if c not in player_cols)
+
     for league_key, league_name in LEAGUES.items():
         print(f"Processing Player Data for {league_name}...")
-        path = os.path.join(ALL_STATS_DIR, f"{league_key}_Stats.xlsx")
-        
-        if not os.path.exists(path):
+        if master.empty:
             continue
-            
-        # Read all sheets
-        xl = pd.ExcelFile(path)
-        
-        base_df = None
-        
-        for sheet in SHEETS_OF_INTEREST:
-            if sheet not in xl.sheet_names:
-                continue
-            
-            df = pd.read_excel(path, sheet_name=sheet)
-            
-            # Common keys for merging
-            merge_keys = ['Player', 'Squad', 'Nation', 'Pos']
-            # Filter to available keys
-            merge_keys = [k for k in merge_keys if k in df.columns]
-            
-            if base_df is None:
-                base_df = df
-            else:
-                # Drop columns that are already in base_df to avoid _x _y suffixes, except merge keys
-                cols_to_use = merge_keys + [c for c in df.columns if c not in base_df.columns]
-                base_df = pd.merge(base_df, df[cols_to_use], on=merge_keys, how='outer')
-
-        if base_df is None or base_df.empty:
+        league_df = master[master["League"] == league_key]
+        base_df = league_df[[c for c in player_cols if c in league_df.columns]]
+        if base_df.empty:
             continue
 
         # Calculate Percentiles for Radar Charts
@@ -155,7 +143,7 @@ def load_player_data():
         # Clean column names for usage
         # FBRef cols often have headers like 'Per 90 Minutes_Gls'.
         
-        for _, row in base_df.iterrows():
+        for idx, row in base_df.iterrows():
             if pd.isna(row.get('Player')): continue
             
             player_entry = {
@@ -177,9 +165,10 @@ def load_player_data():
                 # key cleaning
                 key = col.replace(' ', '_').replace('+', '_plus_').replace('-', '_')
                 
+                per90 = player_master.per90_value(league_df, idx, col)
                 player_entry["metrics"][key] = {
                     "raw": float(val),
-                    "per90": float(val) / float(player_entry["minutes90s"]) if player_entry["minutes90s"] > 0 and 'Per 90' not in col else float(val)
+                    "per90": per90
                 }
                 
                 # Mapping for app.js Radar
@@ -227,10 +216,7 @@ def load_player_data():
                     if target not in player_entry["metrics"]:
                          player_entry["metrics"][target] = {}
                     player_entry["metrics"][target]["raw"] = float(val)
-                    if 'Per 90' not in col:
-                        player_entry["metrics"][target]["per90"] = float(val) / player_entry["minutes90s"] if player_entry["minutes90s"] > 0 else 0
-                    else:
-                        player_entry["metrics"][target]["per90"] = float(val)
+                    player_entry["metrics"][target]["per90"] = per90
 
             all_players.append(player_entry)
 
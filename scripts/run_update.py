@@ -22,7 +22,15 @@ def get_missing_scripts(steps=None, project_root=PROJECT_ROOT):
     return main_pipeline.get_missing_scripts(steps=steps, project_root=project_root)
 
 
-def run_scripts(continue_on_error=False, dry_run=False, preflight_only=False, include_active=False):
+def run_scripts(
+    continue_on_error=False,
+    dry_run=False,
+    preflight_only=False,
+    include_active=False,
+    workers=main_pipeline.DEFAULT_PIPELINE_WORKERS,
+    incremental=True,
+    skip_scrapers=False,
+):
     return main_pipeline.run_pipeline(
         continue_on_error=continue_on_error,
         dry_run=dry_run,
@@ -30,6 +38,9 @@ def run_scripts(continue_on_error=False, dry_run=False, preflight_only=False, in
         include_active=include_active,
         project_root=PROJECT_ROOT,
         log_callback=print,
+        workers=workers,
+        incremental=incremental,
+        skip_scrapers=skip_scrapers,
     )
 
 
@@ -55,6 +66,22 @@ def parse_args():
         action="store_true",
         help="Run derived/converted ACTIVE scripts after RAW scraping.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=main_pipeline.DEFAULT_PIPELINE_WORKERS,
+        help="Steps run at once when their inputs are ready (1 = sequential).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run every transform even when its inputs, outputs and code are unchanged.",
+    )
+    parser.add_argument(
+        "--skip-scrapers",
+        action="store_true",
+        help="Only refresh the transforms from the data already on disk.",
+    )
     return parser.parse_args()
 
 
@@ -66,5 +93,8 @@ if __name__ == "__main__":
             dry_run=args.dry_run,
             preflight_only=args.preflight_only,
             include_active=args.include_active,
+            workers=args.workers,
+            incremental=not args.force,
+            skip_scrapers=args.skip_scrapers,
         )
     )
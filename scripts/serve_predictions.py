@@ -0,0 +1,33 @@
+import argparse
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import analyze_match
+import prediction_service
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Local prediction service: data stays in memory and is hot-reloaded when the pipeline rewrites it."
+    )
+    parser.add_argument("--host", default=prediction_service.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=prediction_service.DEFAULT_PORT)
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=prediction_service.DEFAULT_POLL_SECONDS,
+        help="Seconds between data file change checks.",
+    )
+    parser.add_argument("--warm", help="Fixtures CSV (as for analyze_match.py --fixtures) to load before serving.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    fixtures = analyze_match.load_fixtures(args.warm) if args.warm else None
+    prediction_service.run(host=args.host, port=args.port, poll_seconds=args.poll, warm_fixtures=fixtures)
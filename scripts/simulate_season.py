@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pandas as pd
+
+import season_sim
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Monte Carlo the rest of each league season from the unplayed fixtures in Match Logs."
+    )
+    parser.add_argument(
+        "--league",
+        action="append",
+        help="Only simulate this league (repeatable). Default: all five leagues.",
+    )
+    parser.add_argument("--sims", type=int, default=season_sim.DEFAULT_SIMULATIONS, help="Seasons per league.")
+    parser.add_argument("--seed", type=int, default=season_sim.DEFAULT_SEED)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per league/CPU).")
+    parser.add_argument("--output", default="season_projections.xlsx", help="Output workbook (one sheet per league).")
+    return parser.parse_args()
+
+
+def _sheet(projection):
+    out = projection.drop(columns=["position_probs"])
+    positions = pd.DataFrame(
+        projection["position_probs"].tolist(),
+        columns=[f"P{i + 1}" for i in range(len(projection))],
+        index=projection.index,
+    )
+    return pd.concat([out, positions], axis=1)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.chdir(PROJECT_ROOT)
+    started = time.perf_counter()
+    results = season_sim.run_all(args.league, n_sims=args.sims, seed=args.seed, workers=args.workers)
+
+    with pd.ExcelWriter(args.output) as writer:
+        for result in results:
+            _sheet(result["table"]).to_excel(writer, sheet_name=result["league"][:31], index=False)
+
+    for result in results:
+        top = result["table"].iloc[0]
+        print(
+            f"  + {result['league']}: {result['fixtures']} fixtures left, "
+            f"favourite {top['team']} ({top['title_prob'] * 100:.1f}%) [{result['seconds']:.1f}s]"
+        )
+    print(f"Saved {args.output} ({args.sims} seasons per league, {time.perf_counter() - started:.1f}s)")
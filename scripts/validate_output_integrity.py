@@ -1,6 +1,14 @@
-import os
-import pandas as pd
+import argparse
 import glob
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import workbook_schema
 
 OUTPUT_DIR = r"d:\model footbal\output_opta"
 
@@ -21,181 +29,149 @@ REQUIRED_COLUMNS = {
     "Goalkeeping": ["saves made", "goals conceded"]
 }
 
-def validate_files():
-    print(f"Scanning {OUTPUT_DIR}...\n")
-    
-    # Find all xlsx files recursively
-    files = glob.glob(os.path.join(OUTPUT_DIR, "**", "*.xlsx"), recursive=True)
-    
+REPAIR_TARGETS_FILE = "repair_targets.json"
+
+
+def _missing_required_columns(sheet, cols):
+    missing_cols = []
+    for rc in REQUIRED_COLUMNS.get(sheet, []):
+        # Handle synonyms
+        if rc == "interceptions":
+            if not any(x in str(cols) for x in ["interceptions", "ints"]):
+                missing_cols.append(rc)
+        elif rc == "goals conceded":
+            if not any(x in str(cols) for x in ["goals conceded", "goalsconceded", "gc"]):
+                missing_cols.append(rc)
+        else:
+            if not any(rc in c for c in cols):
+                missing_cols.append(rc)
+    return missing_cols
+
+
+def _check_workbook(info, tag):
+    """Issues for one workbook, from workbook_schema.read_headers()/read_full() output."""
+    issues = []
+    missing_sheets = [s for s in REQUIRED_SHEETS if s not in info["sheet_names"]]
+    if missing_sheets:
+        return [f"[{tag}] Missing Sheets: {missing_sheets}"]
+
+    for sheet in REQUIRED_SHEETS:
+        sheet_info = info["sheets"].get(sheet, {})
+        cols = [str(c).lower() for c in sheet_info.get("columns", [])]
+        if not cols or not sheet_info.get("rows"):
+            issues.append(f"[{tag}] Sheet '{sheet}' is EMPTY")
+            continue
+
+        # Raw Tuple Headers (Bad Flattening)
+        if any("('unnamed:" in c for c in cols):
+            issues.append(f"[{tag}] Sheet '{sheet}' has Raw Tuple Headers")
+            continue
+
+        # Super Table
+        if len(cols) > 30:
+            issues.append(f"[{tag}] Sheet '{sheet}' has SUPER TABLE ({len(cols)} cols)")
+            continue
+
+        missing_cols = _missing_required_columns(sheet, cols)
+        if missing_cols:
+            issues.append(f"[{tag}] Sheet '{sheet}' Missing Cols: {missing_cols}")
+    return issues
+
+
+def check_file(file_path, cache=None):
+    """
+    Issues for one team workbook. Only header rows and row counts are read; a workbook that
+    fails that check is parsed in full before its issues are reported. Unchanged files replay
+    their cached result.
+    """
+    filename = os.path.basename(file_path)
+    league = os.path.basename(os.path.dirname(file_path))
+    tag = f"{league}/{filename}"
+
+    if os.path.getsize(file_path) < 100:
+        return [f"[{tag}] File size too small ({os.path.getsize(file_path)} bytes)"]
+
+    cached = cache.get(file_path) if cache is not None else None
+    if cached is not None:
+        return cached
+
+    try:
+        issues = _check_workbook(workbook_schema.read_headers(file_path, sheets=REQUIRED_SHEETS), tag)
+        if issues:
+            issues = _check_workbook(workbook_schema.read_full(file_path, sheets=REQUIRED_SHEETS), tag)
+    except Exception as e:
+        return [f"[{tag}] Error reading file: {e}"]
+
+    if cache is not None:
+        cache.put(file_path, issues)
+    return issues
+
+
+def _team_workbooks(output_dir):
+    # Team workbooks live in {output_dir}/{league}/; league-level tables next to the folders are skipped.
+    return sorted(glob.glob(os.path.join(output_dir, "*", "*.xlsx")))
+
+
+def _open_cache(enabled=True):
+    return workbook_schema.ValidationCache(
+        workbook_schema.default_cache_path(),
+        "validate_output_integrity",
+        workbook_schema.rules_digest(REQUIRED_SHEETS, REQUIRED_COLUMNS),
+        enabled=enabled,
+    )
+
+
+def validate_files(output_dir=OUTPUT_DIR, use_cache=True):
+    print(f"Scanning {output_dir}...\n")
+    files = _team_workbooks(output_dir)
     print(f"Found {len(files)} files.")
-    
+
+    cache = _open_cache(use_cache)
     issues = []
-    
     for i, file_path in enumerate(files):
-        filename = os.path.basename(file_path)
-        league = os.path.basename(os.path.dirname(file_path))
-        
-        try:
-            xl = pd.ExcelFile(file_path)
-            sheet_names = xl.sheet_names
-            
-            missing_sheets = [s for s in REQUIRED_SHEETS if s not in sheet_names]
-            
-            if missing_sheets:
-                issues.append(f"[{league}/{filename}] Missing Sheets: {missing_sheets}")
-                continue
-            
-            # Check content of each sheet
-            for sheet in REQUIRED_SHEETS:
-                df = pd.read_excel(file_path, sheet_name=sheet)
-                
-                if df.empty:
-                     issues.append(f"[{league}/{filename}] Sheet '{sheet}' is EMPTY")
-                     continue
-                     
-                # Check columns
-                cols = [str(c).lower() for c in df.columns]
-                
-                # Check for Super Table abuse
-                if len(cols) > 30:
-                    issues.append(f"[{league}/{filename}] Sheet '{sheet}' has SUPER TABLE ({len(cols)} cols)")
-                    continue
-
-                req_cols = REQUIRED_COLUMNS.get(sheet, [])
-                
-                missing_cols = []
-                for rc in req_cols:
-                    # Handle synonyms
-                    if rc == "interceptions":
-                        if not any(x in str(cols) for x in ["interceptions", "ints"]):
-                             missing_cols.append(rc)
-                    elif rc == "goals conceded":
-                         if not any(x in str(cols) for x in ["goals conceded", "goalsconceded", "gc"]):
-                             missing_cols.append(rc)
-                    else:
-                        if not any(rc in c for c in cols):
-                             missing_cols.append(rc)
-                
-                if missing_cols:
-                    issues.append(f"[{league}/{filename}] Sheet '{sheet}' Missing Cols: {missing_cols}")
-
-        except Exception as e:
-            issues.append(f"[{league}/{filename}] Error reading file: {e}")
-
-        # Progress
+        issues.extend(check_file(file_path, cache=cache))
         if (i+1) % 10 == 0:
             print(f"Checked {i+1}/{len(files)} files...")
+    cache.save()
 
     print("\n" + "="*50)
     print("VALIDATION SUMMARY")
     print("="*50)
-    
+
     if not issues:
         print("[OK] ALL FILES VALID! (All sheets present, basic columns check passed)")
     else:
         print(f"[FAIL] Found {len(issues)} issues:")
         for issue in issues:
             print(issue)
-            
-    # Export bad files list for repair
-    bad_files = []
-    
-    # We need to re-iterate or change the loop to collect `bad_files`
-    # Let's just modify the main loop to collect file_path when an issue is found.
-    pass
-
-def validate_and_collect():
-    print(f"Scanning {OUTPUT_DIR}...\n")
-    files = glob.glob(os.path.join(OUTPUT_DIR, "**", "*.xlsx"), recursive=True)
+    return issues
+
+
+def validate_and_collect(output_dir=OUTPUT_DIR, use_cache=True):
+    print(f"Scanning {output_dir}...\n")
+    files = _team_workbooks(output_dir)
     print(f"Found {len(files)} files.")
-    
+
+    cache = _open_cache(use_cache)
     issues = []
-    bad_files = set() 
-    
+    bad_files = set()
+
     for i, file_path in enumerate(files):
-        filename = os.path.basename(file_path)
-        league = os.path.basename(os.path.dirname(file_path))
-        is_bad = False
-        
-        # Check size first
-        if os.path.getsize(file_path) < 100:
-            issues.append(f"[{league}/{filename}] File size too small ({os.path.getsize(file_path)} bytes)")
-            is_bad = True
-            bad_files.add(file_path)
-            continue
-        
-        try:
-            with pd.ExcelFile(file_path, engine='openpyxl') as xl:
-                sheet_names = xl.sheet_names
-            
-            # Check 1: Missing Sheets
-            missing_sheets = [s for s in REQUIRED_SHEETS if s not in sheet_names]
-            if missing_sheets:
-                issues.append(f"[{league}/{filename}] Missing Sheets: {missing_sheets}")
-                is_bad = True
-            
-            # Check 2: Sheet Content
-            if not is_bad: # Only check deeper if basic check passed (or check all?)
-                # let's check all to be thorough
-                for sheet in REQUIRED_SHEETS:
-                    if sheet not in sheet_names: continue
-                    
-                    df = pd.read_excel(file_path, sheet_name=sheet)
-                    
-                    if df.empty:
-                         issues.append(f"[{league}/{filename}] Sheet '{sheet}' is EMPTY")
-                         is_bad = True
-                         continue
-                         
-                    cols = [str(c).lower() for c in df.columns]
-                    
-                    # Check 2.5: Raw Tuple Headers (Bad Flattening)
-                    if any("('unnamed:" in c for c in cols):
-                         issues.append(f"[{league}/{filename}] Sheet '{sheet}' has Raw Tuple Headers")
-                         is_bad = True
-                         # No need to check other things if headers are broken
-                         continue
-                    
-                    # Check 3: Super Table
-                    if len(cols) > 30:
-                        issues.append(f"[{league}/{filename}] Sheet '{sheet}' has SUPER TABLE ({len(cols)} cols)")
-                        is_bad = True
-                        continue
-
-                    # Check 4: Missing Cols
-                    req_cols = REQUIRED_COLUMNS.get(sheet, [])
-                    missing_cols = []
-                    for rc in req_cols:
-                        if rc == "interceptions":
-                            if not any(x in str(cols) for x in ["interceptions", "ints"]):
-                                 missing_cols.append(rc)
-                        elif rc == "goals conceded":
-                             if not any(x in str(cols) for x in ["goals conceded", "goalsconceded", "gc"]):
-                                 missing_cols.append(rc)
-                        else:
-                            if not any(rc in c for c in cols):
-                                 missing_cols.append(rc)
-                    
-                    if missing_cols:
-                        issues.append(f"[{league}/{filename}] Sheet '{sheet}' Missing Cols: {missing_cols}")
-                        # Don't mark bad for minor col miss? 
-                        # Actually 'Defending' missing 'interceptions' is bad if we want complete data.
-                        is_bad = True
-
-        except Exception as e:
-            issues.append(f"[{league}/{filename}] Error reading file: {e}")
-            is_bad = True
-            
-        if is_bad:
+        file_issues = check_file(file_path, cache=cache)
+        if file_issues:
+            issues.extend(file_issues)
             bad_files.add(file_path)
 
         if (i+1) % 20 == 0:
             print(f"Checked {i+1}/{len(files)} files...")
+    cache.save()
 
     print("\n" + "="*50)
     print("VALIDATION SUMMARY")
     print("="*50)
-    
+    if cache.hits:
+        print(f"Unchanged files skipped: {cache.hits}")
+
     if not issues:
         print("[OK] ALL FILES VALID!")
     else:
@@ -203,11 +179,19 @@ def validate_and_collect():
         print("First 10 issues:")
         for issue in issues[:10]:
             print(issue)
-        
-    import json
-    with open("repair_targets.json", "w") as f:
-        json.dump(list(bad_files), f, indent=2)
-    print(f"Saved {len(bad_files)} files to 'repair_targets.json'")
+
+    with open(REPAIR_TARGETS_FILE, "w") as f:
+        json.dump(sorted(bad_files), f, indent=2)
+    print(f"Saved {len(bad_files)} files to '{REPAIR_TARGETS_FILE}'")
+
 
 if __name__ == "__main__":
-    validate_and_collect()
+    parser = argparse.ArgumentParser(description="Check OPTA team workbooks for missing sheets/columns.")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-check every workbook instead of skipping files unchanged since the last run.",
+    )
+    args = parser.parse_args()
+    validate_and_collect(args.output_dir, use_cache=not args.no_cache)
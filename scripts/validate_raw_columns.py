@@ -1,7 +1,13 @@
 import argparse
+import sys
 from pathlib import Path
 
-import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import workbook_schema
 
 
 LEAGUES = [
@@ -61,11 +67,69 @@ FBREF_DETAILED_SHEETS = [
 ]
 
 
-def _missing_columns(df, required):
-    return [c for c in required if c not in df.columns]
+def _missing_columns(columns, required):
+    return [c for c in required if c not in columns]
+
+
+def _check_sofascore(info, file_name):
+    issues = []
+    warnings = []
+    first = info["sheet_names"][0] if info["sheet_names"] else None
+    columns = info["sheets"].get(first, {}).get("columns", [])
+
+    missing = _missing_columns(columns, SOFASCORE_REQUIRED_COLUMNS)
+    if missing:
+        issues.append(f"[SofaScore] {file_name} missing columns: {missing}")
+
+    per90_cols = [c for c in columns if str(c).endswith("_per_90")]
+    if per90_cols:
+        warnings.append(
+            f"[SofaScore] {file_name} contains derived *_per_90 columns ({len(per90_cols)} cols)."
+        )
+    return issues, warnings
+
+
+def _check_fbref(info, file_name):
+    issues = []
+    warnings = []
+    for sheet in FBREF_REQUIRED_SHEETS:
+        if sheet not in info["sheet_names"]:
+            issues.append(f"[FBref] {file_name} missing required sheet: {sheet}")
+            continue
+        missing = _missing_columns(info["sheets"].get(sheet, {}).get("columns", []), FBREF_REQUIRED_COLUMNS[sheet])
+        if missing:
+            issues.append(f"[FBref] {file_name}::{sheet} missing columns: {missing}")
+
+    detailed_present = [s for s in FBREF_DETAILED_SHEETS if s in info["sheet_names"]]
+    if not detailed_present:
+        warnings.append(
+            f"[FBref] {file_name} has no detailed sheets (shooting/passing/defense/etc)."
+        )
+    return issues, warnings
+
+
+def _validate_file(file_path, check, label, cache, sheets=None):
+    """
+    Header-only check of one workbook; a failing file is re-checked from a full pandas parse
+    before its issues are reported. Results are cached per file fingerprint.
+    """
+    cached = cache.get(file_path) if cache is not None else None
+    if cached is not None:
+        return cached["issues"], cached["warnings"]
+
+    try:
+        issues, warnings = check(workbook_schema.read_headers(file_path, sheets=sheets), file_path.name)
+        if issues:
+            issues, warnings = check(workbook_schema.read_full(file_path, sheets=sheets), file_path.name)
+    except Exception as exc:
+        return [f"[{label}] Failed reading {file_path.name}: {exc}"], []
+
+    if cache is not None:
+        cache.put(file_path, {"issues": issues, "warnings": warnings})
+    return issues, warnings
 
 
-def validate_sofascore(base_dir):
+def validate_sofascore(base_dir, cache=None):
     issues = []
     warnings = []
 
@@ -74,27 +138,14 @@ def validate_sofascore(base_dir):
         if not file_path.exists():
             issues.append(f"[SofaScore] Missing file: {file_path}")
             continue
-
-        try:
-            df = pd.read_excel(file_path, nrows=5)
-        except Exception as exc:
-            issues.append(f"[SofaScore] Failed reading {file_path.name}: {exc}")
-            continue
-
-        missing = _missing_columns(df, SOFASCORE_REQUIRED_COLUMNS)
-        if missing:
-            issues.append(f"[SofaScore] {file_path.name} missing columns: {missing}")
-
-        per90_cols = [c for c in df.columns if c.endswith("_per_90")]
-        if per90_cols:
-            warnings.append(
-                f"[SofaScore] {file_path.name} contains derived *_per_90 columns ({len(per90_cols)} cols)."
-            )
+        file_issues, file_warnings = _validate_file(file_path, _check_sofascore, "SofaScore", cache)
+        issues.extend(file_issues)
+        warnings.extend(file_warnings)
 
     return issues, warnings
 
 
-def validate_fbref(base_dir):
+def validate_fbref(base_dir, cache=None):
     issues = []
     warnings = []
 
@@ -103,31 +154,11 @@ def validate_fbref(base_dir):
         if not file_path.exists():
             issues.append(f"[FBref] Missing file: {file_path}")
             continue
-
-        try:
-            excel = pd.ExcelFile(file_path)
-        except Exception as exc:
-            issues.append(f"[FBref] Failed opening {file_path.name}: {exc}")
-            continue
-
-        for sheet in FBREF_REQUIRED_SHEETS:
-            if sheet not in excel.sheet_names:
-                issues.append(f"[FBref] {file_path.name} missing required sheet: {sheet}")
-                continue
-            try:
-                df = pd.read_excel(file_path, sheet_name=sheet, nrows=3)
-            except Exception as exc:
-                issues.append(f"[FBref] Failed reading {file_path.name}::{sheet}: {exc}")
-                continue
-            missing = _missing_columns(df, FBREF_REQUIRED_COLUMNS[sheet])
-            if missing:
-                issues.append(f"[FBref] {file_path.name}::{sheet} missing columns: {missing}")
-
-        detailed_present = [s for s in FBREF_DETAILED_SHEETS if s in excel.sheet_names]
-        if not detailed_present:
-            warnings.append(
-                f"[FBref] {file_path.name} has no detailed sheets (shooting/passing/defense/etc)."
-            )
+        file_issues, file_warnings = _validate_file(
+            file_path, _check_fbref, "FBref", cache, sheets=FBREF_REQUIRED_SHEETS
+        )
+        issues.extend(file_issues)
+        warnings.extend(file_warnings)
 
     return issues, warnings
 
@@ -141,16 +172,30 @@ def main():
         action="store_true",
         help="Fail on warnings as well.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-check every workbook instead of skipping files unchanged since the last run.",
+    )
     args = parser.parse_args()
 
     sofascore_dir = Path(args.sofascore_dir)
     fbref_dir = Path(args.fbref_dir)
+    cache = workbook_schema.ValidationCache(
+        workbook_schema.default_cache_path(),
+        "validate_raw_columns",
+        workbook_schema.rules_digest(
+            SOFASCORE_REQUIRED_COLUMNS, FBREF_REQUIRED_SHEETS, FBREF_REQUIRED_COLUMNS, FBREF_DETAILED_SHEETS
+        ),
+        enabled=not args.no_cache,
+    )
 
     issues = []
     warnings = []
 
-    sofa_issues, sofa_warnings = validate_sofascore(sofascore_dir)
-    fbref_issues, fbref_warnings = validate_fbref(fbref_dir)
+    sofa_issues, sofa_warnings = validate_sofascore(sofascore_dir, cache=cache)
+    fbref_issues, fbref_warnings = validate_fbref(fbref_dir, cache=cache)
+    cache.save()
 
     issues.extend(sofa_issues)
     issues.extend(fbref_issues)
@@ -160,6 +205,8 @@ def main():
     print("=== RAW Schema Validation ===")
     print(f"Critical issues: {len(issues)}")
     print(f"Warnings: {len(warnings)}")
+    if cache.hits:
+        print(f"Unchanged files skipped: {cache.hits}")
 
     if issues:
         print("\n[CRITICAL]")
@@ -0,0 +1,217 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import match_log
+import simulator_v9
+import xg_engine
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+MATCH_LOGS_DIR = "Match Logs"
+FIXTURES_SHEET = "Scores & Fixtures"
+# League rounds are "Matchweek N" in every FBref schedule; cups and European games are skipped.
+LEAGUE_ROUND_PREFIX = "Matchweek"
+LEAGUES = ["Premier_League", "La_Liga", "Bundesliga", "Serie_A", "Ligue_1"]
+# Direct relegation places (Bundesliga / Ligue 1 16th place goes to a playoff and is not counted).
+RELEGATION_PLACES = {"Premier_League": 3, "La_Liga": 3, "Serie_A": 3, "Bundesliga": 2, "Ligue_1": 2}
+TOP_PLACES = 4
+DEFAULT_SIMULATIONS = 100000
+DEFAULT_SEED = 20260220
+CHUNK_SIMULATIONS = 25000
+RESULT_POINTS = {"W": 3, "D": 1, "L": 0}
+
+
+def _resolve_opponent(engine, name, cache):
+    if name not in cache:
+        path = engine.resolve_team_file(name)
+        cache[name] = os.path.splitext(os.path.basename(path))[0] if path else None
+    return cache[name]
+
+
+def load_league_state(league, match_logs_dir=MATCH_LOGS_DIR):
+    """
+    Current table and unplayed league fixtures of a league from its Match Logs schedules.
+    Returns (table, fixtures): table has team/played/points/gf/ga/gd, fixtures has date/home/away
+    (teams named by their Match Logs workbook).
+    """
+    league_dir = Path(match_logs_dir) / league
+    paths = sorted(p for p in league_dir.glob("*.xlsx") if not p.name.startswith("~$"))
+    engine = xg_engine.XGEngine(league)
+    names = {}
+
+    table_rows = []
+    fixtures = {}
+    for path in paths:
+        log = match_log.load_team_match_log(path)
+        df = log.sheet(FIXTURES_SHEET)
+        if df is None or df.empty or "Round" not in df.columns:
+            continue
+        df = df[df["Round"].astype(str).str.startswith(LEAGUE_ROUND_PREFIX)]
+        result = df["Result"].astype(str).str.strip().str[:1]
+        played = df[result.isin(list(RESULT_POINTS))]
+        table_rows.append(
+            {
+                "team": log.team,
+                "played": int(len(played)),
+                "points": int(result[played.index].map(RESULT_POINTS).sum()),
+                "gf": int(pd.to_numeric(played.get("Goals For"), errors="coerce").fillna(0).sum()),
+                "ga": int(pd.to_numeric(played.get("Goals Against"), errors="coerce").fillna(0).sum()),
+            }
+        )
+        for _, row in df[df["Result"].isna()].iterrows():
+            opponent = _resolve_opponent(engine, row.get("Opponent"), names)
+            if not opponent or opponent == log.team:
+                continue
+            home_side = str(row.get("Venue", "")).strip().lower() == "home"
+            home, away = (log.team, opponent) if home_side else (opponent, log.team)
+            fixtures.setdefault((home, away), pd.to_datetime(row.get("Date"), errors="coerce"))
+
+    table = pd.DataFrame(table_rows, columns=["team", "played", "points", "gf", "ga"])
+    table["gd"] = table["gf"] - table["ga"]
+    known = set(table["team"])
+    fixture_rows = [
+        {"date": date, "home": home, "away": away} for (home, away), date in fixtures.items() if home in known and away in known
+    ]
+    fixture_frame = pd.DataFrame(fixture_rows, columns=["date", "home", "away"])
+    return table, fixture_frame.sort_values(["date", "home"], kind="stable").reset_index(drop=True)
+
+
+def price_fixtures(league, fixtures, n_games=10):
+    """(F, 3) home/draw/away probabilities of the fixtures from one simulator_v9.simulate_matches call."""
+    if fixtures.empty:
+        return np.zeros((0, 3))
+    engine = xg_engine.XGEngine(league)
+    teams = sorted(set(fixtures["home"]) | set(fixtures["away"]))
+    form = {team: engine.get_team_rolling_stats(team, n_games=n_games) or {} for team in teams}
+    batch = simulator_v9.simulate_matches(
+        [
+            {"home_xg": form[home], "away_xg": form[away], "league": league, "home_team": home, "away_team": away}
+            for home, away in zip(fixtures["home"], fixtures["away"])
+        ]
+    )
+    probs = np.array([[sim["home_win_prob"], sim["draw_prob"], sim["away_win_prob"]] for sim in batch]) / 100.0
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+def simulate_season(
+    table,
+    fixtures,
+    probs,
+    n_sims=DEFAULT_SIMULATIONS,
+    seed=DEFAULT_SEED,
+    relegation_places=3,
+    top_places=TOP_PLACES,
+    chunk=CHUNK_SIMULATIONS,
+):
+    """
+    Vectorized season Monte Carlo: every remaining fixture's result is drawn from its 1X2
+    probabilities for `n_sims` seasons (in chunks), points are added through fixture->team
+    incidence matrices and each season is ranked by points, then current goal difference,
+    then lot. Returns one row per team with title/top/relegation odds, final-points quantiles
+    and the finishing-position distribution ("position_probs", index 0 = 1st).
+    """
+    teams = list(table["team"])
+    n_teams = len(teams)
+    index = {team: i for i, team in enumerate(teams)}
+    home_hits = np.zeros((len(fixtures), n_teams), dtype=np.float32)
+    away_hits = np.zeros((len(fixtures), n_teams), dtype=np.float32)
+    home_hits[np.arange(len(fixtures)), [index[t] for t in fixtures["home"]]] = 1.0
+    away_hits[np.arange(len(fixtures)), [index[t] for t in fixtures["away"]]] = 1.0
+    cum_home = np.asarray(probs[:, 0], dtype=float)
+    cum_draw = cum_home + np.asarray(probs[:, 1], dtype=float)
+
+    base = table["points"].to_numpy(dtype=np.float64)
+    tiebreak = (table["gd"].to_numpy(dtype=np.float64) + 500.0) * 1e-4
+    rng = np.random.default_rng(seed)
+    position_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    final_points = []
+
+    done = 0
+    while done < n_sims:
+        size = min(chunk, n_sims - done)
+        draws = rng.random((size, len(fixtures)))
+        home_win = draws < cum_home
+        draw = ~home_win & (draws < cum_draw)
+        home_pts = (3.0 * home_win + draw).astype(np.float32)
+        away_pts = (3.0 * (~home_win & ~draw) + draw).astype(np.float32)
+        points = base + home_pts @ home_hits + away_pts @ away_hits
+
+        key = points + tiebreak + rng.random((size, n_teams)) * 1e-6
+        order = np.argsort(-key, axis=1)
+        positions = np.empty_like(order)
+        positions[np.arange(size)[:, None], order] = np.arange(n_teams)
+        position_counts += np.bincount(
+            (np.arange(n_teams) * n_teams + positions).ravel(), minlength=n_teams * n_teams
+        ).reshape(n_teams, n_teams)
+        final_points.append(points.astype(np.int16))
+        done += size
+
+    final_points = np.concatenate(final_points) if final_points else np.zeros((0, n_teams), dtype=np.int16)
+    position_probs = position_counts / max(1, n_sims)
+    quantiles = np.percentile(final_points, [5, 50, 95], axis=0) if len(final_points) else np.zeros((3, n_teams))
+    remaining = home_hits.sum(axis=0) + away_hits.sum(axis=0)
+
+    out = table[["team", "played", "points", "gd"]].copy()
+    out["remaining"] = remaining.astype(int)
+    out["exp_points"] = final_points.mean(axis=0) if len(final_points) else base
+    out["points_p5"] = quantiles[0]
+    out["points_p50"] = quantiles[1]
+    out["points_p95"] = quantiles[2]
+    out["title_prob"] = position_probs[:, 0]
+    out[f"top{top_places}_prob"] = position_probs[:, :top_places].sum(axis=1)
+    out["relegation_prob"] = position_probs[:, n_teams - relegation_places :].sum(axis=1) if relegation_places else 0.0
+    out["exp_position"] = position_probs @ np.arange(1, n_teams + 1)
+    out["position_probs"] = [list(map(float, row)) for row in position_probs]
+    return out.sort_values("exp_position", kind="stable").reset_index(drop=True)
+
+
+def run_league(league, n_sims=DEFAULT_SIMULATIONS, seed=DEFAULT_SEED, match_logs_dir=MATCH_LOGS_DIR):
+    """Load, price and simulate one league. Returns {"league", "fixtures", "table", "seconds"}."""
+    started = time.perf_counter()
+    table, fixtures = load_league_state(league, match_logs_dir=match_logs_dir)
+    probs = price_fixtures(league, fixtures)
+    projection = simulate_season(
+        table,
+        fixtures,
+        probs,
+        n_sims=n_sims,
+        seed=seed,
+        relegation_places=RELEGATION_PLACES.get(league, 3),
+    )
+    return {
+        "league": league,
+        "fixtures": int(len(fixtures)),
+        "table": projection,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _init_worker(project_root):
+    # Workers resolve Match Logs, player files and the data_store snapshot relative to the project root.
+    os.chdir(project_root)
+
+
+def run_all(leagues=None, n_sims=DEFAULT_SIMULATIONS, seed=DEFAULT_SEED, workers=None, project_root=PROJECT_ROOT):
+    """
+    run_league for every league in a process pool (one league per task, seeds offset by league
+    order so results are reproducible regardless of scheduling). workers=1 runs in-process.
+    """
+    leagues = list(leagues or LEAGUES)
+    seeds = {league: seed + i for i, league in enumerate(leagues)}
+    if workers == 1 or len(leagues) == 1:
+        # Same relative data paths as the workers, without moving the caller's cwd for good.
+        cwd = os.getcwd()
+        os.chdir(project_root)
+        try:
+            return [run_league(league, n_sims=n_sims, seed=seeds[league]) for league in leagues]
+        finally:
+            os.chdir(cwd)
+
+    max_workers = min(len(leagues), workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(str(project_root),)) as pool:
+        futures = [pool.submit(run_league, league, n_sims, seeds[league]) for league in leagues]
+        return [future.result() for future in futures]
@@ -2,15 +2,24 @@ import json
 import math
 import os
 import re
-import unicodedata
 from datetime import timedelta
 
 import numpy as np
 
+import market_pricing
+import match_montecarlo
+import player_names
+import team_registry
+
 try:
     import pandas as pd
+
+    import data_store
+    import match_log
 except Exception:  # pragma: no cover
     pd = None
+    data_store = None
+    match_log = None
 
 TEAM_NAME_ALIASES = {
     "paris s g": "Paris Saint-Germain",
@@ -42,7 +51,11 @@ TEAM_NAME_ALIASES = {
     "spurs": "Tottenham Hotspur",
 }
 
+# league -> (parsed characteristics table, name lookup); rebuilt when data_store serves a new table.
 _CHAR_CACHE = {}
+_PLAYER_FRAME_CACHE = {}
+# abs path -> (file signature, calibration dict)
+_CALIBRATION_CACHE = {}
 CALIBRATION_PATH = "model_calibration.json"
 
 
@@ -65,12 +78,7 @@ def _tanh_norm(value, scale):
 
 
 def _norm_text(text):
-    text = "" if text is None else str(text)
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
-    text = re.sub(r"[^0-9a-zA-Z\s]", " ", text).lower()
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    return player_names.normalize_name(text)
 
 
 def _canonical_team_name(team_name):
@@ -87,86 +95,17 @@ def _token_overlap_score(a, b):
     return len(a_tokens.intersection(b_tokens))
 
 
-def _find_file_by_team(base_dir, league, team_name, suffix):
-    league_dir = os.path.join(base_dir, league)
-    if not os.path.isdir(league_dir):
-        return None
-
+def _find_team_file(source, league, team_name):
     candidates = []
     canonical = _canonical_team_name(team_name)
     if canonical != team_name:
         candidates.append(canonical)
     candidates.append(team_name)
 
-    for c in candidates:
-        direct = os.path.join(league_dir, f"{c}_{suffix}.xlsx")
-        if os.path.exists(direct):
-            return direct
-
-    target_norm = _norm_text(team_name)
-    best_path = None
-    best_score = -1
-
-    for fname in os.listdir(league_dir):
-        if not fname.lower().endswith(f"_{suffix}.xlsx"):
-            continue
-        team_part = fname[: -(len(f"_{suffix}.xlsx"))]
-        team_norm = _norm_text(team_part)
-
-        score = 0
-        if team_norm == target_norm:
-            score = 100
-        elif target_norm and (target_norm in team_norm or team_norm in target_norm):
-            score = 40 + min(len(target_norm), len(team_norm))
-        else:
-            score = _token_overlap_score(target_norm, team_norm) * 6
-
-        if score > best_score:
-            best_score = score
-            best_path = os.path.join(league_dir, fname)
-
-    return best_path if best_score >= 6 else None
-
-
-def _find_match_log_file(league, team_name):
-    logs_dir = os.path.join("Match Logs", league)
-    if not os.path.isdir(logs_dir):
+    fname = team_registry.get_registry().resolve(source, league, team_name, candidates)
+    if not fname:
         return None
-
-    candidates = []
-    canonical = _canonical_team_name(team_name)
-    if canonical != team_name:
-        candidates.append(canonical)
-    candidates.append(team_name)
-
-    for c in candidates:
-        direct = os.path.join(logs_dir, f"{c}.xlsx")
-        if os.path.exists(direct):
-            return direct
-
-    target_norm = _norm_text(team_name)
-    best_path = None
-    best_score = -1
-
-    for fname in os.listdir(logs_dir):
-        if not fname.lower().endswith(".xlsx"):
-            continue
-        stem = fname[:-5]
-        stem_norm = _norm_text(stem)
-
-        score = 0
-        if stem_norm == target_norm:
-            score = 100
-        elif target_norm and (target_norm in stem_norm or stem_norm in target_norm):
-            score = 40 + min(len(target_norm), len(stem_norm))
-        else:
-            score = _token_overlap_score(target_norm, stem_norm) * 6
-
-        if score > best_score:
-            best_score = score
-            best_path = os.path.join(logs_dir, fname)
-
-    return best_path if best_score >= 6 else None
+    return os.path.join(team_registry.TEAM_SOURCES[source][0], league, fname)
 
 
 def _poisson_pmf(k, lam):
@@ -208,14 +147,24 @@ def _top_scores(prob_matrix, top_n=3):
 
 
 def _load_model_calibration(path=CALIBRATION_PATH):
+    """Calibration dict of model_calibration.json, parsed once per file version (treat it as read-only)."""
     if not path or not os.path.exists(path):
         return None
+    sig = data_store.file_signature(path) if data_store is not None else None
+    key = os.path.abspath(path)
+    hit = _CALIBRATION_CACHE.get(key)
+    if hit is not None and sig is not None and hit[0] == sig:
+        return hit[1]
     try:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
     except Exception:
-        return None
-    return data if isinstance(data, dict) else None
+        # Mid-rewrite or corrupt: keep serving the last version that parsed.
+        return hit[1] if hit is not None else None
+    data = data if isinstance(data, dict) else None
+    if sig is not None:
+        _CALIBRATION_CACHE[key] = (sig, data)
+    return data
 
 
 def _team_calibration_entry(by_team, team_name):
@@ -430,22 +379,21 @@ def _parse_confirmed_lineups(context_text, home_team, away_team):
 def _load_characteristics_lookup(league):
     if pd is None:
         return {}
-    if league in _CHAR_CACHE:
-        return _CHAR_CACHE[league]
 
     path = os.path.join("player_characteristics", f"{league}_Characteristics.xlsx")
     if not os.path.exists(path):
-        _CHAR_CACHE[league] = {}
         return {}
 
     try:
-        df = pd.read_excel(path)
+        df = data_store.cached_table(path)
     except Exception:
-        _CHAR_CACHE[league] = {}
         return {}
 
+    hit = _CHAR_CACHE.get(league)
+    if hit is not None and hit[0] is df:
+        return hit[1]
     if df.empty or "Player" not in df.columns:
-        _CHAR_CACHE[league] = {}
+        _CHAR_CACHE[league] = (df, {})
         return {}
 
     out = {}
@@ -461,20 +409,46 @@ def _load_characteristics_lookup(league):
             "weaknesses": str(row.get("Weaknesses", "") or ""),
         }
 
-    _CHAR_CACHE[league] = out
+    _CHAR_CACHE[league] = (df, out)
     return out
 
 
 def _load_team_player_frame(league, team_name):
+    """
+    Merged player stats/characteristics/positions frame of a team, shared while data_store serves
+    the same source tables. Treat it as read-only (_build_team_profile works on a copy).
+    """
     if pd is None:
         return None
 
-    stats_file = _find_file_by_team("sofaplayer", league, team_name, "stats")
+    stats_file = _find_team_file("player_stats", league, team_name)
     if not stats_file:
         return None
 
+    pos_file = _find_team_file("positions", league, team_name)
+    key = (league, stats_file, pos_file)
+    char_file = os.path.join("player_characteristics", f"{league}_Characteristics.xlsx")
+    sources = (_source_table(stats_file), _source_table(pos_file), _source_table(char_file))
+    hit = _PLAYER_FRAME_CACHE.get(key)
+    if hit is None or any(old is not new for old, new in zip(hit[0], sources)):
+        hit = (sources, _read_team_player_frame(league, stats_file, pos_file))
+        _PLAYER_FRAME_CACHE[key] = hit
+    return hit[1]
+
+
+def _source_table(path):
+    """The parsed table data_store currently serves for `path` (None when missing or unreadable)."""
+    if not path or not os.path.exists(path):
+        return None
     try:
-        df = pd.read_excel(stats_file)
+        return data_store.cached_table(path)
+    except Exception:
+        return None
+
+
+def _read_team_player_frame(league, stats_file, pos_file):
+    try:
+        df = data_store.read_table(stats_file)
     except Exception:
         return None
 
@@ -499,10 +473,9 @@ def _load_team_player_frame(league, team_name):
         df["Strengths_Text"] = ""
         df["Weaknesses_Text"] = ""
 
-    pos_file = _find_file_by_team("position", league, team_name, "positions")
     if pos_file:
         try:
-            pos_df = pd.read_excel(pos_file)
+            pos_df = data_store.read_table(pos_file)
         except Exception:
             pos_df = None
 
@@ -581,108 +554,80 @@ def _role_from_position(pos_value):
     return "MID"
 
 
-def _lineup_priority(row):
-    starts = _safe_float(row.get("matchesStarted"), 0.0)
-    apps = _safe_float(row.get("appearances"), 0.0)
-    mins = _safe_float(row.get("minutesPlayed"), 0.0)
-    rating = _safe_float(row.get("rating"), 6.6)
-    return (starts * 4.0) + (apps * 1.5) + (mins / 90.0) + (rating * 1.3)
-
+def _numeric_column(df, field, default=0.0):
+    """Float array of a column with missing, unparseable and non-finite cells set to `default` (column-wise _safe_float)."""
+    if field in df.columns:
+        column = df[field]
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in "fiu":
+            values = column.to_numpy(dtype=float)
+        else:
+            values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=float)
+    else:
+        values = np.full(len(df), np.nan)
+    return np.where(np.isfinite(values), values, default)
 
-def _project_lineup(df):
-    if df is None or df.empty:
-        return df
 
-    df = df.copy()
-    df["__role"] = df["Primary_Position"].map(_role_from_position)
-    df["__priority"] = df.apply(_lineup_priority, axis=1)
+def _tanh_norm_array(values, scale):
+    return np.tanh(np.maximum(0.0, values) / max(1e-9, float(scale)))
 
-    selected = []
-    selected_set = set()
 
-    def pick(role, count):
-        subset = df[df["__role"] == role].sort_values(by="__priority", ascending=False)
-        for idx in subset.index:
-            if idx in selected_set:
-                continue
-            selected.append(idx)
-            selected_set.add(idx)
-            if len([x for x in selected if x in subset.index]) >= count:
-                break
+def _lineup_priorities(df):
+    starts = _numeric_column(df, "matchesStarted", 0.0)
+    apps = _numeric_column(df, "appearances", 0.0)
+    mins = _numeric_column(df, "minutesPlayed", 0.0)
+    rating = _numeric_column(df, "rating", 6.6)
+    return (starts * 4.0) + (apps * 1.5) + (mins / 90.0) + (rating * 1.3)
 
-    pick("GK", 1)
-    pick("DEF", 4)
-    pick("MID", 3)
-    pick("ATT", 3)
 
-    if len(selected) < 11:
-        for idx in df.sort_values(by="__priority", ascending=False).index:
-            if idx not in selected_set:
-                selected.append(idx)
-                selected_set.add(idx)
-            if len(selected) >= 11:
-                break
+def _priority_order(priority):
+    """Row positions by descending priority, ties kept in frame order."""
+    priority = np.asarray(priority, dtype=float)
+    return np.lexsort((np.arange(len(priority)), -priority))
 
-    return df.loc[selected[:11]].copy()
 
+# Projected XI shape: best players of each role by lineup priority.
+PROJECTED_SHAPE = [("GK", 1), ("DEF", 4), ("MID", 3), ("ATT", 3)]
 
-def _match_player_row(df, lineup_name, used_indexes):
-    target = _norm_text(lineup_name)
-    if not target:
-        return None
 
-    exact = df[(df["__name_key"] == target) & (~df.index.isin(used_indexes))]
-    if not exact.empty:
-        return exact.sort_values(by="__priority", ascending=False).index[0]
+def _project_lineup(df):
+    if df is None or df.empty:
+        return df
 
-    tokens = [t for t in target.split() if len(t) >= 3]
-    best_idx = None
-    best_score = 0
-    best_priority = -1e9
+    priority = df["__priority"].to_numpy(dtype=float) if "__priority" in df.columns else _lineup_priorities(df)
+    order = _priority_order(priority)
+    roles = np.array([_role_from_position(pos) for pos in df["Primary_Position"].tolist()], dtype=object)[order]
+    selected = []
+    for role, count in PROJECTED_SHAPE:
+        selected.extend(order[roles == role][:count].tolist())
 
-    for idx, row in df.iterrows():
-        if idx in used_indexes:
-            continue
-        candidate = row.get("__name_key", "")
-        if not candidate:
-            continue
+    if len(selected) < 11:
+        chosen = set(selected)
+        selected.extend([pos for pos in order.tolist() if pos not in chosen][: 11 - len(selected)])
 
-        score = 0
-        if target in candidate or candidate in target:
-            score += 20
-        for token in tokens:
-            if token in candidate:
-                score += len(token)
-        if tokens and candidate.endswith(tokens[-1]):
-            score += 8
+    return df.iloc[selected[:11]]
 
-        if score > 0:
-            pr = _safe_float(row.get("__priority"), 0.0)
-            if score > best_score or (score == best_score and pr > best_priority):
-                best_score = score
-                best_priority = pr
-                best_idx = idx
 
-    return best_idx if best_score >= 6 else None
+def _squad_name_index(df):
+    return player_names.squad_index(df["__name_key"].tolist(), df["__priority"].tolist())
 
 
-def _lineup_from_names(df, lineup_names, projected_lineup):
+def _lineup_from_names(df, lineup_names, projected_lineup, name_index=None):
     if not lineup_names:
         return projected_lineup, 0
 
-    used = set()
-    selected = []
-
+    name_index = name_index or _squad_name_index(df)
+    positions = []
     for name in lineup_names:
-        idx = _match_player_row(df, name, used)
-        if idx is not None:
-            selected.append(idx)
-            used.add(idx)
+        pos = name_index.match_lineup_name(name, positions)
+        if pos is not None:
+            positions.append(pos)
 
-    matched = len(selected)
+    matched = len(positions)
     if matched == 0:
         return projected_lineup, 0
 
+    selected = [df.index[pos] for pos in positions]
+    used = set(selected)
     for idx in projected_lineup.index:
         if idx not in used:
             selected.append(idx)
@@ -691,7 +636,7 @@ def _lineup_from_names(df, lineup_names, projected_lineup):
             break
 
     if len(selected) < 11:
-        for idx in df.sort_values(by="__priority", ascending=False).index:
+        for idx in df.index[_priority_order(df["__priority"].to_numpy(dtype=float))]:
             if idx not in used:
                 selected.append(idx)
                 used.add(idx)
@@ -701,135 +646,159 @@ def _lineup_from_names(df, lineup_names, projected_lineup):
     return df.loc[selected[:11]].copy(), matched
 
 
-def _per90(row, field, minutes):
-    return (_safe_float(row.get(field), 0.0) / max(1.0, minutes)) * 90.0
-
-
-def _player_profile(row):
-    minutes = _safe_float(row.get("minutesPlayed"), 0.0)
-    apps = max(1.0, _safe_float(row.get("appearances"), 1.0))
-    if minutes <= 0:
-        minutes = apps * 60.0
-
-    rating = _safe_float(row.get("rating"), 6.7)
-    rating_norm = _clip((rating - 5.8) / 2.4, 0.0, 1.35)
-
-    xg_p90 = _per90(row, "expectedGoals", minutes)
-    goals_p90 = _per90(row, "goals", minutes)
-    xa_p90 = _per90(row, "expectedAssists", minutes)
-    assists_p90 = _per90(row, "assists", minutes)
-    key_pass_p90 = _per90(row, "keyPasses", minutes)
-    dribble_p90 = _per90(row, "successfulDribbles", minutes)
-    shots_on_target_p90 = _per90(row, "shotsOnTarget", minutes)
-    opp_half_passes_p90 = _per90(row, "accurateOppositionHalfPasses", minutes)
-    big_created_p90 = _per90(row, "bigChancesCreated", minutes)
-    inside_box_shots_p90 = _per90(row, "shotsFromInsideTheBox", minutes)
+# Scouting-report phrases -> (attack, defense) adjustment; a rule applies once however many of its phrases match.
+STRENGTH_TRAITS = [
+    (("finishing",), 0.03, 0.0),
+    (("key passes", "through balls"), 0.03, 0.0),
+    (("dribbling",), 0.02, 0.0),
+    (("aerial duels",), 0.01, 0.02),
+    (("tackling", "ball interception", "defensive contribution"), 0.0, 0.03),
+    (("concentration",), 0.0, 0.02),
+]
+WEAKNESS_TRAITS = [
+    (("finishing",), -0.03, 0.0),
+    (("passing",), -0.02, 0.0),
+    (("dribbling", "holding on to the ball"), -0.02, 0.0),
+    (("aerial duels",), -0.01, -0.02),
+    (("tackling", "defensive contribution"), 0.0, -0.03),
+    (("discipline",), 0.0, -0.01),
+]
+# Role -> (attack, defense) multipliers of a player profile.
+ROLE_PROFILE_SCALES = {"ATT": (1.14, 0.76), "MID": (1.0, 1.0), "DEF": (0.72, 1.22), "GK": (0.28, 1.36)}
+PROFILE_COLUMNS = [
+    "name",
+    "primary_position",
+    "role",
+    "attack",
+    "defense",
+    "control",
+    "minutes",
+    "workload",
+    "xg_p90",
+    "xa_p90",
+    "xt_proxy",
+    "aerial_pct",
+    "key_passes_p90",
+    "dribbles_p90",
+    "tackles_p90",
+]
+
+
+def _trait_adjustments(df):
+    """(attack, defense) trait adjustment arrays from the Strengths_Text / Weaknesses_Text columns."""
+    attack_adj = np.zeros(len(df))
+    defense_adj = np.zeros(len(df))
+    for column, rules in (("Strengths_Text", STRENGTH_TRAITS), ("Weaknesses_Text", WEAKNESS_TRAITS)):
+        if column not in df.columns:
+            continue
+        texts = [_norm_text(text) for text in df[column].tolist()]
+        for phrases, attack, defense in rules:
+            hit = np.array([any(phrase in text for phrase in phrases) for text in texts], dtype=bool)
+            attack_adj = attack_adj + np.where(hit, attack, 0.0)
+            defense_adj = defense_adj + np.where(hit, defense, 0.0)
+    return np.clip(attack_adj, -0.06, 0.08), np.clip(defense_adj, -0.06, 0.08)
 
-    tackles_p90 = _per90(row, "tackles", minutes)
-    interceptions_p90 = _per90(row, "interceptions", minutes)
-    clearances_p90 = _per90(row, "clearances", minutes)
-    duel_pct = _safe_float(row.get("totalDuelsWonPercentage"), 50.0)
-    aerial_pct = _safe_float(row.get("aerialDuelsWonPercentage"), duel_pct)
 
-    finisher_signal = _tanh_norm((xg_p90 * 0.7) + (goals_p90 * 0.55) + (shots_on_target_p90 * 0.22), 0.85)
-    creator_signal = _tanh_norm((xa_p90 * 0.9) + (assists_p90 * 0.55) + (key_pass_p90 * 0.18) + (dribble_p90 * 0.08), 0.75)
+def _player_profiles(df):
+    """
+    Attack/defense/control/load profile of every player in a squad frame as whole-column array
+    operations. Returns a frame indexed like `df` with PROFILE_COLUMNS.
+    """
+    minutes = _numeric_column(df, "minutesPlayed", 0.0)
+    apps = np.maximum(1.0, _numeric_column(df, "appearances", 1.0))
+    minutes = np.where(minutes <= 0, apps * 60.0, minutes)
+
+    def per90(field):
+        return (_numeric_column(df, field, 0.0) / np.maximum(1.0, minutes)) * 90.0
+
+    rating = _numeric_column(df, "rating", 6.7)
+    rating_norm = np.clip((rating - 5.8) / 2.4, 0.0, 1.35)
+
+    xg_p90 = per90("expectedGoals")
+    goals_p90 = per90("goals")
+    xa_p90 = per90("expectedAssists")
+    assists_p90 = per90("assists")
+    key_pass_p90 = per90("keyPasses")
+    dribble_p90 = per90("successfulDribbles")
+    shots_on_target_p90 = per90("shotsOnTarget")
+    opp_half_passes_p90 = per90("accurateOppositionHalfPasses")
+    big_created_p90 = per90("bigChancesCreated")
+    inside_box_shots_p90 = per90("shotsFromInsideTheBox")
+
+    tackles_p90 = per90("tackles")
+    interceptions_p90 = per90("interceptions")
+    clearances_p90 = per90("clearances")
+    duel_pct = _numeric_column(df, "totalDuelsWonPercentage", 50.0)
+    aerial_pct = _numeric_column(df, "aerialDuelsWonPercentage", duel_pct)
+
+    finisher_signal = _tanh_norm_array((xg_p90 * 0.7) + (goals_p90 * 0.55) + (shots_on_target_p90 * 0.22), 0.85)
+    creator_signal = _tanh_norm_array(
+        (xa_p90 * 0.9) + (assists_p90 * 0.55) + (key_pass_p90 * 0.18) + (dribble_p90 * 0.08), 0.75
+    )
     attack = (0.50 * rating_norm) + (0.30 * finisher_signal) + (0.20 * creator_signal)
-    xt_proxy = _clip(
-        (0.42 * _tanh_norm((xa_p90 * 1.7) + (key_pass_p90 * 0.75) + (big_created_p90 * 0.55), 2.1))
-        + (0.30 * _tanh_norm((dribble_p90 * 0.8) + (opp_half_passes_p90 / 35.0), 1.7))
-        + (0.28 * _tanh_norm((xg_p90 * 1.2) + (inside_box_shots_p90 * 0.24), 1.35)),
+    xt_proxy = np.clip(
+        (0.42 * _tanh_norm_array((xa_p90 * 1.7) + (key_pass_p90 * 0.75) + (big_created_p90 * 0.55), 2.1))
+        + (0.30 * _tanh_norm_array((dribble_p90 * 0.8) + (opp_half_passes_p90 / 35.0), 1.7))
+        + (0.28 * _tanh_norm_array((xg_p90 * 1.2) + (inside_box_shots_p90 * 0.24), 1.35)),
         0.0,
         1.2,
     )
 
-    defensive_actions = _tanh_norm((tackles_p90 * 0.45) + (interceptions_p90 * 0.55) + (clearances_p90 * 0.25), 1.25)
-    duel_signal = _clip(((duel_pct / 100.0) + (aerial_pct / 100.0)) * 0.5, 0.0, 1.2)
+    defensive_actions = _tanh_norm_array(
+        (tackles_p90 * 0.45) + (interceptions_p90 * 0.55) + (clearances_p90 * 0.25), 1.25
+    )
+    duel_signal = np.clip(((duel_pct / 100.0) + (aerial_pct / 100.0)) * 0.5, 0.0, 1.2)
     defense = (0.52 * rating_norm) + (0.30 * defensive_actions) + (0.18 * duel_signal)
-    control = _clip(
-        (0.44 * _tanh_norm((key_pass_p90 * 0.55) + (xa_p90 * 1.6), 1.4))
-        + (0.30 * _tanh_norm(dribble_p90, 2.4))
-        + (0.26 * _clip(duel_pct / 100.0, 0.0, 1.15)),
+    control = np.clip(
+        (0.44 * _tanh_norm_array((key_pass_p90 * 0.55) + (xa_p90 * 1.6), 1.4))
+        + (0.30 * _tanh_norm_array(dribble_p90, 2.4))
+        + (0.26 * np.clip(duel_pct / 100.0, 0.0, 1.15)),
         0.0,
         1.2,
     )
 
-    strengths = _norm_text(row.get("Strengths_Text", ""))
-    weaknesses = _norm_text(row.get("Weaknesses_Text", ""))
-
-    attack_trait_adj = 0.0
-    defense_trait_adj = 0.0
-
-    if "finishing" in strengths:
-        attack_trait_adj += 0.03
-    if "key passes" in strengths or "through balls" in strengths:
-        attack_trait_adj += 0.03
-    if "dribbling" in strengths:
-        attack_trait_adj += 0.02
-    if "aerial duels" in strengths:
-        attack_trait_adj += 0.01
-        defense_trait_adj += 0.02
-    if "tackling" in strengths or "ball interception" in strengths or "defensive contribution" in strengths:
-        defense_trait_adj += 0.03
-    if "concentration" in strengths:
-        defense_trait_adj += 0.02
-
-    if "finishing" in weaknesses:
-        attack_trait_adj -= 0.03
-    if "passing" in weaknesses:
-        attack_trait_adj -= 0.02
-    if "dribbling" in weaknesses or "holding on to the ball" in weaknesses:
-        attack_trait_adj -= 0.02
-    if "aerial duels" in weaknesses:
-        attack_trait_adj -= 0.01
-        defense_trait_adj -= 0.02
-    if "tackling" in weaknesses or "defensive contribution" in weaknesses:
-        defense_trait_adj -= 0.03
-    if "discipline" in weaknesses:
-        defense_trait_adj -= 0.01
-
-    attack += _clip(attack_trait_adj, -0.06, 0.08)
-    defense += _clip(defense_trait_adj, -0.06, 0.08)
-
-    role = _role_from_position(row.get("Primary_Position"))
-    if role == "ATT":
-        attack *= 1.14
-        defense *= 0.76
-    elif role == "MID":
-        pass
-    elif role == "DEF":
-        attack *= 0.72
-        defense *= 1.22
-    elif role == "GK":
-        attack *= 0.28
-        defense *= 1.36
-
-    reliability = _clip(minutes / 900.0, 0.25, 1.0)
+    attack_trait_adj, defense_trait_adj = _trait_adjustments(df)
+    attack = attack + attack_trait_adj
+    defense = defense + defense_trait_adj
+
+    positions = df["Primary_Position"].tolist() if "Primary_Position" in df.columns else [None] * len(df)
+    role = np.array([_role_from_position(pos) for pos in positions], dtype=object)
+    scales = np.array([ROLE_PROFILE_SCALES.get(r, (1.0, 1.0)) for r in role], dtype=float).reshape(-1, 2)
+    attack = attack * scales[:, 0]
+    defense = defense * scales[:, 1]
+
+    reliability = np.clip(minutes / 900.0, 0.25, 1.0)
     fallback_level = 0.45 + (0.20 * rating_norm)
     attack = (attack * reliability) + (fallback_level * (1.0 - reliability))
     defense = (defense * reliability) + (fallback_level * (1.0 - reliability))
     control = (control * reliability) + ((fallback_level * 0.95) * (1.0 - reliability))
 
-    return {
-        "name": row.get("Player_Name", "Unknown"),
-        "primary_position": str(row.get("Primary_Position", "") or "").upper().strip(),
-        "role": role,
-        "attack": float(attack),
-        "defense": float(defense),
-        "control": float(control),
-        "minutes": float(minutes),
-        "workload": _clip(minutes / (apps * 90.0), 0.40, 1.20),
-        "xg_p90": float(xg_p90),
-        "xa_p90": float(xa_p90),
-        "xt_proxy": float(xt_proxy),
-        "aerial_pct": float(aerial_pct),
-        "key_passes_p90": float(key_pass_p90),
-        "dribbles_p90": float(dribble_p90),
-        "tackles_p90": float(tackles_p90),
-    }
+    names = df["Player_Name"] if "Player_Name" in df.columns else pd.Series("Unknown", index=df.index)
+    return pd.DataFrame(
+        {
+            "name": names.to_numpy(dtype=object),
+            "primary_position": np.array([str(pos or "").upper().strip() for pos in positions], dtype=object),
+            "role": role,
+            "attack": attack,
+            "defense": defense,
+            "control": control,
+            "minutes": minutes,
+            "workload": np.clip(minutes / (apps * 90.0), 0.40, 1.20),
+            "xg_p90": xg_p90,
+            "xa_p90": xa_p90,
+            "xt_proxy": xt_proxy,
+            "aerial_pct": aerial_pct,
+            "key_passes_p90": key_pass_p90,
+            "dribbles_p90": dribble_p90,
+            "tackles_p90": tackles_p90,
+        },
+        index=df.index,
+        columns=PROFILE_COLUMNS,
+    )
 
 
-def _aggregate_lineup(lineup_df):
-    if lineup_df is None or lineup_df.empty:
+def _aggregate_profiles(profiles):
+    if profiles is None or profiles.empty:
         return {
             "attack": 0.70,
             "defense": 0.70,
@@ -845,59 +814,50 @@ def _aggregate_lineup(lineup_df):
     defense_weights = {"GK": 1.45, "DEF": 1.26, "MID": 1.00, "ATT": 0.55}
     overall_weights = {"GK": 0.90, "DEF": 1.00, "MID": 1.00, "ATT": 1.10}
 
-    players = []
-    att_sum = att_w_sum = 0.0
-    def_sum = def_w_sum = 0.0
-    ov_sum = ov_w_sum = 0.0
-    xg_sum = xa_sum = xt_sum = 0.0
-    workloads = []
-
-    for _, row in lineup_df.iterrows():
-        p = _player_profile(row)
-        players.append(p)
-
-        rel = _clip(p["minutes"] / 900.0, 0.40, 1.00)
-        aw = attack_weights[p["role"]] * rel
-        dw = defense_weights[p["role"]] * rel
-        ow = overall_weights[p["role"]] * rel
-
-        att_sum += p["attack"] * aw
-        att_w_sum += aw
-        def_sum += p["defense"] * dw
-        def_w_sum += dw
-        ov_sum += ((p["attack"] + p["defense"]) * 0.5) * ow
-        ov_w_sum += ow
-        xg_sum += p["xg_p90"] * aw
-        xa_sum += p["xa_p90"] * aw
-        xt_sum += p["xt_proxy"] * ow
-        workloads.append(p["workload"])
+    role = profiles["role"].tolist()
+    rel = np.clip(profiles["minutes"].to_numpy(dtype=float) / 900.0, 0.40, 1.00)
+    aw = np.array([attack_weights[r] for r in role]) * rel
+    dw = np.array([defense_weights[r] for r in role]) * rel
+    ow = np.array([overall_weights[r] for r in role]) * rel
+    attack = profiles["attack"].to_numpy(dtype=float)
+    defense = profiles["defense"].to_numpy(dtype=float)
+    att_w_sum = max(1e-9, aw.sum())
+    ov_w_sum = max(1e-9, ow.sum())
 
     return {
-        "attack": float(att_sum / max(1e-9, att_w_sum)),
-        "defense": float(def_sum / max(1e-9, def_w_sum)),
-        "overall": float(ov_sum / max(1e-9, ov_w_sum)),
-        "load_index": float(np.mean(workloads) if workloads else 0.90),
-        "xg_p90": float(xg_sum / max(1e-9, att_w_sum)),
-        "xa_p90": float(xa_sum / max(1e-9, att_w_sum)),
-        "xt_proxy": float(xt_sum / max(1e-9, ov_w_sum)),
-        "players": players,
+        "attack": float((attack * aw).sum() / att_w_sum),
+        "defense": float((defense * dw).sum() / max(1e-9, dw.sum())),
+        "overall": float((((attack + defense) * 0.5) * ow).sum() / ov_w_sum),
+        "load_index": float(profiles["workload"].mean()),
+        "xg_p90": float((profiles["xg_p90"].to_numpy(dtype=float) * aw).sum() / att_w_sum),
+        "xa_p90": float((profiles["xa_p90"].to_numpy(dtype=float) * aw).sum() / att_w_sum),
+        "xt_proxy": float((profiles["xt_proxy"].to_numpy(dtype=float) * ow).sum() / ov_w_sum),
+        "players": [dict(zip(PROFILE_COLUMNS, row)) for row in zip(*(profiles[c].tolist() for c in PROFILE_COLUMNS))],
     }
 
 
+def _aggregate_lineup(lineup_df):
+    if lineup_df is None or lineup_df.empty:
+        return _aggregate_profiles(None)
+    return _aggregate_profiles(_player_profiles(lineup_df))
+
+
 def _build_team_profile(df, lineup_names):
     if df is None or df.empty:
         return None
 
     work = df.copy()
-    work["__priority"] = work.apply(_lineup_priority, axis=1)
+    work["__priority"] = _lineup_priorities(work)
     if "__name_key" not in work.columns:
         work["__name_key"] = work["Player_Name"].map(_norm_text)
 
+    # One profile pass over the squad; any candidate XI is then a row selection.
+    profiles = _player_profiles(work)
     projected = _project_lineup(work)
     actual, matched_count = _lineup_from_names(work, lineup_names, projected)
 
-    projected_stats = _aggregate_lineup(projected)
-    actual_stats = _aggregate_lineup(actual)
+    projected_stats = _aggregate_profiles(profiles.loc[projected.index])
+    actual_stats = _aggregate_profiles(profiles.loc[actual.index])
 
     if lineup_names and matched_count >= 8:
         source = "confirmed"
@@ -1084,53 +1044,37 @@ def _load_match_dates(league, team_name):
     if pd is None:
         return []
 
-    log_file = _find_match_log_file(league, team_name)
+    log_file = _find_team_file("match_logs", league, team_name)
     if not log_file:
         return []
 
     try:
-        df = pd.read_excel(log_file, sheet_name="Shooting")
+        log = match_log.load_team_match_log(log_file)
     except Exception:
-        try:
-            df = pd.read_excel(log_file, sheet_name=0)
-        except Exception:
-            return []
-
-    if df.empty:
-        return []
-
-    date_col = None
-    for col in df.columns:
-        col_text = str(col).lower()
-        if col_text == "date" or col_text.endswith("_date"):
-            date_col = col
-            break
-
-    if not date_col:
         return []
 
-    dates = pd.to_datetime(df[date_col], errors="coerce").dropna().dt.normalize()
-    if dates.empty:
-        return []
+    return log.match_dates(until=pd.Timestamp.now())
 
-    today = pd.Timestamp.now().normalize()
-    dates = dates[dates <= today]
-    if dates.empty:
-        return []
 
-    return list(dates.drop_duplicates().sort_values(ascending=False))
+def _fatigue_counts(league, team_name, as_of=None):
+    """(days since last match, matches in the last 7/14/21 days), or None without match dates."""
+    if as_of is not None:
+        log_file = _find_team_file("match_logs", league, team_name) if pd is not None else None
+        if not log_file:
+            return None
+        try:
+            import feature_store
 
+            counts = feature_store.team_timeline(match_log.load_team_match_log(log_file)).fatigue(as_of)
+        except Exception:
+            return None
+        if counts["days_since_last"] is None:
+            return None
+        return counts["days_since_last"], counts["matches_7d"], counts["matches_14d"], counts["matches_21d"]
 
-def _compute_fatigue(league, team_name, load_index):
     dates = _load_match_dates(league, team_name)
     if not dates:
-        return {
-            "attack_penalty": 0.0,
-            "defense_leak": 0.0,
-            "days_since_last": None,
-            "matches_7d": 0,
-            "matches_14d": 0,
-        }
+        return None
 
     today = pd.Timestamp.now().normalize()
     last_date = dates[0]
@@ -1139,6 +1083,20 @@ def _compute_fatigue(league, team_name, load_index):
     matches_7d = sum(1 for d in dates if d >= (today - timedelta(days=7)))
     matches_14d = sum(1 for d in dates if d >= (today - timedelta(days=14)))
     matches_21d = sum(1 for d in dates if d >= (today - timedelta(days=21)))
+    return days_since, matches_7d, matches_14d, matches_21d
+
+
+def _compute_fatigue(league, team_name, load_index, as_of=None):
+    counts = _fatigue_counts(league, team_name, as_of=as_of)
+    if counts is None:
+        return {
+            "attack_penalty": 0.0,
+            "defense_leak": 0.0,
+            "days_since_last": None,
+            "matches_7d": 0,
+            "matches_14d": 0,
+        }
+    days_since, matches_7d, matches_14d, matches_21d = counts
 
     pressure = 0.0
     if days_since <= 1:
@@ -1283,12 +1241,7 @@ def _progression_strength(prog):
     return float(_clip(strength, 0.0, 1.2))
 
 
-def simulate_match(
-    home_xg,
-    away_xg,
-    home_sofascore=None,
-    away_sofascore=None,
-    iterations=10000,
+def _fixture_signals(
     league=None,
     home_team=None,
     away_team=None,
@@ -1297,73 +1250,14 @@ def simulate_match(
     away_progression=None,
     home_flow=None,
     away_flow=None,
+    calibration=None,
+    as_of=None,
 ):
     """
-    Simulator v9
-    - Keeps v8 base (xG + goals/90 + shrinkage + Dixon-Coles)
-    - Adds Dynamic Lineup Strength from player-level data
-    - Adds Key Matchups (position-vs-position)
-    - Adds Fatigue adjustments from match logs
-    - Adds xT/Progression proxy adjustments
+    Lambda-independent v9 layers of one fixture (progression, tactical, lineup, matchup, fatigue,
+    calibration) as contexts plus the ordered multiplicative factors for each side.
+    as_of: fatigue counts only use matches played before that day.
     """
-    h_att = _safe_float(home_xg.get("attack", {}).get("xg_per_game"), 1.25)
-    h_def = _safe_float(home_xg.get("defense", {}).get("xga_per_game"), 1.20)
-    a_att = _safe_float(away_xg.get("attack", {}).get("xg_per_game"), 1.25)
-    a_def = _safe_float(away_xg.get("defense", {}).get("xga_per_game"), 1.20)
-
-    xg_home = (h_att + a_def) / 2.0
-    xg_away = (a_att + h_def) / 2.0
-
-    has_ss = home_sofascore is not None and away_sofascore is not None
-    if has_ss:
-        h_gf = _safe_float(home_sofascore.get("goals_scored_per_game"), xg_home)
-        h_ga = _safe_float(home_sofascore.get("goals_conceded_per_game"), h_def)
-        a_gf = _safe_float(away_sofascore.get("goals_scored_per_game"), xg_away)
-        a_ga = _safe_float(away_sofascore.get("goals_conceded_per_game"), a_def)
-        goals_home = (h_gf + a_ga) / 2.0
-        goals_away = (a_gf + h_ga) / 2.0
-        w_xg, w_goals = 0.58, 0.42
-    else:
-        goals_home, goals_away = xg_home, xg_away
-        w_xg, w_goals = 1.0, 0.0
-
-    base_home = (w_xg * xg_home) + (w_goals * goals_home)
-    base_away = (w_xg * xg_away) + (w_goals * goals_away)
-
-    prior_home, prior_away = 1.35, 1.20
-    shr = 0.86
-    reg_home = (shr * base_home) + ((1 - shr) * prior_home)
-    reg_away = (shr * base_away) + ((1 - shr) * prior_away)
-
-    # Calibrated to keep baseline home tilt near ~5-6% (including prior shrinkage effect).
-    home_adv, away_dis = 1.034, 0.996
-    h_form = _safe_float(home_xg.get("form_last_5"), 7.5)
-    a_form = _safe_float(away_xg.get("form_last_5"), 7.5)
-    form_adj = _clip(((h_form - a_form) / 15.0) * 0.08, -0.04, 0.04)
-
-    strength_raw = math.log((reg_home + 0.05) / (reg_away + 0.05))
-    strength_adj = _clip(math.tanh(strength_raw) * 0.06, -0.06, 0.06)
-
-    lambda_home = reg_home * home_adv * (1.0 + form_adj + strength_adj)
-    lambda_away = reg_away * away_dis * (1.0 - form_adj - strength_adj)
-
-    # Winner mentality signal (v7.1 spirit, moderated for v9 stability).
-    home_ratio = reg_home / max(1e-9, reg_away)
-    away_ratio = reg_away / max(1e-9, reg_home)
-    ratio_threshold = 1.12
-    home_math_bonus = 0.0
-    away_math_bonus = 0.0
-    math_winner_side = "none"
-    if home_ratio > ratio_threshold and home_ratio >= away_ratio:
-        home_math_bonus = _clip((home_ratio - ratio_threshold) * 0.045, 0.0, 0.030)
-        math_winner_side = "home"
-    elif away_ratio > ratio_threshold:
-        away_math_bonus = _clip((away_ratio - ratio_threshold) * 0.045, 0.0, 0.030)
-        math_winner_side = "away"
-
-    lambda_home *= 1.0 + home_math_bonus
-    lambda_away *= 1.0 + away_math_bonus
-
     lineup_ctx = {
         "home_source": "off",
         "away_source": "off",
@@ -1377,12 +1271,6 @@ def simulate_match(
         "home_attack_penalty": 0.0,
         "away_attack_penalty": 0.0,
     }
-    calibration_ctx = {
-        "enabled": False,
-        "path": CALIBRATION_PATH,
-        "home_multiplier": 1.0,
-        "away_multiplier": 1.0,
-    }
     progression_ctx = {
         "home_xt_proxy": None,
         "away_xt_proxy": None,
@@ -1398,15 +1286,9 @@ def simulate_match(
     }
     key_matchups = []
     position_battles = []
-    math_winner_ctx = {
-        "winner_side": math_winner_side,
-        "home_ratio": float(home_ratio),
-        "away_ratio": float(away_ratio),
-        "home_bonus": float(home_math_bonus),
-        "away_bonus": float(away_math_bonus),
-        "ratio_threshold": float(ratio_threshold),
-    }
 
+    home_factors = []
+    away_factors = []
     lineup_quality_adj = 0.0
     home_matchup_adj = 0.0
     away_matchup_adj = 0.0
@@ -1434,8 +1316,8 @@ def simulate_match(
     progression_home_adj = progression_edge + counter_home
     progression_away_adj = (-progression_edge) + counter_away
 
-    lambda_home *= 1.0 + progression_home_adj
-    lambda_away *= 1.0 + progression_away_adj
+    home_factors.append(1.0 + progression_home_adj)
+    away_factors.append(1.0 + progression_away_adj)
 
     progression_ctx = {
         "home_xt_proxy": (home_progression or {}).get("xt_proxy"),
@@ -1456,8 +1338,8 @@ def simulate_match(
 
         tactical_home_adj = home_tactical["attack_adjustment"]
         tactical_away_adj = away_tactical["attack_adjustment"]
-        lambda_home *= 1.0 + tactical_home_adj
-        lambda_away *= 1.0 + tactical_away_adj
+        home_factors.append(1.0 + tactical_home_adj)
+        away_factors.append(1.0 + tactical_away_adj)
 
         tactical_ctx = {
             "enabled": True,
@@ -1514,10 +1396,10 @@ def simulate_match(
                     home_defense_delta_opp = _clip(-home_profile["defense_delta"] * 0.42, -0.07, 0.08)
                     away_defense_delta_opp = _clip(-away_profile["defense_delta"] * 0.42, -0.07, 0.08)
 
-                    lambda_home *= 1.0 + lineup_quality_adj
-                    lambda_away *= 1.0 - lineup_quality_adj
-                    lambda_home *= 1.0 + home_attack_delta_adj + away_defense_delta_opp
-                    lambda_away *= 1.0 + away_attack_delta_adj + home_defense_delta_opp
+                    home_factors.append(1.0 + lineup_quality_adj)
+                    away_factors.append(1.0 - lineup_quality_adj)
+                    home_factors.append(1.0 + home_attack_delta_adj + away_defense_delta_opp)
+                    away_factors.append(1.0 + away_attack_delta_adj + home_defense_delta_opp)
 
                     matchup_data = _derive_matchups(home_profile, away_profile)
                     home_matchup_adj = matchup_data["home_adj"]
@@ -1525,16 +1407,16 @@ def simulate_match(
                     key_matchups = matchup_data["highlights"]
                     position_battles = matchup_data.get("position_battles", [])
 
-                    lambda_home *= 1.0 + home_matchup_adj
-                    lambda_away *= 1.0 + away_matchup_adj
+                    home_factors.append(1.0 + home_matchup_adj)
+                    away_factors.append(1.0 + away_matchup_adj)
 
-                    home_fatigue = _compute_fatigue(league, home_team, home_profile["actual"]["load_index"])
-                    away_fatigue = _compute_fatigue(league, away_team, away_profile["actual"]["load_index"])
+                    home_fatigue = _compute_fatigue(league, home_team, home_profile["actual"]["load_index"], as_of=as_of)
+                    away_fatigue = _compute_fatigue(league, away_team, away_profile["actual"]["load_index"], as_of=as_of)
 
-                    lambda_home *= 1.0 - home_fatigue["attack_penalty"]
-                    lambda_away *= 1.0 - away_fatigue["attack_penalty"]
-                    lambda_home *= 1.0 + away_fatigue["defense_leak"]
-                    lambda_away *= 1.0 + home_fatigue["defense_leak"]
+                    home_factors.append(1.0 - home_fatigue["attack_penalty"])
+                    away_factors.append(1.0 - away_fatigue["attack_penalty"])
+                    home_factors.append(1.0 + away_fatigue["defense_leak"])
+                    away_factors.append(1.0 + home_fatigue["defense_leak"])
 
                     fatigue_ctx = {
                         "home_attack_penalty": home_fatigue["attack_penalty"],
@@ -1564,10 +1446,9 @@ def simulate_match(
     tactical_regime = _classify_tactical_regime(tactical_ctx)
     tactical_ctx["regime"] = tactical_regime
 
-    calibration = _load_model_calibration(CALIBRATION_PATH)
-    lambda_home, lambda_away, calibration_ctx = _apply_model_calibration(
-        lambda_home=lambda_home,
-        lambda_away=lambda_away,
+    _, _, calibration_ctx = _apply_model_calibration(
+        lambda_home=1.0,
+        lambda_away=1.0,
         calibration=calibration,
         league=league,
         home_team=home_team,
@@ -1575,6 +1456,185 @@ def simulate_match(
         tactical_regime=tactical_regime,
     )
 
+    return {
+        "home_factors": home_factors,
+        "away_factors": away_factors,
+        "lineup_context": lineup_ctx,
+        "fatigue_context": fatigue_ctx,
+        "calibration_context": calibration_ctx,
+        "progression_context": progression_ctx,
+        "tactical_context": tactical_ctx,
+        "key_matchups": key_matchups,
+        "position_battles": position_battles,
+        "lineup_quality_adj": lineup_quality_adj,
+        "progression_home_adj": progression_home_adj,
+        "progression_away_adj": progression_away_adj,
+        "tactical_home_adj": tactical_home_adj,
+        "tactical_away_adj": tactical_away_adj,
+        "home_matchup_adj": home_matchup_adj,
+        "away_matchup_adj": away_matchup_adj,
+        "home_attack_penalty": home_fatigue["attack_penalty"],
+        "away_attack_penalty": away_fatigue["attack_penalty"],
+    }
+
+
+def _bonus_text(home_adv, form_adj, strength_adj, home_math_bonus, away_math_bonus, signals, rho):
+    tactical_ctx = signals["tactical_context"]
+    calibration_ctx = signals["calibration_context"]
+    lineup_quality_adj = signals["lineup_quality_adj"]
+    progression_home_adj = signals["progression_home_adj"]
+    progression_away_adj = signals["progression_away_adj"]
+    home_matchup_adj = signals["home_matchup_adj"]
+    away_matchup_adj = signals["away_matchup_adj"]
+    home_penalty = signals["home_attack_penalty"]
+    away_penalty = signals["away_attack_penalty"]
+
+    bonus_parts = [
+        f"HomeAdv x{home_adv:.2f}",
+        f"Form {form_adj*100:+.1f}%",
+        f"Strength {strength_adj*100:+.1f}%",
+    ]
+    if abs(lineup_quality_adj) > 1e-6:
+        bonus_parts.append(f"Lineup {lineup_quality_adj*100:+.1f}%")
+    if home_math_bonus > 1e-6 or away_math_bonus > 1e-6:
+        bonus_parts.append(f"MathWinner H{home_math_bonus*100:+.1f}% A{away_math_bonus*100:+.1f}%")
+    if abs(progression_home_adj) > 1e-6 or abs(progression_away_adj) > 1e-6:
+        bonus_parts.append(f"Progression H{progression_home_adj*100:+.1f}% A{progression_away_adj*100:+.1f}%")
+    if tactical_ctx.get("enabled"):
+        bonus_parts.append(f"Tactical H{signals['tactical_home_adj']*100:+.1f}% A{signals['tactical_away_adj']*100:+.1f}%")
+        tempo_txt = _safe_float(tactical_ctx.get("tempo"), None)
+        balance_txt = _safe_float(tactical_ctx.get("balance"), None)
+        if tempo_txt is not None and balance_txt is not None:
+            bonus_parts.append(f"Tactical tempo {tempo_txt:.2f} balance {balance_txt:.2f}")
+    if abs(home_matchup_adj) > 1e-6 or abs(away_matchup_adj) > 1e-6:
+        bonus_parts.append(f"Matchups H{home_matchup_adj*100:+.1f}% A{away_matchup_adj*100:+.1f}%")
+    if home_penalty > 0 or away_penalty > 0:
+        bonus_parts.append(f"Fatigue H-{home_penalty*100:.1f}% A-{away_penalty*100:.1f}%")
+    if calibration_ctx.get("enabled"):
+        bonus_parts.append(
+            f"Calibration Hx{calibration_ctx.get('home_multiplier', 1.0):.3f} Ax{calibration_ctx.get('away_multiplier', 1.0):.3f}"
+        )
+    bonus_parts.append(f"DC rho {rho:.3f}")
+    return " | ".join(bonus_parts)
+
+
+def simulate_match(
+    home_xg,
+    away_xg,
+    home_sofascore=None,
+    away_sofascore=None,
+    iterations=10000,
+    league=None,
+    home_team=None,
+    away_team=None,
+    context_text=None,
+    home_progression=None,
+    away_progression=None,
+    home_flow=None,
+    away_flow=None,
+    seed=match_montecarlo.DEFAULT_SEED,
+    as_of=None,
+):
+    """
+    Simulator v9
+    - Keeps v8 base (xG + goals/90 + shrinkage + Dixon-Coles)
+    - Adds Dynamic Lineup Strength from player-level data
+    - Adds Key Matchups (position-vs-position)
+    - Adds Fatigue adjustments from match logs
+    - Adds xT/Progression proxy adjustments
+    - `iterations` > 0 adds a seeded minute-by-minute Monte Carlo ("monte_carlo": HT/FT, next goal,
+      late goals) on the final lambdas; the analytic probabilities are unchanged
+    - `as_of` (backtests) computes fatigue from the matches played before that day instead of today
+    """
+    h_att = _safe_float(home_xg.get("attack", {}).get("xg_per_game"), 1.25)
+    h_def = _safe_float(home_xg.get("defense", {}).get("xga_per_game"), 1.20)
+    a_att = _safe_float(away_xg.get("attack", {}).get("xg_per_game"), 1.25)
+    a_def = _safe_float(away_xg.get("defense", {}).get("xga_per_game"), 1.20)
+
+    xg_home = (h_att + a_def) / 2.0
+    xg_away = (a_att + h_def) / 2.0
+
+    has_ss = home_sofascore is not None and away_sofascore is not None
+    if has_ss:
+        h_gf = _safe_float(home_sofascore.get("goals_scored_per_game"), xg_home)
+        h_ga = _safe_float(home_sofascore.get("goals_conceded_per_game"), h_def)
+        a_gf = _safe_float(away_sofascore.get("goals_scored_per_game"), xg_away)
+        a_ga = _safe_float(away_sofascore.get("goals_conceded_per_game"), a_def)
+        goals_home = (h_gf + a_ga) / 2.0
+        goals_away = (a_gf + h_ga) / 2.0
+        w_xg, w_goals = 0.58, 0.42
+    else:
+        goals_home, goals_away = xg_home, xg_away
+        w_xg, w_goals = 1.0, 0.0
+
+    base_home = (w_xg * xg_home) + (w_goals * goals_home)
+    base_away = (w_xg * xg_away) + (w_goals * goals_away)
+
+    prior_home, prior_away = 1.35, 1.20
+    shr = 0.86
+    reg_home = (shr * base_home) + ((1 - shr) * prior_home)
+    reg_away = (shr * base_away) + ((1 - shr) * prior_away)
+
+    # Calibrated to keep baseline home tilt near ~5-6% (including prior shrinkage effect).
+    home_adv, away_dis = 1.034, 0.996
+    h_form = _safe_float(home_xg.get("form_last_5"), 7.5)
+    a_form = _safe_float(away_xg.get("form_last_5"), 7.5)
+    form_adj = _clip(((h_form - a_form) / 15.0) * 0.08, -0.04, 0.04)
+
+    strength_raw = math.log((reg_home + 0.05) / (reg_away + 0.05))
+    strength_adj = _clip(math.tanh(strength_raw) * 0.06, -0.06, 0.06)
+
+    lambda_home = reg_home * home_adv * (1.0 + form_adj + strength_adj)
+    lambda_away = reg_away * away_dis * (1.0 - form_adj - strength_adj)
+
+    # Winner mentality signal (v7.1 spirit, moderated for v9 stability).
+    home_ratio = reg_home / max(1e-9, reg_away)
+    away_ratio = reg_away / max(1e-9, reg_home)
+    ratio_threshold = 1.12
+    home_math_bonus = 0.0
+    away_math_bonus = 0.0
+    math_winner_side = "none"
+    if home_ratio > ratio_threshold and home_ratio >= away_ratio:
+        home_math_bonus = _clip((home_ratio - ratio_threshold) * 0.045, 0.0, 0.030)
+        math_winner_side = "home"
+    elif away_ratio > ratio_threshold:
+        away_math_bonus = _clip((away_ratio - ratio_threshold) * 0.045, 0.0, 0.030)
+        math_winner_side = "away"
+
+    lambda_home *= 1.0 + home_math_bonus
+    lambda_away *= 1.0 + away_math_bonus
+
+    math_winner_ctx = {
+        "winner_side": math_winner_side,
+        "home_ratio": float(home_ratio),
+        "away_ratio": float(away_ratio),
+        "home_bonus": float(home_math_bonus),
+        "away_bonus": float(away_math_bonus),
+        "ratio_threshold": float(ratio_threshold),
+    }
+
+    signals = _fixture_signals(
+        league=league,
+        home_team=home_team,
+        away_team=away_team,
+        context_text=context_text,
+        home_progression=home_progression,
+        away_progression=away_progression,
+        home_flow=home_flow,
+        away_flow=away_flow,
+        calibration=_load_model_calibration(CALIBRATION_PATH),
+        as_of=as_of,
+    )
+    for factor in signals["home_factors"]:
+        lambda_home *= factor
+    for factor in signals["away_factors"]:
+        lambda_away *= factor
+    calibration_ctx = signals["calibration_context"]
+    if calibration_ctx.get("enabled"):
+        lambda_home = lambda_home * calibration_ctx["home_multiplier"]
+        lambda_away = lambda_away * calibration_ctx["away_multiplier"]
+    tactical_ctx = signals["tactical_context"]
+
     lambda_home = _clip(lambda_home, 0.25, 3.8)
     lambda_away = _clip(lambda_away, 0.25, 3.8)
 
@@ -1605,34 +1665,17 @@ def simulate_match(
     most_likely_score = f"{best[0]}-{best[1]}"
     top3_scores = ", ".join([f"{h}-{a} ({p*100:.1f}%)" for h, a, p in top3])
 
-    bonus_parts = [
-        f"HomeAdv x{home_adv:.2f}",
-        f"Form {form_adj*100:+.1f}%",
-        f"Strength {strength_adj*100:+.1f}%",
-    ]
-    if abs(lineup_quality_adj) > 1e-6:
-        bonus_parts.append(f"Lineup {lineup_quality_adj*100:+.1f}%")
-    if home_math_bonus > 1e-6 or away_math_bonus > 1e-6:
-        bonus_parts.append(f"MathWinner H{home_math_bonus*100:+.1f}% A{away_math_bonus*100:+.1f}%")
-    if abs(progression_home_adj) > 1e-6 or abs(progression_away_adj) > 1e-6:
-        bonus_parts.append(f"Progression H{progression_home_adj*100:+.1f}% A{progression_away_adj*100:+.1f}%")
-    if tactical_ctx.get("enabled"):
-        bonus_parts.append(f"Tactical H{tactical_home_adj*100:+.1f}% A{tactical_away_adj*100:+.1f}%")
-        tempo_txt = _safe_float(tactical_ctx.get("tempo"), None)
-        balance_txt = _safe_float(tactical_ctx.get("balance"), None)
-        if tempo_txt is not None and balance_txt is not None:
-            bonus_parts.append(f"Tactical tempo {tempo_txt:.2f} balance {balance_txt:.2f}")
-    if abs(home_matchup_adj) > 1e-6 or abs(away_matchup_adj) > 1e-6:
-        bonus_parts.append(f"Matchups H{home_matchup_adj*100:+.1f}% A{away_matchup_adj*100:+.1f}%")
-    if home_fatigue["attack_penalty"] > 0 or away_fatigue["attack_penalty"] > 0:
-        bonus_parts.append(
-            f"Fatigue H-{home_fatigue['attack_penalty']*100:.1f}% A-{away_fatigue['attack_penalty']*100:.1f}%"
-        )
-    if calibration_ctx.get("enabled"):
-        bonus_parts.append(
-            f"Calibration Hx{calibration_ctx.get('home_multiplier', 1.0):.3f} Ax{calibration_ctx.get('away_multiplier', 1.0):.3f}"
+    bonus_text = _bonus_text(home_adv, form_adj, strength_adj, home_math_bonus, away_math_bonus, signals, rho)
+
+    monte_carlo = None
+    if iterations and int(iterations) > 0:
+        monte_carlo = match_montecarlo.simulate_minutes(
+            lambda_home,
+            lambda_away,
+            iterations=iterations,
+            seed=seed,
+            fatigue_context=signals["fatigue_context"],
         )
-    bonus_parts.append(f"DC rho {rho:.3f}")
 
     return {
         "home_win_prob": home_win_prob,
@@ -1644,19 +1687,180 @@ def simulate_match(
         "top3_scores": top3_scores,
         "base_exp_home": float(base_home),
         "base_exp_away": float(base_away),
-        "bonus_applied": " | ".join(bonus_parts),
+        "bonus_applied": bonus_text,
         "model_version": "v9",
-        "lineup_context": lineup_ctx,
-        "fatigue_context": fatigue_ctx,
+        "lineup_context": signals["lineup_context"],
+        "fatigue_context": signals["fatigue_context"],
         "calibration_context": calibration_ctx,
-        "progression_context": progression_ctx,
+        "progression_context": signals["progression_context"],
         "tactical_context": tactical_ctx,
-        "key_matchups": key_matchups,
-        "position_battles": position_battles,
+        "key_matchups": signals["key_matchups"],
+        "position_battles": signals["position_battles"],
         "math_winner_context": math_winner_ctx,
+        "dixon_coles_rho": float(rho),
+        "monte_carlo": monte_carlo,
     }
 
 
+def _fixture_bases(fixture):
+    home_xg = fixture["home_xg"]
+    away_xg = fixture["away_xg"]
+    home_sofascore = fixture.get("home_sofascore")
+    away_sofascore = fixture.get("away_sofascore")
+    h_att = _safe_float(home_xg.get("attack", {}).get("xg_per_game"), 1.25)
+    h_def = _safe_float(home_xg.get("defense", {}).get("xga_per_game"), 1.20)
+    a_att = _safe_float(away_xg.get("attack", {}).get("xg_per_game"), 1.25)
+    a_def = _safe_float(away_xg.get("defense", {}).get("xga_per_game"), 1.20)
+    xg_home = (h_att + a_def) / 2.0
+    xg_away = (a_att + h_def) / 2.0
+    if home_sofascore is not None and away_sofascore is not None:
+        h_gf = _safe_float(home_sofascore.get("goals_scored_per_game"), xg_home)
+        h_ga = _safe_float(home_sofascore.get("goals_conceded_per_game"), h_def)
+        a_gf = _safe_float(away_sofascore.get("goals_scored_per_game"), xg_away)
+        a_ga = _safe_float(away_sofascore.get("goals_conceded_per_game"), a_def)
+        goals_home = (h_gf + a_ga) / 2.0
+        goals_away = (a_gf + h_ga) / 2.0
+        w_xg = 0.58
+    else:
+        goals_home, goals_away = xg_home, xg_away
+        w_xg = 1.0
+    return (
+        xg_home,
+        xg_away,
+        goals_home,
+        goals_away,
+        w_xg,
+        _safe_float(home_xg.get("form_last_5"), 7.5),
+        _safe_float(away_xg.get("form_last_5"), 7.5),
+    )
+
+
+def simulate_matches(fixtures, max_goals=10, top_n=3):
+    """
+    Batch simulate_match: `fixtures` is a sequence of dicts holding simulate_match keyword arguments
+    (home_xg and away_xg required). Player/fatigue/tactical signals are gathered per fixture, then the
+    lambda pipeline and every Dixon-Coles score matrix are computed as arrays in one pass.
+    Returns one simulate_match-shaped dict per fixture, plus its market_pricing "bet_data"/"bet_detail".
+    The per-fixture Monte Carlo layer is not run here ("monte_carlo" is None; `iterations` is ignored).
+    """
+    fixtures = list(fixtures)
+    if not fixtures:
+        return []
+    calibration = _load_model_calibration(CALIBRATION_PATH)
+    signal_keys = (
+        "league",
+        "home_team",
+        "away_team",
+        "context_text",
+        "home_progression",
+        "away_progression",
+        "home_flow",
+        "away_flow",
+        "as_of",
+    )
+    signals = [_fixture_signals(calibration=calibration, **{k: f.get(k) for k in signal_keys}) for f in fixtures]
+    (xg_home, xg_away, goals_home, goals_away, w_xg, h_form, a_form) = (
+        np.array(col, dtype=float) for col in zip(*[_fixture_bases(f) for f in fixtures])
+    )
+
+    base_home = (w_xg * xg_home) + ((1.0 - w_xg) * goals_home)
+    base_away = (w_xg * xg_away) + ((1.0 - w_xg) * goals_away)
+    prior_home, prior_away = 1.35, 1.20
+    shr = 0.86
+    reg_home = (shr * base_home) + ((1 - shr) * prior_home)
+    reg_away = (shr * base_away) + ((1 - shr) * prior_away)
+
+    home_adv, away_dis = 1.034, 0.996
+    form_adj = np.clip(((h_form - a_form) / 15.0) * 0.08, -0.04, 0.04)
+    strength_adj = np.clip(np.tanh(np.log((reg_home + 0.05) / (reg_away + 0.05))) * 0.06, -0.06, 0.06)
+    lambda_home = reg_home * home_adv * (1.0 + form_adj + strength_adj)
+    lambda_away = reg_away * away_dis * (1.0 - form_adj - strength_adj)
+
+    ratio_threshold = 1.12
+    home_ratio = reg_home / np.maximum(1e-9, reg_away)
+    away_ratio = reg_away / np.maximum(1e-9, reg_home)
+    home_wins = (home_ratio > ratio_threshold) & (home_ratio >= away_ratio)
+    away_wins = ~home_wins & (away_ratio > ratio_threshold)
+    home_math_bonus = np.where(home_wins, np.clip((home_ratio - ratio_threshold) * 0.045, 0.0, 0.030), 0.0)
+    away_math_bonus = np.where(away_wins, np.clip((away_ratio - ratio_threshold) * 0.045, 0.0, 0.030), 0.0)
+    lambda_home = lambda_home * (1.0 + home_math_bonus)
+    lambda_away = lambda_away * (1.0 + away_math_bonus)
+
+    # Ragged per-fixture factor lists, padded with 1.0 and applied in their original order.
+    for side, lam in (("home", lambda_home), ("away", lambda_away)):
+        width = max(len(s[f"{side}_factors"]) for s in signals)
+        factors = np.ones((len(signals), width))
+        for i, s in enumerate(signals):
+            factors[i, : len(s[f"{side}_factors"])] = s[f"{side}_factors"]
+        for col in range(width):
+            lam *= factors[:, col]
+        lam *= [s["calibration_context"][f"{side}_multiplier"] for s in signals]
+
+    lambda_home = np.clip(lambda_home, 0.25, 3.8)
+    lambda_away = np.clip(lambda_away, 0.25, 3.8)
+
+    close = np.clip(1.0 - np.abs(np.log((lambda_home + 0.05) / (lambda_away + 0.05))) / 1.2, 0.0, 1.0)
+    rho = -0.03 - (0.07 * close)
+    tactical = np.array([bool(s["tactical_context"].get("enabled")) for s in signals])
+    tempo = np.array([_safe_float(s["tactical_context"].get("tempo"), 0.5) for s in signals])
+    balance = np.array([_safe_float(s["tactical_context"].get("balance"), 0.5) for s in signals])
+    tactical_rho = np.clip(rho + (tempo - 0.5) * 0.04 + (0.5 - balance) * 0.03, -0.13, -0.01)
+    rho = np.where(tactical, tactical_rho, rho)
+
+    mats = market_pricing.score_matrices(lambda_home, lambda_away, rho=rho, max_goals=max_goals)
+    tables = market_pricing.bet_tables(mats)
+
+    results = []
+    for i, s in enumerate(signals):
+        tactical_ctx = s["tactical_context"]
+        tactical_ctx["rho_adjustment"] = float(rho[i] + (0.03 + (0.07 * close[i]))) if tactical[i] else 0.0
+        bet_data, bet_detail = tables[i]
+        top = market_pricing.top_scores(mats[i], top_n=top_n)
+        results.append(
+            {
+                "home_win_prob": bet_data["Home_Win"] * 100,
+                "draw_prob": bet_data["Draw"] * 100,
+                "away_win_prob": bet_data["Away_Win"] * 100,
+                "expected_goals_home": float(lambda_home[i]),
+                "expected_goals_away": float(lambda_away[i]),
+                "most_likely_score": f"{top[0][0]}-{top[0][1]}",
+                "top3_scores": ", ".join([f"{h}-{a} ({p*100:.1f}%)" for h, a, p in top]),
+                "base_exp_home": float(base_home[i]),
+                "base_exp_away": float(base_away[i]),
+                "bonus_applied": _bonus_text(
+                    home_adv,
+                    float(form_adj[i]),
+                    float(strength_adj[i]),
+                    float(home_math_bonus[i]),
+                    float(away_math_bonus[i]),
+                    s,
+                    float(rho[i]),
+                ),
+                "model_version": "v9",
+                "lineup_context": s["lineup_context"],
+                "fatigue_context": s["fatigue_context"],
+                "calibration_context": s["calibration_context"],
+                "progression_context": s["progression_context"],
+                "tactical_context": tactical_ctx,
+                "key_matchups": s["key_matchups"],
+                "position_battles": s["position_battles"],
+                "math_winner_context": {
+                    "winner_side": "home" if home_wins[i] else ("away" if away_wins[i] else "none"),
+                    "home_ratio": float(home_ratio[i]),
+                    "away_ratio": float(away_ratio[i]),
+                    "home_bonus": float(home_math_bonus[i]),
+                    "away_bonus": float(away_math_bonus[i]),
+                    "ratio_threshold": float(ratio_threshold),
+                },
+                "dixon_coles_rho": float(rho[i]),
+                "monte_carlo": None,
+                "bet_data": bet_data,
+                "bet_detail": bet_detail,
+            }
+        )
+    return results
+
+
 if __name__ == "__main__":
     h_xg = {"attack": {"xg_per_game": 1.6}, "defense": {"xga_per_game": 1.1}, "form_last_5": 10}
     a_xg = {"attack": {"xg_per_game": 1.4}, "defense": {"xga_per_game": 1.3}, "form_last_5": 7}
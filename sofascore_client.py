@@ -0,0 +1,242 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SOFASCORE_API = "https://api.sofascore.com/api/v1"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Referer": "https://www.sofascore.com/",
+    "Origin": "https://www.sofascore.com",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+LEAGUE_CONFIG = {
+    "Premier_League": {"t_id": 17, "s_id": 76986},
+    "La_Liga": {"t_id": 8, "s_id": 77559},
+    "Bundesliga": {"t_id": 35, "s_id": 77333},
+    "Serie_A": {"t_id": 23, "s_id": 76457},
+    "Ligue_1": {"t_id": 34, "s_id": 77356},
+}
+
+# Old scrapers slept 2-4s before every request plus 15s per 50 requests: ~0.3 request/s on average.
+DEFAULT_RATE = 0.3
+DEFAULT_BURST = 2
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 15.0
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 120.0
+FORBIDDEN_BACKOFF_SECONDS = 60.0
+
+
+class SofaScoreBlocked(Exception):
+    """Raised on HTTP 403 when the client was asked to stop instead of waiting the block out."""
+
+
+class TokenBucket:
+    """
+    Request start limiter shared by every task of a client: `rate` starts per second on average
+    with bursts of up to `burst`. pause() empties the bucket until a deadline (server asked us to
+    back off), which holds back all tasks, not just the one that saw the 429.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds):
+        now = self._clock()
+        self._paused_until = max(self._paused_until, now + float(seconds))
+        self._tokens = 0.0
+        self._updated = now
+
+    async def acquire(self):
+        """Take one token, sleeping until one is available; returns the seconds waited."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now >= self._paused_until:
+                    self._tokens = min(self.burst, self._tokens + (now - max(self._updated, self._paused_until)) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = max(self._paused_until - now, 0.0) + max(1.0 - self._tokens, 0.0) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class SofaScoreClient:
+    """
+    asyncio client for the SofaScore JSON API shared by the scrapers. One keep-alive
+    requests.Session (pool sized to `concurrency`) does the HTTP on worker threads; a token bucket
+    keeps the request rate polite while at most `concurrency` requests are in flight, so the
+    politeness gaps overlap with other requests instead of adding up. Retries back off
+    exponentially, honouring Retry-After on 429. Counters are in `stats`.
+
+        async with SofaScoreClient() as client:
+            standings = await client.get_json("unique-tournament/17/season/76986/standings/total")
+    """
+
+    def __init__(
+        self,
+        rate=DEFAULT_RATE,
+        burst=DEFAULT_BURST,
+        concurrency=DEFAULT_CONCURRENCY,
+        retries=DEFAULT_RETRIES,
+        timeout=DEFAULT_TIMEOUT,
+        base_url=SOFASCORE_API,
+        backoff_base=BACKOFF_BASE_SECONDS,
+        backoff_max=BACKOFF_MAX_SECONDS,
+        forbidden_backoff=FORBIDDEN_BACKOFF_SECONDS,
+        stop_on_forbidden=False,
+        headers=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.retries = int(retries)
+        self.timeout = float(timeout)
+        self.backoff_base = float(backoff_base)
+        self.backoff_max = float(backoff_max)
+        self.forbidden_backoff = float(forbidden_backoff)
+        self.stop_on_forbidden = bool(stop_on_forbidden)
+        self.concurrency = max(int(concurrency), 1)
+        self.bucket = TokenBucket(rate, burst)
+        self.stats = {
+            "requests": 0,
+            "ok": 0,
+            "not_found": 0,
+            "failed": 0,
+            "retries": 0,
+            "throttled": 0,
+            "forbidden": 0,
+            "errors": 0,
+            "rate_wait_seconds": 0.0,
+            "backoff_seconds": 0.0,
+        }
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="sofascore")
+        self._session = requests.Session()
+        self._session.headers.update(headers or HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def url(self, path):
+        return path if path.startswith(("http://", "https://")) else f"{self.base_url}/{path.lstrip('/')}"
+
+    def _fetch(self, url):
+        """(status, payload, retry_after) of one GET; payload is None unless a 200 parsed as JSON."""
+        response = self._session.get(url, timeout=self.timeout)
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        if response.status_code != 200:
+            return response.status_code, None, retry_after
+        return 200, response.json(), retry_after
+
+    def _backoff(self, attempt):
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return delay * random.uniform(0.8, 1.2)
+
+    async def get_json(self, path):
+        """Parsed JSON of an API path (or absolute URL); None on 404 or once the retries are spent."""
+        url = self.url(path)
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            async with self._slots:
+                self.stats["rate_wait_seconds"] += await self.bucket.acquire()
+                self.stats["requests"] += 1
+                try:
+                    status, payload, retry_after = await loop.run_in_executor(self._executor, self._fetch, url)
+                except Exception as ex:
+                    status, payload, retry_after = None, None, None
+                    print(f"    Exception {ex}: {url}")
+
+            if status == 200:
+                self.stats["ok"] += 1
+                return payload
+            if status == 404:
+                self.stats["not_found"] += 1
+                return None
+            if status == 403:
+                self.stats["forbidden"] += 1
+                delay = max(retry_after or 0.0, self.forbidden_backoff)
+                # Hold back every queued request before deciding whether to give up.
+                self.bucket.pause(delay)
+                if self.stop_on_forbidden:
+                    raise SofaScoreBlocked(f"403 Forbidden: {url}")
+            elif status == 429:
+                self.stats["throttled"] += 1
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                self.bucket.pause(delay)
+            else:
+                self.stats["errors"] += 1
+                delay = self._backoff(attempt)
+                if status is not None:
+                    print(f"    Error {status}: {url}")
+
+            if attempt == self.retries:
+                break
+            self.stats["retries"] += 1
+            self.stats["backoff_seconds"] += delay
+            print(f"    Retrying in {delay:.1f}s ({status or 'exception'}): {url}")
+            await asyncio.sleep(delay)
+
+        self.stats["failed"] += 1
+        return None
+
+    def summary(self):
+        s = self.stats
+        return (
+            f"{s['requests']} request(s): {s['ok']} ok, {s['not_found']} not found, {s['failed']} failed; "
+            f"{s['retries']} retries ({s['throttled']} x 429, {s['forbidden']} x 403, {s['errors']} other), "
+            f"rate wait {s['rate_wait_seconds']:.0f}s, backoff {s['backoff_seconds']:.0f}s"
+        )
+
+
+async def gather_all(aws):
+    """asyncio.gather of `aws` that cancels the remaining tasks as soon as one of them raises."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _parse_retry_after(value):
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+async def league_teams(client, t_id, s_id):
+    """[{name, id, matches}] of a season's standings table, None when it cannot be loaded."""
+    data = await client.get_json(f"unique-tournament/{t_id}/season/{s_id}/standings/total")
+    try:
+        return [
+            {"name": row["team"]["name"], "id": row["team"]["id"], "matches": row.get("matches", 0)}
+            for row in data["standings"][0]["rows"]
+        ]
+    except (KeyError, IndexError, TypeError):
+        return None
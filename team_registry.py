@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+
+REGISTRY_DIRNAME = "data_store"
+REGISTRY_NAME = "team_registry.json"
+REGISTRY_VERSION = 1
+
+# Per-team data sources: source -> (root dir, filename suffix). Files live at {root}/{league}/{team}{suffix}.
+TEAM_SOURCES = {
+    "player_stats": ("sofaplayer", "_stats.xlsx"),
+    "positions": ("position", "_positions.xlsx"),
+    "match_logs": ("Match Logs", ".xlsx"),
+    "opta": ("output_opta", ".xlsx"),
+}
+# Source whose file names define the canonical team list of a league (first one present wins).
+CANONICAL_SOURCES = ["player_stats", "match_logs"]
+# Seconds a process trusts its registry before rescanning the data directories for changes.
+RECHECK_SECONDS = 30.0
+
+_REGISTRIES = {}
+_CHECKED_AT = {}
+_ALIAS_DIGEST = []
+
+
+def norm_text(text):
+    text = "" if text is None else str(text)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+    text = re.sub(r"[^0-9a-zA-Z\s]", " ", text).lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def name_score(target_norm, stem_norm):
+    """File-name similarity used by every team resolver: exact > substring > shared tokens."""
+    if stem_norm == target_norm:
+        return 100
+    if target_norm and (target_norm in stem_norm or stem_norm in target_norm):
+        return 40 + min(len(target_norm), len(stem_norm))
+    a_tokens = set(target_norm.split())
+    b_tokens = set(stem_norm.split())
+    if not a_tokens or not b_tokens:
+        return 0
+    return len(a_tokens.intersection(b_tokens)) * 6
+
+
+def _alias_maps():
+    # Imported lazily: both modules import this one.
+    from simulator_v9 import TEAM_NAME_ALIASES
+    from xg_engine import TEAM_ALIASES
+
+    return [TEAM_NAME_ALIASES, TEAM_ALIASES]
+
+
+def _directory_signature(root):
+    dirs = {}
+    for base, _ in TEAM_SOURCES.values():
+        base_dir = os.path.join(root, base)
+        if not os.path.isdir(base_dir):
+            continue
+        dirs[base] = os.stat(base_dir).st_mtime_ns
+        for entry in os.scandir(base_dir):
+            if entry.is_dir():
+                dirs[f"{base}/{entry.name}"] = entry.stat().st_mtime_ns
+    if not _ALIAS_DIGEST:
+        alias_blob = json.dumps([sorted(m.items()) for m in _alias_maps()], ensure_ascii=False)
+        _ALIAS_DIGEST.append(hashlib.sha1(alias_blob.encode("utf-8")).hexdigest())
+    return {"dirs": dirs, "aliases": _ALIAS_DIGEST[0]}
+
+
+class TeamRegistry:
+    """
+    Team names known to the data directories: per-source file listings, one record per
+    canonical team (id, league, file per source) and a normalized alias -> team id index.
+    File resolution results are memoized, so a name is only scored against a listing once.
+    """
+
+    def __init__(self, root, data):
+        self.root = root
+        self.signature = data.get("signature") or {}
+        self.listings = data.get("files") or {}
+        self.teams = data.get("teams") or {}
+        self.aliases = data.get("aliases") or {}
+        self._memo = {}
+
+    def leagues(self, source):
+        return list(self.listings.get(source, {}).keys())
+
+    def files(self, source, league):
+        return self.listings.get(source, {}).get(league, [])
+
+    def memo(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def resolve(self, source, league, team_name, candidates=None, normalize=norm_text):
+        """
+        File name (not path) for a team in {root}/{league}/ of a source: a direct hit on one of
+        `candidates` first, otherwise the best name_score over the listing (None below 6).
+        """
+        candidates = tuple(candidates) if candidates else (str(team_name),)
+        key = ("resolve", source, league, str(team_name), candidates, normalize)
+        return self.memo(key, lambda: self._resolve(source, league, team_name, candidates, normalize))
+
+    def _resolve(self, source, league, team_name, candidates, normalize):
+        if league not in self.listings.get(source, {}):
+            return None
+        suffix = TEAM_SOURCES[source][1]
+        fnames = self.files(source, league)
+        present = set(fnames)
+        for candidate in candidates:
+            direct = f"{candidate}{suffix}"
+            if direct in present:
+                return direct
+
+        target_norm = normalize(team_name)
+        best_name = None
+        best_score = -1
+        for fname in fnames:
+            if not fname.lower().endswith(suffix):
+                continue
+            score = name_score(target_norm, normalize(fname[: -len(suffix)]))
+            if score > best_score:
+                best_score = score
+                best_name = fname
+        return best_name if best_score >= 6 else None
+
+    def lookup(self, team_name):
+        """Team record for a known name or alias (exact normalized hit), else None."""
+        team_id = self.aliases.get(norm_text(team_name))
+        return self.teams.get(team_id) if team_id else None
+
+
+def _build(root, signature):
+    listings = {}
+    for source, (base, suffix) in TEAM_SOURCES.items():
+        base_dir = os.path.join(root, base)
+        if not os.path.isdir(base_dir):
+            continue
+        per_league = {}
+        for league in os.listdir(base_dir):
+            league_dir = os.path.join(base_dir, league)
+            if os.path.isdir(league_dir):
+                per_league[league] = [f for f in os.listdir(league_dir) if f.lower().endswith(suffix)]
+        listings[source] = per_league
+
+    registry = TeamRegistry(root, {"signature": signature, "files": listings})
+    alias_maps = _alias_maps()
+    canonical = {}
+    for mapping in alias_maps:
+        for key, value in mapping.items():
+            canonical.setdefault(norm_text(key), value)
+
+    teams = {}
+    aliases = {}
+    leagues = []
+    for source in TEAM_SOURCES:
+        leagues.extend(lg for lg in registry.leagues(source) if lg not in leagues)
+
+    for league in leagues:
+        base_source = next((s for s in CANONICAL_SOURCES if registry.files(s, league)), None)
+        if base_source is None:
+            continue
+        suffix = TEAM_SOURCES[base_source][1]
+        for fname in registry.files(base_source, league):
+            name = fname[: -len(suffix)]
+            team_id = f"{league}/{name}"
+            mapped = canonical.get(norm_text(name), name)
+            candidates = [mapped, name] if mapped != name else [name]
+            files = {}
+            for source in TEAM_SOURCES:
+                resolved = registry.resolve(source, league, name, candidates)
+                if resolved:
+                    files[source] = resolved
+            teams[team_id] = {"id": team_id, "name": name, "league": league, "files": files}
+            aliases.setdefault(norm_text(name), team_id)
+
+    for team_id, team in teams.items():
+        for source, fname in team["files"].items():
+            suffix = TEAM_SOURCES[source][1]
+            aliases.setdefault(norm_text(fname[: -len(suffix)]), team_id)
+    for mapping in alias_maps:
+        for key, value in mapping.items():
+            key_norm, value_norm = norm_text(key), norm_text(value)
+            if value_norm in aliases:
+                aliases.setdefault(key_norm, aliases[value_norm])
+            elif key_norm in aliases:
+                aliases.setdefault(value_norm, aliases[key_norm])
+
+    registry.teams = teams
+    registry.aliases = aliases
+    return registry
+
+
+def _registry_path(root):
+    return os.path.join(root, REGISTRY_DIRNAME, REGISTRY_NAME)
+
+
+def _save(registry):
+    path = _registry_path(registry.root)
+    payload = {
+        "version": REGISTRY_VERSION,
+        "signature": registry.signature,
+        "files": registry.listings,
+        "teams": registry.teams,
+        "aliases": registry.aliases,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _load(root, signature):
+    try:
+        with open(_registry_path(root), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("version") != REGISTRY_VERSION or data.get("signature") != signature:
+        return None
+    return TeamRegistry(root, data)
+
+
+def get_registry(root=".", reload=False):
+    """
+    Registry for the data directories under `root` (the working directory by default).
+    Loaded from data_store/team_registry.json and rebuilt when a source or league directory
+    changes (files added, removed or renamed) or the alias tables change. Within a process the
+    directories are rescanned for such changes at most every RECHECK_SECONDS, or right away
+    with reload=True; calls in between reuse the cached registry without touching the disk.
+    """
+    root = os.path.abspath(root)
+    registry = _REGISTRIES.get(root)
+    now = time.monotonic()
+    if registry is not None and not reload and now - _CHECKED_AT.get(root, 0.0) < RECHECK_SECONDS:
+        return registry
+    signature = _directory_signature(root)
+    _CHECKED_AT[root] = now
+    if registry is not None and registry.signature == signature:
+        return registry
+
+    registry = _load(root, signature)
+    if registry is None:
+        registry = _build(root, signature)
+        _save(registry)
+    _REGISTRIES[root] = registry
+    return registry
@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import analyze_match
+
+
+class TestAnalyzeMatchBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_fixtures_accepts_header_variants(self):
+        path = self.root / "fixtures.csv"
+        path.write_text(
+            "Home Team,Away Team,League,Target Score\n"
+            "Arsenal,Liverpool,Premier_League,2-1\n"
+            ",Chelsea,,\n"
+            "Getafe,Villarreal,,\n",
+            encoding="utf-8",
+        )
+        fixtures = analyze_match.load_fixtures(path)
+        self.assertEqual([(f["home"], f["away"]) for f in fixtures], [("Arsenal", "Liverpool"), ("Getafe", "Villarreal")])
+        self.assertEqual(fixtures[0]["target_score"], "2-1")
+        self.assertEqual(fixtures[1]["league"], "")
+        self.assertEqual(fixtures[1]["context"], "")
+
+        bad = self.root / "bad.csv"
+        bad.write_text("team,opponent\nArsenal,Liverpool\n", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            analyze_match.load_fixtures(bad)
+
+    def test_fixture_context_prefers_fixture_then_league_file(self):
+        (self.root / "Premier_League.txt").write_text("League: Premier_League\nleague-wide", encoding="utf-8")
+        (self.root / "Arsenal_Liverpool.txt").write_text("Match: Arsenal vs Liverpool", encoding="utf-8")
+        own = self.root / "own.txt"
+        own.write_text("own context", encoding="utf-8")
+
+        fixture = {"home": "Arsenal", "away": "Liverpool", "league": "Premier_League", "context": ""}
+        self.assertEqual(analyze_match._fixture_context(fixture, str(self.root)), "Match: Arsenal vs Liverpool")
+        fixture["context"] = str(own)
+        self.assertEqual(analyze_match._fixture_context(fixture, str(self.root)), "own context")
+
+        other = {"home": "Chelsea", "away": "Everton", "league": "Premier_League", "context": ""}
+        self.assertIn("league-wide", analyze_match._fixture_context(other, str(self.root)))
+        self.assertIn("No live context", analyze_match._fixture_context(other, None))
+
+    def test_write_predictions_jsonl(self):
+        path = self.root / "out.jsonl"
+        records = [{"Match": "A vs B", "Pred_Home_Win": 50.0}, {"Match": "C vs D", "Error": "boom"}]
+        analyze_match.write_predictions_jsonl(records, path)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(line) for line in lines], records)
+
+
+    def test_parent_warm_up_only_when_workers_fork(self):
+        class InlinePool:
+            def __init__(self, max_workers, initializer, initargs):
+                InlinePool.initargs = initargs
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def map(self, fn, tasks):
+                InlinePool.mapped = [task[0]["home"] for task in tasks]
+                return [fn(task) for task in tasks]
+
+        fixtures = [{"home": f"H{i}", "away": f"A{i}"} for i in range(4)]
+        fake_predict = lambda task: {"Match": task[0]["home"]}
+        for method, pooled in (("fork", ["H1", "H2", "H3"]), ("spawn", ["H0", "H1", "H2", "H3"])):
+            with mock.patch.object(analyze_match, "ProcessPoolExecutor", InlinePool), mock.patch.object(
+                analyze_match, "_predict_batch_fixture", fake_predict
+            ), mock.patch.object(analyze_match.multiprocessing, "get_start_method", return_value=method):
+                records = analyze_match.predict_fixtures(fixtures, workers=2)
+            self.assertEqual([r["Match"] for r in records], ["H0", "H1", "H2", "H3"])
+            self.assertEqual(InlinePool.mapped, pooled, msg=method)
+            self.assertEqual(InlinePool.initargs, (str(analyze_match.PROJECT_ROOT),))
+
+
+if __name__ == "__main__":
+    unittest.main()
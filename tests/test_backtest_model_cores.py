@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scripts import backtest_model_cores as backtest
+
+
+def _prefix_average(records):
+    out = {"n_matches": len(records)}
+    for key in backtest.METRIC_KEYS:
+        values = [r[key] for r in records if r.get(key) is not None]
+        out[key] = round(float(sum(values) / len(values)), 4) if values else None
+    return out
+
+
+class TestBacktestRollingAggregate(unittest.TestCase):
+    def test_incremental_summary_matches_prefix_average(self):
+        records = [
+            {"brier_1x2": 0.42, "log_loss_1x2": 0.91, "calibration_gap": 0.10, "score_mae": 1.0},
+            {"brier_1x2": 0.61, "log_loss_1x2": 1.20, "calibration_gap": 0.25, "score_mae": None},
+            {"brier_1x2": 0.18, "log_loss_1x2": 0.40, "calibration_gap": 0.05, "score_mae": 2.0},
+            {"brier_1x2": None, "log_loss_1x2": None, "calibration_gap": None, "score_mae": 0.0},
+        ]
+        rolling = backtest.RollingAggregate()
+        for i, record in enumerate(records, start=1):
+            rolling.add(record)
+            self.assertEqual(_prefix_average(records[:i]), rolling.summary())
+        self.assertEqual(_prefix_average(records), backtest._aggregate(records))
+
+    def test_empty_and_missing_metrics(self):
+        self.assertEqual({"n_matches": 0}, backtest._aggregate([]))
+        summary = backtest._aggregate([{"brier_1x2": 0.3}])
+        self.assertEqual(1, summary["n_matches"])
+        self.assertEqual(0.3, summary["brier_1x2"])
+        self.assertIsNone(summary["score_mae"])
+
+
+if __name__ == "__main__":
+    unittest.main()
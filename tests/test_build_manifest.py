@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import build_manifest
+
+STEP = "scripts/create_game_flow.py"
+IO = {
+    "inputs": ["sofascore_team_data/*_Team_Stats.xlsx"],
+    "outputs": ["game flow/*_GameFlow.xlsx"],
+    "partition": {
+        "inputs": "sofascore_team_data/{league}_Team_Stats.xlsx",
+        "outputs": "game flow/{league}_GameFlow.xlsx",
+        "arg": "--league",
+    },
+}
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self._write("scripts/create_game_flow.py", "import helper\nprint('flow')\n")
+        self._write("helper.py", "VALUE = 1\n")
+        for league in ("Premier_League", "La_Liga"):
+            self._write(f"sofascore_team_data/{league}_Team_Stats.xlsx", f"{league} stats")
+            self._write(f"game flow/{league}_GameFlow.xlsx", f"{league} flow")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rel_path, text):
+        path = self.root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def _plan(self, manifest):
+        code = manifest.code_digest(STEP)
+        inputs = manifest.snapshot(IO["inputs"])
+        return manifest.plan(STEP, IO, code, inputs), code, inputs
+
+    def _built(self):
+        manifest = build_manifest.BuildManifest(project_root=self.root)
+        (action, _, _), code, inputs = self._plan(manifest)
+        self.assertNotEqual(action, "skip")
+        manifest.record(STEP, IO, code, inputs)
+        manifest.save()
+        return build_manifest.BuildManifest(project_root=self.root)
+
+    def test_unchanged_step_is_skipped(self):
+        manifest = self._built()
+        (action, leagues, _), _, _ = self._plan(manifest)
+        self.assertEqual((action, leagues), ("skip", None))
+
+    def test_changed_input_or_output_rebuilds_only_that_league(self):
+        self._built()
+        self._write("sofascore_team_data/La_Liga_Team_Stats.xlsx", "new La Liga stats")
+        (action, leagues, _), _, _ = self._plan(build_manifest.BuildManifest(project_root=self.root))
+        self.assertEqual((action, leagues), ("partial", ["La_Liga"]))
+
+        manifest = self._built()
+        (self.root / "game flow" / "Premier_League_GameFlow.xlsx").unlink()
+        (action, leagues, _), _, _ = self._plan(manifest)
+        self.assertEqual((action, leagues), ("partial", ["Premier_League"]))
+
+    def test_same_content_rewrite_is_not_a_change(self):
+        manifest = self._built()
+        path = self.root / "sofascore_team_data" / "La_Liga_Team_Stats.xlsx"
+        st = os.stat(path)
+        os.utime(path, (st.st_atime, st.st_mtime + 60))
+        (action, _, _), _, _ = self._plan(manifest)
+        self.assertEqual(action, "skip")
+
+    def test_code_change_in_imported_module_rebuilds_everything(self):
+        manifest = self._built()
+        self._write("helper.py", "VALUE = 2\n")
+        (action, leagues, reason), _, _ = self._plan(manifest)
+        self.assertEqual((action, leagues, reason), ("run", None, "script changed"))
+
+    def test_partition_of(self):
+        self.assertEqual(build_manifest.partition_of("output_opta/{league}/*.xlsx", "output_opta/Serie_A/Inter.xlsx"), "Serie_A")
+        self.assertIsNone(build_manifest.partition_of("output_opta/{league}/*.xlsx", "output_opta/Serie_A_Team_Aggregates.xlsx"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import data_store
+
+
+@unittest.skipUnless(data_store.parquet_available(), "pyarrow not installed")
+class TestDataStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        logs_dir = self.root / "Match Logs" / "Premier_League"
+        logs_dir.mkdir(parents=True)
+        self.workbook = logs_dir / "Arsenal.xlsx"
+        with pd.ExcelWriter(self.workbook) as writer:
+            pd.DataFrame(
+                {"Date": ["2026-01-01", "2026-01-08"], "Result": ["W", "D"], "Mixed": [1, "n/a"]}
+            ).to_excel(writer, sheet_name="Scores & Fixtures", index=False)
+            pd.DataFrame({"Date": ["2026-01-01"], "Standard_xG": [1.7]}).to_excel(writer, sheet_name="Shooting", index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_and_read_through_store(self):
+        summary = data_store.build_store(project_root=self.root, log_callback=lambda _msg: None)
+        self.assertEqual(summary["compiled"], 1)
+        self.assertTrue((self.root / data_store.STORE_DIRNAME / data_store.MANIFEST_NAME).exists())
+
+        self.assertEqual(
+            data_store.sheet_names(self.workbook, project_root=self.root),
+            ["Scores & Fixtures", "Shooting"],
+        )
+        shooting = data_store.read_table(self.workbook, sheet_name="Shooting", project_root=self.root)
+        self.assertAlmostEqual(float(shooting["Standard_xG"].iloc[0]), 1.7)
+        first = data_store.read_table(self.workbook, sheet_name=0, project_root=self.root)
+        self.assertEqual(list(first["Result"]), ["W", "D"])
+        with self.assertRaises(ValueError):
+            data_store.read_table(self.workbook, sheet_name="Goalkeeping", project_root=self.root)
+
+        again = data_store.build_store(project_root=self.root, log_callback=lambda _msg: None)
+        self.assertEqual(again["compiled"], 0)
+        self.assertEqual(again["skipped"], 1)
+
+    def test_stale_store_falls_back_to_excel(self):
+        data_store.build_store(project_root=self.root, log_callback=lambda _msg: None)
+        with pd.ExcelWriter(self.workbook) as writer:
+            pd.DataFrame({"Date": ["2026-02-01"], "Standard_xG": [0.4]}).to_excel(writer, sheet_name="Shooting", index=False)
+        os.utime(self.workbook, (1, 1))
+
+        shooting = data_store.read_table(self.workbook, sheet_name="Shooting", project_root=self.root)
+        self.assertAlmostEqual(float(shooting["Standard_xG"].iloc[0]), 0.4)
+        self.assertEqual(data_store.sheet_names(self.workbook, project_root=self.root), ["Shooting"])
+
+    def test_table_cache_reused_until_file_changes(self):
+        first = data_store.cached_table(self.workbook, sheet_name="Shooting", project_root=self.root)
+        self.assertIs(data_store.cached_table(self.workbook, sheet_name="Shooting", project_root=self.root), first)
+
+        copy = data_store.read_table(self.workbook, sheet_name="Shooting", project_root=self.root)
+        copy.loc[0, "Standard_xG"] = 9.9
+        self.assertAlmostEqual(float(first["Standard_xG"].iloc[0]), 1.7)
+
+        with pd.ExcelWriter(self.workbook) as writer:
+            pd.DataFrame({"Date": ["2026-02-01"], "Standard_xG": [0.4]}).to_excel(writer, sheet_name="Shooting", index=False)
+        os.utime(self.workbook, (1, 1))
+        fresh = data_store.cached_table(self.workbook, sheet_name="Shooting", project_root=self.root)
+        self.assertIsNot(fresh, first)
+        self.assertAlmostEqual(float(fresh["Standard_xG"].iloc[0]), 0.4)
+
+
+class TestTeamRowIndex(unittest.TestCase):
+    def test_lookup_matches_scan_and_follows_file_changes(self):
+        import analyze_match
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "Premier_League_Team_Stats.xlsx"
+            df = pd.DataFrame({"Team_Name": ["Manchester City", "Manchester United", "Arsenal"], "goalsScored": [60, 40, 55]})
+            df.to_excel(path, index=False)
+
+            for name in ["Man Utd", "Manchester United", "Arsenal", "Nowhere FC"]:
+                expected = analyze_match._find_team_row(df, "Team_Name", name)
+                row = analyze_match._lookup_team_row(path, "Team_Name", name)
+                if expected is None:
+                    self.assertIsNone(row)
+                else:
+                    self.assertEqual(row["Team_Name"], expected["Team_Name"])
+
+            df.assign(goalsScored=[61, 41, 56]).to_excel(path, index=False)
+            os.utime(path, (1, 1))
+            self.assertEqual(int(analyze_match._lookup_team_row(path, "Team_Name", "Arsenal")["goalsScored"]), 56)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from demo_model_v2.feature_engine import FeatureEngine
+
+
+class _FakeLogLoader:
+    def __init__(self, logs):
+        self.logs = logs
+        self.calls = []
+
+    def load_match_log(self, team_name):
+        self.calls.append(team_name)
+        return self.logs.get(team_name)
+
+
+def _reference_rating(df_log, season, venue):
+    """The per-match loop the ratings table replaces."""
+    if venue:
+        df_log = df_log[df_log["Venue"] == venue]
+    xg_sum = xga_sum = weight_sum = 0.0
+    for i, row in df_log.iterrows():
+        weight = math.exp(-0.05 * i)
+        opp = season[season["team_name"] == row["Opponent"]]
+        opp_def = opp.iloc[0]["defense_strength"] if not opp.empty else 1.0
+        opp_att = opp.iloc[0]["attack_strength"] if not opp.empty else 1.0
+        xg_sum += row["xG"] / opp_def * weight
+        xga_sum += row["xGA"] / opp_att * weight
+        weight_sum += weight
+    if weight_sum == 0:
+        return None
+    return {"attack": xg_sum / weight_sum / 1.5, "defense": xga_sum / weight_sum / 1.5, "expected_goals_avg": xg_sum / weight_sum}
+
+
+class TestDemoV2FeatureEngine(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        teams = ["A", "B", "C", "D"]
+        self.season = pd.DataFrame(
+            {
+                "team_name": teams,
+                "attack_strength": [1.2, 0.9, 1.0, 0.8],
+                "defense_strength": [0.8, 1.1, 1.0, 1.3],
+            }
+        )
+        self.logs = {}
+        for team in teams[:3] + ["Outside"]:
+            n = 14
+            self.logs[team] = pd.DataFrame(
+                {
+                    "Date": pd.date_range("2026-01-01", periods=n, freq="-7D"),
+                    "Opponent": rng.choice(teams + ["Promoted"], size=n),
+                    "Venue": np.where(np.arange(n) % 2 == 0, "Home", "Away"),
+                    "xG": rng.uniform(0.3, 2.5, size=n),
+                    "xGA": rng.uniform(0.3, 2.5, size=n),
+                }
+            )
+        self.logs["C"] = self.logs["C"][self.logs["C"]["Venue"] == "Away"]
+
+    def test_table_matches_per_match_loop(self):
+        engine = FeatureEngine()
+        loader = _FakeLogLoader(self.logs)
+        for team in ["A", "B", "C", "Outside"]:
+            for venue in (None, "Home", "Away"):
+                got = engine._calculate_weighted_ratings(team, loader, season_stats_df=self.season, venue_filter=venue)
+                want = _reference_rating(self.logs[team], self.season, venue)
+                if want is None:
+                    self.assertIsNone(got)
+                    continue
+                for key, value in want.items():
+                    self.assertAlmostEqual(got[key], value, places=12)
+        self.assertIsNone(engine._calculate_weighted_ratings("D", loader, self.season, "Home"))
+        # One league-wide build, plus the team outside the season table.
+        self.assertEqual(loader.calls, ["A", "B", "C", "D", "Outside"])
+
+    def test_get_team_ratings_reads_the_table(self):
+        engine = FeatureEngine()
+        loader = _FakeLogLoader(self.logs)
+        table = engine.build_ratings_table(self.season, loader)
+        self.assertEqual(set(table["venue"]), {"All", "Home", "Away"})
+        self.assertEqual(int(table[(table["team_name"] == "C") & (table["venue"] == "All")]["matches"].iloc[0]), 7)
+
+        ratings = engine.get_team_ratings(self.season, "A", match_log_loader=loader, venue="Home")
+        row = table[(table["team_name"] == "A") & (table["venue"] == "Home")].iloc[0]
+        self.assertEqual(ratings["source"], "Weighted (Home)")
+        self.assertAlmostEqual(ratings["attack"], row["attack"], places=12)
+
+        fallback = engine.get_team_ratings(self.season, "D", match_log_loader=loader, venue="Away")
+        self.assertEqual(fallback["source"], "Season Average")
+        self.assertEqual(fallback["attack"], 0.8)
+
+
+if __name__ == "__main__":
+    unittest.main()
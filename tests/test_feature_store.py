@@ -0,0 +1,118 @@
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import feature_store
+import match_log
+import xg_engine
+
+
+def _make_log(rows=24, seed=7):
+    rng = np.random.default_rng(seed)
+    dates = list(pd.date_range("2025-08-10", periods=rows, freq="4D").strftime("%Y-%m-%d"))
+    dates[5] = dates[4]  # two rows on one day
+    order = rng.permutation(rows)
+    shooting = pd.DataFrame(
+        {
+            "For Arsenal_Date": [dates[i] for i in order],
+            "For Arsenal_Venue": [("Home" if i % 2 else "Away") for i in order],
+            "For Arsenal_Result": [("W", "D", "L")[i % 3] for i in order],
+            "For Arsenal_Goals For": [i % 4 for i in order],
+            "For Arsenal_Goals Against": [i % 3 for i in order],
+            "Standard_xG": np.where(rng.random(rows) < 0.15, np.nan, rng.random(rows) * 2.5),
+        }
+    )
+    # An unplayed fixture and an undated row are never part of any as-of window.
+    shooting.loc[len(shooting)] = ["2026-06-01", "Home", None, None, None, None]
+    shooting.loc[len(shooting)] = [None, "Away", "W", 2, 0, 1.1]
+    goalkeeping = shooting[["For Arsenal_Date"]].copy()
+    goalkeeping["Performance_PSxG"] = rng.random(len(goalkeeping)) * 2.0
+    return match_log.TeamMatchLog("Match Logs/Premier_League/Arsenal.xlsx", {"Shooting": shooting, "Goalkeeping": goalkeeping})
+
+
+def _truncated(log, as_of):
+    cutoff = pd.Timestamp(as_of).normalize()
+    sheets = {}
+    for name in log.sheet_names:
+        df = log.sheet(name)
+        dates = pd.to_datetime(df["For Arsenal_Date"], errors="coerce")
+        sheets[name] = df[dates < cutoff].reset_index(drop=True)
+    return match_log.TeamMatchLog(log.path, sheets)
+
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self):
+        self.log = _make_log()
+        self.timeline = feature_store.TeamTimeline(self.log, n_games=5)
+        self.days = pd.date_range("2025-08-01", "2026-07-01", freq="3D")
+
+    def test_rolling_matches_engine_on_past_matches(self):
+        engine = xg_engine.XGEngine()
+        for day in self.days:
+            expected = engine._compute_rolling(_truncated(self.log, day), 5)
+            got = self.timeline.rolling(day)
+            self.assertEqual(expected[:2], got[:2], msg=str(day))
+            self.assertAlmostEqual(expected[2], got[2], places=12)
+            self.assertAlmostEqual(expected[4], got[4], places=12)
+            self.assertEqual((expected[3], expected[5]), (got[3], got[5]))
+
+    def test_fatigue_counts_matches_before_day(self):
+        played = sorted(set(pd.to_datetime(self.log.sheet("Shooting")["For Arsenal_Date"]).dropna()))
+        for day in self.days:
+            before = [d for d in played if d < day]
+            got = self.timeline.fatigue(day)
+            self.assertEqual(got["days_since_last"], (day - before[-1]).days if before else None)
+            for window in (7, 14, 21):
+                start = day - pd.Timedelta(days=window)
+                self.assertEqual(got[f"matches_{window}d"], sum(1 for d in before if d >= start))
+
+    def test_season_to_date_and_decay_ratings(self):
+        shooting = self.log.sheet("Shooting").copy()
+        shooting["date"] = pd.to_datetime(shooting["For Arsenal_Date"], errors="coerce")
+        shooting = shooting.dropna(subset=["date", "For Arsenal_Goals For"]).iloc[::-1].sort_values("date", kind="stable")
+        psxg = self.log.sheet("Goalkeeping")["Performance_PSxG"]
+        for day in self.days:
+            past = shooting[shooting["date"] < day]
+            season = self.timeline.season_to_date(day)
+            self.assertEqual(season["games"], len(past))
+            if past.empty:
+                self.assertIsNone(self.timeline.ratings(day))
+                continue
+            self.assertAlmostEqual(season["goals_for_per_game"], past["For Arsenal_Goals For"].astype(float).mean())
+
+            for venue in ("All", "Home"):
+                weights = np.exp(-feature_store.DECAY_ALPHA * np.arange(len(past))[::-1])
+                mask = np.ones(len(past), dtype=bool) if venue == "All" else (past["For Arsenal_Venue"] == venue).to_numpy()
+                xg = past["Standard_xG"].astype(float).fillna(past["For Arsenal_Goals For"].astype(float)).to_numpy()
+                xga = psxg.loc[past.index].to_numpy()
+                rating = self.timeline.ratings(day, venue)
+                if not mask.any():
+                    self.assertIsNone(rating)
+                    continue
+                w = weights[mask]
+                self.assertEqual(rating["matches"], int(mask.sum()))
+                self.assertAlmostEqual(rating["expected_goals_avg"], float((xg[mask] * w).sum() / w.sum()), places=12)
+                self.assertAlmostEqual(
+                    rating["defense"], float((xga[mask] * w).sum() / w.sum()) / feature_store.LEAGUE_BASELINE_XG, places=12
+                )
+
+    def test_team_timeline_reused_for_same_log(self):
+        first = feature_store.team_timeline(self.log, n_games=5)
+        self.assertIs(first, feature_store.team_timeline(self.log, n_games=5))
+        self.assertIsNot(first, feature_store.team_timeline(_make_log(), n_games=5))
+        features = first.features("2025-10-01")
+        self.assertEqual(features["as_of"], "2025-10-01")
+        self.assertFalse(math.isnan(features["xg_per_game"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
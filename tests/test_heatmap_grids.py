@@ -0,0 +1,66 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import heatmap_grids
+
+
+class TestHeatmapGrids(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        league_dir = self.root / heatmap_grids.HEATMAP_DIR / "Premier_League"
+        league_dir.mkdir(parents=True)
+        pd.DataFrame(
+            {
+                "League": "Premier_League",
+                "Team": "Arsenal",
+                "Player_Name": ["Saka", "Saka", "Saka", "Raya"],
+                "Player_ID": [1, 1, 1, 2],
+                "X": [90, 91, 100, 3],
+                "Y": [10, 10, 50, 50],
+                "Count": [2, 1, 1, 5],
+            }
+        ).to_excel(league_dir / "Arsenal_heatmaps.xlsx", index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rasterize_bins_and_clips(self):
+        grid = heatmap_grids.rasterize([0, 1, 100, np.nan], [0, 1, 100, 5], [1, 2, 70000, 1])
+        self.assertEqual(grid.dtype, np.uint16)
+        self.assertEqual(grid[0, 0], 3)
+        self.assertEqual(grid[-1, -1], np.iinfo(np.uint16).max)
+
+    def test_build_load_and_features(self):
+        out = heatmap_grids.build_league("Premier_League", project_root=self.root)
+        self.assertIsNotNone(out)
+        self.assertIsNone(heatmap_grids.build_league("Premier_League", project_root=self.root))
+
+        league = heatmap_grids.load_league("Premier_League", project_root=self.root)
+        self.assertIs(heatmap_grids.load_league("Premier_League", project_root=self.root), league)
+        self.assertEqual(league.grids.shape, (2, heatmap_grids.GRID_SIZE, heatmap_grids.GRID_SIZE))
+        self.assertEqual(int(league.player(1).sum()), 4)
+        self.assertEqual(int(league.player(1)[5, 45]), 3)
+        self.assertIsNone(league.player(99))
+        self.assertEqual(int(league.team("Arsenal").sum()), 9)
+
+        features = league.features().set_index("player_id")
+        self.assertAlmostEqual(features.loc[1, "heat_att_third"], 1.0)
+        self.assertAlmostEqual(features.loc[2, "heat_def_third"], 1.0)
+        self.assertAlmostEqual(features.loc[1, "heat_wide_share"], 0.75)
+        self.assertGreater(features.loc[1, "heat_depth"], features.loc[2, "heat_depth"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import unittest
+
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import market_pricing
+import simulator_v9
+import update_tracker
+
+
+class TestMarketPricing(unittest.TestCase):
+    def test_score_matrices_match_simulator_builder(self):
+        lambdas = [(0.25, 3.8), (1.4, 1.1), (2.2, 0.6)]
+        mats = market_pricing.score_matrices([h for h, _ in lambdas], [a for _, a in lambdas], rho=-0.08)
+        for mat, (h, a) in zip(mats, lambdas):
+            want = simulator_v9._build_score_matrix(h, a, rho=-0.08)
+            self.assertLess(abs(mat - want).max(), 1e-12)
+
+    def test_markets_match_cell_by_cell_settlement(self):
+        mat = simulator_v9._build_score_matrix(1.7, 0.9, rho=-0.06)
+        bet_data, bet_detail = market_pricing.bet_tables(mat[None])[0]
+        cells = [(h, a, mat[h, a]) for h in range(11) for a in range(11)]
+
+        for hdp in (-2, 0, 1):
+            detail = bet_detail[f"HDP_{hdp}"]
+            self.assertAlmostEqual(detail["win"], sum(p for h, a, p in cells if h - a + hdp > 0), places=12)
+            self.assertAlmostEqual(detail["push"], sum(p for h, a, p in cells if h - a + hdp == 0), places=12)
+            self.assertAlmostEqual(detail["loss"], sum(p for h, a, p in cells if h - a + hdp < 0), places=12)
+        self.assertAlmostEqual(bet_data["Over_2.5"], sum(p for h, a, p in cells if h + a > 2.5), places=12)
+        self.assertAlmostEqual(bet_data["BTTS_Yes"], sum(p for h, a, p in cells if h > 0 and a > 0), places=12)
+        self.assertAlmostEqual(bet_data["Clean_Sheet_Home"], sum(p for h, a, p in cells if a == 0), places=12)
+        self.assertAlmostEqual(bet_data["Home_Win"] + bet_data["Draw"] + bet_data["Away_Win"], 1.0, places=12)
+
+        # -0.25 = half the stake on 0 (push on a draw), half on -0.5 (loss on a draw).
+        quarter = bet_detail["HDP_-0.25"]
+        self.assertAlmostEqual(quarter["win"], bet_data["Home_Win"], places=12)
+        self.assertAlmostEqual(quarter["half_loss"], bet_data["Draw"], places=12)
+        self.assertEqual(quarter["push"], 0.0)
+        self.assertAlmostEqual(sum(quarter.values()), 1.0, places=12)
+        best = max(cells, key=lambda c: c[2])
+        self.assertEqual(next(iter(bet_detail["Correct_Score"])), f"{best[0]}-{best[1]}")
+        home_best = max((c for c in cells if c[0] > c[1]), key=lambda c: c[2])
+        self.assertEqual(market_pricing.best_score_for_result(mat, "Home")[0], f"{home_best[0]}-{home_best[1]}")
+
+    def test_tracker_bet_row_and_push_refund(self):
+        bet_data, bet_detail = market_pricing.price_fixture(1.5, 1.2, rho=-0.05)
+        row = update_tracker._build_bet_data_row({"Date": "2026-02-20", "Match": "A vs B", "Bet_Data": bet_data})
+        self.assertEqual(row["HDP 0"], round(bet_data["HDP_0"] * 100, 1))
+        self.assertEqual(row["Under 3.5"], round(bet_data["Under_3.5"] * 100, 1))
+        detail = bet_detail["HDP_0"]
+        self.assertAlmostEqual(
+            market_pricing.hdp_probability(bet_data, bet_detail, "HDP_0"),
+            detail["win"] / (1.0 - detail["push"]),
+            places=12,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import match_log
+
+
+class TestTeamMatchLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        logs_dir = Path(self.tmp.name) / "Match Logs" / "Premier_League"
+        logs_dir.mkdir(parents=True)
+        self.workbook = logs_dir / "Arsenal.xlsx"
+        with pd.ExcelWriter(self.workbook) as writer:
+            pd.DataFrame({"Date": ["2026-01-01"], "Result": ["W"]}).to_excel(
+                writer, sheet_name="Scores & Fixtures", index=False
+            )
+            pd.DataFrame(
+                {
+                    "For Arsenal_Date": ["2026-01-01", "2026-01-08", "2026-01-08", "2099-01-01"],
+                    "For Arsenal_Result": ["W", "D", "D", None],
+                    "Standard_xG": [1.7, 0.9, 0.9, None],
+                }
+            ).to_excel(writer, sheet_name="Shooting", index=False)
+            pd.DataFrame({"For Arsenal_Date": ["2026-01-01"], "Performance_PSxG": [0.6]}).to_excel(
+                writer, sheet_name="Goalkeeping", index=False
+            )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sheets_roles_and_dates(self):
+        log = match_log.load_team_match_log(self.workbook)
+        self.assertEqual((log.league, log.team), ("Premier_League", "Arsenal"))
+        self.assertEqual(log.sheet_names, ["Scores & Fixtures", "Shooting", "Goalkeeping"])
+        self.assertIsNone(log.sheet("Passing"))
+        self.assertIs(log.results_sheet(), log.sheet("Shooting"))
+
+        self.assertEqual(log.column(0, "date"), "Date")
+        self.assertEqual(log.column("Shooting", "date"), "For Arsenal_Date")
+        self.assertEqual(log.column("Shooting", "xg"), "Standard_xG")
+        self.assertEqual(log.column("Goalkeeping", "psxg"), "Performance_PSxG")
+        self.assertIsNone(log.column(0, "gf"))
+
+        dates = log.match_dates(until="2026-06-01")
+        self.assertEqual(dates, [pd.Timestamp("2026-01-08"), pd.Timestamp("2026-01-01")])
+
+    def test_memoized_until_file_changes(self):
+        first = match_log.load_team_match_log(self.workbook)
+        self.assertIs(match_log.load_team_match_log(self.workbook), first)
+
+        with pd.ExcelWriter(self.workbook) as writer:
+            pd.DataFrame({"Date": ["2026-03-01"]}).to_excel(writer, sheet_name="Scores & Fixtures", index=False)
+        os.utime(self.workbook, (1, 1))
+        fresh = match_log.load_team_match_log(self.workbook)
+        self.assertIsNot(fresh, first)
+        self.assertEqual(fresh.sheet_names, ["Scores & Fixtures"])
+        self.assertEqual(fresh.match_dates(), [pd.Timestamp("2026-03-01")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import market_pricing
+import match_montecarlo
+import simulator_v9
+
+
+class TestMatchMonteCarlo(unittest.TestCase):
+    def test_seeded_runs_repeat_and_match_analytic_1x2(self):
+        a = match_montecarlo.simulate_minutes(1.6, 1.1, iterations=40000, tolerance=0.0, red_card_rate=0.0)
+        b = match_montecarlo.simulate_minutes(1.6, 1.1, iterations=40000, tolerance=0.0, red_card_rate=0.0)
+        self.assertEqual(a, b)
+        self.assertEqual(a["iterations"], 40000)
+        self.assertFalse(a["converged"])
+
+        priced = market_pricing.price_matrices(market_pricing.score_matrix(1.6, 1.1, rho=0.0, max_goals=15))
+        self.assertAlmostEqual(a["home_win_prob"], priced["home_win"][0] * 100, delta=1.0)
+        self.assertAlmostEqual(a["draw_prob"], priced["draw"][0] * 100, delta=1.0)
+        self.assertAlmostEqual(sum(a["ht_ft"].values()), 100.0, places=6)
+        self.assertAlmostEqual(sum(a["next_goal"][k] for k in ("home", "away", "none")), 100.0, places=6)
+
+    def test_adaptive_stop_and_in_play_state(self):
+        loose = match_montecarlo.simulate_minutes(1.3, 1.2, iterations=50000, tolerance=0.02, batch_size=500)
+        self.assertTrue(loose["converged"])
+        self.assertLess(loose["iterations"], 50000)
+        self.assertLess(loose["standard_error"], 0.02)
+
+        late = match_montecarlo.simulate_minutes(1.3, 1.2, iterations=4000, start_minute=80, start_score=(2, 0))
+        self.assertIsNone(late["ht_ft"])
+        self.assertGreater(late["home_win_prob"], 90.0)
+        self.assertEqual(late["next_goal"]["by_window"]["1-15"], 0.0)
+
+    def test_fatigue_moves_goals_late_without_changing_totals(self):
+        fresh = match_montecarlo.minute_rates(1.5, 1.2)
+        tired = match_montecarlo.minute_rates(1.5, 1.2, {"home_attack_penalty": 0.04})
+        np.testing.assert_allclose(tired.sum(axis=1), [1.5, 1.2])
+        late = slice(match_montecarlo.LATE_MINUTE, None)
+        self.assertLess(tired[0, late].sum(), fresh[0, late].sum())
+        self.assertGreater(tired[1, late].sum(), fresh[1, late].sum())
+
+    def test_simulate_match_honours_iterations(self):
+        h_xg = {"attack": {"xg_per_game": 1.6}, "defense": {"xga_per_game": 1.1}, "form_last_5": 10}
+        a_xg = {"attack": {"xg_per_game": 1.4}, "defense": {"xga_per_game": 1.3}, "form_last_5": 7}
+        sim = simulator_v9.simulate_match(h_xg, a_xg, iterations=3000)
+        off = simulator_v9.simulate_match(h_xg, a_xg, iterations=0)
+        self.assertLessEqual(sim["monte_carlo"]["iterations"], 3000)
+        self.assertIsNone(off["monte_carlo"])
+        self.assertEqual(sim["home_win_prob"], off["home_win_prob"])
+
+
+if __name__ == "__main__":
+    unittest.main()
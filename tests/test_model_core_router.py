@@ -45,5 +45,17 @@ class TestModelCoreRouter(unittest.TestCase):
         self.assertIn("fallback", str(ctx.get("fallback_reason")))
 
 
+    def test_v9_monte_carlo_only_runs_when_v9_is_selected(self):
+        sim_v9 = {"model_version": "v9", "home_win_prob": 45.0, "draw_prob": 25.0, "away_win_prob": 30.0}
+        for core, expected in (("v9", 10000), ("hybrid", 0), ("demo_v2", 0)):
+            with mock.patch.dict(os.environ, {"MODEL_CORE": core}, clear=False), mock.patch.object(
+                analyze_match, "_try_simulator", return_value=dict(sim_v9)
+            ) as simulator, mock.patch.object(analyze_match, "_run_demo_v2_shadow", return_value={"enabled": False}):
+                analyze_match._resolve_core_predictions(
+                    "Arsenal", "Chelsea", "Premier_League", {}, {}, {}, {}, "", None, None
+                )
+            self.assertEqual(simulator.call_args.kwargs["iterations"], expected, msg=core)
+
+
 if __name__ == "__main__":
     unittest.main()
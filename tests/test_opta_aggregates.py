@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import opta_aggregates
+
+
+class TestOptaAggregates(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name) / "output_opta"
+        league_dir = self.base / "Premier_League"
+        league_dir.mkdir(parents=True)
+        self.workbook = league_dir / "Arsenal.xlsx"
+        with pd.ExcelWriter(self.workbook) as writer:
+            pd.DataFrame(
+                {"goals": [3, 1], "xg": [2.5, 0.75], "shots": [10, 4], "sot": [5, 2], "conv %": [30.0, None], "xG per Shot": [None, None]}
+            ).to_excel(writer, sheet_name="Attacking", index=False)
+            pd.DataFrame(
+                {
+                    "Open Play Passes_total": [100, 50],
+                    "Open Play Passes_successful": [90, 30],
+                    "In Final Third_total": [20, 0],
+                    "In Final Third_successful": [15, 0],
+                    "Crosses_total": [4, 1],
+                    "through balls": [1, 0],
+                }
+            ).to_excel(writer, sheet_name="Passing", index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_league_table_lookup_matches_direct_aggregation(self):
+        direct = opta_aggregates.aggregate_team_workbook(self.workbook)
+        self.assertEqual(int(direct["opta_goals"]), 4)
+        self.assertAlmostEqual(direct["opta_pass_pct"], 80.0)
+        self.assertIsNone(direct["opta_xg_per_shot"])
+
+        out_path, df = opta_aggregates.build_league_table("Premier_League", base_dir=self.base)
+        self.assertEqual(out_path.name, "Premier_League_Team_Aggregates.xlsx")
+        self.assertEqual(list(df["Team"]), ["Arsenal"])
+
+        looked_up = opta_aggregates.lookup_team(self.workbook, "Premier_League", base_dir=self.base)
+        self.assertEqual(set(looked_up), set(direct))
+        for key, value in direct.items():
+            if value is None:
+                self.assertIsNone(looked_up[key], key)
+            else:
+                self.assertAlmostEqual(float(looked_up[key]), float(value), msg=key)
+
+    def test_stale_or_missing_table_returns_none(self):
+        self.assertIsNone(opta_aggregates.lookup_team(self.workbook, "Premier_League", base_dir=self.base))
+        opta_aggregates.build_league_table("Premier_League", base_dir=self.base)
+        os.utime(self.workbook, (1, 1))
+        self.assertIsNone(opta_aggregates.lookup_team(self.workbook, "Premier_League", base_dir=self.base))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import player_master
+
+
+class TestPlayerMaster(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        stats_dir = self.root / player_master.ALL_STATS_DIR
+        stats_dir.mkdir()
+        self.workbook = stats_dir / "Serie_A_Stats.xlsx"
+        with pd.ExcelWriter(self.workbook) as writer:
+            pd.DataFrame(
+                {
+                    "Player": ["Rafael Leão", "Player", "Bench Guy", "Rafael Leão"],
+                    "Nation": ["pt POR", "Nation", "it ITA", "pt POR"],
+                    "Pos": ["FW", "Pos", "DF", "FW"],
+                    "Squad": ["Milan", "Squad", "Inter", "Milan"],
+                    "Age": ["26-100", "Age", "30-001", "26-100"],
+                    "Playing Time_90s": ["20", "90s", "0", "20"],
+                    "Performance_Gls": ["10", "Gls", "0", "10"],
+                    "Per 90 Minutes_Gls": ["0.5", "Gls", "0", "0.5"],
+                }
+            ).to_excel(writer, sheet_name="Player_Stats", index=False)
+            pd.DataFrame(
+                {"Player": ["Rafael Leao"], "Squad": ["Milan"], "Standard_Sh": [60], "Standard_SoT%": [41.5]}
+            ).to_excel(writer, sheet_name="Shooting", index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_master_is_deduplicated_typed_and_has_per90(self):
+        self.assertTrue(player_master.is_stale(project_root=self.root))
+        master, columns_by_sheet = player_master.load_master(project_root=self.root)
+        self.assertFalse(player_master.is_stale(project_root=self.root))
+
+        self.assertEqual(len(master), 2)
+        self.assertEqual(columns_by_sheet["Shooting"], ["Standard_Sh", "Standard_SoT%"])
+        row = master.set_index("player_key").loc[player_master.player_key("Serie_A", "Rafael Leao", "Milan")]
+        self.assertEqual(row["Standard_Sh"], 60)
+        self.assertAlmostEqual(row["Standard_Sh_per90"], 3.0)
+        self.assertAlmostEqual(row["Performance_Gls_per90"], 0.5)
+        self.assertEqual(player_master.per90_column("Standard_SoT%"), "Standard_SoT%")
+        self.assertEqual(player_master.per90_column("Per 90 Minutes_Gls"), "Per 90 Minutes_Gls")
+        self.assertNotIn("Age_per90", master.columns)
+        self.assertTrue(pd.api.types.is_integer_dtype(master["Performance_Gls"]))
+        self.assertEqual(master["Performance_Gls"].dtype.itemsize, 1)
+
+        bench = master[master["Player"] == "Bench Guy"].iloc[0]
+        self.assertEqual(bench["Performance_Gls_per90"], 0.0)
+
+        os.utime(self.workbook, (1, 1))
+        self.assertTrue(player_master.is_stale(project_root=self.root))
+
+    def test_per90_value_semantics(self):
+        master, _ = player_master.load_master(project_root=self.root)
+        leao = master.index[master["Player"] == "Rafael Leão"][0]
+        bench = master.index[master["Player"] == "Bench Guy"][0]
+        # Counting stats are divided by 90s; players without minutes get 0, not the raw count.
+        self.assertAlmostEqual(player_master.per90_value(master, leao, "Standard_Sh"), 3.0)
+        self.assertEqual(player_master.per90_value(master, bench, "Performance_Gls"), 0.0)
+        # Percentages, ratios and Per 90 columns are already rates and are not divided again.
+        self.assertAlmostEqual(player_master.per90_value(master, leao, "Standard_SoT%"), 41.5)
+        self.assertAlmostEqual(player_master.per90_value(master, leao, "Per 90 Minutes_Gls"), 0.5)
+
+        mixed = pd.DataFrame({"Playing Time_90s": [10.0], "Performance_PK": pd.Series([2], dtype=object)})
+        self.assertEqual(player_master.per90_value(mixed, 0, "Performance_PK"), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import unittest
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import player_names
+
+SQUAD = [
+    "David Raya",
+    "William Saliba",
+    "Gabriel Magalhães",
+    "Gabriel Jesus",
+    "Declan Rice",
+    "Martin Ødegaard",
+    "Bukayo Saka",
+    "Gabriel Martinelli",
+    "Kai Havertz",
+    "Maurice Ricelli",
+]
+
+
+def _scan_match(keys, priorities, target, used):
+    """Reference full scan of the lineup matcher (exact, then best score, priority, squad order)."""
+    exact = [pos for pos, key in enumerate(keys) if key == target and pos not in used]
+    if exact:
+        return max(exact, key=lambda pos: (priorities[pos], -pos))
+    best = None
+    for pos, key in enumerate(keys):
+        if pos in used:
+            continue
+        score = player_names.lineup_score(target, key)
+        if score >= player_names.MIN_LINEUP_SCORE and (best is None or (score, priorities[pos]) > best[0]):
+            best = ((score, priorities[pos]), pos)
+    return best[1] if best else None
+
+
+class TestPlayerNames(unittest.TestCase):
+    def test_lineup_matches_full_scan(self):
+        priorities = [30, 28, 27, 15, 29, 26, 30, 20, 22, 1]
+        index = player_names.PlayerNameIndex(SQUAD, priorities)
+        keys = [player_names.normalize_name(name) for name in SQUAD]
+        queries = ["Raya", "Gabriel", "Gabriel", "Saka", "Odegaard", "B. Saka", "Rice", "Havertz", "Jesus", "Xyz", "Magalhaes"]
+        used = []
+        for query in queries:
+            want = _scan_match(keys, priorities, player_names.normalize_name(query), used)
+            got = index.match_lineup_name(query, used)
+            self.assertEqual(got, want, query)
+            if got is not None:
+                used.append(got)
+        # "Gabriel" goes to the highest-priority Gabriel first, then the next one.
+        self.assertEqual(used[1:3], [2, 7])
+
+    def test_find_prefers_whole_names_and_caches(self):
+        index = player_names.squad_index(SQUAD)
+        self.assertIs(index, player_names.squad_index(list(SQUAD)))
+        self.assertEqual(index.find("Rice"), 4)
+        self.assertEqual(index.find("saka"), 6)
+        self.assertEqual(index.find("Magalhaes"), 2)
+        self.assertEqual(index.find("Gabriel"), 2)
+        self.assertEqual(index.find("Marti"), 5)
+        self.assertEqual(index.find("Havert"), 8)
+        self.assertEqual(index.find("Kai Havers"), 8)
+        self.assertIsNone(index.find("Completely Unknown"))
+        self.assertIsNone(index.find(""))
+        self.assertIn("kai havers", index._find_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import data_store
+import prediction_service
+
+
+def _write_table(path, value, bump=0):
+    pd.DataFrame({"Team_Name": ["Arsenal"], "value": [value]}).to_excel(path, index=False)
+    if bump:
+        st = os.stat(path)
+        os.utime(path, (st.st_atime, st.st_mtime + bump))
+
+
+def _fake_prediction(home, away, **kwargs):
+    return {"Match": f"{home} vs {away}", "Context": kwargs.get("match_context")}
+
+
+async def _http(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, content = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content.decode("utf-8"))
+
+
+class TestPredictionService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "Premier_League_Team_Stats.xlsx"
+        _write_table(self.path, 1)
+        data_store.clear_cache()
+
+    def tearDown(self):
+        data_store.set_resident(False)
+        data_store.clear_cache()
+        self.tmp.cleanup()
+
+    def test_resident_table_swapped_in_only_on_install(self):
+        data_store.set_resident(True)
+        self.assertEqual(data_store.cached_table(self.path)["value"].iloc[0], 1)
+        _write_table(self.path, 2, bump=10)
+
+        self.assertEqual(data_store.cached_table(self.path)["value"].iloc[0], 1)
+        stale = data_store.stale_tables()
+        self.assertEqual(list(stale), [(os.path.abspath(str(self.path)), 0)])
+        entries = data_store.load_tables(stale, project_root=self.tmp.name)
+        self.assertEqual(data_store.cached_table(self.path)["value"].iloc[0], 1)
+
+        data_store.install_tables(entries)
+        self.assertEqual(data_store.cached_table(self.path)["value"].iloc[0], 2)
+        self.assertEqual(data_store.stale_tables(), {})
+
+    def test_http_predict_and_settled_reload(self):
+        async def scenario():
+            service = prediction_service.PredictionService(project_root=self.tmp.name)
+            server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                await asyncio.get_running_loop().run_in_executor(service._predictor, data_store.cached_table, self.path)
+                status, record = await _http(
+                    port, "POST", "/predict", {"home": "Arsenal", "away": "Liverpool", "match_context": "Match: A vs L"}
+                )
+                self.assertEqual(status, 200)
+                self.assertEqual(record["Match"], "Arsenal vs Liverpool")
+                self.assertEqual(record["Context"], "Match: A vs L")
+                self.assertEqual(record["Data_Generation"], 0)
+                self.assertEqual((await _http(port, "POST", "/predict", {"home": "Arsenal"}))[0], 400)
+                self.assertEqual((await _http(port, "GET", "/nowhere"))[0], 404)
+
+                _write_table(self.path, 2, bump=10)
+                self.assertEqual(await service.refresh(), 0)
+                self.assertEqual(await service.refresh(), 1)
+                self.assertEqual(data_store.cached_table(self.path)["value"].iloc[0], 2)
+                status, health = await _http(port, "GET", "/health")
+                self.assertEqual((status, health["data_generation"], health["reloaded_tables"]), (200, 1, 1))
+            finally:
+                server.close()
+                await server.wait_closed()
+                service.close()
+
+        with mock.patch.object(prediction_service, "predict_match", _fake_prediction):
+            asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import season_sim
+
+
+def _table(points, gd=None):
+    teams = [f"T{i}" for i in range(len(points))]
+    gd = gd or [0] * len(points)
+    return pd.DataFrame({"team": teams, "played": 10, "points": points, "gf": 0, "ga": 0, "gd": gd})
+
+
+class TestSeasonSim(unittest.TestCase):
+    def test_certain_results_and_tiebreak(self):
+        table = _table([30, 30, 20, 10], gd=[5, 8, 0, -13])
+        fixtures = pd.DataFrame({"date": pd.NaT, "home": ["T0", "T2"], "away": ["T1", "T3"]})
+        probs = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+        out = season_sim.simulate_season(table, fixtures, probs, n_sims=500, relegation_places=1, top_places=2)
+        rows = out.set_index("team")
+
+        self.assertEqual(list(out["team"]), ["T0", "T1", "T2", "T3"])
+        self.assertEqual(rows.loc["T0", "title_prob"], 1.0)
+        self.assertEqual(rows.loc["T3", "exp_points"], 13.0)
+        self.assertEqual(rows.loc["T2", "remaining"], 1)
+        # T2 and T3 finish level on 20: T2's better goal difference keeps it up.
+        self.assertEqual(rows.loc["T3", "relegation_prob"], 1.0)
+        self.assertEqual(rows.loc["T1", "top2_prob"], 1.0)
+
+    def test_distributions_sum_and_seed_repeats(self):
+        rng = np.random.default_rng(0)
+        teams = [f"T{i}" for i in range(6)]
+        pairs = [(h, a) for h in teams for a in teams if h != a]
+        fixtures = pd.DataFrame({"date": pd.NaT, "home": [h for h, _ in pairs], "away": [a for _, a in pairs]})
+        raw = rng.random((len(pairs), 3))
+        probs = raw / raw.sum(axis=1, keepdims=True)
+        table = _table([12, 11, 10, 9, 8, 7])
+
+        a = season_sim.simulate_season(table, fixtures, probs, n_sims=3000, seed=7, chunk=1000, relegation_places=2)
+        c = season_sim.simulate_season(table, fixtures, probs, n_sims=3000, seed=8, chunk=1000, relegation_places=2)
+
+        self.assertAlmostEqual(a["title_prob"].sum(), 1.0, places=9)
+        self.assertAlmostEqual(a["top4_prob"].sum(), 4.0, places=9)
+        self.assertAlmostEqual(a["relegation_prob"].sum(), 2.0, places=9)
+        position_probs = np.array(a["position_probs"].tolist())
+        np.testing.assert_allclose(position_probs.sum(axis=0), 1.0)
+        np.testing.assert_allclose(position_probs.sum(axis=1), 1.0)
+        self.assertTrue((a["points_p5"] <= a["points_p50"]).all())
+        self.assertTrue((a["points_p50"] <= a["points_p95"]).all())
+
+        expected = table["points"].to_numpy(dtype=float)
+        for k, (h, w) in enumerate(pairs):
+            expected[teams.index(h)] += 3 * probs[k, 0] + probs[k, 1]
+            expected[teams.index(w)] += 3 * probs[k, 2] + probs[k, 1]
+        np.testing.assert_allclose(a.set_index("team").loc[teams, "exp_points"], expected, atol=0.3)
+
+        again = season_sim.simulate_season(table, fixtures, probs, n_sims=3000, seed=7, chunk=1000, relegation_places=2)
+        pd.testing.assert_frame_equal(a, again)
+        self.assertFalse(a["exp_points"].equals(c["exp_points"]))
+
+    def test_no_fixtures_left_is_the_current_table(self):
+        table = _table([40, 35, 35], gd=[0, -2, 4])
+        fixtures = pd.DataFrame(columns=["date", "home", "away"])
+        out = season_sim.simulate_season(table, fixtures, np.zeros((0, 3)), n_sims=200, relegation_places=1)
+        self.assertEqual(list(out["team"]), ["T0", "T2", "T1"])
+        self.assertEqual(out.set_index("team").loc["T2", "exp_position"], 2.0)
+
+
+    def test_in_process_run_restores_cwd(self):
+        seen = []
+
+        def fake_run_league(league, n_sims, seed):
+            seen.append(os.getcwd())
+            return {"league": league}
+
+        before = os.getcwd()
+        with tempfile.TemporaryDirectory() as root, mock.patch.object(season_sim, "run_league", fake_run_league):
+            results = season_sim.run_all(["Serie_A"], n_sims=10, project_root=root)
+            self.assertEqual(seen, [os.path.realpath(root)])
+        self.assertEqual(results, [{"league": "Serie_A"}])
+        self.assertEqual(os.getcwd(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,8 @@ import os
 import sys
 import unittest
 
+import pandas as pd
+
 # Ensure we can import local modules
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
@@ -102,5 +104,72 @@ class TestSimulatorV9(unittest.TestCase):
         self.assertLess(with_tactical["expected_goals_away"], base["expected_goals_away"])
 
 
+    def test_batch_matches_single_fixtures(self):
+        flow_a = {"calc_PPDA": 4.6, "calc_FieldTilt_Pct": 0.62, "calc_Directness": 0.12, "calc_BigChance_Diff": 6.0}
+        flow_b = {"calc_PPDA": 11.8, "calc_FieldTilt_Pct": 0.39, "calc_Directness": 0.07, "calc_BigChance_Diff": -6.0}
+        fixtures = [
+            {
+                "home_xg": {"attack": {"xg_per_game": 1.0 + 0.1 * i}, "defense": {"xga_per_game": 1.4 - 0.05 * i}, "form_last_5": 4 + i},
+                "away_xg": {"attack": {"xg_per_game": 1.6 - 0.1 * i}, "defense": {"xga_per_game": 1.0 + 0.05 * i}, "form_last_5": 9},
+                "home_sofascore": {"goals_scored_per_game": 1.5, "goals_conceded_per_game": 1.1} if i % 2 else None,
+                "away_sofascore": {"goals_scored_per_game": 1.2, "goals_conceded_per_game": 1.3} if i % 2 else None,
+                "home_flow": flow_a if i % 3 == 0 else None,
+                "away_flow": flow_b if i % 3 == 0 else None,
+            }
+            for i in range(8)
+        ]
+        batch = simulator_v9.simulate_matches(fixtures)
+        self.assertEqual(len(batch), len(fixtures))
+        for fixture, got in zip(fixtures, batch):
+            want = simulator_v9.simulate_match(**fixture)
+            for key in ("home_win_prob", "draw_prob", "away_win_prob", "expected_goals_home", "expected_goals_away"):
+                self.assertAlmostEqual(got[key], want[key], places=9)
+            self.assertEqual(got["most_likely_score"], want["most_likely_score"])
+            self.assertEqual(got["top3_scores"], want["top3_scores"])
+            self.assertEqual(got["bonus_applied"], want["bonus_applied"])
+            self.assertEqual(got["math_winner_context"]["winner_side"], want["math_winner_context"]["winner_side"])
+            self.assertEqual(got["dixon_coles_rho"], want["dixon_coles_rho"])
+            self.assertAlmostEqual(got["bet_data"]["HDP_0"] * 100, want["home_win_prob"], places=9)
+
+    def test_squad_profiles_and_projected_lineup(self):
+        positions = ["GK", "GK"] + ["CB"] * 5 + ["CM"] * 4 + ["ST"] * 4
+        squad = pd.DataFrame(
+            {
+                "Player_Name": [f"P{i}" for i in range(len(positions))],
+                "Primary_Position": positions,
+                "matchesStarted": [20, 3, 20, 18, 15, 15, 2, 20, 19, 17, 1, 20, 10, 10, 0],
+                "appearances": [20, 5, 20, 20, 16, 16, 4, 20, 20, 18, 3, 20, 12, 12, 2],
+                "minutesPlayed": [1800, 300, 1800, 1600, 1350, 1350, 200, 1750, 1650, 1500, 90, 1700, 900, 900, 0],
+                "rating": [7.0, 6.5, 7.1, 6.9, 6.8, 6.8, 6.4, 7.2, 7.0, 6.9, 6.3, 7.4, 6.7, 6.7, None],
+                "expectedGoals": [0, 0, 1, 0.5, 0.4, 0.4, 0, 3, 2, 1, 0, 12, 4, 4, 0],
+                "Strengths_Text": [""] * 11 + ["Finishing, Dribbling", "", "", ""],
+                "Weaknesses_Text": [""] * 12 + ["Finishing", "", ""],
+            }
+        )
+        squad["__priority"] = simulator_v9._lineup_priorities(squad)
+
+        lineup = simulator_v9._project_lineup(squad)
+        # Players 4 and 5 and players 12 and 13 tie on priority: frame order decides.
+        self.assertEqual(list(lineup.index), [0, 2, 3, 4, 5, 7, 8, 9, 11, 12, 13])
+
+        profiles = simulator_v9._player_profiles(squad)
+        self.assertEqual(list(profiles.columns), simulator_v9.PROFILE_COLUMNS)
+        self.assertEqual(profiles.loc[0, "role"], "GK")
+        self.assertEqual(profiles.loc[14, "minutes"], 120.0)
+        self.assertAlmostEqual(profiles.loc[11, "xg_p90"], 12 / 1700 * 90)
+        # Same stats as player 13, but the finishing weakness lowers player 12's attack.
+        self.assertLess(profiles.loc[12, "attack"], profiles.loc[13, "attack"])
+        self.assertEqual(profiles.loc[12, "defense"], profiles.loc[13, "defense"])
+
+        whole = simulator_v9._aggregate_lineup(lineup)
+        selected = simulator_v9._aggregate_profiles(profiles.loc[lineup.index])
+        self.assertEqual(whole, selected)
+        self.assertEqual([p["name"] for p in whole["players"]], list(lineup["Player_Name"]))
+
+        confirmed = simulator_v9._build_team_profile(squad, ["P1", "P6", "P10", "P14"])
+        self.assertEqual(confirmed["matched_count"], 4)
+        self.assertEqual(confirmed["source"], "hybrid")
+        self.assertLess(confirmed["attack_delta"], 0.0)
+
 if __name__ == "__main__":
     unittest.main()
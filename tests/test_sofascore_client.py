@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import sofascore_client
+from scripts import scrape_sofaplayer
+
+# Recorded API responses, trimmed to the fields the scrapers read.
+RECORDED = {
+    "/api/v1/unique-tournament/17/season/76986/standings/total": {
+        "standings": [{"rows": [{"team": {"name": "Arsenal", "id": 42}, "matches": 8}]}]
+    },
+    "/api/v1/team/42/players": {
+        "players": [{"player": {"name": "Bukayo Saka", "id": 934235}}, {"player": {"name": "Bench Keeper", "id": 1}}]
+    },
+    "/api/v1/player/934235/unique-tournament/17/season/76986/statistics/overall": {
+        "statistics": {"goals": 3, "rating": 7.6, "appearances": 8, "statisticsType": {"sportSlug": "football"}}
+    },
+}
+
+
+class StubSofaScore:
+    """Local HTTP server replaying RECORDED; `script` queues (status, headers) answers per path before it."""
+
+    def __init__(self, delay=0.0):
+        self.script = {}
+        self.hits = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.hits.append(self.path)
+                    stub.inflight += 1
+                    stub.max_inflight = max(stub.max_inflight, stub.inflight)
+                    queued = stub.script.get(self.path)
+                    status, headers = queued.pop(0) if queued else (200, {})
+                time.sleep(delay)
+                payload = RECORDED.get(self.path)
+                if status == 200 and payload is None:
+                    status = 404
+                body = json.dumps(payload if status == 200 else {"error": status}).encode("utf-8")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub.inflight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v1"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _client(stub, **kwargs):
+    options = {"rate": 1000, "burst": 10, "backoff_base": 0.01, "forbidden_backoff": 0.01, "base_url": stub.base_url}
+    options.update(kwargs)
+    return sofascore_client.SofaScoreClient(**options)
+
+
+class TestSofaScoreClient(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubSofaScore()
+
+    def tearDown(self):
+        self.stub.close()
+
+    def test_retries_throttling_and_not_found(self):
+        standings = "/api/v1/unique-tournament/17/season/76986/standings/total"
+        self.stub.script[standings] = [(429, {"Retry-After": "0"}), (503, {})]
+        self.stub.script["/api/v1/team/42/players"] = [(500, {})] * 5
+
+        async def scenario():
+            async with _client(self.stub, retries=2) as client:
+                teams = await sofascore_client.league_teams(client, 17, 76986)
+                missing = await client.get_json("player/999/characteristics")
+                players = await client.get_json("team/42/players")
+                return teams, missing, players, client.stats
+
+        teams, missing, players, stats = asyncio.run(scenario())
+        self.assertEqual(teams, [{"name": "Arsenal", "id": 42, "matches": 8}])
+        self.assertIsNone(missing)
+        self.assertIsNone(players)
+        self.assertEqual(self.stub.hits.count(standings), 3)
+        self.assertEqual((stats["ok"], stats["not_found"], stats["failed"]), (1, 1, 1))
+        self.assertEqual((stats["throttled"], stats["errors"], stats["retries"]), (1, 4, 4))
+
+    def test_forbidden_can_stop_the_run(self):
+        self.stub.script["/api/v1/team/42/players"] = [(403, {})]
+
+        async def scenario():
+            async with _client(self.stub, stop_on_forbidden=True) as client:
+                await client.get_json("team/42/players")
+
+        with self.assertRaises(sofascore_client.SofaScoreBlocked):
+            asyncio.run(scenario())
+
+    def test_forbidden_stops_queued_requests(self):
+        self.stub.script["/api/v1/team/42/players"] = [(403, {})]
+
+        async def scenario():
+            async with _client(self.stub, concurrency=1, stop_on_forbidden=True, forbidden_backoff=0.5) as client:
+                paths = ["team/42/players"] + [f"player/{i}/characteristics" for i in range(10)]
+                with self.assertRaises(sofascore_client.SofaScoreBlocked):
+                    await sofascore_client.gather_all(client.get_json(path) for path in paths)
+                await asyncio.sleep(0.6)
+                return client.stats
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(self.stub.hits, ["/api/v1/team/42/players"])
+        self.assertEqual(stats["requests"], 1)
+
+    def test_rate_and_concurrency_limits(self):
+        self.stub.close()
+        self.stub = StubSofaScore(delay=0.05)
+
+        async def scenario():
+            async with _client(self.stub, rate=40, burst=1, concurrency=2) as client:
+                started = time.perf_counter()
+                await asyncio.gather(*(client.get_json("team/42/players") for _ in range(8)))
+                return time.perf_counter() - started
+
+        elapsed = asyncio.run(scenario())
+        # 8 starts at 40/s with a burst of 1 need at least 7 refill intervals.
+        self.assertGreaterEqual(elapsed, 7 / 40 * 0.9)
+        self.assertLessEqual(self.stub.max_inflight, 2)
+
+    def test_player_stats_scraper_against_stub(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            async def scenario():
+                async with _client(self.stub) as client:
+                    await scrape_sofaplayer.scrape_league_player_stats(client, "Premier_League", 17, 76986)
+
+            with mock.patch.object(scrape_sofaplayer, "OUTPUT_BASE_DIR", tmp), mock.patch("builtins.print"):
+                asyncio.run(scenario())
+            df = pd.read_excel(os.path.join(tmp, "Premier_League", "Arsenal_stats.xlsx"))
+
+        self.assertEqual(list(df.columns[:6]), ["League", "Team", "Player_Name", "Player_ID", "rating", "appearances"])
+        self.assertEqual(df["Player_Name"].tolist(), ["Bukayo Saka"])
+        self.assertNotIn("statisticsType", df.columns)
+        self.assertEqual(int(df["goals"].iloc[0]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
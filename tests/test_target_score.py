@@ -0,0 +1,81 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import analyze_match
+
+
+def _brute_force_shift(lambda_home, lambda_away, target_home, target_away):
+    """Reference cell-by-cell search over the default 0.72..1.28 scale grid."""
+    base = analyze_match._score_probability(lambda_home, lambda_away, target_home, target_away)
+    goal = min(0.25, base + max(0.008, base * 0.35))
+    scales = [round(0.72 + (i * 0.02), 2) for i in range(29)]
+    best_any = best_reaching = None
+    for h_scale in scales:
+        for a_scale in scales:
+            cand = (max(0.25, min(3.8, lambda_home * h_scale)), max(0.25, min(3.8, lambda_away * a_scale)))
+            prob = analyze_match._score_probability(cand[0], cand[1], target_home, target_away)
+            move = abs(h_scale - 1.0) + abs(a_scale - 1.0)
+            if best_any is None or prob > best_any[0] + 1e-12 or (abs(prob - best_any[0]) <= 1e-12 and move < best_any[1]):
+                best_any = (prob, move, h_scale, a_scale)
+            if prob + 1e-12 < goal:
+                continue
+            if best_reaching is None or move < best_reaching[1] - 1e-12 or (
+                abs(move - best_reaching[1]) <= 1e-12 and prob > best_reaching[0] + 1e-12
+            ):
+                best_reaching = (prob, move, h_scale, a_scale)
+    return best_reaching or best_any, best_reaching is not None
+
+
+class TestTargetScoreSolver(unittest.TestCase):
+    def test_vectorized_shift_matches_grid_search(self):
+        cases = [(1.42, 1.18, 2, 1), (0.6, 2.9, 0, 3), (2.4, 0.7, 1, 1), (1.1, 1.0, 4, 4)]
+        for lambda_home, lambda_away, th, ta in cases:
+            got = analyze_match._search_reasonable_shift(lambda_home, lambda_away, th, ta)
+            (prob, _, h_scale, a_scale), reached = _brute_force_shift(lambda_home, lambda_away, th, ta)
+            self.assertEqual((got["home_scale"], got["away_scale"]), (h_scale, a_scale))
+            self.assertEqual(got["target_reached"], reached)
+            self.assertAlmostEqual(got["probability"], prob, places=12)
+
+    def test_multiple_targets_in_one_call(self):
+        sim = {"expected_goals_home": 1.7, "expected_goals_away": 1.1}
+        targets = analyze_match.expand_target_scores("top3, 3-3, nope", sim)
+        self.assertEqual(len(targets), 5)
+        results = analyze_match.analyze_target_scores("Home", "Away", sim, targets)
+
+        self.assertEqual([r.get("rank_in_score_grid") for r in results[:3]], [1, 2, 3])
+        self.assertEqual(results[-1]["error"], "invalid_target_score")
+        single = analyze_match.analyze_target_score_scenario("Home", "Away", sim, "3-3")
+        self.assertEqual(results[3], single)
+
+        # The finer grid contains the default one, so it never needs a larger shift.
+        coarse = analyze_match._search_reasonable_shift(1.7, 1.1, 1, 0)
+        fine = analyze_match._search_reasonable_shifts(1.7, 1.1, [(1, 0)], step=0.005)[0]
+        self.assertTrue(coarse["target_reached"] and fine["target_reached"])
+        self.assertLessEqual(fine["move"], coarse["move"] + 1e-9)
+
+
+    def test_shift_grid_is_anchored_at_no_shift(self):
+        default = analyze_match._shift_scales()
+        self.assertEqual(list(default), [round(0.72 + i * 0.02, 2) for i in range(29)])
+        for step in (0.03, 0.05, 0.07, 0.3):
+            scales = analyze_match._shift_scales(step)
+            self.assertIn(1.0, scales, msg=step)
+            self.assertGreaterEqual(scales.min(), analyze_match.TARGET_SHIFT_MIN - 1e-9)
+            self.assertLessEqual(scales.max(), analyze_match.TARGET_SHIFT_MAX + 1e-9)
+        for step in (0, -0.02):
+            with self.assertRaises(ValueError):
+                analyze_match._shift_scales(step)
+            with self.assertRaises(SystemExit), mock.patch("sys.stderr"):
+                analyze_match._parse_args(["Arsenal", "Chelsea", "--target-step", str(step)])
+        self.assertEqual(analyze_match._parse_args(["Arsenal", "Chelsea", "--target-step", "0.05"]).target_step, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
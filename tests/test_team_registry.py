@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import team_registry
+
+
+class TestTeamRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for rel in [
+            "sofaplayer/Premier_League/Arsenal_stats.xlsx",
+            "sofaplayer/Premier_League/Manchester United_stats.xlsx",
+            "position/Premier_League/Manchester United_positions.xlsx",
+            "Match Logs/Premier_League/Manchester Utd.xlsx",
+            "Match Logs/Premier_League/Arsenal.xlsx",
+        ]:
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_records_aliases_and_resolution(self):
+        registry = team_registry.get_registry(self.root)
+        self.assertTrue((self.root / "data_store" / team_registry.REGISTRY_NAME).exists())
+
+        team = registry.lookup("Man Utd")
+        self.assertEqual(team["id"], "Premier_League/Manchester United")
+        self.assertEqual(team["files"]["match_logs"], "Manchester Utd.xlsx")
+        self.assertEqual(team["files"]["positions"], "Manchester United_positions.xlsx")
+        self.assertIsNone(registry.lookup("Chelsea"))
+
+        self.assertEqual(registry.resolve("player_stats", "Premier_League", "Arsenal"), "Arsenal_stats.xlsx")
+        self.assertEqual(registry.resolve("match_logs", "Premier_League", "Manchester United"), "Manchester Utd.xlsx")
+        self.assertIsNone(registry.resolve("match_logs", "Premier_League", "Chelsea"))
+        self.assertIsNone(registry.resolve("player_stats", "La_Liga", "Arsenal"))
+
+        # Same directories -> same registry object, loaded from disk in a fresh process.
+        self.assertIs(team_registry.get_registry(self.root), registry)
+        team_registry._REGISTRIES.clear()
+        reloaded = team_registry.get_registry(self.root)
+        self.assertEqual(reloaded.teams, registry.teams)
+
+    def test_rebuilt_when_directory_changes(self):
+        registry = team_registry.get_registry(self.root)
+        league_dir = self.root / "sofaplayer" / "Premier_League"
+        (league_dir / "Chelsea_stats.xlsx").write_bytes(b"")
+        os.utime(league_dir, ns=(1, 1))
+
+        # Trusted for RECHECK_SECONDS, then (or on reload=True) the directories are rescanned.
+        self.assertIs(team_registry.get_registry(self.root), registry)
+        with mock.patch.object(team_registry, "RECHECK_SECONDS", 0.0):
+            rebuilt = team_registry.get_registry(self.root)
+        self.assertIsNot(rebuilt, registry)
+        (league_dir / "Everton_stats.xlsx").write_bytes(b"")
+        os.utime(league_dir, ns=(2, 2))
+        self.assertIsNotNone(team_registry.get_registry(self.root, reload=True).lookup("everton"))
+        self.assertEqual(rebuilt.lookup("chelsea")["league"], "Premier_League")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import tracker_backup
+import tracker_ledger
+import update_tracker
+
+
+def _prediction(home, away, date="2026-02-20"):
+    return {
+        "Date": date,
+        "Match": f"{home} vs {away}",
+        "League": "Ligue_1",
+        "Home_Team": home,
+        "Away_Team": away,
+        "Pred_Home_Win": 40.0,
+        "Pred_Draw": 30.0,
+        "Pred_Away_Win": 30.0,
+        "Pred_Score": "1-0",
+        "Pred_Result": "Home",
+        "Expected_Goals_Home": 1.4,
+        "Expected_Goals_Away": 1.0,
+    }
+
+
+class TestTrackerLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _save(self, payload):
+        with open("latest_prediction.json", "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        update_tracker.save_new_prediction()
+
+    def test_save_upserts_and_keeps_hand_edits(self):
+        self._save(_prediction("Stade Brestois", "Lens"))
+        self._save(_prediction("Stade Brestois", "Lens"))
+        self.assertTrue(os.path.exists(tracker_ledger.ledger_path("prediction_tracker.xlsx")))
+        df = pd.read_excel("prediction_tracker.xlsx", sheet_name="Predictions")
+        self.assertEqual(len(df), 1)
+
+        # Result typed into the workbook by hand survives the next save.
+        df["Actual_Score"] = df["Actual_Score"].astype(object)
+        df.loc[0, "Actual_Score"] = "2-1"
+        df.to_excel("prediction_tracker.xlsx", sheet_name="Predictions", index=False)
+        self._save(_prediction("Lille", "Nice"))
+
+        df = pd.read_excel("prediction_tracker.xlsx", sheet_name="Predictions")
+        self.assertEqual(list(df["Home"]), ["Stade Brestois", "Lille"])
+        self.assertEqual(df.loc[0, "Actual_Score"], "2-1")
+
+    def test_replace_sheet_collapses_duplicate_keys(self):
+        with tracker_ledger.TrackerLedger("t.db", update_tracker._ledger_row_key) as ledger:
+            rows = pd.DataFrame(
+                [
+                    {"Date": "2026-02-20", "Home": "PSG", "Away": "Lens", "Notes": "old"},
+                    {"Date": "2026-02-20", "Home": "Lille", "Away": "Nice", "Notes": None},
+                    {"Date": "2026-02-20", "Home": "PSG", "Away": "Lens", "Notes": "new"},
+                ]
+            )
+            self.assertEqual(ledger.replace_sheet("Predictions", rows), 1)
+            ledger.replace_sheet("Summary", pd.DataFrame({"Metric": ["n"], "Value": [2]}))
+            ledger.replace_sheet("Predictions", ledger.frame("Predictions"))
+
+            self.assertEqual(ledger.sheet_names(), ["Predictions", "Summary"])
+            frame = ledger.frame("Predictions")
+            self.assertEqual(list(frame["Home"]), ["Lille", "PSG"])
+            self.assertEqual(frame.loc[1, "Notes"], "new")
+            self.assertTrue(ledger.dirty)
+
+
+class TestTrackerBackup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.backup_dir = os.path.join(self.tmp.name, "backups")
+        self.ledger = tracker_ledger.TrackerLedger(os.path.join(self.tmp.name, "t.db"), update_tracker._ledger_row_key)
+
+    def tearDown(self):
+        self.ledger.close()
+        self.tmp.cleanup()
+
+    def test_snapshots_dedupe_and_restore(self):
+        rows = [{"Date": "2026-02-20", "Home": f"Home {i}", "Away": "Lens"} for i in range(5)]
+        self.ledger.upsert_rows("Predictions", rows)
+        self.ledger.replace_sheet("Summary", pd.DataFrame({"Metric": ["n"], "Value": [5]}))
+        first = tracker_backup.snapshot(self.ledger, self.backup_dir)
+        self.assertEqual(first["rows"], {"Predictions": 5, "Summary": 1})
+        self.assertIsNone(tracker_backup.snapshot(self.ledger, self.backup_dir))
+
+        # Only the chunk holding the new row is written; Summary is shared with the first snapshot.
+        self.ledger.upsert("Predictions", {"Date": "2026-02-21", "Home": "Lille", "Away": "Nice"})
+        second = tracker_backup.snapshot(self.ledger, self.backup_dir)
+        self.assertEqual(second["new_chunks"], 1)
+        self.assertEqual(second["sheets"][1], first["sheets"][1])
+
+        entry = tracker_backup.restore(self.ledger, self.backup_dir, first["id"])
+        self.assertEqual(entry["id"], first["id"])
+        self.assertEqual(len(self.ledger.frame("Predictions")), 5)
+        self.assertEqual(self.ledger.sheet_names(), ["Predictions", "Summary"])
+        self.assertEqual(tracker_backup.find_snapshot(self.backup_dir, "latest")["id"], second["id"])
+        self.assertIsNone(tracker_backup.find_snapshot(self.backup_dir, "2000-01-01"))
+
+
+if __name__ == "__main__":
+    unittest.main()
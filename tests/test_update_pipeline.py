@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import update_football_data as pipeline
+
+STEP_SCRIPT = """import json, sys, time
+start = time.time()
+time.sleep({sleep})
+with open({log!r}, "a", encoding="utf-8") as f:
+    f.write(json.dumps([{name!r}, start, time.time()]) + "\\n")
+sys.exit({code})
+"""
+
+
+class TestUpdatePipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.log = self.root / "runs.jsonl"
+        self.steps = pipeline.build_steps(include_active=True)
+        self.index = {rel_path: i for i, (rel_path, _) in enumerate(self.steps)}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_scripts(self, failing=()):
+        for rel_path, _ in self.steps:
+            path = self.root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            code = 1 if rel_path in failing else 0
+            path.write_text(STEP_SCRIPT.format(sleep=0.2, log=str(self.log), name=rel_path, code=code), encoding="utf-8")
+
+    def _runs(self):
+        lines = self.log.read_text(encoding="utf-8").splitlines() if self.log.exists() else []
+        return {name: (start, end) for name, start, end in (json.loads(line) for line in lines)}
+
+    def test_dependencies_follow_declared_inputs_and_outputs(self):
+        deps = pipeline.step_dependencies(self.steps)
+        scrapers = [
+            "all stats/scrape_all_stats.py",
+            "sofascore_team_data/scrape_sofascore.py",
+            "scripts/scrape_sofaplayer.py",
+            "Match Logs/scrape_match_logs.py",
+            "scrape_stats_opta.py",
+        ]
+        for name in scrapers:
+            self.assertEqual(deps[self.index[name]], set(), msg=name)
+        self.assertEqual(deps[self.index["scripts/create_game_flow.py"]], {self.index["sofascore_team_data/scrape_sofascore.py"]})
+        self.assertIn(self.index["scripts/create_game_flow.py"], deps[self.index["scripts/build_data_store.py"]])
+        self.assertIn(self.index["all stats/scrape_all_stats.py"], deps[self.index["all stats/scrape_detailed_stats.py"]])
+        self.assertIn(
+            self.index["scripts/build_player_master.py"], deps[self.index["scripts/prepare_dashboard_data.py"]]
+        )
+
+        unknown = self.steps[:2] + [("scripts/new_step.py", "New")] + self.steps[2:4]
+        unknown_deps = pipeline.step_dependencies(unknown)
+        self.assertEqual(unknown_deps[2], {0, 1})
+        self.assertEqual(unknown_deps[4], {2})
+
+    def test_critical_path_is_longest_chain(self):
+        deps = [set(), set(), {0}, {1, 2}]
+        total, path = pipeline.critical_path(deps, {0: 5.0, 1: 1.0, 2: 2.0, 3: 1.5})
+        self.assertEqual(path, [0, 2, 3])
+        self.assertAlmostEqual(total, 8.5)
+
+    def test_parallel_run_respects_dependencies_and_hosts(self):
+        self._write_scripts()
+        messages = []
+        code = pipeline.run_pipeline(include_active=True, project_root=self.root, log_callback=messages.append, workers=4)
+        self.assertEqual(code, 0)
+        runs = self._runs()
+        self.assertEqual(set(runs), set(self.index))
+
+        deps = pipeline.step_dependencies(self.steps)
+        for rel_path, i in self.index.items():
+            for d in deps[i]:
+                self.assertGreaterEqual(runs[rel_path][0], runs[self.steps[d][0]][1], msg=f"{rel_path} before {self.steps[d][0]}")
+        fbref = sorted(runs[name] for name, io in pipeline.STEP_IO.items() if io.get("host") == "fbref.com")
+        for (_, end), (start, _) in zip(fbref, fbref[1:]):
+            self.assertGreaterEqual(start, end)
+        self.assertTrue(any(m.startswith("Critical Path:") for m in messages))
+
+    def test_unchanged_transforms_skipped_on_rerun(self):
+        self._write_scripts()
+        self.assertEqual(pipeline.run_pipeline(include_active=True, project_root=self.root, log_callback=lambda _: None), 0)
+        self.log.unlink()
+        self.assertEqual(pipeline.run_pipeline(include_active=True, project_root=self.root, log_callback=lambda _: None), 0)
+        hosts = {name for name, io in pipeline.STEP_IO.items() if io.get("host")}
+        self.assertEqual(set(self._runs()), hosts)
+
+        self.log.unlink()
+        code = pipeline.run_pipeline(
+            include_active=True, project_root=self.root, log_callback=lambda _: None, skip_scrapers=True
+        )
+        self.assertEqual(code, 0)
+        self.assertFalse(self.log.exists())
+
+    def test_failure_stops_new_steps_unless_continue_on_error(self):
+        self._write_scripts(failing={"sofascore_team_data/scrape_sofascore.py"})
+        code = pipeline.run_pipeline(include_active=True, project_root=self.root, log_callback=lambda _: None, workers=1)
+        self.assertEqual(code, 1)
+        self.assertNotIn("scripts/create_game_flow.py", self._runs())
+
+        self.log.unlink()
+        code = pipeline.run_pipeline(
+            continue_on_error=True,
+            include_active=True,
+            project_root=self.root,
+            log_callback=lambda _: None,
+            workers=3,
+            incremental=False,
+        )
+        self.assertEqual(code, 1)
+        self.assertEqual(set(self._runs()), set(self.index))
+
+
+if __name__ == "__main__":
+    unittest.main()
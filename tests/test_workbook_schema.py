@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure we can import local modules
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import workbook_schema
+from scripts import validate_output_integrity
+
+
+OPTA_COLUMNS = {
+    "Attacking": ["player", "goals", "xg", "shots"],
+    "Passing": ["player", "Open Play Passes_total", "Open Play Passes_successful"],
+    "Defending": ["player", "tackles", "ints"],
+    "Carrying": ["player", "carries", "Progressive_total"],
+    "Goalkeeping": ["player", "saves made", "goals conceded"],
+}
+
+
+class TestWorkbookSchema(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.league_dir = self.root / "Premier_League"
+        self.league_dir.mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, sheets):
+        path = self.league_dir / name
+        with pd.ExcelWriter(path) as writer:
+            for sheet, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet, index=False)
+        return path
+
+    def test_headers_match_pandas(self):
+        path = self._write(
+            "Arsenal.xlsx",
+            {"Shooting": pd.DataFrame([[1, 2, 3], [4, 5, 6]], columns=["xg", "xg", "Squad"]), "Empty": pd.DataFrame()},
+        )
+        info = workbook_schema.read_headers(path)
+        full = workbook_schema.read_full(path)
+        self.assertEqual(info["sheet_names"], ["Shooting", "Empty"])
+        self.assertEqual(info["sheets"]["Shooting"], full["sheets"]["Shooting"])
+        self.assertEqual(info["sheets"]["Shooting"]["columns"], ["xg", "xg.1", "Squad"])
+        self.assertEqual(info["sheets"]["Empty"]["rows"], 0)
+        self.assertEqual(list(workbook_schema.read_headers(path, sheets=["Empty"])["sheets"]), ["Empty"])
+
+    def test_opta_check_and_cache(self):
+        good = self._write("Arsenal.xlsx", {s: pd.DataFrame([[1] * len(c)], columns=c) for s, c in OPTA_COLUMNS.items()})
+        bad_sheets = dict(OPTA_COLUMNS, Defending=["player", "tackles"])
+        bad = self._write("Chelsea.xlsx", {s: pd.DataFrame([[1] * len(c)], columns=c) for s, c in bad_sheets.items()})
+        cache = workbook_schema.ValidationCache(str(self.root / "cache.json"), "opta", "rules")
+
+        self.assertEqual(validate_output_integrity.check_file(str(good), cache=cache), [])
+        self.assertEqual(
+            validate_output_integrity.check_file(str(bad), cache=cache),
+            ["[Premier_League/Chelsea.xlsx] Sheet 'Defending' Missing Cols: ['interceptions']"],
+        )
+        cache.save()
+
+        reloaded = workbook_schema.ValidationCache(str(self.root / "cache.json"), "opta", "rules")
+        self.assertEqual(len(validate_output_integrity.check_file(str(bad), cache=reloaded)), 1)
+        self.assertEqual(reloaded.hits, 1)
+        os.utime(bad, (1, 1))
+        self.assertIsNone(reloaded.get(bad))
+        self.assertIsNone(workbook_schema.ValidationCache(str(self.root / "cache.json"), "opta", "v2").get(good))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+BACKUP_DIRNAME = "backups"
+OBJECTS_DIRNAME = "objects"
+MANIFEST_NAME = "tracker_snapshots.jsonl"
+# Rows per content-addressed chunk. Appending predictions only rewrites the last chunk of a sheet.
+CHUNK_ROWS = 200
+
+
+def backup_dir_for(excel_file):
+    return os.path.join(os.path.dirname(excel_file) or ".", BACKUP_DIRNAME)
+
+
+def _object_path(backup_dir, digest):
+    return os.path.join(backup_dir, OBJECTS_DIRNAME, digest[:2], f"{digest}.json.gz")
+
+
+def _store_object(backup_dir, payload):
+    """Write payload once under its SHA-1; returns (digest, newly written)."""
+    blob = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha1(blob).hexdigest()
+    path = _object_path(backup_dir, digest)
+    if os.path.exists(path):
+        return digest, False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+    return digest, True
+
+
+def _load_object(backup_dir, digest):
+    with gzip.open(_object_path(backup_dir, digest), "rb") as f:
+        return json.loads(f.read().decode("utf-8"))
+
+
+def list_snapshots(backup_dir):
+    """Snapshot entries, oldest first."""
+    path = os.path.join(backup_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def snapshot(ledger, backup_dir, note=None):
+    """
+    Record the ledger's current state. Each sheet is split into chunks of CHUNK_ROWS rows stored
+    by content hash, so unchanged sheets and chunks cost nothing. Returns the new entry, or None
+    when the state equals the latest snapshot.
+    """
+    sheets = []
+    counts = {}
+    written = 0
+    for sheet in ledger.sheet_names():
+        rows = [[key, data] for key, data in ledger.raw_rows(sheet)]
+        counts[sheet] = len(rows)
+        chunks = []
+        for start in range(0, len(rows), CHUNK_ROWS):
+            digest, new = _store_object(backup_dir, rows[start : start + CHUNK_ROWS])
+            chunks.append(digest)
+            written += int(new)
+        sheets.append({"name": sheet, "columns": ledger.columns(sheet), "chunks": chunks})
+
+    history = list_snapshots(backup_dir)
+    if history and history[-1].get("sheets") == sheets:
+        return None
+
+    now = datetime.now()
+    entry = {
+        "id": now.strftime("%Y%m%d_%H%M%S_%f"),
+        "created": now.isoformat(timespec="seconds"),
+        "rows": counts,
+        "new_chunks": written,
+        "sheets": sheets,
+    }
+    if note:
+        entry["note"] = note
+    os.makedirs(backup_dir, exist_ok=True)
+    with open(os.path.join(backup_dir, MANIFEST_NAME), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return entry
+
+
+def find_snapshot(backup_dir, ref="latest"):
+    """
+    Resolve `ref` to a snapshot entry: "latest", an exact id, an id prefix, or a point in time
+    ("2026-02-20", "2026-02-20 23:30") meaning the last snapshot taken at or before it.
+    """
+    history = list_snapshots(backup_dir)
+    if not history:
+        return None
+    ref = str(ref or "latest").strip()
+    if ref.lower() == "latest":
+        return history[-1]
+    for entry in reversed(history):
+        if entry.get("id") == ref:
+            return entry
+    matches = [entry for entry in history if str(entry.get("id", "")).startswith(ref)]
+    if matches:
+        return matches[-1]
+    try:
+        as_of = pd.Timestamp(ref)
+    except (ValueError, TypeError):
+        return None
+    if len(ref) <= 10:
+        as_of = as_of + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+    before = [entry for entry in history if pd.Timestamp(entry["created"]) <= as_of]
+    return before[-1] if before else None
+
+
+def load_snapshot(backup_dir, entry):
+    """[(sheet, columns, [(key, data JSON)])] of a snapshot entry, as accepted by TrackerLedger.load_raw()."""
+    sheets = []
+    for sheet in entry.get("sheets", []):
+        rows = []
+        for digest in sheet.get("chunks", []):
+            rows.extend((key, data) for key, data in _load_object(backup_dir, digest))
+        sheets.append((sheet["name"], sheet.get("columns") or [], rows))
+    return sheets
+
+
+def restore(ledger, backup_dir, ref="latest"):
+    """Load snapshot `ref` into the ledger (replacing its contents). Returns the entry or None."""
+    entry = find_snapshot(backup_dir, ref)
+    if entry is None:
+        return None
+    ledger.load_raw(load_snapshot(backup_dir, entry))
+    return entry
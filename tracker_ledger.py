@@ -0,0 +1,282 @@
+import json
+import math
+import os
+import sqlite3
+from datetime import date, datetime
+
+import pandas as pd
+
+LEDGER_SUFFIX = ".db"
+
+
+def ledger_path(excel_file):
+    """prediction_tracker.xlsx -> prediction_tracker.db next to it."""
+    return os.path.splitext(excel_file)[0] + LEDGER_SUFFIX
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _encode_value(val):
+    if val is None:
+        return None
+    if isinstance(val, (pd.Timestamp, datetime, date)):
+        if pd.isna(val):
+            return None
+        return {"__ts__": pd.Timestamp(val).isoformat()}
+    if hasattr(val, "item") and not isinstance(val, (str, bytes)):
+        try:
+            val = val.item()
+        except Exception:
+            pass
+    try:
+        if pd.isna(val):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if isinstance(val, float) and math.isinf(val):
+        return None
+    if isinstance(val, (str, int, float, bool)):
+        return val
+    return str(val)
+
+
+def _decode_value(val):
+    if isinstance(val, dict) and "__ts__" in val:
+        return pd.Timestamp(val["__ts__"])
+    return val
+
+
+class TrackerLedger:
+    """
+    SQLite ledger behind prediction_tracker.xlsx.
+
+    Every workbook sheet is stored as rows of JSON objects. Sheets for which `key_func`
+    returns a key (predictions, bet rows, bet EV) are upserted row by row on that key;
+    the others (Summary, Model Eval ...) are replaced as a whole. The workbook itself is
+    only an export, regenerated by export_workbook(). Hand edits to the workbook are
+    picked up by sync_from_workbook() the next time the ledger is opened.
+    """
+
+    def __init__(self, path, key_func):
+        self.path = path
+        self.key_func = key_func
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sheets (
+                name TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                columns TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS rows (
+                sheet TEXT NOT NULL,
+                key TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (sheet, key)
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                k TEXT PRIMARY KEY,
+                v TEXT
+            );
+            """
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- meta -------------------------------------------------------------
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT v FROM meta WHERE k = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (k, v) VALUES (?, ?)", (key, value))
+
+    def _mark_dirty(self):
+        self._set_meta("dirty", "1")
+
+    @property
+    def dirty(self):
+        return self._get_meta("dirty") == "1"
+
+    # --- sheets -----------------------------------------------------------
+    def sheet_names(self):
+        return [r[0] for r in self.conn.execute("SELECT name FROM sheets ORDER BY position")]
+
+    def is_empty(self):
+        return self.conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0] == 0 and not self.sheet_names()
+
+    def columns(self, sheet):
+        row = self.conn.execute("SELECT columns FROM sheets WHERE name = ?", (sheet,)).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def _ensure_sheet(self, sheet, columns, position=None):
+        current = self.columns(sheet)
+        if not self.conn.execute("SELECT 1 FROM sheets WHERE name = ?", (sheet,)).fetchone():
+            if position is None:
+                position = self.conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM sheets").fetchone()[0]
+            self.conn.execute(
+                "INSERT INTO sheets (name, position, columns) VALUES (?, ?, ?)",
+                (sheet, position, json.dumps([str(c) for c in columns], ensure_ascii=False)),
+            )
+            return
+        merged = current + [str(c) for c in columns if str(c) not in current]
+        if merged != current:
+            self.conn.execute(
+                "UPDATE sheets SET columns = ? WHERE name = ?", (json.dumps(merged, ensure_ascii=False), sheet)
+            )
+
+    def frame(self, sheet):
+        columns = self.columns(sheet)
+        records = [
+            {k: _decode_value(v) for k, v in json.loads(data).items()}
+            for (data,) in self.conn.execute("SELECT data FROM rows WHERE sheet = ? ORDER BY seq", (sheet,))
+        ]
+        if not columns and not records:
+            return pd.DataFrame()
+        return pd.DataFrame(records, columns=columns)
+
+    def get(self, sheet, key):
+        row = self.conn.execute("SELECT data FROM rows WHERE sheet = ? AND key = ?", (sheet, key)).fetchone()
+        if not row:
+            return None
+        return {k: _decode_value(v) for k, v in json.loads(row[0]).items()}
+
+    def row_key(self, sheet, row):
+        return self.key_func(sheet, row)
+
+    def upsert_rows(self, sheet, rows, commit=True):
+        """Insert or update rows of a keyed sheet; existing rows keep their position."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        columns = []
+        for row in rows:
+            columns.extend(c for c in row.keys() if c not in columns)
+        self._ensure_sheet(sheet, columns)
+        next_seq = self.conn.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM rows WHERE sheet = ?", (sheet,)).fetchone()[0]
+        for row in rows:
+            key = self.key_func(sheet, row)
+            if key is None:
+                raise ValueError(f"Sheet '{sheet}' is not keyed; use replace_sheet().")
+            data = json.dumps({str(k): _encode_value(v) for k, v in row.items()}, ensure_ascii=False)
+            updated = self.conn.execute(
+                "UPDATE rows SET data = ? WHERE sheet = ? AND key = ?", (data, sheet, key)
+            ).rowcount
+            if not updated:
+                self.conn.execute(
+                    "INSERT INTO rows (sheet, key, seq, data) VALUES (?, ?, ?, ?)", (sheet, key, next_seq, data)
+                )
+                next_seq += 1
+        self._mark_dirty()
+        if commit:
+            self.conn.commit()
+        return len(rows)
+
+    def upsert(self, sheet, row, commit=True):
+        self.upsert_rows(sheet, [row], commit=commit)
+
+    def replace_sheet(self, sheet, df, commit=True):
+        """Replace a whole sheet. Keyed sheets collapse duplicate keys (last row wins)."""
+        df = df if df is not None else pd.DataFrame()
+        row = self.conn.execute("SELECT position FROM sheets WHERE name = ?", (sheet,)).fetchone()
+        self.conn.execute("DELETE FROM rows WHERE sheet = ?", (sheet,))
+        self.conn.execute("DELETE FROM sheets WHERE name = ?", (sheet,))
+        self._ensure_sheet(sheet, list(df.columns), position=row[0] if row else None)
+        collapsed = 0
+        for seq, row in enumerate(df.to_dict(orient="records")):
+            key = self.key_func(sheet, row)
+            if key is None:
+                key = str(seq)
+            data = json.dumps({str(k): _encode_value(v) for k, v in row.items()}, ensure_ascii=False)
+            exists = self.conn.execute("SELECT 1 FROM rows WHERE sheet = ? AND key = ?", (sheet, key)).fetchone()
+            if exists:
+                collapsed += 1
+                self.conn.execute("DELETE FROM rows WHERE sheet = ? AND key = ?", (sheet, key))
+            self.conn.execute("INSERT INTO rows (sheet, key, seq, data) VALUES (?, ?, ?, ?)", (sheet, key, seq, data))
+        self._mark_dirty()
+        if commit:
+            self.conn.commit()
+        return collapsed
+
+    # --- raw access (backups) ---------------------------------------------
+    def raw_rows(self, sheet):
+        """[(key, data JSON)] of a sheet in row order, exactly as stored."""
+        return [
+            (key, data)
+            for key, data in self.conn.execute("SELECT key, data FROM rows WHERE sheet = ? ORDER BY seq", (sheet,))
+        ]
+
+    def load_raw(self, sheets):
+        """Replace the whole ledger with [(sheet, columns, [(key, data JSON)])] from raw_rows()."""
+        self.conn.execute("DELETE FROM rows")
+        self.conn.execute("DELETE FROM sheets")
+        for position, (sheet, columns, rows) in enumerate(sheets):
+            self._ensure_sheet(sheet, columns, position=position)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rows (sheet, key, seq, data) VALUES (?, ?, ?, ?)",
+                [(sheet, key, seq, data) for seq, (key, data) in enumerate(rows)],
+            )
+        self._mark_dirty()
+        self.conn.commit()
+
+    # --- workbook import / export -----------------------------------------
+    def import_workbook(self, excel_file, merge=False):
+        """
+        Load every sheet of the workbook. With merge=False the workbook replaces the ledger;
+        with merge=True keyed rows are upserted (workbook wins) and nothing is deleted.
+        Returns {sheet: duplicate keys collapsed}.
+        """
+        xl = pd.ExcelFile(excel_file)
+        sheets = {sheet: pd.read_excel(xl, sheet_name=sheet) for sheet in xl.sheet_names}
+        collapsed = {}
+        if not merge:
+            self.conn.execute("DELETE FROM rows")
+            self.conn.execute("DELETE FROM sheets")
+        for sheet, df in sheets.items():
+            keyed = not df.empty and self.key_func(sheet, df.iloc[0].to_dict()) is not None
+            if merge and keyed:
+                self.upsert_rows(sheet, df.to_dict(orient="records"), commit=False)
+            else:
+                collapsed[sheet] = self.replace_sheet(sheet, df, commit=False)
+        self._set_meta("workbook_signature", _file_signature(excel_file))
+        self._set_meta("dirty", "1" if merge else "0")
+        self.conn.commit()
+        return collapsed
+
+    def sync_from_workbook(self, excel_file):
+        """
+        Re-import the workbook if it changed since the last export (e.g. results typed in by hand).
+        Returns import_workbook()'s duplicate counts, or None when nothing was imported.
+        """
+        if not os.path.exists(excel_file):
+            return None
+        signature = _file_signature(excel_file)
+        if signature == self._get_meta("workbook_signature"):
+            return None
+        merge = self.dirty and not self.is_empty()
+        if merge:
+            print(f"[Ledger] {excel_file} changed while the ledger had unexported rows; merging.")
+        return self.import_workbook(excel_file, merge=merge)
+
+    def export_workbook(self, excel_file):
+        with pd.ExcelWriter(excel_file, engine="openpyxl", mode="w") as writer:
+            for sheet in self.sheet_names():
+                self.frame(sheet).to_excel(writer, sheet_name=sheet, index=False)
+        self._set_meta("workbook_signature", _file_signature(excel_file))
+        self._set_meta("dirty", "0")
+        self.conn.commit()
@@ -1,10 +1,14 @@
 import argparse
+import fnmatch
 import subprocess
 import sys
 import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
+import build_manifest
+
 try:
     import tkinter as tk
     from tkinter import scrolledtext
@@ -23,10 +27,12 @@ PROJECT_ROOT = Path(__file__).resolve().parent
 RAW_SCRIPTS_TO_RUN = [
     ("all stats/scrape_all_stats.py", "Scraping Base League Stats..."),
     ("all stats/scrape_detailed_stats.py", "Scraping Detailed Stats (Shooting, Passing, etc.)..."),
+    ("scripts/build_player_master.py", "Building FBref player master table..."),
     ("sofascore_team_data/scrape_sofascore.py", "Scraping SofaScore Team Data (raw only)..."),
     ("scripts/scrape_sofaplayer.py", "Scraping Detailed Player Season Stats..."),
     ("Match Logs/scrape_match_logs.py", "Scraping Match Logs..."),
     ("scrape_stats_opta.py", "Scraping OPTA Advanced Stats (theanalyst.com)..."),
+    ("scripts/build_opta_team_table.py", "Aggregating OPTA player stats into league team tables..."),
     ("scripts/validate_raw_columns.py", "Validating RAW columns against expected schema..."),
 ]
 
@@ -36,13 +42,123 @@ ACTIVE_SCRIPTS_TO_RUN = [
     ("scripts/prepare_dashboard_data.py", "Updating Dashboard Data (data.json)..."),
 ]
 
+# Compile what the steps above wrote into the Parquet store read by the prediction path (ordered by STEP_IO).
+STORE_SCRIPTS_TO_RUN = [
+    ("scripts/build_data_store.py", "Compiling Excel outputs into columnar data store..."),
+    ("scripts/build_heatmap_grids.py", "Rasterizing heatmap points into player grids..."),
+]
+
+# Files each step reads and writes (globs relative to the project root) and the site it scrapes.
+# run_pipeline derives the step DAG from these: a step waits for every earlier step that writes a
+# file it reads or writes, or that reads a file it writes; steps scraping the same host never overlap
+# (FBref and SofaScore rate-limit per client). A step missing here waits for everything before it.
+# Steps with inputs and no host are incremental (build_manifest): skipped while their code, inputs and
+# outputs are unchanged; a "partition" maps files to leagues so only the changed leagues are rebuilt
+# (the script is re-run with one `arg` per league).
+STEP_IO = {
+    "all stats/scrape_all_stats.py": {
+        "inputs": [],
+        "outputs": ["all stats/*_Stats.xlsx"],
+        "host": "fbref.com",
+    },
+    "all stats/scrape_detailed_stats.py": {
+        "inputs": ["all stats/*_Stats.xlsx"],
+        "outputs": ["all stats/*_Stats.xlsx"],
+        "host": "fbref.com",
+    },
+    "scripts/build_player_master.py": {
+        "inputs": ["all stats/*_Stats.xlsx"],
+        "outputs": ["data_store/player_master.*"],
+    },
+    "sofascore_team_data/scrape_sofascore.py": {
+        "inputs": [],
+        "outputs": ["sofascore_team_data/*_Team_Stats.xlsx"],
+        "host": "sofascore.com",
+    },
+    "scripts/scrape_sofaplayer.py": {
+        "inputs": [],
+        "outputs": ["sofaplayer/*/*_stats.xlsx"],
+        "host": "sofascore.com",
+    },
+    "Match Logs/scrape_match_logs.py": {
+        "inputs": [],
+        "outputs": ["Match Logs/*/*.xlsx"],
+        "host": "fbref.com",
+    },
+    "scrape_stats_opta.py": {
+        "inputs": [],
+        "outputs": ["output_opta/*/*.xlsx"],
+        "host": "theanalyst.com",
+    },
+    "scripts/build_opta_team_table.py": {
+        "inputs": ["output_opta/*/*.xlsx"],
+        "outputs": ["output_opta/*_Team_Aggregates.xlsx"],
+        "partition": {
+            "inputs": "output_opta/{league}/*.xlsx",
+            "outputs": "output_opta/{league}_Team_Aggregates.xlsx",
+            "arg": "--league",
+        },
+    },
+    "scripts/validate_raw_columns.py": {
+        "inputs": ["sofascore_team_data/*_Team_Stats.xlsx", "all stats/*_Stats.xlsx"],
+        "outputs": ["data_store/validation_cache.json"],
+    },
+    "active/convert_sofascore_per90.py": {
+        "inputs": ["sofascore_team_data/*_Team_Stats.xlsx"],
+        "outputs": ["active/sofascore_team_data/*_Team_Stats.xlsx"],
+        "partition": {
+            "inputs": "sofascore_team_data/{league}_Team_Stats.xlsx",
+            "outputs": "active/sofascore_team_data/{league}_Team_Stats.xlsx",
+            "arg": "--league",
+        },
+    },
+    "scripts/create_game_flow.py": {
+        "inputs": ["sofascore_team_data/*_Team_Stats.xlsx"],
+        "outputs": ["game flow/*_GameFlow.xlsx"],
+        "partition": {
+            "inputs": "sofascore_team_data/{league}_Team_Stats.xlsx",
+            "outputs": "game flow/{league}_GameFlow.xlsx",
+            "arg": "--league",
+        },
+    },
+    # player_master.load_master() rebuilds a stale master in place, so wait for build_player_master.
+    "scripts/prepare_dashboard_data.py": {
+        "inputs": [
+            "sofascore_team_data/*_Team_Stats.xlsx",
+            "game flow/*_GameFlow.xlsx",
+            "all stats/*_Stats.xlsx",
+            "data_store/player_master.*",
+        ],
+        "outputs": ["dashboard/data.json"],
+    },
+    # Inputs mirror data_store.STORE_SOURCES.
+    "scripts/build_data_store.py": {
+        "inputs": [
+            "sofascore_team_data/*_Team_Stats.xlsx",
+            "sofaplayer/*/*_stats.xlsx",
+            "position/*/*_positions.xlsx",
+            "player_characteristics/*_Characteristics.xlsx",
+            "game flow/*_GameFlow.xlsx",
+            "Match Logs/*/*.xlsx",
+            "output_opta/*/*.xlsx",
+            "output_opta/*_Team_Aggregates.xlsx",
+        ],
+        "outputs": ["data_store/manifest.json", "data_store/*/**/*.parquet"],
+    },
+    "scripts/build_heatmap_grids.py": {
+        "inputs": ["scripts/heatmap/*/*_heatmaps.xlsx"],
+        "outputs": ["data_store/heatmaps/*"],
+    },
+}
+
 DEFAULT_RUN_ACTIVE_SCRIPTS = False
+DEFAULT_PIPELINE_WORKERS = 4
 
 
 def build_steps(include_active=False):
     if include_active:
-        return RAW_SCRIPTS_TO_RUN + ACTIVE_SCRIPTS_TO_RUN
-    return list(RAW_SCRIPTS_TO_RUN)
+        return RAW_SCRIPTS_TO_RUN + ACTIVE_SCRIPTS_TO_RUN + STORE_SCRIPTS_TO_RUN
+    return RAW_SCRIPTS_TO_RUN + STORE_SCRIPTS_TO_RUN
 
 
 def resolve_step_path(relative_script_path, project_root=PROJECT_ROOT):
@@ -60,10 +176,58 @@ def get_missing_scripts(steps=None, project_root=PROJECT_ROOT):
     return missing
 
 
-def _run_single_script(script_path, cwd, log_callback):
+def _patterns_overlap(a, b):
+    return a == b or fnmatch.fnmatchcase(a, b) or fnmatch.fnmatchcase(b, a)
+
+
+def _touches(patterns, others):
+    return any(_patterns_overlap(a, b) for a in patterns for b in others)
+
+
+def step_dependencies(steps):
+    """For each step, the indices of the earlier steps it has to wait for (see STEP_IO)."""
+    deps = []
+    for index, (rel_path, _) in enumerate(steps):
+        io = STEP_IO.get(rel_path)
+        after = set()
+        for earlier, (earlier_path, _) in enumerate(steps[:index]):
+            prev = STEP_IO.get(earlier_path)
+            if io is None or prev is None:
+                after.add(earlier)
+            elif (
+                _touches(io["inputs"], prev["outputs"])
+                or _touches(io["outputs"], prev["outputs"])
+                or _touches(io["outputs"], prev["inputs"])
+            ):
+                after.add(earlier)
+        deps.append(after)
+    return deps
+
+
+def critical_path(deps, durations):
+    """(total seconds, step indices) of the longest dependency chain through the finished steps."""
+    finish = {}
+    back = {}
+    for index in sorted(durations):
+        parents = [d for d in deps[index] if d in finish]
+        parent = max(parents, key=lambda d: finish[d]) if parents else None
+        finish[index] = durations[index] + (finish[parent] if parent is not None else 0.0)
+        back[index] = parent
+    if not finish:
+        return 0.0, []
+    end = max(finish, key=lambda i: finish[i])
+    path = []
+    node = end
+    while node is not None:
+        path.append(node)
+        node = back[node]
+    return finish[end], path[::-1]
+
+
+def _run_single_script(script_path, cwd, log_callback, prefix="  > ", args=()):
     start = time.time()
     process = subprocess.Popen(
-        [sys.executable, "-u", str(script_path)],
+        [sys.executable, "-u", str(script_path), *args],
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         universal_newlines=True,
@@ -72,7 +236,7 @@ def _run_single_script(script_path, cwd, log_callback):
     )
     if process.stdout is not None:
         for line in process.stdout:
-            log_callback(f"  > {line.rstrip()}")
+            log_callback(f"{prefix}{line.rstrip()}")
     process.wait()
     return process.returncode, time.time() - start
 
@@ -84,14 +248,25 @@ def run_pipeline(
     include_active=False,
     project_root=PROJECT_ROOT,
     log_callback=print,
+    workers=DEFAULT_PIPELINE_WORKERS,
+    incremental=True,
+    skip_scrapers=False,
 ):
+    """
+    Run the pipeline steps as a DAG (step_dependencies): each step starts as soon as the steps it
+    depends on have finished, with at most `workers` scripts at once (workers=1 runs them in list order).
+    incremental=False (--force) re-runs every transform; skip_scrapers only refreshes the transforms.
+    """
     steps = build_steps(include_active=include_active)
+    deps = step_dependencies(steps)
+    workers = max(1, int(workers or 1))
     mode_text = "RAW + ACTIVE" if include_active else "RAW ONLY"
 
     log_callback("=== Starting Automation Pipeline ===")
     log_callback(f"Project Root: {project_root}")
     log_callback(f"Start Time: {time.strftime('%Y-%m-%d %H:%M:%S')}")
     log_callback(f"Mode: {mode_text}")
+    log_callback(f"Workers: {workers}")
 
     missing = get_missing_scripts(steps=steps, project_root=project_root)
     if missing:
@@ -107,50 +282,142 @@ def run_pipeline(
     if dry_run:
         log_callback("\n[Dry Run] Pipeline steps:")
         for idx, (rel_path, description) in enumerate(steps, start=1):
-            log_callback(f"  {idx:02d}. {description} -> {rel_path}")
+            after = ", ".join(f"{d + 1:02d}" for d in sorted(deps[idx - 1]))
+            log_callback(f"  {idx:02d}. {description} -> {rel_path}" + (f" (after {after})" if after else ""))
         return 0
 
     if preflight_only:
         return 0
 
-    results = []
     total = len(steps)
-    for index, (script_rel_path, description) in enumerate(steps, start=1):
+    results = {}
+    skipped = set()
+    builds = {}
+    pending = list(range(total))
+    running = {}
+    busy_hosts = set()
+    stopping = False
+    started_at = time.time()
+    manifest = build_manifest.BuildManifest(project_root=project_root) if incremental else None
+
+    def _plan_step(index):
+        """(action, script args, reason); keeps the code/input hashes a tracked step is about to run on."""
+        script_rel_path = steps[index][0]
+        io = STEP_IO.get(script_rel_path)
+        if io and io.get("host"):
+            return ("skip", (), "scraper skipped (--skip-scrapers)") if skip_scrapers else ("run", (), "")
+        if manifest is None or not io or not io["inputs"]:
+            return "run", (), ""
+        code = manifest.code_digest(script_rel_path)
+        inputs = manifest.snapshot(io["inputs"])
+        action, leagues, reason = manifest.plan(script_rel_path, io, code, inputs)
+        builds[index] = (io, code, inputs)
+        if action != "partial":
+            return action, (), reason
+        arg = io["partition"]["arg"]
+        return "run", tuple(part for league in leagues for part in (arg, league)), f"{reason}: {', '.join(leagues)}"
+
+    def _run_step(index, args):
+        script_rel_path = steps[index][0]
         script_path = resolve_step_path(script_rel_path, project_root=project_root)
-        log_callback(f"\n[{index}/{total}] {description}")
-        log_callback(f"Script: {script_path}")
+        prefix = "  > " if workers == 1 else f"  [{index + 1:02d}] > "
         try:
-            returncode, duration = _run_single_script(script_path, cwd=project_root, log_callback=log_callback)
-        except KeyboardInterrupt:
-            log_callback("\nPipeline interrupted by user.")
-            return 130
+            return _run_single_script(
+                script_path, cwd=project_root, log_callback=log_callback, prefix=prefix, args=args
+            )
         except Exception as exc:
             log_callback(f"[!] Exception while running {script_rel_path}: {exc}")
-            returncode = 1
-            duration = 0.0
-
-        ok = returncode == 0
-        status = "OK" if ok else "FAILED"
-        log_callback(f"  [{status}] exit={returncode} time={duration:.1f}s")
-        results.append((script_rel_path, description, returncode, duration))
-        if not ok and not continue_on_error:
-            log_callback("\nStopping pipeline due to failure (use --continue-on-error to keep going).")
-            break
-
-    ok_count = sum(1 for _, _, code, _ in results if code == 0)
+            return 1, 0.0
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while running or (pending and not stopping):
+            for index in list(pending):
+                if stopping or len(running) >= workers:
+                    break
+                host = (STEP_IO.get(steps[index][0]) or {}).get("host")
+                if any(d not in results for d in deps[index]) or (host and host in busy_hosts):
+                    continue
+                pending.remove(index)
+                script_rel_path, description = steps[index]
+                log_callback(f"\n[{index + 1}/{total}] {description}")
+                action, args, reason = _plan_step(index)
+                if action == "skip":
+                    log_callback(f"  [SKIP] {script_rel_path}: {reason}")
+                    results[index] = (0, 0.0)
+                    skipped.add(index)
+                    continue
+                if host:
+                    busy_hosts.add(host)
+                log_callback(f"Script: {resolve_step_path(script_rel_path, project_root=project_root)}")
+                if reason:
+                    log_callback(f"Rebuild: {reason}" + (f" -> {' '.join(args)}" if args else ""))
+                running[pool.submit(_run_step, index, args)] = index
+
+            if not running:
+                break
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = running.pop(future)
+                returncode, duration = future.result()
+                host = (STEP_IO.get(steps[index][0]) or {}).get("host")
+                busy_hosts.discard(host)
+                results[index] = (returncode, duration)
+                ok = returncode == 0
+                if index in builds:
+                    io, code, inputs = builds[index]
+                    if ok:
+                        manifest.record(steps[index][0], io, code, inputs)
+                    else:
+                        manifest.forget(steps[index][0])
+                    manifest.save()
+                status = "OK" if ok else "FAILED"
+                log_callback(f"  [{status}] {steps[index][0]} exit={returncode} time={duration:.1f}s")
+                if not ok and not continue_on_error and not stopping:
+                    stopping = True
+                    log_callback("\nStopping pipeline due to failure (use --continue-on-error to keep going).")
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        log_callback("\nPipeline interrupted by user.")
+        return 130
+    pool.shutdown(wait=True)
+    if manifest is not None:
+        manifest.save()
+
+    ok_count = sum(1 for code, _ in results.values() if code == 0)
     fail_count = len(results) - ok_count
+    durations = {index: duration for index, (_, duration) in results.items() if index not in skipped}
+    path_seconds, path = critical_path(deps, durations)
     log_callback("\n=== Pipeline Summary ===")
     log_callback(f"Completed Steps: {len(results)}/{len(steps)}")
-    log_callback(f"Successful: {ok_count}")
+    log_callback(f"Successful: {ok_count}" + (f" ({len(skipped)} up to date / skipped)" if skipped else ""))
     log_callback(f"Failed: {fail_count}")
+    log_callback(
+        f"Wall Time: {time.time() - started_at:.1f}s (steps total {sum(durations.values()):.1f}s, "
+        f"critical path {path_seconds:.1f}s)"
+    )
+    if path:
+        log_callback("Critical Path:")
+        for index in path:
+            log_callback(f"  - {steps[index][0]} ({durations[index]:.1f}s)")
     log_callback(f"End Time: {time.strftime('%Y-%m-%d %H:%M:%S')}")
     return 0 if fail_count == 0 and len(results) == len(steps) else 1
 
 
 class ScraperApp:
-    def __init__(self, root, include_active=DEFAULT_RUN_ACTIVE_SCRIPTS):
+    def __init__(
+        self,
+        root,
+        include_active=DEFAULT_RUN_ACTIVE_SCRIPTS,
+        workers=DEFAULT_PIPELINE_WORKERS,
+        incremental=True,
+        skip_scrapers=False,
+    ):
         self.root = root
         self.include_active = include_active
+        self.workers = workers
+        self.incremental = incremental
+        self.skip_scrapers = skip_scrapers
         self.root.title("Football Data Automation Pipeline")
         self.root.geometry("800x600")
 
@@ -233,6 +500,9 @@ class ScraperApp:
             include_active=self.include_active,
             project_root=PROJECT_ROOT,
             log_callback=gui_logger,
+            workers=self.workers,
+            incremental=self.incremental,
+            skip_scrapers=self.skip_scrapers,
         )
 
         if exit_code == 0:
@@ -268,15 +538,43 @@ def parse_args():
         action="store_true",
         help="Validate required scripts and exit.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_PIPELINE_WORKERS,
+        help=f"Steps run at once when their inputs are ready (default: {DEFAULT_PIPELINE_WORKERS}; 1 = sequential).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run every transform even when its inputs, outputs and code are unchanged.",
+    )
+    parser.add_argument(
+        "--skip-scrapers",
+        action="store_true",
+        help="Only refresh the transforms from the data already on disk.",
+    )
     return parser.parse_args()
 
 
-def launch_gui(auto_start=False, include_active=DEFAULT_RUN_ACTIVE_SCRIPTS):
+def launch_gui(
+    auto_start=False,
+    include_active=DEFAULT_RUN_ACTIVE_SCRIPTS,
+    workers=DEFAULT_PIPELINE_WORKERS,
+    incremental=True,
+    skip_scrapers=False,
+):
     if tk is None:
         print("Tkinter is not available in this environment. Use --headless mode.")
         return 3
     root = tk.Tk()
-    app = ScraperApp(root, include_active=include_active)
+    app = ScraperApp(
+        root,
+        include_active=include_active,
+        workers=workers,
+        incremental=incremental,
+        skip_scrapers=skip_scrapers,
+    )
     if auto_start:
         root.after(1000, app.start_pipeline)
     root.mainloop()
@@ -291,6 +589,8 @@ if __name__ == "__main__":
         or args.dry_run
         or args.preflight_only
         or args.continue_on_error
+        or args.skip_scrapers
+        or args.force
     )
 
     if headless_mode:
@@ -302,6 +602,17 @@ if __name__ == "__main__":
                 include_active=args.include_active,
                 project_root=PROJECT_ROOT,
                 log_callback=print,
+                workers=args.workers,
+                incremental=not args.force,
+                skip_scrapers=args.skip_scrapers,
             )
         )
-    raise SystemExit(launch_gui(auto_start=args.auto_start, include_active=args.include_active))
+    raise SystemExit(
+        launch_gui(
+            auto_start=args.auto_start,
+            include_active=args.include_active,
+            workers=args.workers,
+            incremental=not args.force,
+            skip_scrapers=args.skip_scrapers,
+        )
+    )
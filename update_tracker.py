@@ -3,16 +3,21 @@ import json
 import math
 import os
 import re
-import shutil
 import unicodedata
 from datetime import datetime
 
 import pandas as pd
 
+import market_pricing
+import tracker_backup
+import tracker_ledger
+
 NO_BET_LABEL = "No Bet"
 TEAM_SUFFIX_TOKENS = {"fc", "cf", "sc", "afc", "ac"}
 CALIBRATION_FILE = "model_calibration.json"
 PERFORMANCE_FILE = "model_performance.json"
+# Sheets upserted row by row on (date, home, away); "bet ev" is keyed on (date, match, selection).
+LEDGER_KEYED_SHEETS = {"Predictions", "bet data", "bet predic", "bet ev"}
 QUALITY_GATES = {
     "min_completed_matches": 30,
     "result_accuracy_min": 0.50,
@@ -23,24 +28,42 @@ QUALITY_GATES = {
 }
 
 
-def backup_tracker(excel_file, max_backups=10):
-    if not os.path.exists(excel_file):
-        return
-    backup_dir = os.path.join(os.path.dirname(excel_file) or ".", "backups")
-    os.makedirs(backup_dir, exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_name = f"prediction_tracker_backup_{ts}.xlsx"
-    backup_path = os.path.join(backup_dir, backup_name)
+def backup_tracker(excel_file, ledger, note=None):
+    """Snapshot the ledger into backups/ (content-addressed chunks; unchanged state is skipped)."""
     try:
-        shutil.copy2(excel_file, backup_path)
-        backups = sorted(
-            [f for f in os.listdir(backup_dir) if f.startswith("prediction_tracker_backup_") and f.endswith(".xlsx")]
-        )
-        while len(backups) > max_backups:
-            old = backups.pop(0)
-            os.remove(os.path.join(backup_dir, old))
+        entry = tracker_backup.snapshot(ledger, tracker_backup.backup_dir_for(excel_file), note=note)
+        if entry is not None and entry.get("new_chunks"):
+            print(f"[Backup] Snapshot {entry['id']} ({entry['new_chunks']} new chunks)")
+        return entry
     except Exception as e:
         print(f"[Backup Warning] {e}")
+        return None
+
+
+def list_backups(filename="prediction_tracker.xlsx"):
+    history = tracker_backup.list_snapshots(tracker_backup.backup_dir_for(filename))
+    if not history:
+        print("No tracker snapshots yet.")
+        return
+    for entry in history:
+        rows = ", ".join(f"{sheet}={n}" for sheet, n in entry.get("rows", {}).items())
+        note = f" [{entry['note']}]" if entry.get("note") else ""
+        print(f"{entry['id']}  {entry['created']}  {rows}{note}")
+
+
+def restore_backup(ref="latest", filename="prediction_tracker.xlsx"):
+    """Restore the tracker to snapshot `ref` (id, id prefix, 'latest' or a date/time) and re-export."""
+    backup_dir = tracker_backup.backup_dir_for(filename)
+    entry = tracker_backup.find_snapshot(backup_dir, ref)
+    if entry is None:
+        print(f"No tracker snapshot matches '{ref}'.")
+        return None
+    with _open_ledger(filename) as ledger:
+        backup_tracker(filename, ledger, note=f"before restore {entry['id']}")
+        ledger.load_raw(tracker_backup.load_snapshot(backup_dir, entry))
+        ledger.export_workbook(filename)
+    print(f"[Info] Restored {filename} to snapshot {entry['id']} ({entry['created']}).")
+    return entry
 
 
 def _normalize_text_key(value):
@@ -77,62 +100,58 @@ def _first_nonblank(row, candidates):
     return None
 
 
-def _duplicate_mask(df, row_date, row_match, row_home=None, row_away=None):
-    if df is None or df.empty:
-        return pd.Series([], dtype=bool)
-
-    date_key = _normalize_date_key(row_date)
-    date_col = df.get("Date", pd.Series([""] * len(df)))
-    date_norm = pd.to_datetime(date_col, errors="coerce")
-    date_norm = date_norm.dt.strftime("%Y-%m-%d").where(date_norm.notna(), date_col.astype(str).str.slice(0, 10))
-    date_mask = date_norm == date_key
-
-    match_col = df.get("Match", pd.Series([""] * len(df)))
-    match_mask = match_col.astype(str).apply(_normalize_text_key) == _normalize_text_key(row_match)
-    mask = date_mask & match_mask
-    if mask.any():
-        return mask
-
-    home_col = None
-    away_col = None
-    if "Home_Team" in df.columns:
-        home_col = "Home_Team"
-    elif "Home" in df.columns:
-        home_col = "Home"
-    if "Away_Team" in df.columns:
-        away_col = "Away_Team"
-    elif "Away" in df.columns:
-        away_col = "Away"
-
-    if row_home is not None and row_away is not None and home_col and away_col:
-        home_mask = df[home_col].astype(str).apply(_normalize_team_key) == _normalize_team_key(row_home)
-        away_mask = df[away_col].astype(str).apply(_normalize_team_key) == _normalize_team_key(row_away)
-        mask = date_mask & home_mask & away_mask
-    return mask
-
-
-def _ensure_columns(df, columns):
-    out = df.copy() if df is not None else pd.DataFrame()
-    for col in columns:
-        if col not in out.columns:
-            out[col] = pd.NA
-    return out
+def _ledger_row_key(sheet, row):
+    """Ledger upsert key: (date, canonical home, canonical away) for match sheets, None for derived sheets."""
+    if sheet == "bet ev":
+        return "|".join(
+            [_normalize_date_key(row.get("Date"))]
+            + ["" if _is_blank_value(row.get(col)) else str(row.get(col)).strip() for col in ["Match", "Selection"]]
+        )
+    if sheet not in LEDGER_KEYED_SHEETS:
+        return None
+
+    date_key = _normalize_date_key(row.get("Date"))
+    home = next((row.get(c) for c in ["Home_Team", "Home"] if not _is_blank_value(row.get(c))), None)
+    away = next((row.get(c) for c in ["Away_Team", "Away"] if not _is_blank_value(row.get(c))), None)
+    match = row.get("Match")
+    if (home is None or away is None) and not _is_blank_value(match) and " vs " in str(match):
+        home, away = [part.strip() for part in str(match).split(" vs ", 1)]
+    if home is not None and away is not None:
+        return f"{date_key}|{_normalize_team_key(home)}|{_normalize_team_key(away)}"
+    return f"{date_key}|{_normalize_text_key(match)}"
+
+
+def _tracker_exists(filename):
+    return os.path.exists(filename) or os.path.exists(tracker_ledger.ledger_path(filename))
 
 
-def _load_all_sheets(filename):
-    if not os.path.exists(filename):
-        return {}
+def _open_ledger(filename):
+    ledger = tracker_ledger.TrackerLedger(tracker_ledger.ledger_path(filename), _ledger_row_key)
     try:
-        xl = pd.ExcelFile(filename)
-        return {sheet: pd.read_excel(filename, sheet_name=sheet) for sheet in xl.sheet_names}
-    except Exception:
-        return {}
+        collapsed = ledger.sync_from_workbook(filename)
+    except Exception as e:
+        print(f"[Ledger Warning] Could not import {filename}: {e}")
+        collapsed = None
+    for sheet, removed in (collapsed or {}).items():
+        if removed > 0:
+            print(f"[Info] {sheet}: removed {removed} duplicates")
+    if collapsed is not None:
+        backup_tracker(filename, ledger, note="imported workbook")
+    return ledger
 
 
-def _save_all_sheets(filename, sheets):
-    with pd.ExcelWriter(filename, engine="openpyxl", mode="w") as writer:
-        for sheet_name, df in sheets.items():
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
+def export_tracker(filename="prediction_tracker.xlsx", force=False):
+    """Regenerate the Excel view from the ledger (skipped when nothing changed since the last export)."""
+    if not _tracker_exists(filename):
+        print(f"{filename} not found.")
+        return
+    with _open_ledger(filename) as ledger:
+        if not ledger.sheet_names():
+            return
+        if not force and not ledger.dirty and os.path.exists(filename):
+            return
+        backup_tracker(filename, ledger)
+        ledger.export_workbook(filename)
 
 
 def _format_line_value(val):
@@ -703,14 +722,20 @@ def _build_calibration_from_predictions(df):
     }
 
 
-def build_model_calibration(filename="prediction_tracker.xlsx", output_file=CALIBRATION_FILE):
-    if not os.path.exists(filename):
+def _read_predictions(filename):
+    if not _tracker_exists(filename):
         print(f"{filename} not found.")
-        return
-    try:
-        df = pd.read_excel(filename, sheet_name="Predictions", engine="openpyxl")
-    except Exception as e:
-        print(f"Could not read Predictions sheet: {e}")
+        return None
+    with _open_ledger(filename) as ledger:
+        if "Predictions" not in ledger.sheet_names():
+            print("Could not read Predictions sheet: not found in tracker.")
+            return None
+        return ledger.frame("Predictions")
+
+
+def build_model_calibration(filename="prediction_tracker.xlsx", output_file=CALIBRATION_FILE):
+    df = _read_predictions(filename)
+    if df is None:
         return
 
     calibration = _build_calibration_from_predictions(df)
@@ -731,15 +756,9 @@ def build_model_calibration(filename="prediction_tracker.xlsx", output_file=CALI
     )
 
 
-def evaluate_model_performance(filename="prediction_tracker.xlsx", output_file=PERFORMANCE_FILE):
-    if not os.path.exists(filename):
-        print(f"{filename} not found.")
-        return
-
-    try:
-        df = pd.read_excel(filename, sheet_name="Predictions", engine="openpyxl")
-    except Exception as e:
-        print(f"Could not read Predictions sheet: {e}")
+def evaluate_model_performance(filename="prediction_tracker.xlsx", output_file=PERFORMANCE_FILE, export=True):
+    df = _read_predictions(filename)
+    if df is None:
         return
 
     metrics = _evaluate_prediction_rows(df)
@@ -820,12 +839,12 @@ def evaluate_model_performance(filename="prediction_tracker.xlsx", output_file=P
         seg_rows.append(row)
     df_segments = pd.DataFrame(seg_rows).sort_values(by=["Segment_Type", "n_matches"], ascending=[True, False]) if seg_rows else pd.DataFrame()
 
-    sheets = _load_all_sheets(filename)
-    sheets["Model Eval"] = df_overall
-    sheets["Model Eval League"] = df_league
-    sheets["Model Eval Segments"] = df_segments
-    backup_tracker(filename)
-    _save_all_sheets(filename, sheets)
+    with _open_ledger(filename) as ledger:
+        ledger.replace_sheet("Model Eval", df_overall)
+        ledger.replace_sheet("Model Eval League", df_league)
+        ledger.replace_sheet("Model Eval Segments", df_segments)
+    if export:
+        export_tracker(filename)
 
     print(f"[Info] Performance report saved to {output_file}")
     print(
@@ -840,9 +859,10 @@ def evaluate_model_performance(filename="prediction_tracker.xlsx", output_file=P
 
 
 def close_loop_after_actual(filename="prediction_tracker.xlsx"):
-    update_bet_results(filename=filename)
+    update_bet_results(filename=filename, export=False)
     build_model_calibration(filename=filename, output_file=CALIBRATION_FILE)
-    evaluate_model_performance(filename=filename, output_file=PERFORMANCE_FILE)
+    evaluate_model_performance(filename=filename, output_file=PERFORMANCE_FILE, export=False)
+    export_tracker(filename)
     print("[Info] Close loop complete: update_bets -> calibrate -> evaluate")
 
 
@@ -851,29 +871,13 @@ def _build_bet_data_row(data):
     if not bet_data:
         return None
 
-    def pct(val):
-        return round(float(val) * 100.0, 1)
-
-    return {
+    row = {
         "Date": data.get("Date", ""),
         "Match": data.get("Match", ""),
         "League": data.get("League", ""),
-        "HDP -3": pct(bet_data.get("HDP_-3", 0.0)),
-        "HDP -2": pct(bet_data.get("HDP_-2", 0.0)),
-        "HDP -1": pct(bet_data.get("HDP_-1", 0.0)),
-        "HDP 0": pct(bet_data.get("HDP_0", 0.0)),
-        "HDP +1": pct(bet_data.get("HDP_1", 0.0)),
-        "HDP +2": pct(bet_data.get("HDP_2", 0.0)),
-        "HDP +3": pct(bet_data.get("HDP_3", 0.0)),
-        "Over 0.5": pct(bet_data.get("Over_0.5", 0.0)),
-        "Under 0.5": pct(bet_data.get("Under_0.5", 0.0)),
-        "Over 1.5": pct(bet_data.get("Over_1.5", 0.0)),
-        "Under 1.5": pct(bet_data.get("Under_1.5", 0.0)),
-        "Over 2.5": pct(bet_data.get("Over_2.5", 0.0)),
-        "Under 2.5": pct(bet_data.get("Under_2.5", 0.0)),
-        "Over 3.5": pct(bet_data.get("Over_3.5", 0.0)),
-        "Under 3.5": pct(bet_data.get("Under_3.5", 0.0)),
     }
+    row.update(market_pricing.bet_row(bet_data))
+    return row
 
 
 def _best_bet_from_model(data):
@@ -892,13 +896,7 @@ def _best_bet_from_model(data):
 
     for hdp in [-1, 0, 1]:
         key = f"HDP_{hdp}"
-        if key in bet_detail:
-            win = float(bet_detail[key].get("win", 0.0))
-            push = float(bet_detail[key].get("push", 0.0))
-        else:
-            win = float(bet_data.get(key, 0.0))
-            push = 0.0
-        prob = win / max(1e-9, 1.0 - push)
+        prob = market_pricing.hdp_probability(bet_data, bet_detail, key)
         label = f"HDP {hdp}" if hdp <= 0 else f"HDP +{hdp}"
         candidates.append((label, prob))
 
@@ -949,7 +947,7 @@ def _best_bet_from_model(data):
     }
 
 
-def save_new_prediction():
+def save_new_prediction(export=True):
     json_file = "latest_prediction.json"
     excel_file = "prediction_tracker.xlsx"
 
@@ -963,40 +961,37 @@ def save_new_prediction():
     print(f"Loading prediction: {data.get('Match', 'Unknown')}")
     new_row = _build_new_prediction_row(data)
 
-    sheets = _load_all_sheets(excel_file)
-    df_pred = sheets.get("Predictions", pd.DataFrame())
-    df_pred = _ensure_columns(df_pred, list(new_row.keys()))
-
-    match_label = f"{new_row['Home']} vs {new_row['Away']}"
-    dup = _duplicate_mask(df_pred, new_row["Date"], match_label, new_row["Home"], new_row["Away"])
-    if dup.any():
-        preserve_cols = {
-            "Actual_Score",
-            "Actual_Result",
-            "Correct",
-            "Notes",
-        }
-        for col, val in new_row.items():
-            if col in preserve_cols and _is_blank_value(val):
-                continue
-            df_pred.loc[dup, col] = val
-        print("[Info] Updated existing Predictions row.")
-    else:
-        df_pred = pd.concat([df_pred, pd.DataFrame([new_row])], ignore_index=True)
-        print("[Info] Added row to Predictions.")
-    sheets["Predictions"] = df_pred
+    with _open_ledger(excel_file) as ledger:
+        existing = ledger.get("Predictions", ledger.row_key("Predictions", new_row))
+        if existing is not None:
+            preserve_cols = {
+                "Actual_Score",
+                "Actual_Result",
+                "Correct",
+                "Notes",
+            }
+            row = dict(existing)
+            for col, val in new_row.items():
+                if col in preserve_cols and _is_blank_value(val):
+                    continue
+                row[col] = val
+            print("[Info] Updated existing Predictions row.")
+        else:
+            row = new_row
+            print("[Info] Added row to Predictions.")
+        ledger.upsert("Predictions", row)
 
-    backup_tracker(excel_file)
-    _save_all_sheets(excel_file, sheets)
+    if export:
+        export_tracker(excel_file)
     print(f"Saved prediction to {excel_file}")
 
-def calculate_summary_stats(filename="prediction_tracker.xlsx"):
-    if not os.path.exists(filename):
-        return
-    try:
-        df = pd.read_excel(filename, sheet_name="Predictions", engine="openpyxl")
-    except Exception:
+def calculate_summary_stats(filename="prediction_tracker.xlsx", export=True):
+    if not _tracker_exists(filename):
         return
+    with _open_ledger(filename) as ledger:
+        if "Predictions" not in ledger.sheet_names():
+            return
+        df = ledger.frame("Predictions")
 
     if "Actual_Result" not in df.columns:
         return
@@ -1028,95 +1023,75 @@ def calculate_summary_stats(filename="prediction_tracker.xlsx"):
             }
         )
 
-    sheets = _load_all_sheets(filename)
-    sheets["Summary"] = summary_df
-    backup_tracker(filename)
-    _save_all_sheets(filename, sheets)
+    with _open_ledger(filename) as ledger:
+        ledger.replace_sheet("Summary", summary_df)
+    if export:
+        export_tracker(filename)
     print("[Info] Summary updated.")
 
 
 def clean_duplicates(filename="prediction_tracker.xlsx"):
-    if not os.path.exists(filename):
+    if not _tracker_exists(filename):
         print(f"{filename} not found.")
         return
 
-    sheets = _load_all_sheets(filename)
-    for sheet in ["Predictions", "bet data", "bet predic"]:
-        if sheet not in sheets or sheets[sheet].empty:
-            continue
-        df = sheets[sheet].copy()
-        date_key = pd.to_datetime(df.get("Date", pd.Series([""] * len(df))), errors="coerce")
-        date_key = date_key.dt.strftime("%Y-%m-%d").where(date_key.notna(), df.get("Date", "").astype(str).str.slice(0, 10))
-
-        if "Home_Team" in df.columns and "Away_Team" in df.columns:
-            key = (
-                date_key.astype(str)
-                + "|"
-                + df["Home_Team"].astype(str).apply(_normalize_team_key)
-                + "|"
-                + df["Away_Team"].astype(str).apply(_normalize_team_key)
-            )
-        else:
-            key = date_key.astype(str) + "|" + df.get("Match", "").astype(str).apply(_normalize_text_key)
-
-        before = len(df)
-        df["__key"] = key
-        df = df.drop_duplicates(subset=["__key"], keep="last").drop(columns=["__key"])
-        sheets[sheet] = df
-        removed = before - len(df)
-        if removed > 0:
-            print(f"[Info] {sheet}: removed {removed} duplicates")
+    # Keyed sheets cannot hold duplicates in the ledger; re-keying catches rows whose key
+    # changed (e.g. team names edited by hand) since they were stored.
+    with _open_ledger(filename) as ledger:
+        for sheet in ["Predictions", "bet data", "bet predic"]:
+            if sheet not in ledger.sheet_names():
+                continue
+            df = ledger.frame(sheet)
+            if df.empty:
+                continue
+            removed = ledger.replace_sheet(sheet, df)
+            if removed > 0:
+                print(f"[Info] {sheet}: removed {removed} duplicates")
 
-    backup_tracker(filename)
-    _save_all_sheets(filename, sheets)
-    calculate_summary_stats(filename)
+    calculate_summary_stats(filename, export=False)
+    export_tracker(filename, force=True)
 
 
-def update_bet_results(filename="prediction_tracker.xlsx"):
-    if not os.path.exists(filename):
+def update_bet_results(filename="prediction_tracker.xlsx", export=True):
+    if not _tracker_exists(filename):
         print(f"{filename} not found.")
         return
 
-    sheets = _load_all_sheets(filename)
-    df_pred = sheets.get("Predictions", pd.DataFrame())
-    df_bet = sheets.get("bet predic", pd.DataFrame())
+    with _open_ledger(filename) as ledger:
+        df_pred = ledger.frame("Predictions")
+        df_bet = ledger.frame("bet predic")
 
-    if df_pred.empty or df_bet.empty:
-        print("No data to update bet results.")
-        return
+        if df_pred.empty or df_bet.empty:
+            print("No data to update bet results.")
+            return
 
-    for col in ["Actual_Score", "Bet_Result"]:
-        if col not in df_bet.columns:
-            df_bet[col] = pd.Series([pd.NA] * len(df_bet), dtype="object")
-        else:
-            df_bet[col] = df_bet[col].astype("object")
+        results = {}
+        for _, row in df_pred.iterrows():
+            score = row.get("Actual_Score")
+            result = row.get("Actual_Result")
+            if pd.isna(score) or str(score).strip() == "":
+                continue
+            key = (_normalize_date_key(row.get("Date")), _normalize_text_key(row.get("Match")))
+            results[key] = (str(score), str(result))
 
-    results = {}
-    for _, row in df_pred.iterrows():
-        score = row.get("Actual_Score")
-        result = row.get("Actual_Result")
-        if pd.isna(score) or str(score).strip() == "":
-            continue
-        key = (_normalize_date_key(row.get("Date")), _normalize_text_key(row.get("Match")))
-        results[key] = (str(score), str(result))
+        changed = []
+        for row in df_bet.to_dict(orient="records"):
+            key = (_normalize_date_key(row.get("Date")), _normalize_text_key(row.get("Match")))
+            if key not in results:
+                continue
+            score_str, result_str = results[key]
+            status = evaluate_bet_outcome(row.get("Selected_Bet"), score_str, result_str)
+            if status != "Pending":
+                row["Actual_Score"] = score_str
+                row["Bet_Result"] = status
+                changed.append(row)
 
-    updated = 0
-    for i, row in df_bet.iterrows():
-        key = (_normalize_date_key(row.get("Date")), _normalize_text_key(row.get("Match")))
-        if key not in results:
-            continue
-        score_str, result_str = results[key]
-        status = evaluate_bet_outcome(row.get("Selected_Bet"), score_str, result_str)
-        if status != "Pending":
-            df_bet.at[i, "Actual_Score"] = score_str
-            df_bet.at[i, "Bet_Result"] = status
-            updated += 1
+        ledger.upsert_rows("bet predic", changed)
 
-    sheets["bet predic"] = df_bet
-    backup_tracker(filename)
-    _save_all_sheets(filename, sheets)
-    calculate_summary_stats(filename)
-    print(f"[Info] Updated {updated} bet rows.")
+    calculate_summary_stats(filename, export=False)
+    if export:
+        export_tracker(filename)
+    print(f"[Info] Updated {len(changed)} bet rows.")
 
 
 def _calculate_ev(probability, decimal_odds):
@@ -1134,11 +1109,11 @@ def _calculate_ev(probability, decimal_odds):
         return None
 
 
-def update_bet_ev(filename="prediction_tracker.xlsx", odds_file="odds_input.csv"):
-    if not os.path.exists(filename):
+def update_bet_ev(filename="prediction_tracker.xlsx", odds_file="odds_input.csv", export=True):
+    if not _tracker_exists(filename):
         print(f"{filename} not found.")
         return
-    
+
     # helper to normalize match names for matching
     def norm_key(date_val, match_val):
         return (_normalize_date_key(date_val), _normalize_text_key(match_val))
@@ -1147,108 +1122,95 @@ def update_bet_ev(filename="prediction_tracker.xlsx", odds_file="odds_input.csv"
     if not os.path.exists(odds_file):
         print(f"{odds_file} not found. Cannot calculate EV without odds.")
         return
-    
+
     try:
         df_odds = pd.read_csv(odds_file)
     except Exception as e:
         print(f"Error reading {odds_file}: {e}")
         return
 
-    sheets = _load_all_sheets(filename)
-    df_predic = sheets.get("bet predic", pd.DataFrame())
-    
-    if df_predic.empty:
-        print("No 'bet predic' data found to match with odds.")
-        return
-
-    # Create map from prediction tracker
-    # Key: (Date, Match) -> { 'Model_Prob': ..., 'Selected_Bet': ... }
-    pred_map = {}
-    for i, row in df_predic.iterrows():
-        k = norm_key(row.get("Date"), row.get("Match"))
-        pred_map[k] = {
-            "Model_Prob": row.get("Model_Prob"),
-            "Selected_Bet": row.get("Selected_Bet"),
-            "Confidence": row.get("Confidence"),
-            "League": row.get("League", "") # Might be in Predictions, but let's try
-        }
-        # If League is missing in bet predic, we might need to look it up in Predictions
-        # But for 'bet ev' sheet, we just need the basics + EV.
-
-    ev_rows = []
-    
-    # Iterate through odds input
-    # We match odds input to our predictions
-    matched_count = 0
-    
-    for _, row in df_odds.iterrows():
-        # Clean inputs
-        date_str = str(row.get("Date", "")).strip()
-        match_str = str(row.get("Match", "")).strip()
-        selection = str(row.get("Selection", "")).strip()
-        odds_val = row.get("Odds")
-        
-        k = norm_key(date_str, match_str)
-        
-        if k in pred_map:
-            # We found a match in our tracker
-            pred_info = pred_map[k]
-            model_sel = str(pred_info.get("Selected_Bet", "")).strip()
-            
-            # Use fuzzy check or direct check if the odds selection matches the model selection
-            # Simple check: is the selection string contained in model selection or vice versa?
-            # Or assume the user inputted odds FOR the selected bet.
-            # For now, let's assume valid input in CSV corresponds to the 'Selected_Bet'.
-            # Or we can check if 'Selection' matches 'Selected_Bet' loosely
-            
-            # Logic: If Selection is valid and Odds is valid
-            prob = pred_info.get("Model_Prob")
-            ev = _calculate_ev(prob, odds_val)
-            
-            new_row = {
-                "Date": date_str,
-                "Match": match_str,
-                "Selection": selection, # User input selection
-                "Model_Selection": model_sel,
-                "Model_Prob": prob,
-                "Odds": odds_val,
-                "EV%": ev,
-                "Confidence": pred_info.get("Confidence"),
-                "Notes": "Matched" if ev is not None else "Invalid Odds/Prob"
+    with _open_ledger(filename) as ledger:
+        df_predic = ledger.frame("bet predic")
+
+        if df_predic.empty:
+            print("No 'bet predic' data found to match with odds.")
+            return
+
+        # Create map from prediction tracker
+        # Key: (Date, Match) -> { 'Model_Prob': ..., 'Selected_Bet': ... }
+        pred_map = {}
+        for i, row in df_predic.iterrows():
+            k = norm_key(row.get("Date"), row.get("Match"))
+            pred_map[k] = {
+                "Model_Prob": row.get("Model_Prob"),
+                "Selected_Bet": row.get("Selected_Bet"),
+                "Confidence": row.get("Confidence"),
+                "League": row.get("League", "") # Might be in Predictions, but let's try
             }
-            ev_rows.append(new_row)
-            matched_count += 1
-            
-            # OPTIONAL: Update 'bet predic' sheet with these odds and EV too?
-            # The user asked for 'bet ev' sheet specifically in the past context (implied by README check)
-            # README says: bet ev sheet exists.
-            
-    if not ev_rows:
-        print("No matches found between odds_input.csv and prediction_tracker.xlsx")
-        # Ensure sheet exists at least
-        if "bet ev" not in sheets:
-            sheets["bet ev"] = pd.DataFrame(columns=["Date", "Match", "Selection", "Model_Selection", "Model_Prob", "Odds", "EV%", "Confidence", "Notes"])
-    else:
-        df_ev = pd.DataFrame(ev_rows)
-        # Merge with existing 'bet ev' to avoid wiping history?
-        # Implementation: Append new ones, update existing? 
-        # For simplicity: Re-build or Append. README doesn't specify history policy for this sheet.
-        # Let's Append.
-        
-        current_ev = sheets.get("bet ev", pd.DataFrame())
-        current_ev = _ensure_columns(current_ev, list(ev_rows[0].keys()))
-        
-        # Deduplicate based on Date+Match+Selection
-        df_ev = pd.concat([current_ev, df_ev], ignore_index=True)
-        # Simple dedupe
-        df_ev["__key"] = df_ev["Date"].astype(str) + "|" + df_ev["Match"].astype(str) + "|" + df_ev["Selection"].astype(str)
-        df_ev = df_ev.drop_duplicates(subset=["__key"], keep="last").drop(columns=["__key"])
-        
-        sheets["bet ev"] = df_ev
-        print(f"[Info] Updated 'bet ev' sheet with {matched_count} entries.")
-
-    backup_tracker(filename)
-    _save_all_sheets(filename, sheets)
+            # If League is missing in bet predic, we might need to look it up in Predictions
+            # But for 'bet ev' sheet, we just need the basics + EV.
+
+        ev_rows = []
+
+        # Iterate through odds input
+        # We match odds input to our predictions
+        matched_count = 0
+
+        for _, row in df_odds.iterrows():
+            # Clean inputs
+            date_str = str(row.get("Date", "")).strip()
+            match_str = str(row.get("Match", "")).strip()
+            selection = str(row.get("Selection", "")).strip()
+            odds_val = row.get("Odds")
+
+            k = norm_key(date_str, match_str)
+
+            if k in pred_map:
+                # We found a match in our tracker
+                pred_info = pred_map[k]
+                model_sel = str(pred_info.get("Selected_Bet", "")).strip()
+
+                # Use fuzzy check or direct check if the odds selection matches the model selection
+                # Simple check: is the selection string contained in model selection or vice versa?
+                # Or assume the user inputted odds FOR the selected bet.
+                # For now, let's assume valid input in CSV corresponds to the 'Selected_Bet'.
+                # Or we can check if 'Selection' matches 'Selected_Bet' loosely
+
+                # Logic: If Selection is valid and Odds is valid
+                prob = pred_info.get("Model_Prob")
+                ev = _calculate_ev(prob, odds_val)
+
+                new_row = {
+                    "Date": date_str,
+                    "Match": match_str,
+                    "Selection": selection, # User input selection
+                    "Model_Selection": model_sel,
+                    "Model_Prob": prob,
+                    "Odds": odds_val,
+                    "EV%": ev,
+                    "Confidence": pred_info.get("Confidence"),
+                    "Notes": "Matched" if ev is not None else "Invalid Odds/Prob"
+                }
+                ev_rows.append(new_row)
+                matched_count += 1
+
+                # OPTIONAL: Update 'bet predic' sheet with these odds and EV too?
+                # The user asked for 'bet ev' sheet specifically in the past context (implied by README check)
+                # README says: bet ev sheet exists.
+
+        ev_columns = ["Date", "Match", "Selection", "Model_Selection", "Model_Prob", "Odds", "EV%", "Confidence", "Notes"]
+        if not ev_rows:
+            print("No matches found between odds_input.csv and prediction_tracker.xlsx")
+            # Ensure sheet exists at least
+            if "bet ev" not in ledger.sheet_names():
+                ledger.replace_sheet("bet ev", pd.DataFrame(columns=ev_columns))
+        else:
+            # Upsert on Date+Match+Selection, so re-running with the same odds file keeps one row each.
+            ledger.upsert_rows("bet ev", ev_rows)
+            print(f"[Info] Updated 'bet ev' sheet with {matched_count} entries.")
+
+    if export:
+        export_tracker(filename)
 
 
 def update_prediction_with_result():
@@ -1262,7 +1224,7 @@ if __name__ == "__main__":
     if len(os.sys.argv) > 1:
         cmd = os.sys.argv[1].strip().lower()
         if cmd == "save":
-            save_new_prediction()
+            save_new_prediction(export=False)
             calculate_summary_stats()
         elif cmd == "clean":
             clean_duplicates()
@@ -1276,8 +1238,17 @@ if __name__ == "__main__":
             evaluate_model_performance()
         elif cmd == "close_loop":
             close_loop_after_actual()
+        elif cmd == "export":
+            export_tracker(force=True)
+        elif cmd == "backups":
+            list_backups()
+        elif cmd == "restore":
+            restore_backup(os.sys.argv[2] if len(os.sys.argv) > 2 else "latest")
         else:
-            print("Usage: python update_tracker.py [save|clean|update_bets|update_ev|calibrate|evaluate|close_loop]")
+            print(
+                "Usage: python update_tracker.py "
+                "[save|clean|update_bets|update_ev|calibrate|evaluate|close_loop|export|backups|restore <id|date>]"
+            )
     else:
         update_prediction_with_result()
         calculate_summary_stats()
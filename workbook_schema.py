@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+import data_store
+
+CACHE_NAME = "validation_cache.json"
+CACHE_VERSION = 1
+
+
+def _mangle_columns(values):
+    """Header cells -> column labels the way pandas names them (Unnamed: i, duplicate .1/.2 suffixes)."""
+    values = list(values)
+    while values and values[-1] is None:
+        values.pop()
+    columns = []
+    seen = {}
+    for i, val in enumerate(values):
+        label = f"Unnamed: {i}" if val is None or (isinstance(val, str) and not val.strip()) else val
+        if label in seen:
+            seen[label] += 1
+            label = f"{label}.{seen[label]}"
+        else:
+            seen[label] = 0
+        columns.append(label)
+    return columns
+
+
+def _count_data_rows(ws):
+    try:
+        ws.calculate_dimension()
+        max_row = ws.max_row
+    except ValueError:
+        max_row = None
+    if max_row is not None:
+        return max(int(max_row) - 1, 0)
+    # Unsized sheet (no <dimension> element): stream the rows, ignoring trailing blank ones.
+    last = 0
+    for i, row in enumerate(ws.iter_rows(values_only=True), start=1):
+        if any(v is not None for v in row):
+            last = i
+    return max(last - 1, 0)
+
+
+def read_headers(path, sheets=None):
+    """
+    Sheet names plus the header row and data-row count of each sheet (all sheets, or `sheets`),
+    read through openpyxl's streaming read-only reader without loading any cell below row 1:
+    {"sheet_names": [...], "sheets": {name: {"columns": [...], "rows": n}}}.
+    Row counts come from the sheet dimension, so trailing formatted-but-empty rows are counted.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        info = {"sheet_names": list(wb.sheetnames), "sheets": {}}
+        for name in wb.sheetnames:
+            if sheets is not None and name not in sheets:
+                continue
+            ws = wb[name]
+            header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            info["sheets"][name] = {"columns": _mangle_columns(header), "rows": _count_data_rows(ws)}
+        return info
+    finally:
+        wb.close()
+
+
+def read_full(path, sheets=None):
+    """Same shape as read_headers(), from a full pandas parse (used to confirm header failures)."""
+    with pd.ExcelFile(path) as xl:
+        info = {"sheet_names": list(xl.sheet_names), "sheets": {}}
+        for name in xl.sheet_names:
+            if sheets is not None and name not in sheets:
+                continue
+            df = pd.read_excel(xl, sheet_name=name)
+            info["sheets"][name] = {"columns": list(df.columns), "rows": int(len(df))}
+    return info
+
+
+def rules_digest(*rules):
+    """Digest of a validator's rule tables; cached results are discarded when the rules change."""
+    blob = json.dumps(rules, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class ValidationCache:
+    """
+    Per-file validation results keyed by (validator, absolute path) and stored with the file's
+    mtime/size fingerprint and the validator's rules digest. An unchanged file replays its stored
+    result instead of being opened again.
+    """
+
+    def __init__(self, path, validator, rules, enabled=True):
+        self.path = path
+        self.validator = validator
+        self.rules = rules
+        self.enabled = enabled
+        self.entries = {}
+        self.hits = 0
+        self._changed = False
+        if enabled:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data.get("entries") or {}
+            except Exception:
+                self.entries = {}
+
+    def _key(self, file_path):
+        return f"{self.validator}:{os.path.abspath(str(file_path))}"
+
+    def get(self, file_path):
+        if not self.enabled:
+            return None
+        entry = self.entries.get(self._key(file_path))
+        if not entry or entry.get("rules") != self.rules:
+            return None
+        if entry.get("signature") != data_store.file_signature(file_path):
+            return None
+        self.hits += 1
+        return entry.get("result")
+
+    def put(self, file_path, result):
+        if not self.enabled:
+            return
+        signature = data_store.file_signature(file_path)
+        if signature is None:
+            return
+        self.entries[self._key(file_path)] = {"signature": signature, "rules": self.rules, "result": result}
+        self._changed = True
+
+    def save(self):
+        if not self.enabled or not self._changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": self.entries}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def default_cache_path():
+    return os.path.join(str(data_store.PROJECT_ROOT), data_store.STORE_DIRNAME, CACHE_NAME)
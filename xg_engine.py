@@ -3,6 +3,12 @@ import unicodedata
 
 import pandas as pd
 
+import match_log
+import team_registry
+
+# (workbook path, n_games) -> (TeamMatchLog, rolling figures); reused while match_log serves the same log.
+_ROLLING_CACHE = {}
+
 TEAM_ALIASES = {
     "Paris S-G": "Paris Saint-Germain",
     "PSG": "Paris Saint-Germain",
@@ -48,6 +54,7 @@ def _clip(value, low, high):
 
 class XGEngine:
     def __init__(self, league_name="Premier_League"):
+        self.league_name = league_name
         self.base_dir = f"Match Logs/{league_name}"
         self.aliases = TEAM_ALIASES
 
@@ -86,65 +93,18 @@ class XGEngine:
                 final.append(item)
         return final
 
-    def _resolve_team_file(self, team_name):
-        if not os.path.isdir(self.base_dir):
-            return None
-
-        for candidate in self._candidate_team_names(team_name):
-            file_path = os.path.join(self.base_dir, f"{candidate}.xlsx")
-            if os.path.exists(file_path):
-                return file_path
-
-        target = self._normalize_text(team_name)
-        best_path = None
-        best_score = -1
-        for filename in os.listdir(self.base_dir):
-            if not filename.lower().endswith(".xlsx"):
-                continue
-            stem = filename[:-5]
-            stem_norm = self._normalize_text(stem)
-            score = 0
-            if stem_norm == target:
-                score = 100
-            elif target and (target in stem_norm or stem_norm in target):
-                score = 40 + min(len(target), len(stem_norm))
-            else:
-                stem_tokens = set(stem_norm.split())
-                target_tokens = set(target.split())
-                score = len(stem_tokens.intersection(target_tokens)) * 6
-            if score > best_score:
-                best_score = score
-                best_path = os.path.join(self.base_dir, filename)
-
-        return best_path if best_score >= 6 else None
-
-    @staticmethod
-    def _find_col(df, exact=None, endswith=None, contains=None):
-        if df is None or df.empty:
-            return None
-
-        exact = [x.lower() for x in (exact or [])]
-        endswith = [x.lower() for x in (endswith or [])]
-        contains = [x.lower() for x in (contains or [])]
-
-        columns = list(df.columns)
-        lowered = {str(col).lower(): col for col in columns}
-
-        for key in exact:
-            if key in lowered:
-                return lowered[key]
-
-        for col in columns:
-            col_text = str(col).lower()
-            if any(col_text.endswith(s) for s in endswith):
-                return col
-
-        for col in columns:
-            col_text = str(col).lower()
-            if any(s in col_text for s in contains):
-                return col
+    def resolve_team_file(self, team_name):
+        """Path of the team's Match Logs workbook in this league (aliases resolved), None when unknown."""
+        fname = team_registry.get_registry().resolve(
+            "match_logs",
+            self.league_name,
+            team_name,
+            candidates=self._candidate_team_names(team_name),
+            normalize=self._normalize_text,
+        )
+        return os.path.join(self.base_dir, fname) if fname else None
 
-        return None
+    _find_col = staticmethod(match_log.find_col)
 
     @staticmethod
     def _sort_recent(df, date_col):
@@ -157,6 +117,16 @@ class XGEngine:
         out = out.sort_values(by=date_col, ascending=False, na_position="last")
         return out
 
+    def _recent_values(self, df, values, n_games):
+        """The `n_games` most recent entries of a per-row series of `df` (newest first)."""
+        date_col = self._find_col(df, exact=["date"], endswith=["_date"])
+        values = values.reset_index(drop=True)
+        if not date_col:
+            return values.head(max(1, int(n_games)))
+        dates = pd.to_datetime(df[date_col], errors="coerce").reset_index(drop=True)
+        order = dates.sort_values(ascending=False, na_position="last").index
+        return values.iloc[order[: max(1, int(n_games))]]
+
     @staticmethod
     def _mean_numeric(series, default):
         if series is None:
@@ -166,6 +136,11 @@ class XGEngine:
             return float(default)
         return float(vals.mean())
 
+    @staticmethod
+    def _result_points(results):
+        tokens = results.astype(str).str.strip().str.upper()
+        return tokens.str.startswith("W") * 3 + tokens.str.startswith("D") * 1
+
     def _compute_form(self, df_res):
         if df_res is None or df_res.empty:
             return DEFAULT_FORM_LAST_5, 0
@@ -185,138 +160,148 @@ class XGEngine:
         if work.empty:
             return DEFAULT_FORM_LAST_5, 0
 
-        points = 0
-        for res in work.head(5)[result_col].astype(str):
-            token = res.strip().upper()
-            if token.startswith("W"):
-                points += 3
-            elif token.startswith("D"):
-                points += 1
+        points = int(self._result_points(work.head(5)[result_col]).sum())
         return int(points), int(len(work))
 
-    def _compute_attack_xg(self, df_shoot, n_games):
-        if df_shoot is None or df_shoot.empty:
-            return DEFAULT_ATTACK_XG, "default_attack"
-
-        date_col = self._find_col(df_shoot, exact=["date"], endswith=["_date"])
-        work = self._sort_recent(df_shoot, date_col).head(max(1, int(n_games)))
-
+    def _attack_values(self, df_shoot):
+        """
+        Per-match attacking xG of a Shooting (or results) sheet: (values, source, low, high) with
+        the clip range of its average, or None when the sheet has no usable column.
+        """
         xg_col = self._find_col(
-            work,
+            df_shoot,
             exact=["standard_xg", "expected_xg"],
             endswith=["_xg"],
             contains=["_xg", "expected_xg"],
         )
         if xg_col:
-            xg_val = self._mean_numeric(work[xg_col], DEFAULT_ATTACK_XG)
-            return _clip(xg_val, 0.25, 3.5), f"column:{xg_col}"
+            return pd.to_numeric(df_shoot[xg_col], errors="coerce"), f"column:{xg_col}", 0.25, 3.5
 
-        shots_col = self._find_col(work, exact=["standard_sh"], endswith=["_sh"])
-        sot_col = self._find_col(work, exact=["standard_sot"], endswith=["_sot"])
-        goals_col = self._find_col(work, exact=["standard_gls"], endswith=["_gls"])
-        gf_col = self._find_col(work, exact=["gf"], endswith=["_gf"])
+        shots_col = self._find_col(df_shoot, exact=["standard_sh"], endswith=["_sh"])
+        sot_col = self._find_col(df_shoot, exact=["standard_sot"], endswith=["_sot"])
+        goals_col = self._find_col(df_shoot, exact=["standard_gls"], endswith=["_gls"])
+        gf_col = self._find_col(df_shoot, exact=["gf"], endswith=["_gf"])
 
-        shots = pd.to_numeric(work[shots_col], errors="coerce") if shots_col else pd.Series(index=work.index, dtype=float)
-        sot = pd.to_numeric(work[sot_col], errors="coerce") if sot_col else pd.Series(index=work.index, dtype=float)
-        goals = pd.to_numeric(work[goals_col], errors="coerce") if goals_col else None
+        shots = pd.to_numeric(df_shoot[shots_col], errors="coerce") if shots_col else pd.Series(index=df_shoot.index, dtype=float)
+        sot = pd.to_numeric(df_shoot[sot_col], errors="coerce") if sot_col else pd.Series(index=df_shoot.index, dtype=float)
+        goals = pd.to_numeric(df_shoot[goals_col], errors="coerce") if goals_col else None
         if goals is None and gf_col:
-            goals = pd.to_numeric(work[gf_col], errors="coerce")
+            goals = pd.to_numeric(df_shoot[gf_col], errors="coerce")
 
         if shots_col or sot_col or goals is not None:
             if goals is None:
-                goals = pd.Series(0.0, index=work.index)
+                goals = pd.Series(0.0, index=df_shoot.index)
             proxy = (shots.fillna(0.0) * 0.045) + (sot.fillna(0.0) * 0.080) + (goals.fillna(0.0) * 0.300)
-            proxy_val = self._mean_numeric(proxy, DEFAULT_ATTACK_XG)
-            return _clip(proxy_val, 0.35, 3.2), "proxy:shots_sot_goals"
+            return proxy, "proxy:shots_sot_goals", 0.35, 3.2
 
-        return DEFAULT_ATTACK_XG, "default_attack"
+        return None
 
-    def _compute_defense_xga(self, df_goalkeeping, df_res, n_games):
-        if df_goalkeeping is not None and not df_goalkeeping.empty:
-            date_col = self._find_col(df_goalkeeping, exact=["date"], endswith=["_date"])
-            work = self._sort_recent(df_goalkeeping, date_col).head(max(1, int(n_games)))
+    def _compute_attack_xg(self, df_shoot, n_games):
+        if df_shoot is None or df_shoot.empty:
+            return DEFAULT_ATTACK_XG, "default_attack"
 
+        attack = self._attack_values(df_shoot)
+        if attack is None:
+            return DEFAULT_ATTACK_XG, "default_attack"
+        values, source, low, high = attack
+        xg_val = self._mean_numeric(self._recent_values(df_shoot, values, n_games), DEFAULT_ATTACK_XG)
+        return _clip(xg_val, low, high), source
+
+    def _defense_values(self, df_goalkeeping, df_res):
+        """
+        Per-match xGA: (sheet, values, source, low, high) from Goalkeeping (PSxG, else a GA/SoTA/save%
+        proxy) or the results sheet's GA, or None when neither has a usable column.
+        """
+        if df_goalkeeping is not None and not df_goalkeeping.empty:
             psxg_col = self._find_col(
-                work,
+                df_goalkeeping,
                 exact=["performance_psxg"],
                 endswith=["_psxg"],
                 contains=["psxg"],
             )
             if psxg_col:
-                xga_val = self._mean_numeric(work[psxg_col], DEFAULT_DEFENSE_XGA)
-                return _clip(xga_val, 0.20, 3.5), f"column:{psxg_col}"
+                values = pd.to_numeric(df_goalkeeping[psxg_col], errors="coerce")
+                return df_goalkeeping, values, f"column:{psxg_col}", 0.20, 3.5
 
-            ga_col = self._find_col(work, exact=["performance_ga", "ga"], endswith=["_ga"])
-            sota_col = self._find_col(work, exact=["performance_sota"], endswith=["_sota"])
+            ga_col = self._find_col(df_goalkeeping, exact=["performance_ga", "ga"], endswith=["_ga"])
+            sota_col = self._find_col(df_goalkeeping, exact=["performance_sota"], endswith=["_sota"])
             save_col = self._find_col(
-                work,
+                df_goalkeeping,
                 exact=["performance_save%"],
                 endswith=["_save%"],
                 contains=["save%"],
             )
 
             if ga_col or sota_col:
-                ga = pd.to_numeric(work[ga_col], errors="coerce") if ga_col else pd.Series(0.0, index=work.index)
-                sota = pd.to_numeric(work[sota_col], errors="coerce") if sota_col else pd.Series(0.0, index=work.index)
+                index = df_goalkeeping.index
+                ga = pd.to_numeric(df_goalkeeping[ga_col], errors="coerce") if ga_col else pd.Series(0.0, index=index)
+                sota = pd.to_numeric(df_goalkeeping[sota_col], errors="coerce") if sota_col else pd.Series(0.0, index=index)
 
                 if save_col:
-                    save_pct = pd.to_numeric(work[save_col], errors="coerce")
+                    save_pct = pd.to_numeric(df_goalkeeping[save_col], errors="coerce")
                     save_ratio = save_pct.where(save_pct <= 1.0, save_pct / 100.0).clip(lower=0.0, upper=1.0)
                 else:
-                    save_ratio = pd.Series(0.70, index=work.index)
+                    save_ratio = pd.Series(0.70, index=index)
 
                 shot_quality = (1.0 - save_ratio.fillna(0.70)) * 0.90
                 proxy = (ga.fillna(0.0) * 0.62) + (sota.fillna(0.0) * 0.06) + shot_quality
-                proxy_val = self._mean_numeric(proxy, DEFAULT_DEFENSE_XGA)
-                return _clip(proxy_val, 0.30, 3.2), "proxy:ga_sota_save"
+                return df_goalkeeping, proxy, "proxy:ga_sota_save", 0.30, 3.2
 
         if df_res is not None and not df_res.empty:
-            date_col = self._find_col(df_res, exact=["date"], endswith=["_date"])
-            work = self._sort_recent(df_res, date_col).head(max(1, int(n_games)))
-            ga_col = self._find_col(work, exact=["ga"], endswith=["_ga"])
+            ga_col = self._find_col(df_res, exact=["ga"], endswith=["_ga"])
             if ga_col:
-                ga_val = self._mean_numeric(work[ga_col], DEFAULT_DEFENSE_XGA)
-                return _clip(ga_val, 0.30, 3.2), f"column:{ga_col}"
+                return df_res, pd.to_numeric(df_res[ga_col], errors="coerce"), f"column:{ga_col}", 0.30, 3.2
 
-        return DEFAULT_DEFENSE_XGA, "default_defense"
+        return None
 
-    def get_team_rolling_stats(self, team_name, n_games=10):
+    def _compute_defense_xga(self, df_goalkeeping, df_res, n_games):
+        defense = self._defense_values(df_goalkeeping, df_res)
+        if defense is None:
+            return DEFAULT_DEFENSE_XGA, "default_defense"
+        frame, values, source, low, high = defense
+        xga_val = self._mean_numeric(self._recent_values(frame, values, n_games), DEFAULT_DEFENSE_XGA)
+        return _clip(xga_val, low, high), source
+
+    def _compute_rolling(self, log, n_games):
+        df_shoot = log.sheet("Shooting")
+        df_goalkeeping = log.sheet("Goalkeeping")
+        df_res = log.results_sheet()
+
+        form_score, games_played = self._compute_form(df_res)
+        avg_xg_for, xg_source = self._compute_attack_xg(df_shoot if df_shoot is not None else df_res, n_games=n_games)
+        avg_xga, xga_source = self._compute_defense_xga(df_goalkeeping, df_res, n_games=n_games)
+        return form_score, games_played, avg_xg_for, xg_source, avg_xga, xga_source
+
+    def get_team_rolling_stats(self, team_name, n_games=10, as_of=None):
         """
         Calculates rolling xG/xGA and Form (Last 5 games).
         Supports both legacy and prefixed match-log schemas.
+        as_of: only use matches played before that day (point-in-time, via feature_store).
         """
-        team_file = self._resolve_team_file(team_name)
+        team_file = self.resolve_team_file(team_name)
 
         if not team_file:
             print(f"[XGEngine] Warning: Match logs not found for {team_name} in {self.base_dir}")
             return None
 
         try:
-            df_shoot = None
-            df_goalkeeping = None
-            df_res = None
-
             try:
-                df_shoot = pd.read_excel(team_file, sheet_name="Shooting")
+                log = match_log.load_team_match_log(team_file)
             except Exception:
-                df_shoot = None
+                log = match_log.TeamMatchLog(team_file, {})
 
-            try:
-                df_goalkeeping = pd.read_excel(team_file, sheet_name="Goalkeeping")
-            except Exception:
-                df_goalkeeping = None
+            key = (os.path.abspath(team_file), int(n_games))
+            hit = _ROLLING_CACHE.get(key)
+            if as_of is not None:
+                import feature_store
 
-            if df_shoot is not None and not df_shoot.empty:
-                df_res = df_shoot
+                rolling = feature_store.team_timeline(log, n_games=n_games).rolling(as_of)
+            elif hit is not None and hit[0] is log:
+                rolling = hit[1]
             else:
-                try:
-                    df_res = pd.read_excel(team_file, sheet_name=0)
-                except Exception:
-                    df_res = None
-
-            form_score, games_played = self._compute_form(df_res)
-            avg_xg_for, xg_source = self._compute_attack_xg(df_shoot if df_shoot is not None else df_res, n_games=n_games)
-            avg_xga, xga_source = self._compute_defense_xga(df_goalkeeping, df_res, n_games=n_games)
+                rolling = self._compute_rolling(log, n_games)
+                _ROLLING_CACHE[key] = (log, rolling)
+            form_score, games_played, avg_xg_for, xg_source, avg_xga, xga_source = rolling
 
             return {
                 "team": team_name,